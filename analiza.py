@@ -1,5 +1,9 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from leniwe import leniwy_import
+
+# matplotlib ładowany dopiero przy rysowaniu (przy braku danych skrypt kończy się od razu)
+plt = leniwy_import("matplotlib.pyplot")
 
 # 1. Wczytanie danych
 try:
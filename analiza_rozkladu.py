@@ -1,13 +1,11 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import scipy.stats as stats
 import numpy as np
 
-# Funkcja do obliczania Entropii Shannona
-def calculate_entropy(series):
-    p_data = series.value_counts() / len(series) # Prawdopodobieństwo wystąpienia każdej liczby
-    entropy = -sum(p_data * np.log2(p_data))
-    return entropy
+import rownolegle
+from leniwe import leniwy_import
+
+# matplotlib ładowany dopiero przy rysowaniu (przy braku danych skrypt kończy się od razu)
+plt = leniwy_import("matplotlib.pyplot")
 
 # 1. Wczytanie danych
 try:
@@ -17,9 +15,10 @@ except FileNotFoundError:
     print("Brak pliku dane_statystyczne.csv")
     exit()
 
-# 2. Obliczenia
-entropy_randao = calculate_entropy(df['randao_val'])
-entropy_vrf = calculate_entropy(df['vrf_val'])
+# 2. Obliczenia - liczniki wartości z puli procesów na pamięci współdzielonej (przy dużych plikach)
+bateria = rownolegle.bateria_kolumn({k: df[k].to_numpy() for k in ['randao_val', 'vrf_val']}, zakres=100)
+entropy_randao = bateria['randao_val']['entropia']
+entropy_vrf = bateria['vrf_val']['entropia']
 
 # Maksymalna możliwa entropia dla 100 wartości (0-99) to log2(100) ≈ 6.64
 max_entropy = np.log2(100)
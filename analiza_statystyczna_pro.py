@@ -1,7 +1,6 @@
-import pandas as pd
 import numpy as np
-from scipy import stats
-import matplotlib.pyplot as plt
+
+import rownolegle
 
 # Symulacja danych (jeśli nie masz jeszcze dużego pliku z wynikami losowań)
 # W pracy użyj prawdziwych danych z blockchaina/symulacji!
@@ -15,16 +14,19 @@ print("=== ANALIZA STATYSTYCZNA (Entropia i Chi-Square) ===\n")
 def analyze_randomness(name, data):
     print(f"--- Algorytm: {name} ---")
     
+    # Liczniki wartości - przy dużych próbach z puli procesów na pamięci współdzielonej (rownolegle.py)
+    wynik = rownolegle.bateria_kolumn({name: data}, zakres=256)[name]
+    counts = wynik['liczniki'][wynik['liczniki'] > 0]  # jak np.unique: tylko wartości, które wystąpiły
+
     # 1. Entropia Shannona
     # Idealna entropia dla zakresu 0-255 (8 bitów) to 8.0
-    counts = pd.Series(data).value_counts()
-    entropy = stats.entropy(counts, base=2)
+    entropy = wynik['entropia']
     print(f"Entropia Shannona: {entropy:.4f} (Idealna: ~8.0 dla pełnego bajtu)")
 
     # 2. Test Chi-Kwadrat (Test równomierności)
     # H0: Rozkład jest równomierny. p-value < 0.05 odrzuca hipotezę (czyli liczby NIE są losowe)
     # Oczekujemy p-value > 0.05
-    chisq, p_value = stats.chisquare(counts)
+    chisq, p_value = rownolegle.chi_kwadrat(counts)
     print(f"Test Chi-Square: statistic={chisq:.2f}, p-value={p_value:.4f}")
     
     if p_value > 0.05:
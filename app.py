@@ -1,10 +1,21 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-from scipy import stats
+
+import obliczenia as obl
+from leniwe import leniwy_import
+
+# Moduły analiz ładowane przy pierwszym użyciu w zakładce: nagłówek i pasek boczny
+# pojawiają się, zanim zaimportuje się matplotlib, scipy.stats.qmc czy plotly
+atak_ostatniego = leniwy_import("atak_ostatniego")
+atak_sybil = leniwy_import("atak_sybil")
+autokorelacja = leniwy_import("autokorelacja")
+entropia = leniwy_import("entropia")
+szkice = leniwy_import("szkice")
+wykresy = leniwy_import("wykresy")
+wykresy_web = leniwy_import("wykresy_web")
+wrazliwosc = leniwy_import("wrazliwosc")
+projekcja_loterii = leniwy_import("projekcja_loterii")
 
 # Konfiguracja strony
 st.set_page_config(
@@ -13,28 +24,68 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Styl
-sns.set_palette("husl")
-
 # === SIDEBAR - ŁADOWANIE DANYCH ===
 st.sidebar.title("⚙️ Konfiguracja")
 st.sidebar.markdown("---")
 
 def load_data(filename):
     """Próbuje załadować plik automatycznie, a jak nie ma, to prosi o upload."""
-    if os.path.exists(filename):
-        return pd.read_csv(filename)
-    else:
-        st.sidebar.warning(f"⚠️ Brak pliku: {filename}")
-        uploaded = st.sidebar.file_uploader(
-            f"Wgraj {filename}:", 
-            type="csv", 
-            key=f"upload_{filename}"
-        )
-        if uploaded:
-            return pd.read_csv(uploaded)
+    df = obl.wczytaj_dane(filename)
+    if df is not None:
+        return df
+    st.sidebar.warning(f"⚠️ Brak pliku: {filename}")
+    uploaded = st.sidebar.file_uploader(
+        f"Wgraj {filename}:", 
+        type="csv", 
+        key=f"upload_{filename}"
+    )
+    if uploaded:
+        return pd.read_csv(uploaded)
     return None
 
+@st.cache_data
+def krzywa_ataku_cache(gracze, atakujacy):
+    """P(sukces) ataku last revealer dla koalicji 1..atakujacy (atak_ostatniego.py, punkty zapamiętane per k)."""
+    return atak_ostatniego.krzywa_ataku(gracze, atakujacy)
+
+@st.cache_data
+def analiza_sybil_cache(gracze, adresy, pula, kaucja, kara):
+    """Krzywa ataku Sybil dla m = 1..adresy (atak_sybil.py)."""
+    return atak_sybil.analiza(gracze, adresy, pula=pula, kaucja=kaucja, kara=kara)
+
+@st.cache_data
+def autokorelacja_cache(wartosci, maks_opoznienie):
+    """ACF z pasmami i periodogram strumienia wyników (autokorelacja.py)."""
+    return autokorelacja.test(wartosci, maks_opoznienie)
+
+@st.cache_data
+def szkice_cache(plik, kolumny):
+    """Szkice kwantylowe kolumn CSV zapisane obok danych (szkice.py) - Q-Q bez sortowania próby."""
+    return szkice.szkice_csv(plik, list(kolumny))
+
+@st.cache_data
+def entropia_cache(katalog, kolumna, maks_slow):
+    """Min-entropia słów 256-bit z magazynu wyników (entropia.py, estymatory SP 800-90B)."""
+    return entropia.entropia_kolumny(katalog, kolumna, maks_slow)
+
+@st.cache_data
+def wrazliwosc_cache(n, stale):
+    """Indeksy Sobola kosztu i opłacalności ataku (wrazliwosc.py, quasi-Monte Carlo)."""
+    return wrazliwosc.analiza(n, stale=dict(stale))
+
+def pokaz_wykres(klucz, mpl, web, punkty=0):
+    """Wykres z przełącznikiem backendu: matplotlib (obraz z serwera) albo plotly/WebGL w przeglądarce.
+
+    mpl i web to funkcje bez argumentów zwracające figurę; rysowana jest tylko wybrana.
+    Przy dużej liczbie punktów domyślnie WebGL - powiększanie bez reruna.
+    """
+    if st.toggle("⚡ WebGL (plotly)", value=punkty >= wykresy_web.PROG_WEBGL, key=f"webgl_{klucz}",
+                 help="Rysowanie w przeglądarce z przerzedzonych danych; zoom i przesuwanie bez odświeżania. "
+                      "Wyłączone = obraz matplotlib jak w raporcie."):
+        st.plotly_chart(web(), use_container_width=True, config=wykresy_web.KONFIGURACJA)
+    else:
+        st.pyplot(mpl())
+
 # Ładowanie danych
 df_costs = load_data("wyniki_badan.csv")
 df_stats = load_data("dane_statystyczne.csv")
@@ -107,11 +158,12 @@ with tab1:
     st.markdown("---")
     
     # Kluczowe metryki
-    if df_costs is not None and 'randao_total_gas' in df_costs.columns:
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
         st.subheader("🔑 Kluczowe metryki")
         
-        avg_randao = df_costs['randao_total_gas'].mean()
-        avg_vrf = df_costs['vrf_request_gas'].mean() + df_costs['vrf_callback_gas'].mean()
+        koszty = obl.statystyki_kosztow(df_costs)
+        avg_randao = koszty['avg_randao']
+        avg_vrf = koszty['avg_vrf']
         
         metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
         
@@ -126,19 +178,15 @@ with tab1:
             help="Request + callback"
         )
         
-        diff_gas = avg_vrf - avg_randao
-        diff_pct = (diff_gas / avg_randao) * 100
-        
         metric_col3.metric(
             "Różnica absolutna", 
-            f"{int(diff_gas):,} gas",
-            f"{diff_pct:+.1f}%"
+            f"{int(koszty['diff_gas']):,} gas",
+            f"{koszty['diff_pct']:+.1f}%"
         )
         
-        winner = "RANDAO" if avg_randao < avg_vrf else "VRF"
         metric_col4.metric(
             "Tańszy algorytm", 
-            winner,
+            koszty['zwyciezca'],
             help="Dla single-user scenario"
         )
 
@@ -148,7 +196,9 @@ with tab1:
 with tab2:
     st.header("💰 Analiza Kosztów Ekonomicznych")
     
-    if df_costs is not None and 'randao_total_gas' in df_costs.columns:
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
+        koszty = obl.statystyki_kosztow(df_costs)
+
         # Dekompozycja kosztów
         st.subheader("📉 Dekompozycja kosztów")
         
@@ -156,15 +206,15 @@ with tab2:
         
         with col1:
             st.markdown("**RANDAO:**")
-            avg_randao_total = df_costs['randao_total_gas'].mean()
+            avg_randao_total = koszty['avg_randao']
             
             # Próbujemy obliczyć commit i reveal osobno (jeśli mamy kolumny)
             st.metric("Total (Commit + Reveal)", f"{int(avg_randao_total):,} gas")
             
         with col2:
             st.markdown("**VRF:**")
-            avg_vrf_req = df_costs['vrf_request_gas'].mean()
-            avg_vrf_cb = df_costs['vrf_callback_gas'].mean()
+            avg_vrf_req = koszty['avg_vrf_req']
+            avg_vrf_cb = koszty['avg_vrf_cb']
             
             st.metric("Request (user pays)", f"{int(avg_vrf_req):,} gas")
             st.metric("Callback (oracle pays)", f"{int(avg_vrf_cb):,} gas")
@@ -175,48 +225,8 @@ with tab2:
         # Wykres porównawczy
         st.subheader("📊 Przebieg kosztów w kolejnych próbach")
         
-        fig, ax = plt.subplots(figsize=(12, 5))
-        
-        ax.plot(
-            df_costs['iteracja'], 
-            df_costs['randao_total_gas'], 
-            label='RANDAO (Total)', 
-            marker='o', 
-            linewidth=2,
-            color='#3498db'
-        )
-        ax.plot(
-            df_costs['iteracja'], 
-            df_costs['vrf_request_gas'] + df_costs['vrf_callback_gas'], 
-            label='VRF (Total)', 
-            marker='s', 
-            linewidth=2,
-            color='#2ecc71'
-        )
-        
-        # Średnie linie
-        ax.axhline(
-            y=avg_randao_total, 
-            color='#3498db', 
-            linestyle='--', 
-            alpha=0.5,
-            label=f'RANDAO avg: {int(avg_randao_total):,}'
-        )
-        ax.axhline(
-            y=avg_vrf_req + avg_vrf_cb, 
-            color='#2ecc71', 
-            linestyle='--', 
-            alpha=0.5,
-            label=f'VRF avg: {int(avg_vrf_req + avg_vrf_cb):,}'
-        )
-        
-        ax.set_xlabel("Numer próby", fontsize=12)
-        ax.set_ylabel("Zużycie gazu (gas)", fontsize=12)
-        ax.set_title("Porównanie kosztów Gas w kolejnych iteracjach", fontsize=14, fontweight='bold')
-        ax.legend(loc='best')
-        ax.grid(True, alpha=0.3)
-        
-        st.pyplot(fig)
+        pokaz_wykres("koszty", lambda: wykresy.wykres_kosztow(df_costs, koszty),
+                     lambda: wykresy_web.wykres_kosztow(df_costs, koszty), len(df_costs))
         
         # Koszt w ETH
         st.markdown("---")
@@ -230,16 +240,12 @@ with tab2:
             step=10
         )
         
-        wei_per_gwei = 1e9
-        wei_per_eth = 1e18
-        
-        cost_randao_eth = (avg_randao_total * gas_price_gwei * wei_per_gwei) / wei_per_eth
-        cost_vrf_eth = ((avg_vrf_req + avg_vrf_cb) * gas_price_gwei * wei_per_gwei) / wei_per_eth
+        eth = obl.koszty_w_eth(koszty, gas_price_gwei)
         
         col1, col2, col3 = st.columns(3)
-        col1.metric("RANDAO koszt", f"{cost_randao_eth:.6f} ETH")
-        col2.metric("VRF koszt", f"{cost_vrf_eth:.6f} ETH")
-        col3.metric("Różnica", f"{abs(cost_vrf_eth - cost_randao_eth):.6f} ETH")
+        col1.metric("RANDAO koszt", f"{eth['randao_eth']:.6f} ETH")
+        col2.metric("VRF koszt", f"{eth['vrf_eth']:.6f} ETH")
+        col3.metric("Różnica", f"{eth['roznica_eth']:.6f} ETH")
         
         st.info(f"💡 Przy cenie gazu **{gas_price_gwei} Gwei** i ~$3000/ETH")
         
@@ -252,37 +258,21 @@ with tab2:
 with tab3:
     st.header("🎲 Testy Statystyczne Losowości")
     
-    if df_stats is not None and 'randao_val' in df_stats.columns:
-        
-        # Funkcje pomocnicze
-        def chi_square_test(values, bins=10):
-            """Test Chi-kwadrat dla rozkładu jednostajnego"""
-            observed, _ = np.histogram(values, bins=bins, range=(0, 100))
-            expected = len(values) / bins
-            
-            chi2_stat = np.sum((observed - expected)**2 / expected)
-            p_value = 1 - stats.chi2.cdf(chi2_stat, bins - 1)
-            
-            return chi2_stat, p_value
-        
-        def shannon_entropy(values):
-            """Entropia Shannona"""
-            value_counts = pd.Series(values).value_counts()
-            probabilities = value_counts / len(values)
-            entropy = -np.sum(probabilities * np.log2(probabilities))
-            return entropy
+    if obl.ma_kolumne(df_stats, 'randao_val'):
         
         # Obliczenia
-        randao_vals = df_stats['randao_val'].values
-        vrf_vals = df_stats['vrf_val'].values
+        analiza = obl.analiza_statystyczna(df_stats)
+        
+        randao_vals = analiza['randao']['wartosci']
+        vrf_vals = analiza['vrf']['wartosci']
         
-        chi2_randao, p_randao = chi_square_test(randao_vals)
-        chi2_vrf, p_vrf = chi_square_test(vrf_vals)
+        chi2_randao, p_randao = analiza['randao']['chi2'], analiza['randao']['p']
+        chi2_vrf, p_vrf = analiza['vrf']['chi2'], analiza['vrf']['p']
         
-        entropy_randao = shannon_entropy(randao_vals)
-        entropy_vrf = shannon_entropy(vrf_vals)
+        entropy_randao = analiza['randao']['entropia']
+        entropy_vrf = analiza['vrf']['entropia']
         
-        max_entropy = np.log2(100)  # Dla 100 możliwych wartości
+        max_entropy = analiza['max_entropia']
         
         # Metryki
         st.subheader("📊 Statystyki opisowe")
@@ -351,31 +341,34 @@ with tab3:
             st.progress(entropy_vrf / max_entropy)
             st.caption(f"Max teoretyczne: {max_entropy:.2f} bitów")
         
+        st.caption("Entropia Shannona wartości 0-99 nie mówi nic o pełnym 256-bitowym wyniku - patrz min-entropia poniżej.")
+        
+        # Min-entropia pełnych słów (SP 800-90B)
+        st.subheader("🧮 Min-entropia 256-bitowych wyników (SP 800-90B)")
+        
+        if os.path.isdir("magazyn_probki"):
+            maks_slow = st.select_slider("Liczba słów do analizy", options=[1 << 12, 1 << 14, 1 << 16, 1 << 18], value=1 << 14)
+            col1, col2 = st.columns(2)
+            for col, (nazwa, kolumna) in zip([col1, col2], [("RANDAO", "randao_slowo"), ("VRF", "vrf_slowo")]):
+                with col:
+                    st.markdown(f"**{nazwa}**")
+                    w = entropia_cache("magazyn_probki", kolumna, maks_slow)
+                    st.metric("Min-entropia na bit", f"{w['min']:.4f}", f"{w['min'] * 256:.1f} z 256 bitów", delta_color="off")
+                    st.progress(w['min'])
+                    st.dataframe(pd.DataFrame({'Estymator': entropia.ESTYMATORY,
+                                               'bit/bit': [round(w[e], 4) for e in entropia.ESTYMATORY]}),
+                                 hide_index=True, use_container_width=True)
+            st.info("💡 Wynik to minimum z estymatorów (jak w SP 800-90B). Nawet dla idealnego źródła zachowawcze estymatory (kompresyjny, t-krotek) dają ok. 0.85-0.95 bit/bit - liczy się porównanie RANDAO z VRF na tej samej liczbie słów.")
+        else:
+            st.info("ℹ️ Brak magazynu słów 256-bit. Wygeneruj go: `python generuj_probki.py --probki 100000`, a potem `python entropia.py`.")
+        
         st.markdown("---")
         
         # Histogramy
         st.subheader("📊 Rozkład wartości (Histogramy)")
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-        
-        ax1.hist(randao_vals, bins=20, color='#3498db', alpha=0.7, edgecolor='black')
-        ax1.set_title("RANDAO - Rozkład wartości", fontsize=14, fontweight='bold')
-        ax1.set_xlabel("Wartość (0-99)")
-        ax1.set_ylabel("Częstość")
-        ax1.axhline(y=len(randao_vals)/20, color='red', linestyle='--', label='Oczekiwane (jednostajny)')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        ax2.hist(vrf_vals, bins=20, color='#2ecc71', alpha=0.7, edgecolor='black')
-        ax2.set_title("VRF - Rozkład wartości", fontsize=14, fontweight='bold')
-        ax2.set_xlabel("Wartość (0-99)")
-        ax2.set_ylabel("Częstość")
-        ax2.axhline(y=len(vrf_vals)/20, color='red', linestyle='--', label='Oczekiwane (jednostajny)')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        pokaz_wykres("histogramy", lambda: wykresy.wykres_histogramow(randao_vals, vrf_vals),
+                     lambda: wykresy_web.wykres_histogramow(randao_vals, vrf_vals), len(randao_vals))
         
         st.markdown("---")
         
@@ -383,20 +376,42 @@ with tab3:
         st.subheader("📈 Q-Q Plot (Quantile-Quantile)")
         st.markdown("Porównanie rozkładu empirycznego z teoretycznym rozkładem jednostajnym")
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+        if os.path.exists("dane_statystyczne.csv"):
+            szkic = szkice_cache("dane_statystyczne.csv", ("randao_val", "vrf_val"))
+            qq_randao, qq_vrf = szkic['randao_val'], szkic['vrf_val']
+        else:
+            qq_randao, qq_vrf = randao_vals, vrf_vals
+        pokaz_wykres("qq", lambda: wykresy.wykres_qq(qq_randao, qq_vrf),
+                     lambda: wykresy_web.wykres_qq(qq_randao, qq_vrf), len(randao_vals))
+        
+        st.markdown("---")
         
-        # RANDAO
-        stats.probplot(randao_vals, dist="uniform", plot=ax1)
-        ax1.set_title("RANDAO - Q-Q Plot", fontsize=14, fontweight='bold')
-        ax1.grid(True, alpha=0.3)
+        # Autokorelacja i widmo
+        st.subheader("🔁 Autokorelacja i widmo (zależność między rundami)")
+        st.markdown("Chi-kwadrat zakłada niezależne rundy - tu sprawdzamy przeniesienie wyniku do kolejnej rundy i okresowość")
         
-        # VRF
-        stats.probplot(vrf_vals, dist="uniform", plot=ax2)
-        ax2.set_title("VRF - Q-Q Plot", fontsize=14, fontweight='bold')
-        ax2.grid(True, alpha=0.3)
+        maks_opoznienie = st.slider("Maksymalne opóźnienie (rundy)", 5, max(5, len(randao_vals) // 4), min(50, max(5, len(randao_vals) // 4)))
+        wyniki_acf = {
+            'RANDAO': autokorelacja_cache(randao_vals, maks_opoznienie),
+            'VRF': autokorelacja_cache(vrf_vals, maks_opoznienie),
+        }
         
-        plt.tight_layout()
-        st.pyplot(fig)
+        col1, col2 = st.columns(2)
+        for col, (nazwa, w) in zip([col1, col2], wyniki_acf.items()):
+            with col:
+                st.markdown(f"**{nazwa}**")
+                st.metric("Autokorelacja r₁", f"{w['r1']:+.4f}", f"p = {w['p_r1']:.4f}", delta_color="off")
+                st.metric("Ljung-Box p-wartość", f"{w['p_ljung_box']:.4f}")
+                if w['zaliczony']:
+                    st.success("✅ PASSED - brak istotnej autokorelacji i okresowości")
+                else:
+                    st.error(f"❌ FAILED - istotne opóźnienia: {', '.join(map(str, w['istotne_opoznienia'][:10])) or 'brak'}, "
+                             f"pik widma przy okresie {w['okres']:.1f} rund (p = {w['p_widmo']:.4f})")
+        
+        pokaz_wykres("autokorelacja", lambda: wykresy.wykres_autokorelacji(wyniki_acf),
+                     lambda: wykresy_web.wykres_autokorelacji(wyniki_acf), len(randao_vals))
+        
+        st.info("💡 Przerywane czerwone linie to próg łączny dla wszystkich opóźnień / częstotliwości naraz; werdykt PASSED/FAILED ma łączne α = 0.01 (0.0025 na każdy z 4 testów). Długie strumienie z magazynu wyników: `python autokorelacja.py --zrodlo magazyn_probki`.")
         
     else:
         st.warning("⚠️ Brak danych statystycznych. Wgraj plik `dane_statystyczne.csv`")
@@ -420,10 +435,34 @@ with tab4:
         4. Wynik zostaje zmieniony (XOR bez jego liczby)
         """)
         
+        gracze_atak = st.number_input(
+            "Liczba graczy (zwycięzca = wynik % n):",
+            min_value=2,
+            max_value=1_000_000,
+            value=10,
+            key="gracze_atak"
+        )
+        atakujacy = st.slider(
+            "Atakujący ujawniający na końcu (k):",
+            min_value=1,
+            max_value=min(atak_ostatniego.MAKS_ATAKUJACYCH, int(gracze_atak)),
+            value=1,
+            key="atakujacy_atak"
+        )
+        
+        krzywa_ataku = krzywa_ataku_cache(int(gracze_atak), int(atakujacy))
+        wynik_ataku = krzywa_ataku[-1]
+        # 3 cyfry znaczące zamiast .1% - przy n = 10^6 szanse rzędu 1e-6 nie mogą znikać jako 0.0%
         st.metric(
             "Prawdopodobieństwo sukcesu ataku", 
-            "100%",
-            help="Bez mechanizmu slashing, ostatni gracz ma pełną kontrolę"
+            f"{100 * wynik_ataku['p_atak']:.3g}%",
+            delta=f"{100 * (wynik_ataku['p_atak'] - wynik_ataku['p_uczciwie']):+.3g}% vs gra uczciwa",
+            delta_color="inverse",
+            help=("Dokładnie (WHT w grupie XOR dla części 2^a z n, reszty mod nieparzystej części z CRT)"
+                  if wynik_ataku['dokladny'] else
+                  f"Monte Carlo na pełnych 256 bitach (± {wynik_ataku['blad']:.2%})") +
+                 ": P, że któryś podzbiór wstrzymanych sekretów koalicji daje zwycięzcę z koalicji. "
+                 "Bez slashingu wstrzymanie nic nie kosztuje."
         )
         
         st.markdown("---")
@@ -453,15 +492,15 @@ with tab4:
             key="penalty_randao"
         )
         
-        penalty_eth = pool_size * (penalty / 100)
-        attack_cost = entry_fee + penalty_eth
-        attack_profit = pool_size - attack_cost
+        atak = obl.ekonomia_ataku(pool_size, entry_fee, penalty)
+        attack_cost = atak['koszt']
+        attack_profit = atak['profit']
         
         st.write(f"**Koszt ataku:** {attack_cost:.2f} ETH")
         st.write(f"**Potencjalny zysk:** {pool_size:.2f} ETH")
         st.write(f"**Profit netto:** {attack_profit:.2f} ETH")
         
-        if attack_profit > 0:
+        if atak['oplacalny']:
             st.error(f"❌ Atak jest OPŁACALNY (+{attack_profit:.2f} ETH)")
         else:
             st.success(f"✅ Atak jest NIEOPŁACALNY ({attack_profit:.2f} ETH)")
@@ -500,26 +539,41 @@ with tab4:
     # Wykres porównawczy prawdopodobieństwa
     st.subheader("📊 Porównanie podatności na ataki")
     
-    categories = ['Manipulacja\nużytkownika', 'Przewidywalność\nwyniku', 'Odporność na\ncenzurę', 'Zależność od\n3rd party']
-    randao_scores = [100, 30, 100, 0]  # % podatności (100 = max podatność)
-    vrf_scores = [0, 0, 50, 100]
-    
-    x = np.arange(len(categories))
-    width = 0.35
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig = wykresy.wykres_ryzyka()
     
-    ax.bar(x - width/2, randao_scores, width, label='RANDAO', color='#3498db', alpha=0.8)
-    ax.bar(x + width/2, vrf_scores, width, label='VRF', color='#2ecc71', alpha=0.8)
+    st.pyplot(fig)
     
-    ax.set_ylabel('Poziom ryzyka (%)', fontsize=12)
-    ax.set_title('Porównanie ryzyka bezpieczeństwa', fontsize=14, fontweight='bold')
-    ax.set_xticks(x)
-    ax.set_xticklabels(categories)
-    ax.legend()
-    ax.grid(True, alpha=0.3, axis='y')
+    st.subheader("🎯 Atak last revealer: P(sukces) vs wielkość koalicji")
+    st.pyplot(wykresy.wykres_ataku_ostatniego(krzywa_ataku))
     
-    st.pyplot(fig)
+    st.markdown("---")
+    st.subheader("🕵️ Atak Sybil: wiele adresów w participantList")
+    st.markdown("""
+    Atakujący z **m** adresami wybiera, które sekrety ujawnić - 2^m kandydatów na wynik.
+    Każdy nieujawniony adres traci kaucję (`slashParticipant`) i karę ustawioną wyżej.
+    """)
+    adresy_sybil = st.slider(
+        "Maksymalna liczba adresów atakującego (m):",
+        min_value=1,
+        max_value=min(14, int(gracze_atak)),
+        value=min(8, int(gracze_atak)),
+        key="adresy_sybil"
+    )
+    wyniki_sybil = analiza_sybil_cache(int(gracze_atak), int(adresy_sybil), float(pool_size), float(entry_fee), float(penalty))
+    st.pyplot(wykresy.wykres_sybil(wyniki_sybil))
+    st.dataframe(
+        wyniki_sybil.rename(columns={
+            'adresy': 'm',
+            'p_uczciwie': 'P uczciwie',
+            'p_wygrana': 'P wygrana',
+            'p_oplacalna': 'P opłacalna',
+            'sr_nieujawnione': 'Śr. nieujawnione',
+            'spalona_kaucja': 'Spalone ETH/runda',
+            'zysk_oczekiwany': 'Zysk vs uczciwa gra (ETH)',
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
     
     # Obraz ataku (jeśli istnieje)
     if os.path.exists("wykres_progu_ataku.png"):
@@ -533,7 +587,7 @@ with tab4:
 with tab5:
     st.header("📈 Analiza Skalowalności")
     
-    if df_scalability is not None and 'players' in df_scalability.columns:
+    if obl.ma_kolumne(df_scalability, 'players'):
         
         st.markdown("""
         **Kluczowe pytanie:** Jak koszty rosną wraz z liczbą uczestników?
@@ -543,28 +597,8 @@ with tab5:
         """)
         
         # Wykres
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        players = df_scalability['players'].values
-        gas_total = df_scalability['gas_total'].astype(float).values
-        
-        ax.plot(players, gas_total, marker='o', linewidth=2, markersize=8, color='#3498db', label='RANDAO (measured)')
-        
-        # Linia trendu (regresja liniowa)
-        if len(players) > 1:
-            z = np.polyfit(players, gas_total, 1)
-            p = np.poly1d(z)
-            ax.plot(players, p(players), "--", color='red', alpha=0.7, label=f'Trend: y = {z[0]:.0f}x + {z[1]:.0f}')
-        
-        # Teoretyczny VRF (stała linia)
-        vrf_const = 150000  # Przykładowy koszt VRF
-        ax.axhline(y=vrf_const, color='#2ecc71', linestyle='--', linewidth=2, label='VRF (constant O(1))')
-        
-        ax.set_xlabel("Liczba graczy", fontsize=12)
-        ax.set_ylabel("Zużycie gazu (gas)", fontsize=12)
-        ax.set_title("Skalowalność: RANDAO O(n) vs VRF O(1)", fontsize=14, fontweight='bold')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
+        skal = obl.analiza_skalowalnosci(df_scalability)
+        fig = wykresy.wykres_skalowalnosci(skal)
         
         st.pyplot(fig)
         
@@ -574,21 +608,39 @@ with tab5:
         st.subheader("⚖️ Punkt przełamania (Break-even)")
         
         # Dla ilu graczy VRF staje się tańszy?
-        if len(players) > 1:
-            # Oblicz gdzie linie się przecinają
-            # RANDAO: y = ax + b
-            # VRF: y = const
-            
-            a, b = z[0], z[1]
-            breakeven = (vrf_const - b) / a if a > 0 else float('inf')
+        if skal['trend'] is not None:
+            breakeven = skal['breakeven']
             
-            if breakeven > 0 and breakeven < 1000:
+            if obl.breakeven_w_zakresie(breakeven):
                 st.info(f"🎯 **Punkt przełamania: ~{int(breakeven)} graczy**")
                 st.write(f"- Dla < {int(breakeven)} graczy: **RANDAO tańszy**")
                 st.write(f"- Dla > {int(breakeven)} graczy: **VRF tańszy**")
             else:
                 st.info("🎯 W testowanym zakresie RANDAO pozostaje tańszy")
         
+        # Projekcja loterii do 10^6 graczy (projekcja_loterii.py)
+        st.markdown("---")
+        st.subheader("🎰 Projekcja loterii: 10 - 1 000 000 graczy")
+        
+        kal = projekcja_loterii.kalibracja()
+        col1, col2 = st.columns(2)
+        gaz_proj = col1.slider("Cena gazu (Gwei)", 0.1, 200.0, projekcja_loterii.RYNEK['cena_gazu'], key="proj_gaz")
+        link_proj = col2.slider("Kurs LINK (USD)", 2.0, 50.0, projekcja_loterii.RYNEK['link_usd'], key="proj_link")
+        rynek = dict(projekcja_loterii.RYNEK, cena_gazu=gaz_proj, link_usd=link_proj)
+        
+        proj = projekcja_loterii.projekcja(kal, projekcja_loterii.GRACZE_PROJEKCJI, rynek)
+        st.pyplot(wykresy.wykres_projekcji_loterii(proj))
+        st.info(f"🎯 Przełamanie przy tym rynku: **~{proj['prog']:.0f} graczy**; "
+                f"pickWinner RANDAO przekracza limit gazu bloku od **{proj['n_blok'] + 1:,} graczy** "
+                f"(kalibracja: {kal['zrodlo']})")
+        
+        powierzchnia = projekcja_loterii.powierzchnie(
+            kal, proj['gracze'], *projekcja_loterii.osie_siatki(120), rynek['eth_usd'], rynek['oplata_link'])
+        st.pyplot(wykresy.wykres_progu_loterii(powierzchnia, rynek))
+        st.dataframe(projekcja_loterii.tabela_do_druku(projekcja_loterii.tabela(
+            projekcja_loterii.projekcja(kal, projekcja_loterii.GRACZE_TABELI, rynek))),
+            use_container_width=True, hide_index=True)
+        
         # Tabela danych
         st.markdown("---")
         st.subheader("📋 Dane surowe")
@@ -615,59 +667,11 @@ with tab6:
     
     st.subheader("📊 Tabela porównawcza")
     
-    comparison_data = {
-        "Kryterium": [
-            "Bezpieczeństwo - manipulacja",
-            "Bezpieczeństwo - decentralizacja",
-            "Koszty (małe aplikacje)",
-            "Koszty (duże aplikacje)",
-            "Skalowalność",
-            "Przewidywalność kosztów",
-            "Łatwość implementacji",
-            "Właściwości statystyczne"
-        ],
-        "RANDAO": [
-            "⚠️ Wymaga slashing",
-            "✅ Pełna",
-            "✅ Niższe",
-            "⚠️ Rosną O(n)",
-            "⚠️ O(n)",
-            "⚠️ Zależne od n",
-            "⚠️ Średnia",
-            "✅ Rozkład jednostajny"
-        ],
-        "VRF": [
-            "✅ Wysoka",
-            "⚠️ Oracle dependency",
-            "⚠️ Wyższe",
-            "✅ Stałe",
-            "✅ O(1)",
-            "✅ Stałe",
-            "✅ Prosta (Chainlink)",
-            "✅ Rozkład jednostajny"
-        ],
-        "Zwycięzca": [
-            "VRF",
-            "RANDAO",
-            "RANDAO",
-            "VRF",
-            "VRF",
-            "VRF",
-            "VRF",
-            "Remis"
-        ]
-    }
-    
-    df_comparison = pd.DataFrame(comparison_data)
+    df_comparison = obl.tabela_porownawcza()
     
     # Kolorowanie
     def highlight_winner(row):
-        if row['Zwycięzca'] == 'RANDAO':
-            return ['background-color: #d6eaf8']*4
-        elif row['Zwycięzca'] == 'VRF':
-            return ['background-color: #d5f4e6']*4
-        else:
-            return ['background-color: #fef9e7']*4
+        return [f"background-color: {obl.KOLORY_ZWYCIEZCY[row['Zwycięzca']]}"]*4
     
     st.dataframe(
         df_comparison.style.apply(highlight_winner, axis=1),
@@ -725,7 +729,8 @@ with tab6:
     
     st.subheader("🔬 Wyniki badań")
     
-    st.markdown("""
+    atak_wnioski = krzywa_ataku_cache(10, 3)
+    st.markdown(f"""
     Na podstawie przeprowadzonych testów i analiz:
     
     **1. Właściwości statystyczne** (N=500)
@@ -734,21 +739,19 @@ with tab6:
     - ✅ Brak statystycznie istotnej różnicy w jakości losowości
     
     **2. Bezpieczeństwo**
-    - RANDAO: P(sukces ataku) = 100% bez slashingu, <1% z odpowiednim slashingiem
+    - RANDAO: P(sukces ataku) = {atak_wnioski[0]['p_atak']:.1%} dla 1 oszusta wśród 10 graczy (uczciwie {atak_wnioski[0]['p_uczciwie']:.1%}), {atak_wnioski[2]['p_atak']:.1%} dla koalicji 3 graczy; slashing nie zmienia tego prawdopodobieństwa, ale przy karze ≥ puli atak jest nieopłacalny
     - VRF: P(sukces ataku) = 0% (bezpieczeństwo kryptograficzne)
     
     **3. Koszty ekonomiczne**
     """)
     
-    if df_costs is not None and 'randao_total_gas' in df_costs.columns:
-        avg_randao = int(df_costs['randao_total_gas'].mean())
-        avg_vrf = int(df_costs['vrf_request_gas'].mean() + df_costs['vrf_callback_gas'].mean())
-        diff_pct = ((avg_vrf - avg_randao) / avg_randao * 100)
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
+        wnioski = obl.wnioski_kosztowe(df_costs)
         
         st.markdown(f"""
-    - RANDAO: ~{avg_randao:,} gas (średnia)
-    - VRF: ~{avg_vrf:,} gas (średnia)
-    - Różnica: {diff_pct:+.1f}% (VRF droższy dla single-user)
+    - RANDAO: ~{wnioski['avg_randao']:,} gas (średnia)
+    - VRF: ~{wnioski['avg_vrf']:,} gas (średnia)
+    - Różnica: {wnioski['diff_pct']:+.1f}% (VRF droższy dla single-user)
     
     **4. Skalowalność**
     - RANDAO: Koszty rosną liniowo O(n)
@@ -757,6 +760,41 @@ with tab6:
     
     st.markdown("---")
     
+    st.subheader("🎛️ Wrażliwość wniosków (indeksy Sobola)")
+    
+    st.markdown("""
+    Wszystkie parametry ekonomiczne (gaz, kursy ETH/LINK, opłata Chainlink, wpisowe, kara, pula,
+    liczba graczy) losowane **razem** z ciągu Sobola w ich pełnych zakresach. **S1** - część wariancji
+    wyjaśniona samym parametrem, **ST** - łącznie z interakcjami; parametr z ST ≈ 0 można ustalić.
+    """)
+    
+    # Stałe gazu z wczytanych pomiarów, gdy są dostępne
+    stale = wrazliwosc.stale_z_pomiarow(df_costs, df_scalability)
+    
+    n_sobol = st.select_slider("Punkty bazowe N (ewaluacji: N × 10)", options=[2 ** k for k in range(12, 21)],
+                               value=wrazliwosc.N_DOMYSLNE, format_func=lambda n: f"2^{n.bit_length() - 1}")
+    wrazl = wrazliwosc_cache(n_sobol, tuple(sorted(stale.items())))
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Ewaluacje modelu", f"{wrazl['ewaluacje']:,}")
+    col2.metric("RANDAO tańszy", f"{wrazl['udzial_randao_tansze']:.1%}", help="Udział przestrzeni parametrów")
+    col3.metric("Atak last revealer opłacalny", f"{wrazl['udzial_atak_oplacalny']:.1%}", help="Udział przestrzeni parametrów")
+    
+    st.pyplot(wykresy.wykres_wrazliwosci(wrazl['indeksy'], {
+        'roznica_kosztu': 'Różnica kosztu VRF - RANDAO',
+        'atak_oplacalny': 'Opłacalność ataku',
+    }))
+    
+    wyjscie = st.radio("Ranking dla", list(wrazliwosc.WYJSCIA), format_func=wrazliwosc.WYJSCIA.get, horizontal=True)
+    ranking = wrazliwosc.ranking(wrazl, wyjscie)
+    st.dataframe(ranking.style.format({'S1': '{:.3f}', 'ST': '{:.3f}', 'interakcje': '{:.3f}'}),
+                 use_container_width=True, hide_index=True)
+    glowny = ranking.iloc[0]
+    st.info(f"🎯 Najsilniej na „{wrazliwosc.WYJSCIA[wyjscie]}” wpływa **{glowny['opis']}** "
+            f"(ST = {glowny['ST']:.2f}, w tym interakcje {glowny['interakcje']:.2f})")
+    
+    st.markdown("---")
+    
     st.subheader("🎓 Wnioski końcowe")
     
     st.success("""
@@ -0,0 +1,373 @@
+import argparse
+import sys
+
+import numpy as np
+
+import pamiec
+from atak_sybil import modulo_limby, na_limby
+
+# Prawdopodobieństwo sukcesu ataku "last revealer" na Randao.getFinalRandom().
+#
+# Wynik to XOR ujawnionych sekretów. n - k uczciwych graczy ujawnia pierwszych - ich XOR (H) jest
+# jednostajny. k atakujących (koalicja) zna H i każdy może zatrzymać swój sekret s_i, więc osiągalne
+# wyniki to H ⊕ x_S dla wszystkich podzbiorów S koalicji. Zbiór {x_S} to przestrzeń liniowa V nad GF(2)
+# rozpięta przez sekrety, a atak się udaje, gdy warstwa H ⊕ V trafia w zbiór wygrywający f:
+#
+#   P(sukces) = P_H[ (f * 1_V)(H) > 0 ],   (f * 1_V)(H) = Σ_{v∈V} f(H ⊕ v)   - splot w grupie XOR.
+#
+# Gdy f zależy tylko od b najmłodszych bitów wyniku - m = 2^b albo predykat parzystości - splot
+# liczymy transformatą Walsha-Hadamarda w oknie 2^b stanów: WHT(f * 1_V) = WHT(f) · |V| · 1[w ∈ V⊥],
+# a V⊥ to w z parzystym popcount(w & b_j) dla każdego wektora bazy b_j. Wszystko w liczbach
+# całkowitych - wynik jest dokładny.
+#
+# Dowolne m = 2^a · m' (m' nieparzyste, np. 10 = 2 · 5, 10^6 = 2^6 · 15625): z CRT reszta to para
+# (a najmłodszych bitów, reszta mod m'). Bity okna są liniowe w XOR - jak wyżej. Reszta mod m' zależy
+# od starszych bitów, różnych dla każdego z 2^k wyników H ⊕ x_S (sekrety 256-bit), więc jest
+# jednostajna i niezależna między wynikami. Przy najmłodszych bitach h warstwa przegrywa z
+# prawdopodobieństwem Π_{p ∈ h ⊕ P} (1 - w(p)/m')^c, gdzie P to rzut V na okno, c = |V| / |P|,
+# a w(p) - liczba wygrywających reszt w klasie p. Logarytm tego iloczynu to znów splot XOR
+# (log1p(-w/m') * 1_P), więc koszt to dwie WHT w oknie 2^a - niezależnie od k. Monte Carlo na
+# pełnych 256 bitach (atak_sybil.modulo_limby) zostaje do sprawdzenia (--monte-carlo) i dla
+# m z częścią 2^a większą niż okno. Każdy punkt krzywej (k) jest zapamiętywany osobno.
+#
+#   python atak_ostatniego.py --gracze 10 --atakujacy 1           # 1 oszust wśród 10 graczy
+#   python atak_ostatniego.py --gracze 1000000 --atakujacy 40 --rozklad
+#   python atak_ostatniego.py --gracze 10 --atakujacy 8 --monte-carlo   # sprawdzenie na 256 bitach
+
+MAKS_BITOW = 20         # największe okno dokładnej WHT (część 2^a modułu); powyżej Monte Carlo
+PROBY_MC = 20000        # prób H na punkt krzywej...
+PROBY_MIN = 1000        # ...ale nie mniej niż tyle
+BUDZET_MC = 1 << 21     # par (H, podzbiór) na punkt krzywej - ogranicza próby (i czas) przy dużym k
+PACZKA_MC = 1 << 21     # par na paczkę obliczeń (pamięć: 32 B na parę)
+MAKS_ATAKUJACYCH = 64   # górna granica k w dashboardzie (ścieżka dokładna nie zależy od 2^k)
+MAKS_PRZEGLADU = 20     # bez uczciwych graczy wynik jest ustalony - przegląd 2^k podzbiorów do tej wielkości
+
+
+# --- 1. TRANSFORMATA I PRZESTRZEŃ PODZBIORÓW ---
+def wht(a):
+    """Szybka transformata Walsha-Hadamarda (bez normalizacji) - kopia w int64 (float64 dla liczb rzeczywistych)."""
+    a = np.array(a, dtype=np.float64 if np.asarray(a).dtype.kind == 'f' else np.int64)
+    n = len(a)
+    tmp = np.empty(n // 2, dtype=a.dtype)
+    h = 1
+    while h < n:
+        widok = a.reshape(-1, 2, h)
+        x, y = widok[:, 0], widok[:, 1]
+        t = tmp.reshape(x.shape)
+        np.copyto(t, x)
+        x += y
+        np.subtract(t, y, out=y)
+        h *= 2
+    return a
+
+
+def baza(sekrety, bity):
+    """Zredukowana baza GF(2) przestrzeni rozpiętej przez sekrety obcięte do okna `bity`.
+
+    Każdy wektor ma inny najstarszy bit (pivot), którego nie ma w żadnym innym wektorze.
+    """
+    maska = (1 << bity) - 1
+    wektory = []
+    for s in sekrety:
+        v = int(s) & maska
+        for b in wektory:
+            v = min(v, v ^ b)  # redukcja po pivocie b
+        if v:
+            pivot = 1 << (v.bit_length() - 1)
+            wektory = [b ^ v if b & pivot else b for b in wektory]
+            wektory.append(v)
+            wektory.sort(reverse=True)
+    return wektory
+
+
+def dopelnienie(wektory, bity):
+    """Baza V⊥ = {w : popcount(w & v) parzyste dla v ∈ V} z bazy zredukowanej V."""
+    pivoty = {v.bit_length() - 1: v for v in wektory}
+    dual = []
+    for q in range(bity):
+        if q in pivoty:
+            continue
+        w = 1 << q
+        for p, v in pivoty.items():
+            if v >> q & 1:
+                w |= 1 << p
+        dual.append(w)
+    return dual
+
+
+def rozpiecie(wektory):
+    """Wszystkie 2^d elementy przestrzeni o podanej bazie (podwajanie)."""
+    elementy = np.zeros(1, dtype=np.int64)
+    for v in wektory:
+        elementy = np.concatenate([elementy, elementy ^ v])
+    return elementy
+
+
+def okno_dla(modul, rodzaj='prog'):
+    """(bity okna a, nieparzysta część m') dla m = 2^a · m', albo None, gdy 2^a nie mieści się w oknie."""
+    if rodzaj == 'parzystosc':
+        return 1, 1
+    bity = (modul & -modul).bit_length() - 1
+    if bity > MAKS_BITOW:
+        return None
+    return bity, modul >> bity
+
+
+# --- 2. PREDYKATY WYPŁATY ---
+def wagi_okna(rodzaj, bity, modul, cel=0, prog=1):
+    """Liczba wygrywających reszt mod m w każdej klasie najmłodszych bitów (tablica długości 2^bity).
+
+    Klasa p to reszty r ≡ p (mod 2^bity) - jest ich m' = m / 2^bity. Dla m = 2^bity wagi to 0/1.
+    modulo     - wynik % m == cel               (konkretny zwycięzca, np. lottery pickWinner)
+    prog       - wynik % m < prog               (zwycięzca w koalicji prog graczy)
+    parzystosc - wynik % 2 == cel
+    """
+    p = np.arange(1 << bity, dtype=np.int64)
+    if rodzaj == 'modulo':
+        return ((p == cel % (1 << bity)) & (0 <= cel < modul)).astype(np.int64)
+    if rodzaj == 'prog':
+        # r = p + 2^bity * t < prog  =>  t < (prog - p) / 2^bity
+        return np.maximum(0, -(-(min(prog, modul) - p) >> bity))
+    if rodzaj == 'parzystosc':
+        return (p % 2 == cel).astype(np.int64)
+    raise ValueError(f"Nieznany predykat: {rodzaj}")
+
+
+def wygrywajace_reszty(rodzaj, modul, cel=0, prog=1):
+    """Maska bool wygrywających reszt 0..m-1."""
+    return wygrywa(np.arange(modul, dtype=np.int64), rodzaj, cel, prog)
+
+
+# --- 3. ATAK (DOKŁADNIE, WHT) ---
+def licznosci_warstw(f, wektory_bazy, bity):
+    """(f * 1_V)(H) dla wszystkich H - ile osiągalnych wyników z warstwy H ⊕ V wygrywa."""
+    n = 1 << bity
+    if len(wektory_bazy) == bity:
+        # V to całe okno - każda warstwa zawiera wszystkie wyniki
+        return np.full(n, np.count_nonzero(f), dtype=np.int64)
+    widmo = wht(f.astype(np.int64))
+    if wektory_bazy:
+        w_perp = rozpiecie(dopelnienie(wektory_bazy, bity))
+        maska = np.zeros(n, dtype=bool)
+        maska[w_perp] = True
+        widmo[~maska] = 0
+    # Odwrotna WHT to ta sama transformata / 2^b; czynnik |V| = 2^d się upraszcza
+    return wht(widmo) * (1 << len(wektory_bazy)) >> bity
+
+
+def porazki_warstw(wagi, nieparzysty, sekrety, bity):
+    """P(żaden z 2^k wyników H ⊕ x_S nie wygrywa | najmłodsze bity H = h) dla wszystkich h.
+
+    Klasy wygrywające w całości (w = m', także każda wygrywająca przy m' = 1) liczone dokładnie
+    w liczbach całkowitych; reszta przez splot log1p(-w/m') z 1_P w liczbach rzeczywistych.
+    """
+    wektory = baza(sekrety, bity)
+    pewne = licznosci_warstw(wagi == nieparzysty, wektory, bity) > 0
+    if nieparzysty == 1:
+        return (~pewne).astype(float)
+    # c = |V| / |P| wyników na każdy element rzutu P (sekrety 256-bit są zwykle liniowo niezależne)
+    krotnosc = float(1 << (len(baza(sekrety, 256)) - len(wektory)))
+    log_przegranej = np.where(wagi == nieparzysty, 0.0, np.log1p(-np.where(wagi == nieparzysty, 0, wagi) / nieparzysty))
+    widmo = wht(log_przegranej)
+    if wektory:
+        maska = np.zeros(1 << bity, dtype=bool)
+        maska[rozpiecie(dopelnienie(wektory, bity))] = True
+        widmo[~maska] = 0
+    suma = wht(widmo) * (2.0 ** len(wektory) / (1 << bity))
+    return np.where(pewne, 0.0, np.exp(np.minimum(krotnosc * suma, 0.0)))
+
+
+def sukces_ataku(wagi, nieparzysty, sekrety, bity):
+    """Dokładne P(koalicja trafi w wygrywającą resztę) przy jednostajnym H (uczciwi gracze)."""
+    return float(np.mean(1 - porazki_warstw(wagi, nieparzysty, sekrety, bity)))
+
+
+def rozklad_wyniku(wagi, nieparzysty, sekrety, bity, wygrywajace):
+    """Rozkład wyniku mod m przy strategii: wybierz wygrywający podzbiór, jeśli istnieje,
+    inaczej ujawnij wszystko. Masa sukcesu trafia równo na reszty wygrywające; przy porażce
+    wynik XOR wszystkich sekretów ma resztę jednostajną wśród przegrywających w swojej klasie."""
+    porazka = porazki_warstw(wagi, nieparzysty, sekrety, bity)
+    maska = (1 << bity) - 1
+    x_wszystkie = 0
+    for s in sekrety:
+        x_wszystkie ^= int(s) & maska
+
+    klasy = np.arange(len(wygrywajace), dtype=np.int64) & maska
+    przegrywajace = nieparzysty - wagi
+    # Masa porażki klasy p pochodzi z h = p ⊕ (x_wszystkie & maska)
+    w_klasie = porazka[np.arange(1 << bity) ^ x_wszystkie] / len(porazka)
+    rozklad = np.where(wygrywajace, 0.0, w_klasie[klasy] / np.maximum(przegrywajace[klasy], 1))
+    if wygrywajace.any():
+        rozklad[wygrywajace] += (1 - porazka.mean()) / np.count_nonzero(wygrywajace)
+    return rozklad
+
+
+# --- 4. MONTE CARLO NA PEŁNYCH 256 BITACH ---
+def wygrywa(reszty, rodzaj, cel=0, prog=1):
+    """Predykat na resztach wyniku % m."""
+    if rodzaj == 'modulo':
+        return reszty == cel
+    if rodzaj == 'prog':
+        return reszty < prog
+    if rodzaj == 'parzystosc':
+        return reszty % 2 == cel
+    raise ValueError(f"Nieznany predykat: {rodzaj}")
+
+
+def p_uczciwie(rodzaj, modul, cel=0, prog=1):
+    """P(wygrana) bez ataku dla jednostajnego wyniku 256-bit (obciążenie 2^256 mod m pomijalne)."""
+    if rodzaj == 'modulo':
+        return float(0 <= cel < modul) / modul
+    if rodzaj == 'prog':
+        return min(prog, modul) / modul
+    return 0.5
+
+
+def rozpiecie_limby(sekrety):
+    """Wszystkie 2^k wartości x_S (pełne 256 bitów, limby uint64); ostatni element to XOR wszystkich."""
+    elementy = np.zeros((1, 4), dtype=np.uint64)
+    for s in na_limby(sekrety):
+        elementy = np.concatenate([elementy, elementy ^ s])
+    return elementy
+
+
+def _proby_mc(sekrety, modul, ziarno, proby):
+    """Paczki (H, reszty (H ⊕ x_S) % m dla wszystkich S) - H losowe 256-bit, deterministyczne dla ziarna."""
+    if modul >= 1 << 32:
+        raise ValueError("Monte Carlo obsługuje m < 2^32")
+    rozp = rozpiecie_limby(sekrety)
+    rng = np.random.default_rng([ziarno, len(sekrety), modul])
+    paczka = max(1, PACZKA_MC // len(rozp))
+    for start in range(0, proby, paczka):
+        ile = min(paczka, proby - start)
+        h = np.frombuffer(rng.bytes(32 * ile), dtype=np.uint64).reshape(ile, 4)
+        wartosci = (h[:, None, :] ^ rozp[None, :, :]).reshape(-1, 4)
+        yield modulo_limby(wartosci, modul).reshape(ile, len(rozp))
+
+
+def liczba_prob(k, proby=None):
+    return proby or int(np.clip(BUDZET_MC >> k, PROBY_MIN, PROBY_MC))
+
+
+def bez_uczciwych(sekrety, modul, rodzaj='prog', cel=0, prog=1):
+    """Brak uczciwych graczy: H = 0, wynik to x_S - przegląd wszystkich podzbiorów jest dokładny."""
+    if wygrywajace_reszty(rodzaj, modul, cel, prog).all():
+        return 1.0
+    if len(sekrety) > MAKS_PRZEGLADU:
+        raise ValueError(f"Bez uczciwych graczy wynik zależy od konkretnych sekretów - przegląd 2^k "
+                         f"podzbiorów tylko do k = {MAKS_PRZEGLADU}")
+    reszty = modulo_limby(rozpiecie_limby(sekrety), modul)
+    return float(wygrywa(reszty, rodzaj, cel, prog).any())
+
+
+def sukces_ataku_mc(sekrety, modul, rodzaj='prog', cel=0, prog=1, uczciwi=True, proby=None, ziarno=2024):
+    """P(koalicja trafi w zbiór wygrywający) i błąd standardowy - Monte Carlo po H, % m na 256 bitach."""
+    if not uczciwi:
+        return bez_uczciwych(sekrety, modul, rodzaj, cel, prog), 0.0
+    proby = liczba_prob(len(sekrety), proby)
+    sukcesy = sum(int(np.count_nonzero(wygrywa(r, rodzaj, cel, prog).any(axis=1)))
+                  for r in _proby_mc(sekrety, modul, ziarno, proby))
+    p = sukcesy / proby
+    # Błąd standardowy z poprawką Laplace'a - przy 0 trafieniach (rzadkie zwycięstwo, duże m) nie jest zerowy
+    q = (sukcesy + 1) / (proby + 2)
+    return p, float(np.sqrt(q * (1 - q) / proby))
+
+
+def rozklad_wyniku_mc(sekrety, modul, rodzaj='prog', cel=0, prog=1, proby=None, ziarno=2024):
+    """Empiryczny rozkład wyniku mod m przy strategii: pierwszy wygrywający podzbiór, inaczej ujawnij wszystko."""
+    proby = liczba_prob(len(sekrety), proby)
+    rozklad = np.zeros(modul)
+    for reszty in _proby_mc(sekrety, modul, ziarno, proby):
+        trafienia = wygrywa(reszty, rodzaj, cel, prog)
+        wybor = np.where(trafienia.any(axis=1), trafienia.argmax(axis=1), reszty.shape[1] - 1)
+        rozklad += np.bincount(reszty[np.arange(len(reszty)), wybor].astype(np.int64), minlength=modul)
+    return rozklad / proby
+
+
+# --- 5. KRZYWA ATAKU ---
+def sekrety_losowe(k, ziarno=2024):
+    rng = np.random.default_rng(ziarno)
+    return [int.from_bytes(rng.bytes(32), 'big') for _ in range(k)]
+
+
+@pamiec.zapamietaj(wersja=3)
+def punkt_krzywej(gracze, k, rodzaj='prog', ziarno=2024):
+    """P(sukces) koalicji k graczy; sekrety to pierwsze k z sekrety_losowe, więc punkty są niezależne od maks. k."""
+    sekrety = sekrety_losowe(k, ziarno)
+    okno = okno_dla(gracze, rodzaj)
+    uczciwie = p_uczciwie(rodzaj, gracze, prog=k)
+    if k >= gracze:
+        p, blad = bez_uczciwych(sekrety, gracze, rodzaj, prog=k), 0.0
+    elif okno:
+        bity, nieparzysty = okno
+        p, blad = sukces_ataku(wagi_okna(rodzaj, bity, gracze, prog=k), nieparzysty, sekrety, bity), 0.0
+    else:
+        p, blad = sukces_ataku_mc(sekrety, gracze, rodzaj, prog=k, ziarno=ziarno)
+    return {'atakujacy': k, 'p_uczciwie': uczciwie, 'p_atak': p, 'blad': blad,
+            'dokladny': k >= gracze or okno is not None}
+
+
+def krzywa_ataku(gracze, maks_atakujacych, rodzaj='prog', ziarno=2024):
+    """P(sukces) w funkcji liczby atakujących dla loterii `wynik % gracze` (zakładka 4).
+
+    Koalicja k graczy wygrywa, gdy zwycięzcą jest którykolwiek z nich (indeksy 0..k-1).
+    """
+    return [punkt_krzywej(gracze, k, rodzaj, ziarno) for k in range(1, maks_atakujacych + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P(sukces) ataku last revealer (dokładnie przez WHT, sprawdzenie Monte Carlo 256-bit)")
+    parser.add_argument("--gracze", type=int, default=10, help="liczba graczy n (zwycięzca = wynik %% n)")
+    parser.add_argument("--atakujacy", type=int, default=1, help="wielkość koalicji k ujawniającej na końcu")
+    parser.add_argument("--modul", type=int, help="moduł m predykatu (domyślnie = gracze)")
+    parser.add_argument("--predykat", choices=["prog", "modulo", "parzystosc"], default="prog")
+    parser.add_argument("--cel", type=int, default=0)
+    parser.add_argument("--proby", type=int, help="próby H w Monte Carlo (domyślnie wg budżetu)")
+    parser.add_argument("--ziarno", type=int, default=2024, help="ziarno sekretów koalicji")
+    parser.add_argument("--rozklad", action="store_true", help="pokaż rozkład wyniku mod m przy ataku")
+    parser.add_argument("--monte-carlo", action="store_true", help="Monte Carlo na 256 bitach zamiast ścieżki dokładnej")
+    args = parser.parse_args()
+
+    # Parzystość to wynik % 2 - niezależnie od --modul
+    modul = 2 if args.predykat == 'parzystosc' else args.modul or args.gracze
+    okno = None if args.monte_carlo else okno_dla(modul, args.predykat)
+    sekrety = sekrety_losowe(args.atakujacy, args.ziarno)
+    uczciwi = args.atakujacy < args.gracze
+    uczciwie = p_uczciwie(args.predykat, modul, args.cel, args.atakujacy)
+
+    try:
+        if not uczciwi:
+            p, blad = bez_uczciwych(sekrety, modul, args.predykat, args.cel, args.atakujacy), 0.0
+            print(f"Bez uczciwych graczy: przegląd {2 ** args.atakujacy:,} podzbiorów")
+        elif okno:
+            bity, nieparzysty = okno
+            wagi = wagi_okna(args.predykat, bity, modul, cel=args.cel, prog=args.atakujacy)
+            p, blad = sukces_ataku(wagi, nieparzysty, sekrety, bity), 0.0
+            print(f"Dokładnie (WHT): m = 2^{bity} · {nieparzysty}, rząd przestrzeni podzbiorów w oknie "
+                  f"{len(baza(sekrety, bity))} z {len(baza(sekrety, 256))}")
+        else:
+            p, blad = sukces_ataku_mc(sekrety, modul, args.predykat, args.cel, args.atakujacy, uczciwi,
+                                      args.proby, args.ziarno)
+            print(f"Monte Carlo na 256 bitach: {liczba_prob(args.atakujacy, args.proby):,} prób H x {2 ** args.atakujacy:,} podzbiorów")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"P(wygrana) uczciwie:    {uczciwie:.6g}")
+    print(f"P(wygrana) z atakiem:   {p:.6g} ± {blad:.2g}" + (f"  (x{p / uczciwie:.2f})" if uczciwie else ""))
+
+    if args.rozklad:
+        if okno and uczciwi:
+            rozklad = rozklad_wyniku(wagi, nieparzysty, sekrety, bity,
+                                     wygrywajace_reszty(args.predykat, modul, args.cel, args.atakujacy))
+        else:
+            rozklad = rozklad_wyniku_mc(sekrety, modul, args.predykat, args.cel, args.atakujacy, args.proby, args.ziarno)
+        kolejnosc = np.argsort(rozklad)[::-1]
+        print(f"\nRozkład wyniku mod {modul} (jednostajny: {1 / modul:.6g}):")
+        for r in kolejnosc[:5]:
+            print(f"  {r:>10}  {rozklad[r]:.6g}")
+        print(f"  min: {rozklad.min():.6g}, odchylenie całkowite (TV): {0.5 * np.abs(rozklad - 1 / modul).sum():.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import pamiec
+
+# Atak Sybil na RANDAO: jeden atakujący kontroluje m adresów w participantList.
+#
+# Po ujawnieniu uczciwych graczy (XOR = H) atakujący wybiera, które ze swoich m sekretów ujawnić -
+# to 2^m kandydatów na wynik H ⊕ x_S. Zwycięzca to wynik % n, atakujący wygrywa, gdy indeks trafia
+# w jego adresy. Każdy nieujawniony adres traci kaucję (entryFee, slashParticipant w RandaoSlashing)
+# plus opcjonalną karę w % puli - jak w zakładce 4 dashboardu.
+#
+# Podzbiory przeglądamy w kolejności kodu Graya: kolejny kandydat różni się jednym adresem, więc kosztuje
+# jeden XOR na słowie 256-bit (4 limby uint64, skumulowany XOR w numpy). Przestrzeń 2^m dzielimy na
+# fragmenty po kolejnych indeksach Graya i rozdzielamy między procesy; każdy fragment liczy wartości
+# podzbiorów raz i sprawdza je dla wszystkich prób H. Wynik mod n liczony dokładnie na pełnych 256 bitach.
+#
+#   python atak_sybil.py --gracze 20 --adresy 8                  # krzywa dla m = 1..8
+#   python atak_sybil.py --gracze 100 --adresy 22 --procesy 8 --proby 50
+#   python atak_sybil.py --gracze 20 --adresy 10 --pula 100 --kaucja 1 --kara 50 --csv wyniki_sybil.csv
+
+FRAGMENT = 1 << 18           # podzbiorów na fragment (zadanie dla procesu)
+PROG_WIELOPROCESOWY = 1 << 20  # poniżej tego 2^m liczymy w bieżącym procesie
+LIMBY = 4
+
+
+# --- 1. ARYTMETYKA 256-BIT NA LIMBACH ---
+def na_limby(wartosci):
+    """Liczby 256-bit -> tablica (n, 4) uint64, limb 0 najstarszy."""
+    maska = (1 << 64) - 1
+    return np.array([[(int(w) >> (64 * (LIMBY - 1 - j))) & maska for j in range(LIMBY)] for w in wartosci],
+                    dtype=np.uint64).reshape(-1, LIMBY)
+
+
+def modulo_limby(limby, modul):
+    """Dokładne (wartość 256-bit) % modul dla modul < 2^32 - schemat Hornera po limbach."""
+    m = np.uint64(modul)
+    r = np.uint64((1 << 64) % modul)
+    wynik = limby[:, 0] % m
+    for j in range(1, LIMBY):
+        wynik = (wynik * r + limby[:, j] % m) % m
+    return wynik
+
+
+def popcount(x):
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+# --- 2. PRZEGLĄD PODZBIORÓW W KODZIE GRAYA ---
+def wartosci_fragmentu(sekrety, start, dlugosc):
+    """XOR podzbiorów o indeksach Graya start..start+dlugosc-1 i liczba ujawnionych adresów w każdym."""
+    indeksy = np.arange(start, start + dlugosc, dtype=np.uint64)
+    gray = indeksy ^ (indeksy >> np.uint64(1))
+
+    # Wartość startowa liczona wprost, dalej jeden XOR na krok: zmienia się bit ctz(i)
+    poczatek = np.zeros(LIMBY, dtype=np.uint64)
+    g0 = int(gray[0])
+    for j in range(len(sekrety)):
+        if g0 >> j & 1:
+            poczatek ^= sekrety[j]
+    kroki = indeksy[1:]
+    ctz = np.log2((kroki & (~kroki + np.uint64(1))).astype(np.float64)).astype(np.int64)
+    wartosci = np.empty((dlugosc, LIMBY), dtype=np.uint64)
+    wartosci[0] = poczatek
+    wartosci[1:] = sekrety[ctz]
+    np.bitwise_xor.accumulate(wartosci, axis=0, out=wartosci)
+    return wartosci, popcount(gray)
+
+
+def przeszukaj_fragment(zadanie):
+    """Dla każdej próby H: największa liczba ujawnionych adresów wśród wygrywających podzbiorów (-1: brak)."""
+    sekrety, uczciwi, modul, adresy, start, dlugosc = zadanie
+    wartosci, ujawnione = wartosci_fragmentu(sekrety, start, dlugosc)
+    najlepsze = np.full(len(uczciwi), -1, dtype=np.int64)
+    for t, h in enumerate(uczciwi):
+        wygrana = modulo_limby(wartosci ^ h, modul) < adresy
+        if wygrana.any():
+            najlepsze[t] = ujawnione[wygrana].max()
+    return najlepsze
+
+
+def najlepsze_podzbiory(sekrety, uczciwi, modul, procesy=None, fragment=FRAGMENT):
+    """Łączy fragmenty przestrzeni 2^m (maksimum po fragmentach) - sekwencyjnie lub w puli procesów."""
+    m = len(sekrety)
+    calosc = 1 << m
+    zadania = [(sekrety, uczciwi, modul, m, s, min(fragment, calosc - s)) for s in range(0, calosc, fragment)]
+    najlepsze = np.full(len(uczciwi), -1, dtype=np.int64)
+    if calosc < PROG_WIELOPROCESOWY or procesy == 1:
+        wyniki = map(przeszukaj_fragment, zadania)
+        for wynik in wyniki:
+            np.maximum(najlepsze, wynik, out=najlepsze)
+        return najlepsze
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        for wynik in pula.map(przeszukaj_fragment, zadania):
+            np.maximum(najlepsze, wynik, out=najlepsze)
+    return najlepsze
+
+
+# --- 3. EKONOMIA ---
+@pamiec.zapamietaj(wersja=1, pomin=('procesy',))
+def analiza(gracze, maks_adresow, proby=200, pula=100.0, kaucja=1.0, kara=0.0, ziarno=2024, procesy=None):
+    """Krzywa ataku dla m = 1..maks_adresow: P(wygrana), P(opłacalna wygrana), spalona kaucja.
+
+    Na każdą próbę atakujący wybiera podzbiór o największym zysku: pula za wygraną minus
+    (kaucja + kara% puli) za każdy nieujawniony adres; ujawnienie wszystkiego nic nie kosztuje.
+    """
+    rng = np.random.default_rng(ziarno)
+    wszystkie_sekrety = na_limby(int.from_bytes(rng.bytes(32), 'big') for _ in range(maks_adresow))
+    koszt_adresu = kaucja + pula * kara / 100
+
+    wiersze = []
+    for m in range(1, maks_adresow + 1):
+        if m > gracze:
+            break
+        # Bez uczciwych graczy H = 0 i wynik jest deterministyczny - wystarczy jedna próba
+        n_prob = proby if m < gracze else 1
+        uczciwi = na_limby(int.from_bytes(rng.bytes(32), 'big') for _ in range(n_prob))
+        if m == gracze:
+            uczciwi[:] = 0
+
+        najlepsze = najlepsze_podzbiory(wszystkie_sekrety[:m], uczciwi, gracze, procesy)
+        wygrana = najlepsze >= 0
+        spalone = np.where(wygrana, m - najlepsze, 0)
+        zysk_ataku = pula - spalone * koszt_adresu
+        oplacalna = wygrana & (zysk_ataku > 0)
+
+        wiersze.append({
+            'adresy': m,
+            'p_uczciwie': m / gracze,
+            'p_wygrana': wygrana.mean(),
+            'p_oplacalna': oplacalna.mean(),
+            'sr_nieujawnione': spalone[oplacalna].mean() if oplacalna.any() else 0.0,
+            'spalona_kaucja': (spalone * koszt_adresu)[oplacalna].sum() / n_prob,
+            'zysk_oczekiwany': np.where(oplacalna, zysk_ataku, 0).sum() / n_prob - m / gracze * pula,
+        })
+    return pd.DataFrame(wiersze)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atak Sybil na RANDAO - przegląd 2^m podzbiorów w kodzie Graya")
+    parser.add_argument("--gracze", type=int, default=20, help="liczba uczestników n (zwycięzca = wynik %% n)")
+    parser.add_argument("--adresy", type=int, default=10, help="maksymalna liczba adresów atakującego m")
+    parser.add_argument("--proby", type=int, default=200, help="liczba losowań XOR uczciwych graczy")
+    parser.add_argument("--pula", type=float, default=100.0, help="pula nagród (ETH)")
+    parser.add_argument("--kaucja", type=float, default=1.0, help="entryFee (ETH), tracona przy slashingu")
+    parser.add_argument("--kara", type=float, default=0.0, help="dodatkowa kara za nieujawnienie (%% puli)")
+    parser.add_argument("--ziarno", type=int, default=2024)
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--csv", help="zapis tabeli wyników")
+    args = parser.parse_args()
+
+    if args.gracze >= 1 << 32:
+        print("❌ Liczba graczy musi być mniejsza niż 2^32")
+        sys.exit(1)
+
+    print(f"Gracze: {args.gracze}, adresy atakującego: 1..{args.adresy}, próby: {args.proby}, "
+          f"procesy: {args.procesy or os.cpu_count()}")
+    start = time.perf_counter()
+    wyniki = analiza(args.gracze, args.adresy, args.proby, args.pula, args.kaucja, args.kara,
+                     args.ziarno, args.procesy)
+    print(wyniki.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"Czas: {time.perf_counter() - start:.1f}s")
+
+    if args.csv:
+        wyniki.to_csv(args.csv, index=False)
+        print(f"Zapisano: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+import pamiec
+from leniwe import leniwy_import
+from magazyn import PLIK_MANIFESTU, Magazyn
+
+# Zależność między rundami: autokorelacja i test widmowy (DFT) dla długich strumieni RANDAO / VRF.
+#
+# Testy z zakładki 3 (chi-kwadrat, entropia) zakładają niezależne losowania, a generate_stats.ts
+# używa jednej instancji VRFGame do wszystkich rund - przeniesienie stanu między rundami dałoby
+# korelację, której histogram nie pokaże. Tu liczymy:
+#   - ACF r_k dla k = 1..K w O(n log B): strumień dzielimy na fragmenty po B, a sumy x_t x_{t+k}
+#     liczymy jako korelację wzajemną fragmentu z jego przedłużeniem o K wartości (rfft o długości
+#     >= B + K, bez zawijania). Dane czytamy z np.memmap magazynu wyników - pamięć O(B + K).
+#   - pasma istotności dla wszystkich opóźnień naraz: pod H0 r_k ~ N(0, 1/n), próg łączny Šidáka
+#     dla K opóźnień + test Ljunga-Boxa; opóźnienie 1 (przeniesienie z poprzedniej rundy) to
+#     hipoteza zadana z góry, więc sprawdzamy je też osobno, bez poprawki na wielokrotność.
+#   - periodogram Bartletta: średnia |DFT|^2 / L z M rozłącznych okien; pod H0 każda rzędna ma
+#     rozkład Gamma(M, 1/M), więc próg dla największego piku (okresowość) jest dokładny.
+# Werdykt łączy cztery testy (pasma Šidáka, Ljung-Box, opóźnienie 1, widmo), więc każdy dostaje
+# alfa / 4 (Bonferroni) - łączny odsetek fałszywych alarmów na danych i.i.d. to ok. alfa
+# (alfa = 0.01: zmierzone 0.8% dla n = 500 i 1.0% dla n = 5000).
+#
+#   python autokorelacja.py                                          # dane_statystyczne.csv
+#   python autokorelacja.py --zrodlo magazyn_probki --kolumny randao_val,vrf_val,randao_slowo
+#   python autokorelacja.py --opoznienia 1000 --okno 65536 --wykres autokorelacja.png
+
+# scipy.special tylko do rozkładów (ndtr, chdtrc, gammaincc) - import przy pierwszym teście
+special = leniwy_import("scipy.special")
+
+FRAGMENT = 1 << 20       # wartości na fragment FFT
+MAKS_OPOZNIENIE = 100
+OKNO = 1 << 12           # długość okna periodogramu
+KOLUMNY = ['randao_val', 'vrf_val']
+TESTY = 4                # składowe werdyktu 'zaliczony' dzielące alfa
+
+
+# --- 1. STRUMIEŃ ---
+def wczytaj_strumien(zrodlo, kolumna):
+    """Kolumna z magazynu wyników (memmap, bez kopiowania) albo z pliku CSV."""
+    if os.path.isdir(zrodlo) and os.path.exists(os.path.join(zrodlo, PLIK_MANIFESTU)):
+        return Magazyn(zrodlo).kolumna(kolumna)
+    import pandas as pd
+    return pd.read_csv(zrodlo, usecols=[kolumna])[kolumna].to_numpy()
+
+
+def _wycinek(x, start, stop):
+    """Wycinek strumienia jako float64; słowa 256-bit (n, 32) -> najstarsze 64 bity / 2^64."""
+    w = np.asarray(x[start:stop])
+    if w.ndim == 2:
+        w = np.ascontiguousarray(w[:, :8]).view('>u8')[:, 0]
+        return w.astype(np.float64) / 2.0 ** 64
+    return w.astype(np.float64)
+
+
+def momenty(x, fragment=FRAGMENT):
+    """Średnia i wariancja strumienia jednym przebiegiem (łączenie fragmentów wzorem Chana)."""
+    n, srednia, m2 = 0, 0.0, 0.0
+    for start in range(0, len(x), fragment):
+        w = _wycinek(x, start, start + fragment)
+        nb, sb = len(w), w.mean()
+        delta = sb - srednia
+        m2 += ((w - sb) ** 2).sum() + delta ** 2 * n * nb / (n + nb)
+        srednia += delta * nb / (n + nb)
+        n += nb
+    return srednia, m2 / n
+
+
+# --- 2. AUTOKORELACJA ---
+def acf(x, maks_opoznienie=MAKS_OPOZNIENIE, fragment=FRAGMENT, srednia=None, wariancja=None):
+    """r_k = sum (x_t - m)(x_{t+k} - m) / (n * var) dla k = 0..K, fragmentami przez rfft."""
+    n = len(x)
+    K = min(maks_opoznienie, n - 1)
+    if srednia is None:
+        srednia, wariancja = momenty(x, fragment)
+    B = max(min(fragment, n), K + 1)   # krótki strumień: FFT na jego długość, nie na cały fragment
+    nfft = 1 << (B + K - 1).bit_length()
+    sumy = np.zeros(K + 1)
+    for start in range(0, n, B):
+        a = _wycinek(x, start, start + B) - srednia
+        b = _wycinek(x, start, start + B + K) - srednia   # przedłużenie o K wartości z kolejnego fragmentu
+        # Korelacja wzajemna: c[k] = sum_t a_t b_{t+k}; nfft >= len(a) + K, więc bez zawijania
+        c = np.fft.irfft(np.conj(np.fft.rfft(a, nfft)) * np.fft.rfft(b, nfft), nfft)
+        sumy += c[:K + 1]
+    return sumy / (n * wariancja)
+
+
+def prog_sidaka(alfa, testy):
+    """Kwantyl N(0,1) dla dwustronnego testu łącznego na poziomie alfa przy `testy` porównaniach."""
+    alfa_1 = 1 - (1 - alfa) ** (1 / testy)
+    return -special.ndtri(alfa_1 / 2)
+
+
+# --- 3. PERIODOGRAM ---
+def periodogram(x, okno=OKNO, srednia=None, wariancja=None):
+    """Średni periodogram Bartletta (M okien po L) dla częstotliwości j/L, j = 1..L/2-1."""
+    n = len(x)
+    L = min(okno, 1 << (n.bit_length() - 1))
+    M = n // L
+    if srednia is None:
+        srednia, wariancja = momenty(x)
+    moc = np.zeros(L // 2 + 1)
+    okna_na_wycinek = max(1, FRAGMENT // L)
+    for m in range(0, M, okna_na_wycinek):
+        ile = min(okna_na_wycinek, M - m)
+        w = (_wycinek(x, m * L, (m + ile) * L) - srednia).reshape(ile, L)
+        moc += (np.abs(np.fft.rfft(w, axis=1)) ** 2).sum(axis=0)
+    moc /= M * L * wariancja
+    # Bez składowej stałej (zerowa po odjęciu średniej) i Nyquista (rozkład chi2 z 1 st. swobody)
+    return np.arange(1, L // 2) / L, moc[1:L // 2], M
+
+
+# --- 4. TEST ---
+@pamiec.zapamietaj(wersja=2)
+def test(x, maks_opoznienie=MAKS_OPOZNIENIE, okno=OKNO, alfa=0.01, fragment=FRAGMENT):
+    """Komplet: ACF z pasmami, Ljung-Box, przeniesienie (opóźnienie 1), okresowość w widmie.
+
+    alfa to poziom łączny werdyktu 'zaliczony'; każdy z TESTY testów jest na poziomie alfa / TESTY.
+    """
+    n = len(x)
+    srednia, wariancja = momenty(x, fragment)
+    if wariancja == 0:
+        raise ValueError("Strumień jest stały - autokorelacja nieokreślona")
+    # Powyżej n/4 opóźnień estymatory r_k są zbyt mało dokładne (mało par)
+    r = acf(x, min(maks_opoznienie, max(1, n // 4)), fragment, srednia, wariancja)
+    K = len(r) - 1
+    opoznienia = np.arange(1, K + 1)
+
+    alfa_testu = alfa / TESTY
+    pasmo = -special.ndtri(alfa / 2) / np.sqrt(n)
+    pasmo_laczne = prog_sidaka(alfa_testu, K) / np.sqrt(n)
+    # Ljung-Box z K opóźnieniami przy K ~ n/5 jest antykonserwatywny (przybliżenie chi2); dla krótkich
+    # strumieni bierzemy n/50 opóźnień - pasma Šidáka i tak pokrywają wszystkie K
+    K_lb = max(1, min(K, n // 50))
+    ljung_box = n * (n + 2) * np.sum(r[1:K_lb + 1] ** 2 / (n - opoznienia[:K_lb]))
+    z1 = r[1] * np.sqrt(n)
+
+    czestotliwosci, moc, M = periodogram(x, okno, srednia, wariancja)
+    J = len(moc)
+    # P(Gamma(M, 1/M) > p) = gammaincc(M, M p); próg łączny Šidáka dla J częstotliwości
+    p_min = special.gammaincc(M, M * moc.max())
+    p_widmo = 1 - (1 - p_min) ** J
+    prog_mocy = special.gammainccinv(M, 1 - (1 - alfa_testu) ** (1 / J)) / M
+    szczyt = int(np.argmax(moc))
+
+    wynik = {
+        'n': n,
+        'opoznienia': opoznienia,
+        'acf': r[1:],
+        'pasmo': pasmo,
+        'pasmo_laczne': pasmo_laczne,
+        'istotne_opoznienia': opoznienia[np.abs(r[1:]) > pasmo_laczne],
+        'ljung_box': ljung_box,
+        'opoznienia_lb': K_lb,
+        'p_ljung_box': special.chdtrc(K_lb, ljung_box),
+        'r1': r[1],
+        'p_r1': 2 * special.ndtr(-abs(z1)),
+        'czestotliwosci': czestotliwosci,
+        'moc': moc,
+        'okna': M,
+        'prog_mocy': prog_mocy,
+        'okres': 1 / czestotliwosci[szczyt],
+        'p_widmo': p_widmo,
+        'alfa_testu': alfa_testu,
+    }
+    wynik['przeniesienie'] = wynik['p_r1'] < alfa_testu
+    wynik['okresowosc'] = p_widmo < alfa_testu
+    wynik['zaliczony'] = not (len(wynik['istotne_opoznienia']) or wynik['p_ljung_box'] < alfa_testu
+                              or wynik['przeniesienie'] or wynik['okresowosc'])
+    return wynik
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autokorelacja i test widmowy strumieni RANDAO / VRF")
+    parser.add_argument("--zrodlo", default="dane_statystyczne.csv", help="plik CSV albo katalog magazynu wyników")
+    parser.add_argument("--kolumny", default=",".join(KOLUMNY), help="kolumny do zbadania (lista)")
+    parser.add_argument("--opoznienia", type=int, default=MAKS_OPOZNIENIE, help="maksymalne opóźnienie K")
+    parser.add_argument("--okno", type=int, default=OKNO, help="długość okna periodogramu (potęga 2)")
+    parser.add_argument("--fragment", type=int, default=FRAGMENT, help="wartości na fragment FFT")
+    parser.add_argument("--alfa", type=float, default=0.01)
+    parser.add_argument("--wykres", help="zapis wykresu ACF i periodogramu (PNG)")
+    args = parser.parse_args()
+
+    wyniki = {}
+    for kolumna in [k for k in args.kolumny.split(',') if k]:
+        start = time.perf_counter()
+        try:
+            x = wczytaj_strumien(args.zrodlo, kolumna)
+            w = test(x, args.opoznienia, args.okno, args.alfa, args.fragment)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ {kolumna}: {e}")
+            sys.exit(1)
+        wyniki[kolumna] = w
+        print(f"\n{kolumna}: n = {w['n']:,}, K = {len(w['acf'])}, czas {time.perf_counter() - start:.1f}s")
+        print(f"  r1 = {w['r1']:+.5f} (p = {w['p_r1']:.4f})"
+              f"{'  ⚠️ przeniesienie między rundami' if w['przeniesienie'] else ''}")
+        print(f"  pasmo łączne ±{w['pasmo_laczne']:.5f}, istotne opóźnienia: "
+              f"{', '.join(map(str, w['istotne_opoznienia'][:20])) or 'brak'}")
+        print(f"  Ljung-Box Q = {w['ljung_box']:.2f} (p = {w['p_ljung_box']:.4f})")
+        print(f"  widmo: {w['okna']} okien, największy pik przy okresie {w['okres']:.2f} rund "
+              f"(p = {w['p_widmo']:.4f}){'  ⚠️ okresowość' if w['okresowosc'] else ''}")
+        print(f"  {'✅ PASSED' if w['zaliczony'] else '❌ FAILED'}")
+
+    if args.wykres:
+        import wykresy
+        wykresy.wykres_autokorelacji(wyniki).savefig(args.wykres, bbox_inches='tight', dpi=150)
+        print(f"Zapisano: {args.wykres}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pamiec
+from magazyn import PLIK_MANIFESTU, ROZMIAR_SLOWA, Magazyn, slowa_z_hex
+
+# Min-entropia pełnych 256-bitowych wyników RANDAO / VRF - estymatory w stylu NIST SP 800-90B (6.3).
+#
+# Entropia Shannona z zakładki 3 liczy się na wartościach 0-99 (max log2(100)) i nic nie mówi
+# o samym słowie 256-bit. Tu słowa rozkładamy na bity (big-endian, tak jak w magazynie) i liczymy
+# estymatory min-entropii na bit: MCV (najczęstsza wartość, też na bajtach), kolizyjny, Markowa,
+# kompresyjny (Maurer, bloki 6-bit) i t-krotek. Wynik końcowy to minimum - jak w 90B.
+#
+# Każdy fragment słów daje stan, który się sumuje: liczniki bitów/bajtów/przejść, liczby kolizji
+# długości 2 i 3, sumy log2 odległości kompresji, liczniki t-krotek do MAKS_KROTKA bitów. Fragmenty
+# liczą się w puli procesów (każdy proces sam otwiera memmap magazynu), pamięć O(fragment).
+# Odstępstwa od 90B wynikające z fragmentacji: przejścia między fragmentami są doklejane przy
+# scalaniu, ale kolizje parsujemy niezależnie w segmentach po SEGMENT bitów, słownik kompresji
+# inicjujemy od nowa w każdym fragmencie, a t-krotki na granicy fragmentów pomijamy - przy
+# fragmentach po miliony bitów to pomijalny ułamek danych.
+#
+#   python entropia.py                                            # magazyn_probki, randao_slowo i vrf_slowo
+#   python entropia.py --maks-slow 100000 --procesy 4 --json entropia.json
+#   python entropia.py --zrodlo zdarzenia.csv --kolumny slowo     # kolumna hex w CSV
+
+FRAGMENT = 1 << 15        # słów na zadanie (8 Mbit)
+SEGMENT = 4096            # bity na segment parsowania kolizji
+MAKS_KROTKA = 20          # najdłuższa t-krotka bitów (liczniki 2^t)
+PROG_KROTKI = 35          # t-krotka liczy się, gdy najczęstsza wystąpiła >= 35 razy
+BLOK = 6                  # bity na symbol w teście kompresji
+SLOWNIK = 1000            # bloki inicjujące słownik kompresji
+Z = 2.576                 # kwantyl 99,5% N(0,1) - górna granica ufności jak w 90B
+KOLUMNY = ['randao_slowo', 'vrf_slowo']
+ESTYMATORY = ['mcv', 'mcv_bajty', 'kolizje', 'markow', 'kompresja', 'krotki']
+
+
+# --- 1. STAN FRAGMENTU ---
+def _kolizje(bity):
+    """Liczba kolizji długości 2 (b0 == b1) i 3 - parsowanie równolegle w segmentach."""
+    segmenty = len(bity) // SEGMENT
+    rowne = (bity[:segmenty * SEGMENT].reshape(segmenty, SEGMENT)[:, :-1]
+             == bity[:segmenty * SEGMENT].reshape(segmenty, SEGMENT)[:, 1:])
+    pozycje = np.zeros(segmenty, dtype=np.int64)
+    wiersze = np.arange(segmenty)
+    dwa = trzy = 0
+    while segmenty:
+        aktywne = pozycje + 2 < SEGMENT
+        if not aktywne.any():
+            break
+        w, p = wiersze[aktywne], pozycje[aktywne]
+        para = rowne[w, p]
+        dwa += int(para.sum())
+        trzy += int((~para).sum())
+        pozycje[aktywne] = p + np.where(para, 2, 3)
+    return dwa, trzy
+
+
+def _kompresja(bity):
+    """Suma log2 i log2^2 odległości do poprzedniego wystąpienia bloku (test Maurera, 90B 6.3.4)."""
+    bloki = bity[:len(bity) // BLOK * BLOK].reshape(-1, BLOK) @ (1 << np.arange(BLOK - 1, -1, -1))
+    i = np.arange(1, len(bloki) + 1)
+    kolejnosc = np.lexsort((i, bloki))
+    poprzedni = np.zeros(len(bloki), dtype=np.int64)
+    ten_sam = bloki[kolejnosc][1:] == bloki[kolejnosc][:-1]
+    poprzedni[kolejnosc[1:][ten_sam]] = i[kolejnosc[:-1][ten_sam]]
+    odleglosci = np.log2((i - poprzedni)[SLOWNIK:])
+    return len(odleglosci), float(odleglosci.sum()), float((odleglosci ** 2).sum()), len(bloki)
+
+
+def stan_fragmentu(slowa, maks_krotka=MAKS_KROTKA):
+    """Sumowalne statystyki fragmentu słów (n, 32) uint8."""
+    slowa = np.ascontiguousarray(slowa, dtype=np.uint8)
+    bity = np.unpackbits(slowa.reshape(-1))
+    przejscia = np.bincount(2 * bity[:-1] + bity[1:], minlength=4)
+
+    krotki = []
+    wartosci = bity.astype(np.int32)
+    for t in range(1, maks_krotka + 1):
+        if t > 1:
+            wartosci = (wartosci[:-1] << 1) | bity[t - 1:]
+        krotki.append(np.bincount(wartosci, minlength=1 << t))
+
+    return {
+        'bity': len(bity),
+        'jedynki': int(bity.sum()),
+        'bajty': np.bincount(slowa.reshape(-1), minlength=256),
+        'przejscia': przejscia,
+        'pierwszy': int(bity[0]),
+        'ostatni': int(bity[-1]),
+        'kolizje': _kolizje(bity),
+        'kompresja': _kompresja(bity),
+        'krotki': krotki,
+    }
+
+
+def _zadanie(argumenty):
+    zrodlo, kolumna, start, stop, maks_krotka = argumenty
+    slowa = Magazyn(zrodlo).kolumna(kolumna, start, stop) if isinstance(zrodlo, str) else zrodlo
+    return stan_fragmentu(slowa, maks_krotka)
+
+
+def scal(stany):
+    """Suma stanów kolejnych fragmentów (w kolejności - przejście na granicy jest doklejane)."""
+    wynik = None
+    for s in stany:
+        if wynik is None:
+            wynik = {k: (list(v) if k in ('kolizje', 'kompresja', 'krotki') else v) for k, v in s.items()}
+            continue
+        wynik['przejscia'] = wynik['przejscia'] + s['przejscia']
+        wynik['przejscia'][2 * wynik['ostatni'] + s['pierwszy']] += 1
+        for klucz in ('bity', 'jedynki', 'bajty'):
+            wynik[klucz] = wynik[klucz] + s[klucz]
+        wynik['kolizje'] = [a + b for a, b in zip(wynik['kolizje'], s['kolizje'])]
+        wynik['kompresja'] = [a + b for a, b in zip(wynik['kompresja'], s['kompresja'])]
+        wynik['krotki'] = [a + b for a, b in zip(wynik['krotki'], s['krotki'])]
+        wynik['ostatni'] = s['ostatni']
+    return wynik
+
+
+# --- 2. ESTYMATORY (na bit) ---
+def _gorna_granica(p, n):
+    return min(1.0, p + Z * math.sqrt(p * (1 - p) / (n - 1)))
+
+
+def _bisekcja(funkcja, cel, lewy, prawy, kroki=60):
+    """p z [lewy, prawy], dla którego malejąca funkcja(p) == cel; None, gdy cel poza zakresem."""
+    if not funkcja(prawy) <= cel <= funkcja(lewy):
+        return None
+    for _ in range(kroki):
+        srodek = (lewy + prawy) / 2
+        if funkcja(srodek) > cel:
+            lewy = srodek
+        else:
+            prawy = srodek
+    return (lewy + prawy) / 2
+
+
+def mcv(jedynki, n):
+    return -math.log2(_gorna_granica(max(jedynki, n - jedynki) / n, n))
+
+
+def mcv_bajty(liczniki):
+    n = int(liczniki.sum())
+    return -math.log2(_gorna_granica(liczniki.max() / n, n)) / 8
+
+
+def kolizje(dwa, trzy):
+    """90B 6.3.2: średni czas do kolizji X̄ (2 lub 3 bity) -> p przez bisekcję."""
+    v = dwa + trzy
+    srednia = (2 * dwa + 3 * trzy) / v
+    odchylenie = math.sqrt(max((4 * dwa + 9 * trzy) / v - srednia ** 2, 0) * v / (v - 1))
+    dolna = srednia - Z * odchylenie / math.sqrt(v)
+
+    def oczekiwana(p):
+        q = 1 - p
+        if q <= 0:
+            return 2.0
+        f = 2 * q ** 3 + 2 * q ** 2 + q   # F(q) = Γ(3, 1/q) q^-3 e^(1/q)
+        return p / q ** 2 * (1 + (1 / p - 1 / q) / 2) * f - p / q * (1 / p - 1 / q) / 2
+
+    p = _bisekcja(oczekiwana, dolna, 0.5, 1.0)
+    return 1.0 if p is None else -math.log2(p)
+
+
+def markow(przejscia, jedynki, n):
+    """90B 6.3.3: najbardziej prawdopodobny 128-bitowy ciąg w łańcuchu Markowa 1. rzędu."""
+    c00, c01, c10, c11 = (int(x) for x in przejscia)
+    p0, p1 = 1 - jedynki / n, jedynki / n
+    p00, p01 = (c00 / (c00 + c01), c01 / (c00 + c01)) if c00 + c01 else (0.0, 0.0)
+    p10, p11 = (c10 / (c10 + c11), c11 / (c10 + c11)) if c10 + c11 else (0.0, 0.0)
+    kandydaci = [p0 * p00 ** 127, p0 * p01 ** 64 * p10 ** 63, p0 * p01 * p11 ** 126,
+                 p1 * p10 * p00 ** 126, p1 * p10 ** 64 * p01 ** 63, p1 * p11 ** 127]
+    return min(-math.log2(max(kandydaci)) / 128, 1.0)
+
+
+def _g(z, bloki):
+    """G(z) z 90B 6.3.4 - średni log2 odległości, gdy symbol ma prawdopodobieństwo z."""
+    if z <= 0:
+        return 0.0
+    # Wyrazy (1-z)^u poniżej ~e^-40 są pomijalne - dalej suma po t rośnie liniowo
+    U = int(min(max(SLOWNIK + 2, 40 / z), 2_000_000, bloki))
+    u = np.arange(1, U + 1, dtype=np.float64)
+    potegi = (1 - z) ** (u - 1)
+    log_u = np.log2(u)
+    narastajaco = np.concatenate([[0.0], np.cumsum(log_u * z * z * potegi)])   # suma dla u < t
+    t = np.arange(SLOWNIK + 1, U + 1)
+    suma = (narastajaco[t - 1] + log_u[t - 1] * z * potegi[t - 1]).sum()
+    suma += max(bloki - U, 0) * narastajaco[-1]
+    return suma / (bloki - SLOWNIK)
+
+
+def kompresja(v, suma, suma_kw, bloki):
+    """90B 6.3.4: dolna granica średniego log2 odległości -> p symbolu 6-bit przez bisekcję."""
+    srednia = suma / v
+    odchylenie = 0.5907 * math.sqrt(max(suma_kw / (v - 1) - srednia ** 2, 0))
+    dolna = srednia - Z * odchylenie / math.sqrt(v)
+    symbole = (1 << BLOK) - 1
+
+    def oczekiwana(p):
+        return _g(p, bloki) + symbole * _g((1 - p) / symbole, bloki)
+
+    p = _bisekcja(oczekiwana, dolna, 2.0 ** -BLOK, 1.0, kroki=40)
+    return 1.0 if p is None else -math.log2(p) / BLOK
+
+
+def krotki(liczniki):
+    """90B 6.3.5: najczęstsza t-krotka dla t, przy których wystąpiła >= PROG_KROTKI razy."""
+    p_maks = 0.0
+    for t, licznik in enumerate(liczniki, start=1):
+        najwiecej = int(licznik.max())
+        if najwiecej < PROG_KROTKI:
+            break
+        p_maks = max(p_maks, (najwiecej / int(licznik.sum())) ** (1 / t))
+    n = int(liczniki[0].sum())
+    return -math.log2(_gorna_granica(p_maks, n))
+
+
+def oszacuj(stan):
+    """Min-entropia na bit z każdego estymatora i minimum z nich."""
+    wynik = {
+        'bity': stan['bity'],
+        'mcv': mcv(stan['jedynki'], stan['bity']),
+        'mcv_bajty': mcv_bajty(stan['bajty']),
+        'kolizje': kolizje(*stan['kolizje']),
+        'markow': markow(stan['przejscia'], stan['jedynki'], stan['bity']),
+        'kompresja': kompresja(*stan['kompresja']),
+        'krotki': krotki(stan['krotki']),
+    }
+    wynik['min'] = min(wynik[e] for e in ESTYMATORY)
+    wynik['najslabszy'] = min(ESTYMATORY, key=wynik.get)
+    return wynik
+
+
+# --- 3. ŹRÓDŁA I RÓWNOLEGŁOŚĆ ---
+@pamiec.zapamietaj(wersja=1, pliki=('zrodlo',), pomin=('procesy',))
+def entropia_kolumny(zrodlo, kolumna, maks_slow=None, procesy=None, fragment=FRAGMENT, maks_krotka=MAKS_KROTKA):
+    """Estymatory dla kolumny słów z magazynu wyników (równolegle po fragmentach) albo kolumny hex z CSV."""
+    if os.path.isdir(zrodlo) and os.path.exists(os.path.join(zrodlo, PLIK_MANIFESTU)):
+        magazyn = Magazyn(zrodlo)
+        if magazyn.opis(kolumna)[1] != (ROZMIAR_SLOWA,):
+            raise ValueError(f"Kolumna {kolumna} nie zawiera słów 256-bit")
+        n = min(magazyn.wiersze, maks_slow or magazyn.wiersze)
+        zadania = [(zrodlo, kolumna, s, min(s + fragment, n), maks_krotka) for s in range(0, n, fragment)]
+    else:
+        import pandas as pd
+        slowa = slowa_z_hex(pd.read_csv(zrodlo, usecols=[kolumna], dtype=str)[kolumna].dropna())[:maks_slow]
+        zadania = [(slowa[s:s + fragment], kolumna, 0, 0, maks_krotka) for s in range(0, len(slowa), fragment)]
+    if not zadania:
+        raise ValueError(f"Brak słów w kolumnie {kolumna}")
+
+    if len(zadania) == 1 or procesy == 1:
+        stany = list(map(_zadanie, zadania))
+    else:
+        with ProcessPoolExecutor(max_workers=procesy) as pula:
+            stany = list(pula.map(_zadanie, zadania))
+    return oszacuj(scal(stany))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Min-entropia słów 256-bit (estymatory SP 800-90B)")
+    parser.add_argument("--zrodlo", default="magazyn_probki", help="katalog magazynu wyników albo CSV ze słowami hex")
+    parser.add_argument("--kolumny", default=",".join(KOLUMNY))
+    parser.add_argument("--maks-slow", type=int, help="limit słów na kolumnę (domyślnie wszystkie)")
+    parser.add_argument("--fragment", type=int, default=FRAGMENT, help="słów na zadanie")
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--json", help="zapis wyników")
+    args = parser.parse_args()
+
+    wyniki = {}
+    for kolumna in [k for k in args.kolumny.split(',') if k]:
+        start = time.perf_counter()
+        try:
+            w = entropia_kolumny(args.zrodlo, kolumna, args.maks_slow, args.procesy, args.fragment)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ {kolumna}: {e}")
+            sys.exit(1)
+        wyniki[kolumna] = w
+        print(f"\n{kolumna}: {w['bity']:,} bitów, czas {time.perf_counter() - start:.1f}s")
+        for e in ESTYMATORY:
+            print(f"  {e:<10} {w[e]:.4f} bit/bit")
+        print(f"  min-entropia: {w['min']:.4f} bit/bit ({w['min'] * 8 * ROZMIAR_SLOWA:.1f} z 256 bitów słowa, "
+              f"najsłabszy: {w['najslabszy']})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(wyniki, f, indent=2)
+        print(f"Zapisano: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
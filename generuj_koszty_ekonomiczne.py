@@ -1,5 +1,6 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+
+import tabele
 
 def save_economic_table_fix():
     # --- 1. DANE RYNKOWE (06.01.2026) ---
@@ -49,52 +50,19 @@ def save_economic_table_fix():
     }
     df = pd.DataFrame(data)
 
-    # --- 5. RYSOWANIE Z POPRAWKAMI (FIX) ---
-    
-    # Zwiększamy szerokość obrazka na 16 cali (było 10)
-    fig, ax = plt.subplots(figsize=(16, 6)) 
-    ax.axis('tight')
-    ax.axis('off')
-    
-    # Definiujemy szerokości kolumn:
-    # 1. Opis (20%)
-    # 2. RANDAO (40%)
-    # 3. VRF (40%) - muszą być szerokie przez długie nagłówki
+    # --- 5. ZAPIS (wspólny silnik tabel: SVG + PNG) ---
+    # Szerokości kolumn: opis 20%, RANDAO i VRF po 40% - muszą być szerokie przez długie nagłówki
     widths = [0.20, 0.40, 0.40]
 
-    table = ax.table(
-        cellText=df.values, 
-        colLabels=df.columns, 
-        cellLoc='center', 
-        loc='center',
-        colWidths=widths # <--- Aplikujemy szerokości
-    )
-    
-    # Stylizacja
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    table.scale(1.0, 2.5) # Wysokość wierszy
-    
-    # Kolorowanie
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#d9edf7')
-        elif row == 3: # Suma USD
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#ffffcc') 
-        elif row == 4: # Suma PLN
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#ccffcc')
+    # Wiersze sum pogrubione: USD na żółto, PLN na zielono
+    sumy = {2: ('#ffffcc', True), 3: ('#ccffcc', True)}
+
+    title = (f'Symulacja kosztów rzeczywistych (Data: 06.01.2026)\n'
+             f'ETH = {eth_price:,.0f} USD, LINK = {link_price} USD, Gas = {gas_price_gwei} gwei')
 
-    # ZMIANA: Dodajemy backslash przed $ (\$) żeby matplotlib nie myślał że to matematyka
-    plt.title(f'Symulacja kosztów rzeczywistych (Data: 06.01.2026)\nETH = {eth_price:,.0f} USD, LINK = {link_price} USD, Gas = {gas_price_gwei} gwei', 
-              fontsize=14, weight='bold', pad=20)
-    
     filename = 'tabela_koszty_2026_fix.png'
-    plt.savefig(filename, bbox_inches='tight', dpi=300)
+    tabele.zapisz(df, [filename, 'tabela_koszty_2026_fix.svg'], tytul=title, szerokosci=widths, wyroznienia=sumy)
     print(f"Naprawiono! Zobacz plik: {filename}")
-    plt.close()
 
 if __name__ == "__main__":
     save_economic_table_fix()
\ No newline at end of file
@@ -0,0 +1,242 @@
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from magazyn import ROZMIAR_SLOWA, Magazyn, slowa_modulo, slowa_z_int
+from sekwencyjne import utworz_testy, wszystkie_rozstrzygniete
+
+# Równoległe, powtarzalne generowanie próbek RANDAO / VRF (zamiast 500 iteracji
+# z Math.random() w generate_stats.ts).
+#
+# Docelowa liczba próbek jest dzielona na fragmenty o stałym rozmiarze. Fragment k
+# dostaje ziarno SeedSequence(ziarno, spawn_key=(k,)) - to samo co SeedSequence(ziarno).spawn(n)[k],
+# ale niezależne od liczby fragmentów, więc zwiększenie --probki nie zmienia wcześniejszych danych.
+# Fragmenty liczą się równolegle (procesy), każdy zapisywany atomowo do magazyn/fragmenty/,
+# a scalanie do magazynu wyników idzie ściśle po kolei. Przerwane uruchomienie wznawia się
+# dokładnie: scalone wiersze są pomijane, gotowe pliki fragmentów nie są liczone ponownie.
+#
+#   python generuj_probki.py --probki 10000000                  # symulator w Pythonie
+#   python generuj_probki.py --probki 5000 --silnik hardhat      # generate_stats.ts, proces Hardhat per fragment
+#   python generuj_probki.py --probki 10000000 --csv dane_statystyczne.csv
+#   python generuj_probki.py --probki 1000000 --fragment 1000 --sekwencyjnie   # stop po decyzji testu
+
+KATALOG = os.path.dirname(os.path.abspath(__file__))
+
+KOLUMNY = {
+    'iteracja': ('<i8', ()),
+    'randao_val': ('u1', ()),
+    'vrf_val': ('u1', ()),
+    'randao_slowo': ('u1', (ROZMIAR_SLOWA,)),
+    'vrf_slowo': ('u1', (ROZMIAR_SLOWA,)),
+}
+
+# Parametry, które muszą się zgadzać przy wznawianiu (inaczej dane byłyby niespójne)
+PARAMETRY_STALE = ['ziarno', 'rozmiar_fragmentu', 'uczestnicy', 'silnik']
+
+
+# --- 1. SILNIKI ---
+def ziarno_fragmentu(ziarno, k):
+    return np.random.SeedSequence(ziarno, spawn_key=(k,))
+
+
+def symuluj_fragment(ss, n, uczestnicy):
+    """Symulator w Pythonie: wynik RANDAO = XOR sekretów uczestników, VRF = jednostajne słowo 256-bit."""
+    rng = np.random.default_rng(ss)
+    sekrety = rng.integers(0, 256, size=(n, uczestnicy, ROZMIAR_SLOWA), dtype=np.uint8)
+    randao = np.bitwise_xor.reduce(sekrety, axis=1)
+    vrf = rng.integers(0, 256, size=(n, ROZMIAR_SLOWA), dtype=np.uint8)
+    return randao, vrf
+
+
+def hardhat_fragment(ss, n, katalog_tmp):
+    """Fragment z generate_stats.ts na osobnej (in-process) sieci Hardhat, sekrety z ziarna."""
+    ziarno_hex = "0x" + ss.generate_state(4, np.uint64).astype('>u8').tobytes().hex()
+    plik = os.path.join(katalog_tmp, "fragment.csv")
+    env = dict(os.environ, PROBKI=str(n), ZIARNO=ziarno_hex, PLIK_WYJSCIOWY=plik)
+    npx = shutil.which("npx") or "npx"
+    proc = subprocess.run([npx, "hardhat", "run", "scripts/generate_stats.ts"],
+                          cwd=KATALOG, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"generate_stats.ts zakończył się kodem {proc.returncode}:\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}")
+
+    with open(plik, newline='') as f:
+        wiersze = list(csv.DictReader(f))
+    if len(wiersze) != n:
+        raise RuntimeError(f"generate_stats.ts zwrócił {len(wiersze)} z {n} wierszy")
+    randao = slowa_z_int(int(w['randao_slowo'], 16) for w in wiersze)
+    vrf = slowa_z_int(int(w['vrf_slowo'], 16) for w in wiersze)
+    return randao, vrf
+
+
+# --- 2. FRAGMENTY ---
+def plik_fragmentu(katalog, k):
+    return os.path.join(katalog, 'fragmenty', f"fragment_{k:06d}.npz")
+
+
+def generuj_fragment(zadanie):
+    """Liczy fragment k (zawsze w pełnym rozmiarze - wynik zależy tylko od ziarna i k)."""
+    katalog, k, parametry = zadanie
+    sciezka = plik_fragmentu(katalog, k)
+    if os.path.exists(sciezka):
+        return k
+
+    ss = ziarno_fragmentu(parametry['ziarno'], k)
+    n = parametry['rozmiar_fragmentu']
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(sciezka)) as tmp:
+        if parametry['silnik'] == 'hardhat':
+            randao, vrf = hardhat_fragment(ss, n, tmp)
+        else:
+            randao, vrf = symuluj_fragment(ss, n, parametry['uczestnicy'])
+
+        # Zapis atomowy: plik fragmentu pojawia się dopiero w komplecie
+        tymczasowy = os.path.join(tmp, "fragment.npz")
+        with open(tymczasowy, 'wb') as f:
+            np.savez(f, randao_slowo=randao, vrf_slowo=vrf)
+        os.replace(tymczasowy, sciezka)
+    return k
+
+
+def scal_fragment(magazyn, k, parametry, probki):
+    """Dopisuje do magazynu brakujące wiersze fragmentu k (wznawianie co do wiersza).
+
+    Znacznikiem zużycia fragmentu jest liczba wierszy w manifeście (zapisywanym atomowo): plik
+    fragmentu usuwamy dopiero po dopisaniu, a wiersze już obecne w magazynie nigdy nie są
+    dopisywane drugi raz - awaria między dopisaniem a usunięciem zostawia tylko zbędny plik.
+    """
+    rozmiar = parametry['rozmiar_fragmentu']
+    start, koniec = k * rozmiar, min((k + 1) * rozmiar, probki)
+    if magazyn.wiersze < start:
+        raise ValueError(f"Fragment {k} zaczyna się od wiersza {start}, a magazyn ma {magazyn.wiersze}")
+    if magazyn.wiersze < koniec:
+        with np.load(plik_fragmentu(magazyn.katalog, k)) as dane:
+            od, do = magazyn.wiersze - start, koniec - start
+            randao = dane['randao_slowo'][od:do]
+            vrf = dane['vrf_slowo'][od:do]
+        magazyn.dopisz({
+            'iteracja': np.arange(magazyn.wiersze + 1, koniec + 1, dtype=np.int64),
+            'randao_val': slowa_modulo(randao, 100),
+            'vrf_val': slowa_modulo(vrf, 100),
+            'randao_slowo': randao,
+            'vrf_slowo': vrf,
+        })
+
+    # Ostatni (niepełny) fragment zostaje - przyda się przy zwiększeniu --probki
+    if koniec == (k + 1) * rozmiar:
+        os.remove(plik_fragmentu(magazyn.katalog, k))
+
+
+def usun_zuzyte(magazyn, rozmiar):
+    """Przy wznowieniu: usuwa pliki fragmentów w całości obecnych już w magazynie (osierocone po awarii)."""
+    katalog = os.path.join(magazyn.katalog, 'fragmenty')
+    pelne = magazyn.wiersze // rozmiar
+    for nazwa in os.listdir(katalog):
+        if not (nazwa.startswith('fragment_') and nazwa.endswith('.npz')):
+            continue
+        k = int(nazwa[len('fragment_'):-len('.npz')])
+        if k < pelne:
+            os.remove(os.path.join(katalog, nazwa))
+
+
+# --- 3. PRZEBIEG ---
+def generuj(katalog, probki, parametry, procesy=None, testy=None):
+    """testy: {kolumna: TestSekwencyjny} - zatrzymanie, gdy wszystkie testy wydadzą decyzję."""
+    magazyn = Magazyn.otworz_lub_utworz(katalog, KOLUMNY, dict(parametry))
+    for klucz in PARAMETRY_STALE:
+        if magazyn.metadane.get(klucz) != parametry[klucz]:
+            raise ValueError(f"Magazyn {katalog} ma {klucz}={magazyn.metadane.get(klucz)!r}, "
+                             f"a podano {parametry[klucz]!r} - użyj innego katalogu")
+    os.makedirs(os.path.join(katalog, 'fragmenty'), exist_ok=True)
+
+    rozmiar = parametry['rozmiar_fragmentu']
+    usun_zuzyte(magazyn, rozmiar)
+    pierwszy = magazyn.wiersze // rozmiar
+    ostatni = -(-probki // rozmiar)  # zaokrąglenie w górę
+    if magazyn.wiersze >= probki:
+        print(f"Magazyn ma już {magazyn.wiersze:,} próbek (cel {probki:,}) - nic do zrobienia")
+        return magazyn
+
+    zadania = [(katalog, k, parametry) for k in range(pierwszy, ostatni)]
+    print(f"Fragmenty {pierwszy}..{ostatni - 1} po {rozmiar:,} próbek, "
+          f"procesy: {procesy or os.cpu_count()}, silnik: {parametry['silnik']}")
+
+    if testy:
+        # Wznowienie: testy muszą zobaczyć też próbki scalone wcześniej
+        for kol, test in testy.items():
+            for fragment in magazyn.fragmenty(kol):
+                test.aktualizuj(fragment)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        # map zwraca wyniki w kolejności zadań - scalamy fragment, gdy tylko on i poprzednie są gotowe
+        for k in pula.map(generuj_fragment, zadania):
+            poczatek = magazyn.wiersze
+            scal_fragment(magazyn, k, parametry, probki)
+            print(f"Postęp: {magazyn.wiersze}/{probki} próbek", flush=True)
+            if testy:
+                for kol, test in testy.items():
+                    test.aktualizuj(magazyn.kolumna(kol, poczatek))
+                    print(f"  {kol:12} {test.opis()}")
+                if wszystkie_rozstrzygniete(testy):
+                    # Niepoliczone fragmenty anulujemy; te w toku zostaną na dysku do ewentualnego wznowienia
+                    pula.shutdown(wait=False, cancel_futures=True)
+                    break
+
+    magazyn.ustaw_metadane(probki=magazyn.wiersze)
+    czas = time.perf_counter() - start
+    print(f"Gotowe: {magazyn.wiersze:,} próbek w {czas:.1f}s ({magazyn.wiersze / czas:,.0f} próbek/s)")
+    return magazyn
+
+
+def eksportuj_csv(magazyn, sciezka):
+    """Eksport w formacie dane_statystyczne.csv (iteracja,randao_val,vrf_val)."""
+    with open(sciezka, 'w', newline='') as f:
+        f.write("iteracja,randao_val,vrf_val\n")
+        for it, r, v in zip(magazyn.fragmenty('iteracja'), magazyn.fragmenty('randao_val'), magazyn.fragmenty('vrf_val')):
+            np.savetxt(f, np.column_stack([it, r, v]), fmt='%d', delimiter=',')
+    print(f"Zapisano: {sciezka}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Równoległe generowanie próbek RANDAO/VRF do magazynu wyników")
+    parser.add_argument("--probki", type=int, default=500, help="docelowa liczba próbek")
+    parser.add_argument("--magazyn", default="magazyn_probki", help="katalog magazynu wyników")
+    parser.add_argument("--ziarno", type=int, default=2024, help="ziarno główne (SeedSequence)")
+    parser.add_argument("--fragment", type=int, default=100_000, help="liczba próbek we fragmencie")
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--silnik", choices=["python", "hardhat"], default="python")
+    parser.add_argument("--uczestnicy", type=int, default=1, help="liczba uczestników rundy RANDAO (symulator)")
+    parser.add_argument("--csv", help="eksport do CSV w formacie dane_statystyczne.csv")
+    parser.add_argument("--sekwencyjnie", action="store_true",
+                        help="zatrzymaj, gdy test sekwencyjny rozstrzygnie jednostajny/obciążony")
+    parser.add_argument("--alfa", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.2)
+    parser.add_argument("--tolerancja", type=float, default=0.06, help="odchylenie binu definiujące H1 (sekwencyjne.py)")
+    args = parser.parse_args()
+
+    parametry = {
+        'ziarno': args.ziarno,
+        'rozmiar_fragmentu': args.fragment,
+        'uczestnicy': args.uczestnicy,
+        'silnik': args.silnik,
+    }
+    try:
+        testy = utworz_testy(alfa=args.alfa, beta=args.beta, tolerancja=args.tolerancja) if args.sekwencyjnie else None
+        magazyn = generuj(args.magazyn, args.probki, parametry, args.procesy, testy)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.csv:
+        eksportuj_csv(magazyn, args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,13 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
-# --- FUNKCJA RYSUJĄCA (Z obsługą szerokości kolumn) ---
-def save_table_as_image(df, title, filename, col_widths=None):
-    # Szeroki obrazek (18 cali), żeby zmieściły się nowe kolumny
-    fig, ax = plt.subplots(figsize=(18, 5)) 
-    ax.axis('tight')
-    ax.axis('off')
-    
-    # Tworzenie tabeli
-    table = ax.table(
-        cellText=df.values, 
-        colLabels=df.columns, 
-        cellLoc='center', 
-        loc='center',
-        colWidths=col_widths # Ustawiamy szerokości
-    )
-    
-    # Stylizacja
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    table.scale(1.0, 2.5) # Wysokość wierszy
-    
-    # Kolorowanie nagłówków i wierszy
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#d9edf7') # Niebieski nagłówek
-        else:
-            # Paski (Zebra) dla czytelności
-            if row % 2 == 0:
-                cell.set_facecolor('#f9f9f9')
-            else:
-                cell.set_facecolor('#ffffff')
+import tabele
 
-    plt.title(title, fontsize=14, weight='bold', pad=20)
-    plt.savefig(filename, bbox_inches='tight', dpi=300)
-    print(f"Wygenerowano: {filename}")
-    plt.close()
+# --- FUNKCJA ZAPISU (wspólny silnik tabel: SVG + PNG z pamięcią podręczną) ---
+def save_table_as_image(df, title, filename, col_widths=None):
+    # col_widths jak dawniej w ax.table - ułamki szerokości tabeli
+    pliki = [filename, filename.replace('.png', '.svg')]
+    tabele.zapisz(df, pliki, tytul=title, szerokosci=col_widths)
+    print(f"Wygenerowano: {', '.join(pliki)}")
 
 # ==========================================
 # CZĘŚĆ 1: TABELA KOSZTÓW GŁÓWNYCH (z CSV)
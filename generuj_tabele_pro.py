@@ -1,54 +1,47 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def save_table_as_image(df, title, filename):
-    # POPRAWKA 1: Wyższy obrazek (figsize height zmieniłem z 3 na 6)
-    fig, ax = plt.subplots(figsize=(12, 6)) 
-    ax.axis('tight')
-    ax.axis('off')
-    
-    # Tworzenie tabeli
-    table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-    
-    # Stylizacja
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    # Skalowanie komórek (szerokość, wysokość)
-    table.scale(1.2, 2.0) 
-    
-    # Kolorowanie nagłówka
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#d9edf7') # Jasnoniebieski
+import szkice
+import tabele
 
-    # POPRAWKA 2: Duży odstęp tytułu od tabeli (pad=40)
-    plt.title(title, fontsize=14, weight='bold', pad=40)
-    
-    plt.savefig(filename, bbox_inches='tight', dpi=300)
-    print(f"Wygenerowano: {filename}")
-    plt.close()
+def ogon_csv(sciezka, n, porcja=szkice.PORCJA):
+    """Ostatnie n wierszy i liczba wszystkich wierszy - porcjami, w stałej pamięci."""
+    ogon, wiersze = None, 0
+    for df in pd.read_csv(sciezka, chunksize=porcja):
+        wiersze += len(df)
+        ogon = df.tail(n) if ogon is None else pd.concat([ogon, df]).tail(n)
+    return ogon, wiersze
+
+def save_table_as_image(df, title, filename):
+    # Bez zebry - same białe wiersze pod niebieskim nagłówkiem
+    pliki = [filename, filename.replace('.png', '.svg')]
+    tabele.zapisz(df, pliki, tytul=title, styl={'zebra': None})
+    print(f"Wygenerowano: {', '.join(pliki)}")
 
 # --- 1. WCZYTANIE DANYCH ---
+# Statystyki ze szkiców kwantylowych (szkice.py): budowane porcjami raz na wersję pliku
+# i zapisywane obok jako wyniki_badan.szkice.npz, więc mediana i p95/p99 nie wymagają sortowania kolumn
 try:
-    df = pd.read_csv('wyniki_badan.csv')
-    print(f"Wczytano {len(df)} wierszy danych.")
+    szkic = szkice.szkice_csv('wyniki_badan.csv', ['randao_total_gas', 'vrf_request_gas'],
+                              pochodne={'vrf_total_gas': lambda d: d['vrf_request_gas'] + d['vrf_callback_gas']})
+    # Ogon i liczba wierszy pliku (szkic liczy tylko wartości niepuste, więc nie nadaje się do pozycji wierszy)
+    tail, n_wierszy = ogon_csv('wyniki_badan.csv', 5)
+    print(f"Wczytano {n_wierszy} wierszy danych.")
 
     # --- 2. STATYSTYKA SZCZEGÓŁOWA ---
-    def get_stats(series):
+    def get_stats(s):
         return {
-            'Min': f"{series.min():,.0f}",
-            'Max': f"{series.max():,.0f}",
-            'Średnia': f"{series.mean():,.0f}",
-            'Mediana': f"{series.median():,.0f}",
-            'Odch. Std': f"{series.std():,.2f}"
+            'Min': f"{s.minimum:,.0f}",
+            'Max': f"{s.maksimum:,.0f}",
+            'Średnia': f"{s.srednia:,.0f}",
+            'Mediana': f"{s.kwantyl(0.5):,.0f}",
+            'P95': f"{s.kwantyl(0.95):,.0f}",
+            'P99': f"{s.kwantyl(0.99):,.0f}",
+            'Odch. Std': f"{s.odchylenie:,.2f}"
         }
 
-    stats_randao = get_stats(df['randao_total_gas'])
-    stats_vrf_user = get_stats(df['vrf_request_gas'])
-    
-    series_vrf_total = df['vrf_request_gas'] + df['vrf_callback_gas']
-    stats_vrf_total = get_stats(series_vrf_total)
+    stats_randao = get_stats(szkic['randao_total_gas'])
+    stats_vrf_user = get_stats(szkic['vrf_request_gas'])
+    stats_vrf_total = get_stats(szkic['vrf_total_gas'])
 
     data = {
         'Metoda': ['RANDAO', 'VRF (User)', 'VRF (System)'],
@@ -56,6 +49,8 @@ try:
         'Max': [stats_randao['Max'], stats_vrf_user['Max'], stats_vrf_total['Max']],
         'Średnia': [stats_randao['Średnia'], stats_vrf_user['Średnia'], stats_vrf_total['Średnia']],
         'Mediana': [stats_randao['Mediana'], stats_vrf_user['Mediana'], stats_vrf_total['Mediana']],
+        'P95': [stats_randao['P95'], stats_vrf_user['P95'], stats_vrf_total['P95']],
+        'P99': [stats_randao['P99'], stats_vrf_user['P99'], stats_vrf_total['P99']],
         'Odchylenie Std.': [stats_randao['Odch. Std'], stats_vrf_user['Odch. Std'], stats_vrf_total['Odch. Std']]
     }
 
@@ -65,14 +60,14 @@ try:
 
     # --- 3. TABELA ZAŁĄCZNIK (Inteligentna próbka) ---
     # Jeśli danych jest dużo (>15), robimy ucięcie z kropkami
-    if len(df) > 15:
-        head = df.head(5)
-        tail = df.tail(5)
-        dots = pd.DataFrame([['...', '...', '...', '...']], columns=df.columns)
+    if n_wierszy > 15:
+        # Tylko pierwsze i ostatnie wiersze (ogon zebrany porcjami, w stałej pamięci)
+        head = pd.read_csv('wyniki_badan.csv', nrows=5)
+        dots = pd.DataFrame([['...', '...', '...', '...']], columns=head.columns)
         df_sample = pd.concat([head, dots, tail])
     else:
         # Jeśli danych jest mało (np. 20), pokazujemy całość lub po prostu pierwsze 10
-        df_sample = df.head(20) 
+        df_sample = pd.read_csv('wyniki_badan.csv', nrows=20) 
     
     save_table_as_image(df_sample, 'Fragment danych pomiarowych (Załącznik)', 'tabela_zalacznik.png')
 
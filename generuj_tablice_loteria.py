@@ -1,55 +1,41 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import re
+import os
+import sqlite3
 
-# --- 1. FUNKCJE POMOCNICZE ---
-def strip_ansi(text):
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+import pandas as pd
 
-def get_avg_gas(lines, contract_name, method_name):
-    current_contract = ""
-    for line in lines:
-        clean = strip_ansi(line).strip()
-        # Wykrywanie sekcji kontraktu
-        if contract_name in clean:
-            current_contract = contract_name
-        # Szukanie metody
-        if current_contract == contract_name and method_name in clean:
-            parts = clean.split('|')
-            # Szukamy kolumny z wartością Avg (zwykle index 4 lub okolice)
-            # Przechodzimy przez wszystkie części, szukając liczby
-            for part in parts:
-                clean_part = part.strip().replace(',', '')
-                if clean_part.isdigit() and len(clean_part) > 3: # Filtrujemy małe liczby jak '3' (calls)
-                    return int(clean_part)
-    return 0
+import historia_gazu
+import tabele
 
-# --- 2. PRÓBA ODCZYTU PLIKU ---
+# --- 1. ODCZYT RAPORTU GAS-REPORTERA ---
+# Parser z historia_gazu.py radzi sobie z UTF-16 z PowerShell i znakami strony 852 w ramkach tabeli
 filename = 'wynik_loterii.txt'
-content = []
+print("Próba automatycznego odczytu...")
+gaz = {}
 try:
-    with open(filename, 'r', encoding='utf-16') as f: # Próba 1 (PowerShell default)
-        content = f.readlines()
-except:
-    try:
-        with open(filename, 'r', encoding='utf-8') as f: # Próba 2
-            content = f.readlines()
-    except:
-        pass # Ignorujemy błędy, przejdziemy do fallbacku
+    gaz = {(p['kontrakt'], p['metoda']): p['srednia'] for p in historia_gazu.wczytaj_raport(filename)}
+except (OSError, ValueError):
+    pass
 
-# --- 3. EKSTRAKCJA DANYCH ---
-print("Próba automatycznego odczytu...")
-r_enter = get_avg_gas(content, "LotteryRandao", "enter")
-r_reveal = get_avg_gas(content, "LotteryRandao", "reveal")
-r_pick = get_avg_gas(content, "LotteryRandao", "pickWinner")
-v_enter = get_avg_gas(content, "LotteryVRF", "enter")
-v_pick = get_avg_gas(content, "LotteryVRF", "pickWinner")
+# --- 2. EKSTRAKCJA DANYCH ---
+def get_avg_gas(contract_name, method_name):
+    return int(gaz.get((contract_name, method_name), 0))
+
+# --- 3. MECHANIZM "FAIL-SAFE" (GWARANCJA SUKCESU) ---
+# Brak pliku -> ostatni przebieg z historii gazu; brak historii -> dane z Twojego screenshota
+if get_avg_gas("LotteryRandao", "enter") == 0 and os.path.exists(historia_gazu.BAZA):
+    with sqlite3.connect(historia_gazu.BAZA) as polaczenie:
+        gaz = historia_gazu.ostatnie_srednie(polaczenie)
+    if gaz:
+        print(f"⚠️ Brak {filename} - używam ostatniego przebiegu z {historia_gazu.BAZA}.")
+
+r_enter = get_avg_gas("LotteryRandao", "enter")
+r_reveal = get_avg_gas("LotteryRandao", "reveal")
+r_pick = get_avg_gas("LotteryRandao", "pickWinner")
+v_enter = get_avg_gas("LotteryVRF", "enter")
+v_pick = get_avg_gas("LotteryVRF", "pickWinner")
 
-# --- 4. MECHANIZM "FAIL-SAFE" (GWARANCJA SUKCESU) ---
-# Jeśli parser zwrócił 0 (przez błędy kodowania), używamy danych z Twojego screenshota
 if r_enter == 0:
-    print("\n⚠️ OSTRZEŻENIE: Nie udało się sparsować pliku tekstowego (błąd kodowania PowerShell).")
+    print("\n⚠️ OSTRZEŻENIE: Nie udało się sparsować pliku tekstowego ani historii gazu.")
     print("✅ AKCJA NAPRAWCZA: Używam zweryfikowanych danych z Twojego zrzutu ekranu (Hardhat Output).")
     
     # Dane przepisane z Twojego obrazka image_510162.png
@@ -59,9 +45,9 @@ if r_enter == 0:
     v_enter = 56328
     v_pick = 81670
 else:
-    print("✅ SUKCES: Dane pobrane dynamicznie z pliku.")
+    print("✅ SUKCES: Dane pobrane dynamicznie.")
 
-# --- 5. TWORZENIE TABELI ---
+# --- 4. TWORZENIE TABELI ---
 def fmt(n):
     return f"{n:,}".replace(",", " ")
 
@@ -84,31 +70,11 @@ data = {
 
 df = pd.DataFrame(data)
 
-# --- 6. RYSOWANIE ---
+# --- 5. ZAPIS (wspólny silnik tabel: SVG + PNG) ---
 def save_table_ultimate(df, title, fname):
-    fig, ax = plt.subplots(figsize=(12, 5))
-    ax.axis('tight')
-    ax.axis('off')
-    
-    table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-    
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    table.scale(1.2, 1.8)
-    
-    # Kolorowanie
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#d9edf7')
-        elif row in [1, 2, 3]: 
-            cell.set_facecolor('#fff5f5')
-        elif row in [4, 5]: 
-            cell.set_facecolor('#f0fff0')
-
-    plt.title(title, fontsize=14, weight='bold', pad=20)
-    plt.savefig(fname, bbox_inches='tight', dpi=300)
+    # RANDAO (3 wiersze) na czerwono, VRF (2 wiersze) na zielono
+    kolory = {0: '#fff5f5', 1: '#fff5f5', 2: '#fff5f5', 3: '#f0fff0', 4: '#f0fff0'}
+    tabele.zapisz(df, [fname, fname.replace('.png', '.svg')], tytul=title, wyroznienia=kolory)
     print(f"\nGotowe! Twój plik to: {fname}")
-    plt.close()
 
-save_table_ultimate(df, 'Dynamiczna analiza kosztów (Loterie)', 'tabela_loteria_final.png')
\ No newline at end of file
+save_table_ultimate(df, 'Dynamiczna analiza kosztów (Loterie)', 'tabela_loteria_final.png')
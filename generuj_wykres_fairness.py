@@ -1,5 +1,4 @@
 import matplotlib.pyplot as plt
-import numpy as np
 
 def save_fairness_chart():
     # --- 1. WPISZ TUTAJ WYNIKI Z KONSOLI ---
@@ -3,6 +3,12 @@ import "@nomicfoundation/hardhat-toolbox";
 
 const config: HardhatUserConfig = {
   solidity: "0.8.28",
+  networks: {
+    // Osobny węzeł `npx hardhat node --port N` per etap (orkiestracja.py ustawia URL)
+    wezel: {
+      url: process.env.HARDHAT_WEZEL_URL || "http://127.0.0.1:8545",
+    },
+  },
   gasReporter: {
     enabled: false, // <--- TO JEST KLUCZOWA ZMIANA
   },
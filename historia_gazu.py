@@ -0,0 +1,284 @@
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Historia gazu metod kontraktów między wersjami (commitami) i wykrywanie regresji.
+#
+# Każde uruchomienie hardhat-gas-reporter (tekst z konsoli, np. wynik_loterii.txt zapisany przez
+# PowerShell w UTF-16, albo JSON z outputJSONFile) trafia do lokalnej bazy SQLite jako przebieg
+# przypisany do commitu git. Dla każdej metody zapisujemy min/średnia/max/liczbę wywołań.
+#
+# Regresja: średnia bieżącego przebiegu vs bazowa = średnia z `okno` poprzednich przebiegów tej metody.
+# Gaz tego samego zestawu testów jest deterministyczny - rozrzut min/max wewnątrz przebiegu to różne
+# ścieżki kodu (zimny/ciepły storage), nie szum pomiaru - więc wariancję bierzemy tylko ze średnich
+# kolejnych przebiegów. Gdy bazowa jest stała (jeden przebieg albo identyczne średnie), każda zmiana
+# powyżej tolerancji względnej jest istotna. Inaczej z = różnica / max(odchylenie bazowej, tolerancja * bazowa)
+# i |z| > prog_z oznacza istotną zmianę (regresja, gdy gaz wzrósł).
+#
+#   python historia_gazu.py --dodaj wynik_loterii.txt                 # commit z git rev-parse HEAD
+#   python historia_gazu.py --dodaj gasReporterOutput.json --tabela tabela_regresji_gazu.png
+#   python historia_gazu.py --porownaj --okno 5 --scisle              # kod 1, gdy jest regresja (CI)
+#   python historia_gazu.py --historia LotteryRandao.pickWinner
+
+BAZA = "historia_gazu.sqlite"
+WDROZENIE = "(wdrożenie)"
+
+SCHEMAT = """
+CREATE TABLE IF NOT EXISTS przebiegi (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    git_commit TEXT NOT NULL,
+    czas TEXT NOT NULL,
+    zrodlo TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pomiary (
+    przebieg INTEGER NOT NULL REFERENCES przebiegi(id) ON DELETE CASCADE,
+    kontrakt TEXT NOT NULL,
+    metoda TEXT NOT NULL,
+    minimum INTEGER,
+    srednia REAL NOT NULL,
+    maksimum INTEGER,
+    wywolania INTEGER,
+    PRIMARY KEY (przebieg, kontrakt, metoda)
+);
+CREATE INDEX IF NOT EXISTS pomiary_metoda ON pomiary (kontrakt, metoda, przebieg);
+CREATE INDEX IF NOT EXISTS przebiegi_commit ON przebiegi (git_commit);
+"""
+
+_ANSI = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_SEPARATOR = re.compile(r'\s*[|│·]\s*')
+
+
+# --- 1. PARSOWANIE RAPORTÓW ---
+def _czytaj_tekst(sciezka):
+    """Tekst raportu niezależnie od kodowania (UTF-16 z PowerShell, UTF-8 zapisany jako OEM 852)."""
+    with open(sciezka, 'rb') as f:
+        surowe = f.read()
+    if surowe[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        tekst = surowe.decode('utf-16')
+    else:
+        tekst = surowe.decode('utf-8', errors='replace')
+    try:
+        # Konsola Windows zapisała bajty UTF-8 jako znaki strony 852 ("┬Ě" zamiast "·")
+        tekst = tekst.encode('cp852').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    return _ANSI.sub('', tekst)
+
+
+def _liczba(tekst):
+    tekst = tekst.replace(',', '').replace(' ', '')
+    return int(tekst) if tekst.isdigit() else None
+
+
+def parsuj_tekst(tekst):
+    """Tabela "Methods" / "Deployments" z konsoli hardhat-gas-reporter -> lista słowników."""
+    wiersze, kontrakt, sekcja = [], None, None
+    for linia in tekst.splitlines():
+        pola = [p for p in _SEPARATOR.split(linia.strip()) if p]
+        if not pola:
+            continue
+        if pola[0] in ('Methods', 'Deployments'):
+            sekcja = pola[0]
+            continue
+        if sekcja is None or pola[0].startswith(('Contracts', 'Key', 'Toolchain', 'Solidity')):
+            continue
+        liczby = [_liczba(p) if p != '-' else None for p in pola[1:]]
+        if sekcja == 'Methods' and len(pola) == 1 and re.fullmatch(r'[A-Za-z_]\w*', pola[0]):
+            kontrakt = pola[0]
+        elif sekcja == 'Methods' and kontrakt and len(liczby) >= 4 and liczby[2] is not None:
+            wiersze.append({'kontrakt': kontrakt, 'metoda': pola[0], 'minimum': liczby[0],
+                            'srednia': float(liczby[2]), 'maksimum': liczby[1], 'wywolania': liczby[3]})
+        elif sekcja == 'Deployments' and len(liczby) >= 3 and liczby[2] is not None:
+            wiersze.append({'kontrakt': pola[0], 'metoda': WDROZENIE, 'minimum': liczby[0],
+                            'srednia': float(liczby[2]), 'maksimum': liczby[1], 'wywolania': None})
+    return wiersze
+
+
+def parsuj_json(dane):
+    """Plik outputJSONFile hardhat-gas-reporter (v2): data.methods / data.deployments z gasData."""
+    wiersze = []
+    zrodla = [(m, m.get('method')) for m in dane.get('data', {}).get('methods', {}).values()]
+    zrodla += [(d, WDROZENIE) for d in dane.get('data', {}).get('deployments', [])]
+    for wpis, metoda in zrodla:
+        proby = wpis.get('gasData') or []
+        if not proby:
+            continue
+        wiersze.append({'kontrakt': wpis.get('contract') or wpis.get('name'), 'metoda': metoda,
+                        'minimum': min(proby), 'srednia': sum(proby) / len(proby), 'maksimum': max(proby),
+                        'wywolania': wpis.get('numberOfCalls', len(proby))})
+    return wiersze
+
+
+def wczytaj_raport(sciezka):
+    """Pomiary z raportu gas-reportera (tekst albo JSON)."""
+    if sciezka.endswith('.json'):
+        with open(sciezka, encoding='utf-8') as f:
+            return parsuj_json(json.load(f))
+    return parsuj_tekst(_czytaj_tekst(sciezka))
+
+
+# --- 2. BAZA ---
+def polacz(sciezka=BAZA):
+    polaczenie = sqlite3.connect(sciezka)
+    polaczenie.execute("PRAGMA foreign_keys = ON")
+    polaczenie.executescript(SCHEMAT)
+    return polaczenie
+
+
+def biezacy_commit(katalog="."):
+    """Skrót HEAD; '-dirty', gdy kontrakty mają niezatwierdzone zmiany."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=katalog,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        zmiany = subprocess.run(["git", "status", "--porcelain", "--", "contracts"], cwd=katalog,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "nieznany"
+    return commit + ("-dirty" if zmiany else "")
+
+
+def dodaj_przebieg(polaczenie, pomiary, git_commit, zrodlo):
+    with polaczenie:
+        kursor = polaczenie.execute(
+            "INSERT INTO przebiegi (git_commit, czas, zrodlo) VALUES (?, ?, ?)",
+            (git_commit, datetime.now(timezone.utc).isoformat(timespec='seconds'), zrodlo))
+        przebieg = kursor.lastrowid
+        polaczenie.executemany(
+            # Kolumny po nazwie: starsze bazy mają jeszcze nieużywaną kolumnę odchylenie (NULL)
+            "INSERT OR REPLACE INTO pomiary (przebieg, kontrakt, metoda, minimum, srednia, maksimum, wywolania) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(przebieg, p['kontrakt'], p['metoda'], p.get('minimum'), p['srednia'], p.get('maksimum'),
+              p.get('wywolania')) for p in pomiary])
+    return przebieg
+
+
+def historia(polaczenie, kontrakt=None, metoda=None):
+    zapytanie = """SELECT p.id AS przebieg, p.git_commit, p.czas, p.zrodlo, m.kontrakt, m.metoda,
+                          m.minimum, m.srednia, m.maksimum, m.wywolania
+                   FROM pomiary m JOIN przebiegi p ON p.id = m.przebieg"""
+    warunki, argumenty = [], []
+    if kontrakt:
+        warunki.append("m.kontrakt = ?")
+        argumenty.append(kontrakt)
+    if metoda:
+        warunki.append("m.metoda = ?")
+        argumenty.append(metoda)
+    if warunki:
+        zapytanie += " WHERE " + " AND ".join(warunki)
+    return pd.read_sql_query(zapytanie + " ORDER BY m.kontrakt, m.metoda, p.id", polaczenie, params=argumenty)
+
+
+def ostatnie_srednie(polaczenie):
+    """{(kontrakt, metoda): średnia} z najnowszego przebiegu, w którym metoda wystąpiła."""
+    df = historia(polaczenie)
+    if df.empty:
+        return {}
+    najnowsze = df.groupby(['kontrakt', 'metoda']).tail(1)
+    return {(w.kontrakt, w.metoda): w.srednia for w in najnowsze.itertuples()}
+
+
+# --- 3. REGRESJE ---
+def porownaj(polaczenie, przebieg=None, okno=5, prog_z=3.0, tolerancja=0.001):
+    """Tabela różnic przebiegu (domyślnie ostatniego) względem kroczącej bazy `okno` poprzednich."""
+    df = historia(polaczenie)
+    if df.empty:
+        return df
+    przebieg = przebieg or int(df['przebieg'].max())
+    wiersze = []
+    for (kontrakt, metoda), grupa in df.groupby(['kontrakt', 'metoda'], sort=True):
+        biezacy = grupa[grupa['przebieg'] == przebieg]
+        if biezacy.empty:
+            continue
+        b = biezacy.iloc[0]
+        baza = grupa[grupa['przebieg'] < przebieg].tail(okno)
+        wiersz = {'kontrakt': kontrakt, 'metoda': metoda, 'commit': b['git_commit'], 'srednia': b['srednia'],
+                  'bazowa': math.nan, 'zmiana': math.nan, 'zmiana_%': math.nan, 'z': math.nan, 'status': 'nowa'}
+        if not baza.empty:
+            bazowa = baza['srednia'].mean()
+            sigma = baza['srednia'].std(ddof=1) if len(baza) > 1 else 0.0
+            zmiana = b['srednia'] - bazowa
+            z = zmiana / max(sigma, tolerancja * bazowa, 1.0)
+            # Stała bazowa: próg to sama tolerancja (z > 1), inaczej prog_z odchyleń bazowej
+            prog = prog_z if sigma > 0 else 1.0
+            wiersz.update({'bazowa': bazowa, 'zmiana': zmiana, 'zmiana_%': 100 * zmiana / bazowa, 'z': z,
+                           'status': 'regresja' if z > prog else 'poprawa' if z < -prog else 'bez zmian'})
+        wiersze.append(wiersz)
+    return pd.DataFrame(wiersze)
+
+
+def zapisz_tabele(roznice, sciezka, tytul="Zmiany kosztu gazu względem bazy"):
+    """Tabela różnic (tabele.py, format wg rozszerzenia), regresje na czerwono, poprawy na zielono."""
+    import tabele
+
+    wyswietl = pd.DataFrame({
+        'Kontrakt': roznice['kontrakt'],
+        'Metoda': roznice['metoda'],
+        'Baza (avg)': roznice['bazowa'].map(lambda x: '-' if pd.isna(x) else f"{x:,.0f}"),
+        'Teraz (avg)': roznice['srednia'].map(lambda x: f"{x:,.0f}"),
+        'Zmiana': roznice['zmiana_%'].map(lambda x: '-' if pd.isna(x) else f"{x:+.2f}%"),
+        'Status': roznice['status'],
+    })
+    kolory = {'regresja': '#fff5f5', 'poprawa': '#f0fff0'}
+    wyroznienia = {i: kolory[s] for i, s in enumerate(roznice['status']) if s in kolory}
+    tabele.zapisz(wyswietl, sciezka, tytul=tytul, wyroznienia=wyroznienia, styl={'zebra': None})
+    print(f"Zapisano: {sciezka}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historia gazu metod (hardhat-gas-reporter) i wykrywanie regresji")
+    parser.add_argument("--baza", default=BAZA, help="plik bazy SQLite")
+    parser.add_argument("--dodaj", nargs="*", default=[], help="raporty gas-reportera (tekst lub JSON)")
+    parser.add_argument("--commit", help="commit przypisany do raportów (domyślnie git HEAD)")
+    parser.add_argument("--porownaj", action="store_true", help="porównaj ostatni przebieg z bazą")
+    parser.add_argument("--okno", type=int, default=5, help="liczba poprzednich przebiegów w bazie kroczącej")
+    parser.add_argument("--prog-z", type=float, default=3.0)
+    parser.add_argument("--tolerancja", type=float, default=0.001, help="minimalna istotna zmiana względna")
+    parser.add_argument("--tabela", help="zapis tabeli różnic (.png, .svg, .html, .tex)")
+    parser.add_argument("--historia", help="Kontrakt.metoda - pokaż historię jednej metody")
+    parser.add_argument("--scisle", action="store_true", help="kod wyjścia 1, gdy wykryto regresję")
+    args = parser.parse_args()
+
+    polaczenie = polacz(args.baza)
+    commit = args.commit or biezacy_commit(os.path.dirname(os.path.abspath(__file__)))
+    for sciezka in args.dodaj:
+        try:
+            pomiary = wczytaj_raport(sciezka)
+        except (OSError, ValueError) as e:
+            print(f"❌ {sciezka}: {e}")
+            sys.exit(1)
+        if not pomiary:
+            print(f"❌ {sciezka}: brak tabeli metod gas-reportera")
+            sys.exit(1)
+        przebieg = dodaj_przebieg(polaczenie, pomiary, commit, os.path.basename(sciezka))
+        print(f"Przebieg #{przebieg} ({commit}): {len(pomiary)} metod z {sciezka}")
+
+    if args.historia:
+        kontrakt, _, metoda = args.historia.partition('.')
+        df = historia(polaczenie, kontrakt, metoda or None)
+        print(df.drop(columns=['kontrakt']).to_string(index=False) if not df.empty else "Brak pomiarów")
+
+    if args.porownaj or args.dodaj or args.tabela:
+        roznice = porownaj(polaczenie, okno=args.okno, prog_z=args.prog_z, tolerancja=args.tolerancja)
+        if roznice.empty:
+            print("Baza jest pusta - dodaj raport przez --dodaj")
+            return
+        print(roznice.to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+        if args.tabela:
+            zapisz_tabele(roznice, args.tabela)
+        regresje = roznice[roznice['status'] == 'regresja']
+        if len(regresje):
+            print(f"⚠️ Regresje: {', '.join(regresje['kontrakt'] + '.' + regresje['metoda'])}")
+            if args.scisle:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
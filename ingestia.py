@@ -0,0 +1,272 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from magazyn import ROZMIAR_SLOWA, Magazyn, slowa_z_hex
+from zobowiazania import keccak256
+
+# Pobieranie zdarzeń i receiptów prosto z węzła JSON-RPC (Hardhat / anvil) do magazynu wyników,
+# zamiast CSV dopisywanych przez skrypty TS przez fs.appendFileSync.
+#
+# - eth_getLogs po zakresach bloków, z filtrem na topic0 wszystkich śledzonych eventów naraz;
+#   kilka zakresów leci w jednym żądaniu HTTP (JSON-RPC batch), kilka żądań równolegle,
+# - jedna sesja requests z pulą połączeń keep-alive (bez nowego TCP na każde wywołanie),
+# - receipty (gasUsed, status) pobierane wsadowo i współbieżnie dla unikalnych transakcji,
+# - każdy event ma własny magazyn (kolumny: blok, indeks_logu, tx, kontrakt + pola eventu),
+#   receipty - magazyn `receipty`. Ostatni przetworzony blok jest w metadanych każdego
+#   magazynu (zapisywanych atomowo z danymi), więc ponowne uruchomienie dociąga tylko nowe bloki.
+#
+#   python ingestia.py                                     # http://127.0.0.1:8545, od ostatniego bloku
+#   python ingestia.py --rpc http://127.0.0.1:8600 --adres 0x5FbDB2315678afecb367f032d93F642f64180aa3
+
+# nazwa: (sygnatura, [(pole, typ, indexed)])
+ZDARZENIA = {
+    'LogCommit': ('LogCommit(address,uint256)', [('gracz', 'address', True), ('czas', 'uint256', False)]),
+    'LogReveal': ('LogReveal(address,uint256)', [('gracz', 'address', True), ('sekret', 'uint256', False)]),
+    'LogResult': ('LogResult(uint256)', [('wynik', 'uint256', False)]),
+    'LogSlashed': ('LogSlashed(address,address)', [('ofiara', 'address', True), ('zglaszajacy', 'address', True)]),
+    'RequestSent': ('RequestSent(uint256,address)', [('request_id', 'uint256', False), ('gracz', 'address', False)]),
+    'TicketPurchased': ('TicketPurchased(address,uint256)', [('kupujacy', 'address', True), ('kwota', 'uint256', False)]),
+}
+
+TEMATY = {"0x" + keccak256(sygnatura.encode()).hex(): nazwa for nazwa, (sygnatura, _) in ZDARZENIA.items()}
+
+ROZMIAR_ADRESU = 20
+KOLUMNY_WSPOLNE = {
+    'blok': ('<i8', ()),
+    'indeks_logu': ('<i8', ()),
+    'tx': ('u1', (ROZMIAR_SLOWA,)),
+    'kontrakt': ('u1', (ROZMIAR_ADRESU,)),
+}
+KOLUMNY_RECEIPTOW = {
+    'tx': ('u1', (ROZMIAR_SLOWA,)),
+    'blok': ('<i8', ()),
+    'gas_used': ('<i8', ()),
+    'status': ('u1', ()),
+    'od': ('u1', (ROZMIAR_ADRESU,)),
+    'do': ('u1', (ROZMIAR_ADRESU,)),
+}
+
+
+class BladRPC(Exception):
+    pass
+
+
+# --- 1. KLIENT JSON-RPC ---
+class KlientRPC:
+    """JSON-RPC po HTTP z pulą połączeń keep-alive i obsługą wsadów."""
+
+    def __init__(self, url, polaczenia=8, timeout=120):
+        self.url = url
+        self.timeout = timeout
+        self.sesja = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=polaczenia)
+        self.sesja.mount("http://", adapter)
+        self.sesja.mount("https://", adapter)
+
+    def wywolaj(self, metoda, parametry=()):
+        return self.wsad([(metoda, list(parametry))])[0]
+
+    def wsad(self, wywolania):
+        """Wiele wywołań w jednym żądaniu HTTP. Zwraca wyniki w kolejności wywołań
+        (błąd pojedynczego wywołania jako wyjątek BladRPC na jego pozycji)."""
+        cialo = [{'jsonrpc': '2.0', 'id': i, 'method': m, 'params': p} for i, (m, p) in enumerate(wywolania)]
+        odpowiedz = self.sesja.post(self.url, json=cialo, timeout=self.timeout)
+        odpowiedz.raise_for_status()
+        wyniki = odpowiedz.json()
+        if isinstance(wyniki, dict):  # węzeł odrzucił cały wsad
+            raise BladRPC(wyniki.get('error'))
+        po_id = {w['id']: w for w in wyniki}
+        return [po_id[i]['result'] if 'error' not in po_id[i] else BladRPC(po_id[i]['error'])
+                for i in range(len(wywolania))]
+
+
+# --- 2. LOGI ---
+def _filtr(od, do, adresy):
+    filtr = {'fromBlock': hex(od), 'toBlock': hex(do), 'topics': [list(TEMATY)]}
+    if adresy:
+        filtr['address'] = adresy
+    return filtr
+
+
+def pobierz_logi(klient, od, do, zakres, wsad, adresy, pula):
+    """Wszystkie śledzone logi z bloków [od, do], posortowane po (blok, indeks)."""
+    zakresy = [(a, min(a + zakres - 1, do)) for a in range(od, do + 1, zakres)]
+    logi = []
+    while zakresy:
+        paczki = [zakresy[i:i + wsad] for i in range(0, len(zakresy), wsad)]
+        zakresy = []
+
+        def pobierz(paczka):
+            return paczka, klient.wsad([('eth_getLogs', [_filtr(a, b, adresy)]) for a, b in paczka])
+
+        for paczka, wyniki in pula.map(pobierz, paczki):
+            for (a, b), wynik in zip(paczka, wyniki):
+                if not isinstance(wynik, BladRPC):
+                    logi.extend(wynik)
+                elif a < b:
+                    # Zwykle "za dużo wyników" - dzielimy zakres na pół i ponawiamy
+                    srodek = (a + b) // 2
+                    zakresy += [(a, srodek), (srodek + 1, b)]
+                else:
+                    raise wynik
+    logi.sort(key=lambda l: (int(l['blockNumber'], 16), int(l['logIndex'], 16)))
+    return logi
+
+
+def _adresy(napisy):
+    return slowa_z_hex(napisy)[:, ROZMIAR_SLOWA - ROZMIAR_ADRESU:]
+
+
+def _puste(kolumny):
+    return {k: np.empty((0,) + ksztalt, dtype=dtype) for k, (dtype, ksztalt) in kolumny.items()}
+
+
+def kolumny_zdarzenia(nazwa):
+    kolumny = dict(KOLUMNY_WSPOLNE)
+    for pole, typ, _ in ZDARZENIA[nazwa][1]:
+        kolumny[pole] = ('u1', (ROZMIAR_ADRESU if typ == 'address' else ROZMIAR_SLOWA,))
+    return kolumny
+
+
+def dekoduj(logi):
+    """Logi (JSON z węzła) -> {nazwa eventu: {kolumna: tablica}}; pola dekodowane wsadowo."""
+    grupy = {}
+    for log in logi:
+        grupy.setdefault(TEMATY.get(log['topics'][0]), []).append(log)
+    grupy.pop(None, None)
+
+    wynik = {}
+    for nazwa in ZDARZENIA:
+        grupa = grupy.get(nazwa, [])
+        if not grupa:
+            wynik[nazwa] = _puste(kolumny_zdarzenia(nazwa))
+            continue
+        kolumny = {
+            'blok': np.array([int(l['blockNumber'], 16) for l in grupa], dtype=np.int64),
+            'indeks_logu': np.array([int(l['logIndex'], 16) for l in grupa], dtype=np.int64),
+            'tx': slowa_z_hex([l['transactionHash'] for l in grupa]),
+            'kontrakt': _adresy([l['address'] for l in grupa]),
+        }
+        nr_tematu, nr_slowa = 1, 0
+        for pole, typ, indexed in ZDARZENIA[nazwa][1]:
+            if indexed:
+                slowa = slowa_z_hex([l['topics'][nr_tematu] for l in grupa])
+                nr_tematu += 1
+            else:
+                od = 2 + 64 * nr_slowa
+                slowa = slowa_z_hex([l['data'][od:od + 64] for l in grupa])
+                nr_slowa += 1
+            kolumny[pole] = slowa[:, ROZMIAR_SLOWA - ROZMIAR_ADRESU:] if typ == 'address' else slowa
+        wynik[nazwa] = kolumny
+    return wynik
+
+
+# --- 3. RECEIPTY ---
+def pobierz_receipty(klient, hashe, wsad, pula):
+    paczki = [hashe[i:i + wsad] for i in range(0, len(hashe), wsad)]
+
+    def pobierz(paczka):
+        return klient.wsad([('eth_getTransactionReceipt', [h]) for h in paczka])
+
+    receipty = []
+    for wyniki in pula.map(pobierz, paczki):
+        for r in wyniki:
+            if isinstance(r, BladRPC):
+                raise r
+            receipty.append(r)
+
+    if not receipty:
+        return _puste(KOLUMNY_RECEIPTOW)
+    zero = "0x" + "00" * ROZMIAR_ADRESU
+    return {
+        'tx': slowa_z_hex([r['transactionHash'] for r in receipty]),
+        'blok': np.array([int(r['blockNumber'], 16) for r in receipty], dtype=np.int64),
+        'gas_used': np.array([int(r['gasUsed'], 16) for r in receipty], dtype=np.int64),
+        'status': np.array([int(r.get('status') or '0x1', 16) for r in receipty], dtype=np.uint8),
+        'od': _adresy([r['from'] for r in receipty]),
+        'do': _adresy([r['to'] or zero for r in receipty]),
+    }
+
+
+# --- 4. PRZEBIEG ---
+def otworz_magazyny(katalog, receipty=True):
+    magazyny = {nazwa: Magazyn.otworz_lub_utworz(os.path.join(katalog, nazwa), kolumny_zdarzenia(nazwa),
+                                                 {'do_bloku': -1})
+                for nazwa in ZDARZENIA}
+    if receipty:
+        magazyny['receipty'] = Magazyn.otworz_lub_utworz(os.path.join(katalog, 'receipty'), KOLUMNY_RECEIPTOW,
+                                                         {'do_bloku': -1})
+    return magazyny
+
+
+def _dopisz_od(magazyn, kolumny, do_bloku):
+    # Po przerwaniu część magazynów mogła już dostać to okno - dopisujemy tylko nowsze bloki
+    nowe = kolumny['blok'] > magazyn.metadane['do_bloku']
+    magazyn.dopisz({k: v[nowe] for k, v in kolumny.items()}, metadane={'do_bloku': do_bloku})
+    return int(nowe.sum())
+
+
+def ingestuj(klient, katalog, od=None, do=None, zakres=2000, wsad=20, watki=8, adresy=None,
+             receipty=True, okno=None):
+    magazyny = otworz_magazyny(katalog, receipty)
+    if od is None:
+        od = min(m.metadane['do_bloku'] for m in magazyny.values()) + 1
+    if do is None:
+        do = int(klient.wywolaj('eth_blockNumber'), 16)
+    if od > do:
+        print(f"Brak nowych bloków (ostatni: {do})")
+        return magazyny
+
+    # Okno = tyle bloków, ile obsłuży jedna runda równoległych wsadów; po każdym oknie zapis
+    okno = okno or zakres * wsad * watki
+    start = time.perf_counter()
+    licznik_logow = licznik_receiptow = 0
+    with ThreadPoolExecutor(max_workers=watki) as pula:
+        for a in range(od, do + 1, okno):
+            b = min(a + okno - 1, do)
+            logi = pobierz_logi(klient, a, b, zakres, wsad, adresy, pula)
+            for nazwa, kolumny in dekoduj(logi).items():
+                licznik_logow += _dopisz_od(magazyny[nazwa], kolumny, b)
+            if receipty:
+                hashe = list(dict.fromkeys(l['transactionHash'] for l in logi))
+                licznik_receiptow += _dopisz_od(magazyny['receipty'], pobierz_receipty(klient, hashe, wsad * 5, pula), b)
+            print(f"Postęp: {b - od + 1}/{do - od + 1} bloków, logi: {licznik_logow:,}", flush=True)
+
+    czas = time.perf_counter() - start
+    print(f"Bloki {od}..{do}: {licznik_logow:,} logów, {licznik_receiptow:,} receiptów w {czas:.1f}s")
+    for nazwa, magazyn in magazyny.items():
+        print(f"  {nazwa:16} {magazyn.wiersze:>10,} wierszy")
+    return magazyny
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zdarzenia i receipty z węzła JSON-RPC do magazynu wyników")
+    parser.add_argument("--rpc", default=os.environ.get("HARDHAT_WEZEL_URL", "http://127.0.0.1:8545"))
+    parser.add_argument("--magazyn", default="magazyn_zdarzen", help="katalog z magazynami eventów")
+    parser.add_argument("--od-bloku", type=int, help="domyślnie: blok po ostatnio pobranym")
+    parser.add_argument("--do-bloku", type=int, help="domyślnie: bieżący blok węzła")
+    parser.add_argument("--adres", nargs="*", help="tylko logi z podanych kontraktów")
+    parser.add_argument("--zakres", type=int, default=2000, help="bloków na jedno eth_getLogs")
+    parser.add_argument("--wsad", type=int, default=20, help="wywołań w jednym żądaniu HTTP")
+    parser.add_argument("--watki", type=int, default=8, help="równoległe żądania HTTP")
+    parser.add_argument("--bez-receiptow", action="store_true")
+    args = parser.parse_args()
+
+    klient = KlientRPC(args.rpc, polaczenia=args.watki)
+    try:
+        ingestuj(klient, args.magazyn, args.od_bloku, args.do_bloku, args.zakres, args.wsad, args.watki,
+                 args.adres, receipty=not args.bez_receiptow)
+    except (requests.RequestException, BladRPC) as e:
+        print(f"❌ Błąd komunikacji z {args.rpc}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
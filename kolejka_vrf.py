@@ -0,0 +1,184 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import obliczenia as obl
+
+# Model kolejkowy realizacji VRF (VRFGame.play() -> requestConfirmations -> fulfillRandomWords).
+#
+# simulation.ts mierzy pojedyncze żądanie. Tu żądania napływają procesem Poissona (λ na minutę), czekają
+# requestConfirmations bloków, a potem trafiają do kolejki FIFO wyroczni, która w jednym bloku
+# realizuje co najwyżej `pojemnosc` callbacków. Callbacki i play() muszą się zmieścić w gazie bloku
+# pozostawionym przez resztę ruchu.
+# Opłata bazowa ewoluuje jak w EIP-1559 (tło + ruch VRF względem celu 50% limitu). Ruch tła jest
+# elastyczny - maleje jak (f0 / f)^elastycznosc - więc VRF podbija opłatę, aż wypchnie część tła.
+# Gaz na żądanie jest O(1), ale cena w ETH i opóźnienie rosną z obciążeniem. Powyżej maxFeePerGas
+# transakcje VRF (play() i callbacki) czekają w mempoolu, więc opłata się stabilizuje, a rośnie zaległość.
+#
+# Rekurencja kolejki Q_{t+1} = Q_t + A_{t-k} - S_t idzie po blokach, ale każdy krok jest wektorowy
+# na całej siatce (λ × pojemność). Opóźnienia liczymy z krzywych skumulowanych: żądanie nr j napływa
+# w bloku searchsorted(cumA, j), a obsłużone jest w searchsorted(cumS, j) (FIFO), więc percentyle
+# wychodzą z próby rang bez śledzenia pojedynczych żądań.
+#
+#   python kolejka_vrf.py                                          # domyślna siatka
+#   python kolejka_vrf.py --lambdy 60,600,3000,6000 --pojemnosci 10,50,200,500 --bloki 14400
+#   python kolejka_vrf.py --csv wyniki_kolejka_vrf.csv
+
+CZAS_BLOKU = 12.0
+POTWIERDZENIA = 3             # requestConfirmations w VRFGame.sol
+LIMIT_GAZU_BLOKU = 30_000_000
+GAZ_ZADANIA = 103593          # vrf_request_gas (wyniki_badan.csv)
+GAZ_CALLBACK = 72692          # vrf_callback_gas, gdy brak pliku z pomiarami
+RANGI = 20_000                # liczba żądań (rang) do percentyli opóźnienia
+
+
+# --- 1. DANE WEJŚCIOWE ---
+def gaz_z_pomiarow(plik="wyniki_badan.csv"):
+    """Gaz żądania i empiryczny rozkład gazu callbacku z simulation.ts."""
+    df = obl.wczytaj_dane(plik)
+    if obl.ma_kolumne(df, 'vrf_callback_gas'):
+        return float(df['vrf_request_gas'].mean()), df['vrf_callback_gas'].to_numpy(dtype=float)
+    return float(GAZ_ZADANIA), np.array([GAZ_CALLBACK], dtype=float)
+
+
+# --- 2. SYMULACJA NA SIATCE ---
+def symuluj(lambdy, pojemnosci, bloki=7200, potwierdzenia=POTWIERDZENIA, gaz_zadania=GAZ_ZADANIA,
+            gaz_callback=(GAZ_CALLBACK,), tlo=0.5, elastycznosc=1.0, oplata_gwei=0.9, maks_oplata_gwei=100.0,
+            ziarno=2024):
+    """Kolejka dla każdej pary (λ [żądań/min], pojemność [callbacków/blok]).
+
+    tlo - wykorzystanie bloku przez pozostały ruch przy opłacie początkowej (0.5 = cel EIP-1559).
+    maks_oplata_gwei - maxFeePerGas żądań i callbacków; powyżej niej transakcje VRF czekają.
+    Zwraca słownik tablic: napływy A (L, T), włączone play() W i realizacje S (L, C, T), opłata bazowa (L, C, T).
+    """
+    rng = np.random.default_rng(ziarno)
+    lambdy = np.asarray(lambdy, dtype=float)
+    pojemnosci = np.asarray(pojemnosci, dtype=np.int64)
+    L, C = len(lambdy), len(pojemnosci)
+
+    # Wspólne liczby losowe: te same napływy dla wszystkich pojemności
+    naplywy = rng.poisson(lambdy[:, None] * CZAS_BLOKU / 60, size=(L, bloki)).astype(np.int64)
+    gaz_cb = rng.choice(np.asarray(gaz_callback, dtype=float), size=bloki)
+
+    oczekujace = np.zeros((L, C), dtype=np.int64)   # play() w mempoolu
+    kolejka = np.zeros((L, C), dtype=np.int64)      # po potwierdzeniach, czekają na wyrocznię
+    oplata = np.full((L, C), oplata_gwei)
+    wlaczone = np.empty((L, C, bloki), dtype=np.int64)
+    realizacje = np.empty((L, C, bloki), dtype=np.int64)
+    oplaty = np.empty((L, C, bloki))
+    cel = LIMIT_GAZU_BLOKU / 2
+
+    for t in range(bloki):
+        if t >= potwierdzenia:
+            kolejka += wlaczone[:, :, t - potwierdzenia]
+        oczekujace += naplywy[:, t][:, None]
+        cena_ok = oplata <= maks_oplata_gwei
+        gaz_tla = np.minimum(LIMIT_GAZU_BLOKU * tlo * (oplata_gwei / oplata) ** elastycznosc, LIMIT_GAZU_BLOKU)
+        wolny = LIMIT_GAZU_BLOKU - gaz_tla
+
+        # Najpierw callbacki (starsze żądania), potem nowe play() w pozostałym gazie
+        s = np.minimum(kolejka, np.minimum(pojemnosci[None, :], (wolny // gaz_cb[t]).astype(np.int64))) * cena_ok
+        wolny -= s * gaz_cb[t]
+        w = np.minimum(oczekujace, (wolny // gaz_zadania).astype(np.int64)) * cena_ok
+        wolny -= w * gaz_zadania
+        kolejka -= s
+        oczekujace -= w
+        realizacje[:, :, t] = s
+        wlaczone[:, :, t] = w
+        oplaty[:, :, t] = oplata
+
+        # EIP-1559: zmiana o (zużyte - cel) / cel / 8 na blok
+        oplata = oplata * (1 + (LIMIT_GAZU_BLOKU - wolny - cel) / cel / 8)
+
+    return {'lambdy': lambdy, 'pojemnosci': pojemnosci, 'naplywy': naplywy, 'wlaczone': wlaczone,
+            'realizacje': realizacje, 'oplaty': oplaty, 'gaz_cb': gaz_cb, 'gaz_zadania': gaz_zadania}
+
+
+# --- 3. OPÓŹNIENIA I KOSZTY ---
+def opoznienia(cum_naplywy, cum_realizacje, rng, rangi=RANGI):
+    """Opóźnienie (s) od wysłania play() do callbacku dla próby rang FIFO; inf = nieobsłużone do końca."""
+    wszystkie = int(cum_naplywy[-1])
+    if wszystkie == 0:
+        return np.empty(0)
+    j = np.unique(np.linspace(0, wszystkie - 1, min(rangi, wszystkie)).astype(np.int64))
+    blok_naplywu = np.searchsorted(cum_naplywy, j, side='right')
+    blok_obslugi = np.searchsorted(cum_realizacje, j, side='right')
+    # Żądanie z bloku t mogło zostać wysłane w dowolnej chwili poprzedniego odstępu
+    wynik = (blok_obslugi - blok_naplywu) * CZAS_BLOKU + rng.uniform(0, CZAS_BLOKU, len(j))
+    wynik[blok_obslugi >= len(cum_realizacje)] = np.inf
+    return wynik
+
+
+def podsumuj(wynik, ziarno=2024):
+    rng = np.random.default_rng(ziarno)
+    A, W, S, F = wynik['naplywy'], wynik['wlaczone'], wynik['realizacje'], wynik['oplaty']
+    wiersze = []
+    for i, lam in enumerate(wynik['lambdy']):
+        cum_a = np.cumsum(A[i])
+        for c, poj in enumerate(wynik['pojemnosci']):
+            cum_s = np.cumsum(S[i, c])
+            lat = opoznienia(cum_a, cum_s, rng)
+            obsluzone = int(cum_s[-1])
+            # Koszt: play() płaci użytkownik, callback rozliczany w LINK po bieżącej opłacie - liczymy w ETH
+            koszt_gwei = (W[i, c] * wynik['gaz_zadania'] * F[i, c]).sum() + (S[i, c] * wynik['gaz_cb'] * F[i, c]).sum()
+            wiersze.append({
+                'lambda_na_min': lam,
+                'pojemnosc_na_blok': int(poj),
+                'obciazenie': lam * CZAS_BLOKU / 60 / poj,
+                'p50_s': float(np.percentile(lat, 50, method='higher')) if len(lat) else np.nan,
+                'p95_s': float(np.percentile(lat, 95, method='higher')) if len(lat) else np.nan,
+                'p99_s': float(np.percentile(lat, 99, method='higher')) if len(lat) else np.nan,
+                'nieobsluzone': 1 - obsluzone / max(int(cum_a[-1]), 1),
+                'maks_zaleglosc': int((cum_a - cum_s).max()),
+                'oplata_sr_gwei': float(F[i, c].mean()),
+                'koszt_na_zadanie_eth': koszt_gwei / obl.GWEI_PER_ETH / max(obsluzone, 1),
+            })
+    return pd.DataFrame(wiersze)
+
+
+def lista(tekst, typ):
+    return [typ(x) for x in tekst.split(',') if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model kolejkowy VRF: opóźnienie i koszt żądania pod obciążeniem")
+    parser.add_argument("--lambdy", default="10,100,500,1000,2000,5000", help="napływ żądań na minutę (lista)")
+    parser.add_argument("--pojemnosci", default="10,50,100,200,400", help="callbacki na blok (lista)")
+    parser.add_argument("--bloki", type=int, default=7200, help="długość symulacji w blokach (7200 = doba)")
+    parser.add_argument("--potwierdzenia", type=int, default=POTWIERDZENIA)
+    parser.add_argument("--tlo", type=float, default=0.5, help="wykorzystanie bloku przez resztę ruchu")
+    parser.add_argument("--elastycznosc", type=float, default=1.0, help="elastyczność ruchu tła względem opłaty")
+    parser.add_argument("--oplata", type=float, default=0.9, help="początkowa opłata bazowa (gwei)")
+    parser.add_argument("--maks-oplata", type=float, default=100.0, help="maxFeePerGas transakcji VRF (gwei)")
+    parser.add_argument("--dane", default="wyniki_badan.csv", help="pomiary gazu z simulation.ts")
+    parser.add_argument("--ziarno", type=int, default=2024)
+    parser.add_argument("--csv", help="zapis tabeli wyników")
+    args = parser.parse_args()
+
+    try:
+        lambdy, pojemnosci = lista(args.lambdy, float), lista(args.pojemnosci, int)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    gaz_zadania, gaz_callback = gaz_z_pomiarow(args.dane)
+    print(f"Gaz żądania: {gaz_zadania:,.0f}, callback: {gaz_callback.mean():,.0f} ± {gaz_callback.std():.1f} "
+          f"({len(gaz_callback)} pomiarów), siatka {len(lambdy)}×{len(pojemnosci)}, {args.bloki} bloków")
+
+    start = time.perf_counter()
+    wynik = symuluj(lambdy, pojemnosci, args.bloki, args.potwierdzenia, gaz_zadania, gaz_callback,
+                    args.tlo, args.elastycznosc, args.oplata, args.maks_oplata, args.ziarno)
+    tabela = podsumuj(wynik, args.ziarno)
+    print(tabela.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+    print(f"Czas: {time.perf_counter() - start:.1f}s")
+
+    if args.csv:
+        tabela.to_csv(args.csv, index=False)
+        print(f"Zapisano: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
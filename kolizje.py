@@ -0,0 +1,261 @@
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from magazyn import PLIK_MANIFESTU, ROZMIAR_SLOWA, Magazyn, slowa_na_hex, slowa_z_hex
+
+# Wykrywanie powtórzeń słów 256-bit (wyniki RANDAO / VRF, sekrety) w jednym przebiegu po danych.
+#
+# Zdrowe źródło 256-bit nie powtarza się nigdy, ale zepsuta runda - XOR = 0, gdy nikt nie ujawnił,
+# albo sekrety w stylu 1000 + i * 123 z check_scalability.ts - powtarza się po cichu.
+#
+# Przebieg: każde słowo dostaje trzy niezależne 64-bitowe skróty (mieszanie splitmix64 po 4 limbach,
+# więc także słowa z samymi zerami w starszych bajtach rozkładają się równomiernie). Dwa sterują
+# filtrem Blooma (k pozycji h1 + i*h2), trzeci - odcisk - trafia razem z numerem wiersza do indeksu
+# na dysku, podzielonego na części według najstarszych bitów odcisku. Słowo, które filtr
+# "już widział" (albo powtarza się w tym samym fragmencie), jest kandydatem - zapamiętujemy tylko,
+# w której części leży. Po przebiegu sortujemy po odcisku wyłącznie części z kandydatami, sąsiednie
+# równe odciski dają grupy wierszy, a powtórzenie potwierdza dokładne porównanie słów z magazynu.
+# Pamięć: filtr (--pamiec), potem jedna część naraz - części jest tyle, żeby sortowanie jednej
+# mieściło się w tym samym budżecie; dysk: 16 B na słowo.
+#
+#   python kolizje.py                                              # magazyn_probki: randao_slowo, vrf_slowo
+#   python kolizje.py --zrodlo magazyn_zdarzen/LogReveal --kolumny sekret --id blok,indeks_logu
+#   python kolizje.py --zrodlo magazyn_zobowiazan --kolumny sekret --pamiec 1024 --csv powtorzenia.csv
+
+FRAGMENT = 1 << 20            # słów na fragment
+CZESCI = 256                  # minimalna liczba plików indeksu (po 8 najstarszych bitach odcisku)
+PAMIEC_MB = 256               # budżet filtra Blooma i sortowania jednej części indeksu
+FP_CEL = 1e-4                 # docelowe prawdopodobieństwo fałszywego kandydata
+FP_OSTRZEZENIE = 0.01         # powyżej filtr prawie nic nie odsiewa - sortowana jest większość części
+KOLUMNY = ['randao_slowo', 'vrf_slowo']
+KOLUMNY_ID = ['iteracja', 'blok', 'indeks_logu']
+REKORD = np.dtype([('odcisk', '<u8'), ('wiersz', '<i8')])
+BAJTY_SORTOWANIA = REKORD.itemsize + 8  # rekord + indeks z argsort
+
+_SOL = [np.uint64(s) for s in (0x9E3779B97F4A7C15, 0xD1B54A32D192ED03, 0x8CB92BA72F3D8DD7)]
+
+
+# --- 1. SKRÓTY ---
+def _mieszaj(x):
+    """Finalizator splitmix64 (mnożenie modulo 2^64)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def skroty(slowa):
+    """Trzy 64-bitowe skróty (h1, h2, odcisk) dla słów (n, 32) uint8."""
+    limby = np.ascontiguousarray(slowa, dtype=np.uint8).view('>u8').astype(np.uint64)
+    wynik = []
+    for sol in _SOL:
+        h = np.full(len(limby), sol, dtype=np.uint64)
+        for j in range(ROZMIAR_SLOWA // 8):
+            h = _mieszaj(h ^ limby[:, j])
+        wynik.append(h)
+    return wynik
+
+
+# --- 2. FILTR BLOOMA ---
+class FiltrBlooma:
+    def __init__(self, bity, funkcje):
+        self.bity = np.uint64(bity)
+        self.funkcje = funkcje
+        self.tablica = np.zeros((bity + 7) // 8, dtype=np.uint8)
+
+    @classmethod
+    def dla(cls, n, fp=FP_CEL, pamiec_mb=PAMIEC_MB):
+        """Filtr dla n elementów: optymalny dla fp, ale nie większy niż budżet pamięci."""
+        bity = max(64, math.ceil(-n * math.log(fp) / math.log(2) ** 2))
+        bity = min(bity, pamiec_mb * 8 * 2 ** 20)
+        funkcje = max(1, round(bity / max(n, 1) * math.log(2)))
+        return cls(bity, funkcje)
+
+    def fp(self, n):
+        """Prawdopodobieństwo fałszywego trafienia po wstawieniu n elementów."""
+        return (1 - math.exp(-self.funkcje * n / float(self.bity))) ** self.funkcje
+
+    def _pozycje(self, h1, h2):
+        i = np.arange(self.funkcje, dtype=np.uint64)
+        return (h1[:, None] + i * (h2[:, None] | np.uint64(1))) % self.bity
+
+    def sprawdz_i_dodaj(self, h1, h2):
+        """Czy element mógł już wystąpić (przed tym wywołaniem); potem go wstawia."""
+        pozycje = self._pozycje(h1, h2)
+        bajty, bity = (pozycje >> np.uint64(3)).astype(np.int64), (pozycje & np.uint64(7)).astype(np.uint8)
+        byl = ((self.tablica[bajty] >> bity) & 1).all(axis=1)
+        np.bitwise_or.at(self.tablica, bajty.ravel(), (np.uint8(1) << bity).ravel())
+        return byl
+
+
+# --- 3. PRZEBIEG I INDEKS NA DYSKU ---
+def liczba_czesci(n, pamiec_mb=PAMIEC_MB):
+    """Potęga dwójki (>= CZESCI), przy której posortowanie jednej części mieści się w budżecie."""
+    potrzebne = n * BAJTY_SORTOWANIA / (pamiec_mb * 2 ** 20)
+    return max(CZESCI, 1 << math.ceil(math.log2(max(potrzebne, 1))))
+
+
+class IndeksDyskowy:
+    """Rekordy (odcisk, wiersz) dopisywane do plików-części według najstarszych bitów odcisku."""
+
+    def __init__(self, katalog, czesci=CZESCI):
+        self.katalog = katalog
+        self.czesci = czesci
+        self.przesuniecie = np.uint64(64 - int(math.log2(czesci)))
+        os.makedirs(katalog, exist_ok=True)
+        self.pliki = [open(self._plik(c), 'wb') for c in range(czesci)]
+
+    def _plik(self, czesc):
+        return os.path.join(self.katalog, f"czesc_{czesc:04d}.bin")
+
+    def czesc(self, odciski):
+        return (odciski >> self.przesuniecie).astype(np.int64)
+
+    def dopisz(self, odciski, wiersze):
+        rekordy = np.empty(len(odciski), dtype=REKORD)
+        rekordy['odcisk'], rekordy['wiersz'] = odciski, wiersze
+        czesci = self.czesc(odciski)
+        kolejnosc = np.argsort(czesci, kind='stable')
+        granice = np.searchsorted(czesci[kolejnosc], np.arange(self.czesci + 1))
+        for c in np.flatnonzero(np.diff(granice)):
+            self.pliki[c].write(rekordy[kolejnosc[granice[c]:granice[c + 1]]].tobytes())
+
+    def zamknij(self):
+        for f in self.pliki:
+            f.close()
+
+    def grupy(self, czesc):
+        """Wiersze o wspólnym odcisku w części (rosnąco) - sortowanie po odcisku i porównanie sąsiadów."""
+        rekordy = np.fromfile(self._plik(czesc), dtype=REKORD)
+        # Stabilnie: wiersze dopisywane rosnąco zostają rosnące w obrębie odcisku
+        kolejnosc = np.argsort(rekordy['odcisk'], kind='stable')
+        odciski = rekordy['odcisk'][kolejnosc]
+        rowne = odciski[1:] == odciski[:-1]
+        if not rowne.any():
+            return []
+        poczatki = np.flatnonzero(np.concatenate([[True], ~rowne]))
+        konce = np.append(poczatki[1:], len(odciski))
+        wiersze = rekordy['wiersz'][kolejnosc]
+        return [wiersze[a:b] for a, b in zip(poczatki, konce) if b - a > 1]
+
+
+def _zrodlo(zrodlo, kolumna):
+    """(liczba wierszy, wycinek słów, słowa dla listy wierszy, nazwy kolumn, wartości kolumny id dla wierszy)."""
+    if os.path.isdir(zrodlo) and os.path.exists(os.path.join(zrodlo, PLIK_MANIFESTU)):
+        magazyn = Magazyn(zrodlo)
+        if magazyn.opis(kolumna)[1] != (ROZMIAR_SLOWA,):
+            raise ValueError(f"Kolumna {kolumna} nie zawiera słów 256-bit")
+        dane = magazyn.kolumna(kolumna)
+        return (magazyn.wiersze, lambda a, b: dane[a:b], lambda w: np.asarray(dane[np.sort(w)]), magazyn.kolumny,
+                lambda nazwa, w: np.asarray(magazyn.kolumna(nazwa))[w])
+    df = pd.read_csv(zrodlo, dtype=str)
+    slowa = slowa_z_hex(df[kolumna])
+    return (len(slowa), lambda a, b: slowa[a:b], lambda w: slowa[np.sort(w)], list(df.columns),
+            lambda nazwa, w: df[nazwa].to_numpy()[w])
+
+
+def znajdz_powtorzenia(zrodlo, kolumna, kolumny_id=None, pamiec_mb=PAMIEC_MB, katalog_roboczy=None,
+                       fragment=FRAGMENT, postep=True):
+    """Jeden przebieg po kolumnie słów -> DataFrame powtórzeń (słowo, liczba, wiersze, id) i statystyki."""
+    n, wycinek, slowa_wierszy, kolumny, kolumna_id = _zrodlo(zrodlo, kolumna)
+    kolumny_id = [k for k in (kolumny_id or KOLUMNY_ID) if k in kolumny]
+    filtr = FiltrBlooma.dla(n, pamiec_mb=pamiec_mb)
+    statystyki = {'slowa': n, 'kandydaci': 0, 'bity_filtra': int(filtr.bity), 'funkcje': filtr.funkcje,
+                  'fp': filtr.fp(n), 'czesci': liczba_czesci(n, pamiec_mb)}
+    roboczy = katalog_roboczy or tempfile.mkdtemp(prefix="kolizje_")
+    indeks = IndeksDyskowy(os.path.join(roboczy, kolumna), statystyki['czesci'])
+    z_kandydatami = np.zeros(indeks.czesci, dtype=bool)
+    wiersze_grup = []
+    try:
+        for start in range(0, n, fragment):
+            h1, h2, odcisk = skroty(wycinek(start, start + fragment))
+            byl = filtr.sprawdz_i_dodaj(h1, h2)
+            # Powtórzenia w obrębie fragmentu filtr widzi dopiero od drugiego wystąpienia - tu też
+            _, odwrotne, liczby = np.unique(odcisk, return_inverse=True, return_counts=True)
+            byl |= liczby[odwrotne] > 1
+            statystyki['kandydaci'] += int(byl.sum())
+            z_kandydatami[indeks.czesc(odcisk[byl])] = True
+            indeks.dopisz(odcisk, np.arange(start, start + len(odcisk)))
+            if postep:
+                print(f"\rPostęp: {min(start + fragment, n):,}/{n:,}", end="", flush=True)
+        if postep:
+            print()
+        indeks.zamknij()
+        del filtr  # sortowanie części korzysta z tego samego budżetu pamięci
+
+        # Potwierdzenie: grupy wierszy o tym samym odcisku (filtr nie ma fałszywych negatywów, więc
+        # każde powtórzenie leży w części z kandydatem), porównanie pełnych słów
+        statystyki['sortowane_czesci'] = int(z_kandydatami.sum())
+        for c in np.flatnonzero(z_kandydatami):
+            for grupa in indeks.grupy(c):
+                slowa = slowa_wierszy(grupa)
+                _, odwrotne, liczby = np.unique(slowa, axis=0, return_inverse=True, return_counts=True)
+                for g in np.flatnonzero(liczby > 1):
+                    wiersze_grup.append(grupa[odwrotne.ravel() == g])
+    finally:
+        indeks.zamknij()
+        if katalog_roboczy is None:
+            shutil.rmtree(roboczy, ignore_errors=True)
+
+    wiersze = []
+    for grupa in sorted(wiersze_grup, key=len, reverse=True):
+        slowo = slowa_wierszy(grupa[:1])
+        wiersz = {'slowo': slowa_na_hex(slowo)[0], 'zerowe': not slowo.any(), 'wystapienia': len(grupa),
+                  'wiersze': grupa.tolist()}
+        for k in kolumny_id:
+            wiersz[k] = kolumna_id(k, grupa).tolist()
+        wiersze.append(wiersz)
+    return pd.DataFrame(wiersze, columns=['slowo', 'zerowe', 'wystapienia', 'wiersze'] + kolumny_id), statystyki
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Powtórzenia słów 256-bit: filtr Blooma + indeks na dysku")
+    parser.add_argument("--zrodlo", default="magazyn_probki", help="katalog magazynu wyników albo CSV ze słowami hex")
+    parser.add_argument("--kolumny", default=",".join(KOLUMNY), help="kolumny słów (lista)")
+    parser.add_argument("--id", help="kolumny identyfikujące rundę w raporcie (domyślnie iteracja/blok/indeks_logu)")
+    parser.add_argument("--pamiec", type=int, default=PAMIEC_MB, help="budżet filtra Blooma (MB)")
+    parser.add_argument("--katalog-roboczy", help="katalog indeksu na dysku (domyślnie tymczasowy, usuwany)")
+    parser.add_argument("--csv", help="zapis powtórzeń")
+    args = parser.parse_args()
+
+    kolumny_id = [k for k in args.id.split(',') if k] if args.id else None
+    raporty = []
+    znaleziono = False
+    for kolumna in [k for k in args.kolumny.split(',') if k]:
+        start = time.perf_counter()
+        try:
+            powtorzenia, s = znajdz_powtorzenia(args.zrodlo, kolumna, kolumny_id, args.pamiec, args.katalog_roboczy)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ {kolumna}: {e}")
+            sys.exit(1)
+        print(f"{kolumna}: {s['slowa']:,} słów w {time.perf_counter() - start:.1f}s, filtr {s['bity_filtra'] / 8 / 2**20:.1f} MB "
+              f"(k = {s['funkcje']}, fp = {s['fp']:.1e}), kandydaci {s['kandydaci']:,}, "
+              f"posortowane części indeksu {s['sortowane_czesci']}/{s['czesci']}")
+        if s['fp'] > FP_OSTRZEZENIE:
+            print(f"  ⚠️ Filtr Blooma za mały na {s['slowa']:,} słów (fp = {s['fp']:.2f}): prawie nic nie odsiewa, "
+                  f"więc sortowana jest większość indeksu. Pamięć pozostaje w budżecie, ale zwiększ --pamiec.")
+        if powtorzenia.empty:
+            print("  ✅ brak powtórzeń")
+            continue
+        znaleziono = True
+        print(f"  ⚠️ {len(powtorzenia):,} powtarzających się słów, łącznie {int(powtorzenia['wystapienia'].sum()):,} wystąpień")
+        print(powtorzenia.head(20).to_string(index=False, max_colwidth=70))
+        raporty.append(powtorzenia.assign(kolumna=kolumna))
+
+    if args.csv and raporty:
+        pd.concat(raporty).to_csv(args.csv, index=False)
+        print(f"Zapisano: {args.csv}")
+    sys.exit(1 if znaleziono else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import importlib
+import sys
+import types
+
+# Leniwe importy ciężkich bibliotek (pandas, matplotlib, scipy, seaborn).
+# Skrypty są uruchamiane w pipeline wiele razy na build, a sam import scipy.stats
+# czy seaborn kosztuje ~1-2 s. Moduł jest ładowany dopiero przy pierwszym użyciu
+# atrybutu, więc ścieżki, które z niego nie korzystają, nie płacą za import.
+#
+#   from leniwe import leniwy_import
+#   stats = leniwy_import("scipy.stats")
+#   ...
+#   stats.chi2.cdf(x, df)   # <- dopiero tutaj następuje import scipy.stats
+
+
+class LeniwyModul(types.ModuleType):
+    """Zastępca modułu - importuje prawdziwy moduł przy pierwszym dostępie do atrybutu."""
+
+    def __init__(self, nazwa):
+        super().__init__(nazwa)
+        self._modul = None
+
+    def _zaladuj(self):
+        if self._modul is None:
+            self._modul = importlib.import_module(self.__name__)
+            # Kolejne odwołania trafiają już bezpośrednio do słownika modułu
+            self.__dict__.update(self._modul.__dict__)
+        return self._modul
+
+    def __getattr__(self, atrybut):
+        return getattr(self._zaladuj(), atrybut)
+
+    def __dir__(self):
+        return dir(self._zaladuj())
+
+    def __repr__(self):
+        stan = "załadowany" if self._modul is not None else "leniwy"
+        return f"<LeniwyModul {self.__name__} ({stan})>"
+
+
+def leniwy_import(nazwa):
+    """Zwraca moduł (jeśli już zaimportowany) albo leniwego zastępcę."""
+    if nazwa in sys.modules:
+        return sys.modules[nazwa]
+    return LeniwyModul(nazwa)
+
+
+def zaladowany(nazwa):
+    """Czy moduł faktycznie został już zaimportowany (przydatne przy profilowaniu)."""
+    return nazwa in sys.modules
@@ -0,0 +1,208 @@
+import json
+import os
+
+import numpy as np
+
+# Magazyn wyników - katalog z kolumnami w surowym formacie binarnym + manifest.json.
+# Każda kolumna to osobny plik <nazwa>.bin (dane dopisywane na końcu), więc dopisanie
+# kolejnego fragmentu nie wymaga przepisywania całości, a odczyt to np.memmap bez
+# kopiowania do RAM. 256-bitowe słowa losowe trzymamy jako (n, 32) uint8 big-endian.
+#
+# Liczba wierszy w manifeście jest źródłem prawdy: manifest zapisujemy atomowo
+# (os.replace) PO dopisaniu danych, a przed dopisaniem obcinamy pliki do tej długości.
+# Przerwany zapis zostawia więc co najwyżej śmieci za końcem, które są ignorowane.
+#
+#   m = Magazyn.utworz("magazyn_probki", {'randao_val': ('u1', ()), 'randao_slowo': ('u1', (32,))})
+#   m.dopisz({'randao_val': wartosci, 'randao_slowo': slowa})
+#   Magazyn("magazyn_probki").kolumna('randao_val')   # np.memmap
+
+PLIK_MANIFESTU = 'manifest.json'
+ROZMIAR_SLOWA = 32  # uint256
+
+
+class Magazyn:
+    def __init__(self, katalog):
+        self.katalog = katalog
+        sciezka = os.path.join(katalog, PLIK_MANIFESTU)
+        if not os.path.exists(sciezka):
+            raise FileNotFoundError(f"Brak magazynu wyników: {sciezka}")
+        with open(sciezka, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def utworz(cls, katalog, kolumny, metadane=None):
+        """Nowy, pusty magazyn. kolumny: {nazwa: (dtype, kształt_wiersza)}."""
+        os.makedirs(katalog, exist_ok=True)
+        manifest = {
+            'id': os.urandom(8).hex(),   # odróżnia magazyn utworzony od nowa w tym samym katalogu
+            'wiersze': 0,
+            'kolumny': {nazwa: {'dtype': np.dtype(dtype).str, 'ksztalt': list(ksztalt)}
+                        for nazwa, (dtype, ksztalt) in kolumny.items()},
+            'metadane': metadane or {},
+        }
+        for nazwa in kolumny:
+            open(os.path.join(katalog, f"{nazwa}.bin"), 'wb').close()
+        _zapisz_atomowo(os.path.join(katalog, PLIK_MANIFESTU), manifest)
+        return cls(katalog)
+
+    @classmethod
+    def otworz_lub_utworz(cls, katalog, kolumny, metadane=None):
+        if os.path.exists(os.path.join(katalog, PLIK_MANIFESTU)):
+            return cls(katalog)
+        return cls.utworz(katalog, kolumny, metadane)
+
+    # --- Opis ---
+    @property
+    def wiersze(self):
+        return self.manifest['wiersze']
+
+    @property
+    def metadane(self):
+        return self.manifest['metadane']
+
+    @property
+    def kolumny(self):
+        return list(self.manifest['kolumny'])
+
+    @property
+    def id(self):
+        """Identyfikator nadany przy utworzeniu (None dla magazynów sprzed jego wprowadzenia)."""
+        return self.manifest.get('id')
+
+    def opis(self, nazwa):
+        """(dtype, kształt wiersza) kolumny."""
+        opis = self.manifest['kolumny'][nazwa]
+        return np.dtype(opis['dtype']), tuple(opis['ksztalt'])
+
+    def _plik(self, nazwa):
+        return os.path.join(self.katalog, f"{nazwa}.bin")
+
+    # --- Zapis ---
+    def dopisz(self, dane, metadane=None):
+        """Dopisuje wiersze (wszystkie kolumny naraz) i atomowo aktualizuje manifest."""
+        if set(dane) != set(self.kolumny):
+            raise ValueError(f"Oczekiwane kolumny: {self.kolumny}, otrzymane: {sorted(dane)}")
+
+        tablice = {}
+        for nazwa, wartosci in dane.items():
+            dtype, ksztalt = self.opis(nazwa)
+            wartosci = np.ascontiguousarray(wartosci, dtype=dtype)
+            if wartosci.shape[1:] != ksztalt:
+                raise ValueError(f"Kolumna {nazwa}: kształt wiersza {wartosci.shape[1:]}, oczekiwano {ksztalt}")
+            tablice[nazwa] = wartosci
+        n = len(next(iter(tablice.values())))
+        if any(len(t) != n for t in tablice.values()):
+            raise ValueError("Kolumny mają różną liczbę wierszy")
+
+        for nazwa, wartosci in tablice.items():
+            dtype, ksztalt = self.opis(nazwa)
+            rozmiar_wiersza = dtype.itemsize * int(np.prod(ksztalt, dtype=np.int64))
+            with open(self._plik(nazwa), 'r+b') as f:
+                # Śmieci po przerwanym zapisie (za końcem z manifestu) są nadpisywane
+                f.truncate(self.wiersze * rozmiar_wiersza)
+                f.seek(0, os.SEEK_END)
+                f.write(wartosci.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        manifest = dict(self.manifest, wiersze=self.wiersze + n)
+        if metadane:
+            manifest['metadane'] = dict(self.metadane, **metadane)
+        _zapisz_atomowo(os.path.join(self.katalog, PLIK_MANIFESTU), manifest)
+        self.manifest = manifest
+
+    def ustaw_metadane(self, **metadane):
+        manifest = dict(self.manifest, metadane=dict(self.metadane, **metadane))
+        _zapisz_atomowo(os.path.join(self.katalog, PLIK_MANIFESTU), manifest)
+        self.manifest = manifest
+
+    # --- Odczyt ---
+    def kolumna(self, nazwa, start=0, stop=None):
+        """Kolumna jako np.memmap (tylko do odczytu), opcjonalnie wycinek [start:stop)."""
+        dtype, ksztalt = self.opis(nazwa)
+        stop = self.wiersze if stop is None else min(stop, self.wiersze)
+        if stop <= start:
+            return np.empty((0,) + ksztalt, dtype=dtype)
+        rozmiar_wiersza = dtype.itemsize * int(np.prod(ksztalt, dtype=np.int64))
+        return np.memmap(self._plik(nazwa), dtype=dtype, mode='r',
+                         offset=start * rozmiar_wiersza, shape=(stop - start,) + ksztalt)
+
+    def fragmenty(self, nazwa, rozmiar=1_000_000):
+        """Kolejne wycinki kolumny - do obliczeń strumieniowych na dużych próbach."""
+        for start in range(0, self.wiersze, rozmiar):
+            yield self.kolumna(nazwa, start, start + rozmiar)
+
+    def do_dataframe(self, kolumny=None):
+        """Kolumny skalarne jako pandas.DataFrame (kopiowane do pamięci)."""
+        import pandas as pd
+        kolumny = kolumny or [k for k in self.kolumny if not self.opis(k)[1]]
+        return pd.DataFrame({k: np.asarray(self.kolumna(k)) for k in kolumny})
+
+
+def _zapisz_atomowo(sciezka, manifest):
+    tymczasowy = sciezka + ".tmp"
+    with open(tymczasowy, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tymczasowy, sciezka)
+
+
+# --- Słowa 256-bitowe ---
+def slowa_z_int(liczby):
+    """Lista intów Pythona (0 <= x < 2**256) -> tablica (n, 32) uint8 big-endian."""
+    bufor = b"".join(int(x).to_bytes(ROZMIAR_SLOWA, 'big') for x in liczby)
+    return np.frombuffer(bufor, dtype=np.uint8).reshape(-1, ROZMIAR_SLOWA)
+
+
+def slowa_na_int(slowa):
+    return [int.from_bytes(bytes(w), 'big') for w in slowa]
+
+
+def slowa_modulo(slowa, modul):
+    """uint256 mod m dla całej tablicy słów (n, 32) - schemat Hornera po bajtach."""
+    wynik = np.zeros(len(slowa), dtype=np.int64)
+    for i in range(ROZMIAR_SLOWA):
+        wynik = (wynik * 256 + slowa[:, i]) % modul
+    return wynik
+
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def slowa_na_hex(slowa):
+    """(n, 32) uint8 -> lista napisów '0x…' (64 cyfry hex), bez pętli po bajtach."""
+    znaki = np.empty((len(slowa), 2 * ROZMIAR_SLOWA), dtype=np.uint8)
+    znaki[:, 0::2] = _HEX[slowa >> 4]
+    znaki[:, 1::2] = _HEX[slowa & 0x0F]
+    return ["0x" + w.decode('ascii') for w in znaki.view(f"S{2 * ROZMIAR_SLOWA}").ravel()]
+
+
+_NIBBLE = np.zeros(256, dtype=np.uint8)
+_NIBBLE[np.frombuffer(b"0123456789abcdef", dtype=np.uint8)] = np.arange(16)
+_NIBBLE[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+_CYFRA_HEX = np.zeros(256, dtype=bool)
+_CYFRA_HEX[np.frombuffer(b"0123456789abcdefABCDEF", dtype=np.uint8)] = True
+
+
+def slowa_z_hex(napisy):
+    """Lista napisów hex (z '0x' albo bez, do 64 cyfr) -> (n, 32) uint8 big-endian.
+
+    Niepoprawne znaki -> ValueError (jak bytes.fromhex), nie ciche zera.
+    """
+    napisy = list(napisy)
+    # Typowy przypadek (topics, hashe, wycinki data) - pełne 64 cyfry: dekodowanie tablicowe
+    znaki = np.frombuffer("".join(napisy).encode('ascii'), dtype=np.uint8)
+    for prefiks in (2, 0):
+        szerokosc = prefiks + 2 * ROZMIAR_SLOWA
+        if len(znaki) == szerokosc * len(napisy):
+            wiersze = znaki.reshape(-1, szerokosc)
+            cyfry = wiersze[:, prefiks:]
+            poprawny_prefiks = not prefiks or (np.all(wiersze[:, 0] == ord('0'))
+                                               and np.all((wiersze[:, 1] | 0x20) == ord('x')))
+            # Inaczej (zły znak, mieszane długości) - ścieżka ogólna, która zgłosi błąd albo zdekoduje
+            if poprawny_prefiks and _CYFRA_HEX[cyfry].all():
+                return (_NIBBLE[cyfry[:, 0::2]] << 4) | _NIBBLE[cyfry[:, 1::2]]
+    pelne = [s[2:] if s[:2] in ('0x', '0X') else s for s in napisy]
+    tekst = "".join(s.rjust(2 * ROZMIAR_SLOWA, '0') for s in pelne)
+    return np.frombuffer(bytes.fromhex(tekst), dtype=np.uint8).reshape(-1, ROZMIAR_SLOWA)
@@ -0,0 +1,415 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from ingestia import BladRPC
+from zobowiazania import keccak256, zobowiazania
+
+# Generator obciążenia dla Randao / RandaoSlashing / VRFGame na lokalnym węźle (Hardhat albo anvil).
+#
+# check_scalability.ts wysyła commity po kolei (await na każdą transakcję) i ma tylko 18-20 kont.
+# Tutaj tysiące kont są zasilane przez hardhat_setBalance / anvil_setBalance i podszywane
+# (impersonateAccount), więc węzeł przyjmuje eth_sendTransaction bez podpisywania po stronie Pythona.
+# Nonce każdego nadawcy liczymy lokalnie; transakcje wychodzą współbieżnie ze stałym tempem (--tps)
+# przez pulę połączeń HTTP keep-alive. Osobne zadanie śledzi nowe bloki i mierzy opóźnienie
+# włączenia każdej transakcji do bloku oraz gaz na blok.
+#
+#   python obciazenie.py --scenariusz randao --konta 2000 --tps 200
+#   python obciazenie.py --scenariusz vrf --transakcje 5000 --tps 500 --interwal-bloku 1000
+#   python obciazenie.py --scenariusz slashing --kontrakt 0x...   # już wdrożony kontrakt
+
+KATALOG = os.path.dirname(os.path.abspath(__file__))
+KATALOG_ARTEFAKTOW = os.path.join(KATALOG, 'artifacts', 'contracts')
+
+ETH = 10 ** 18
+KEY_HASH = "474e34a077df58807dbe9c96d3c009b23b3c6d0cce433e59bbf5b34f823bc56c"  # jak w skryptach TS
+
+
+def selektor(sygnatura):
+    return "0x" + keccak256(sygnatura.encode()).hex()[:8]
+
+
+def slowo(wartosc):
+    """Argument ABI (uint256 / address / bytes32) jako 64 cyfry hex."""
+    if isinstance(wartosc, str):
+        return wartosc.lower().replace("0x", "").rjust(64, '0')
+    return format(wartosc, '064x')
+
+
+def wywolanie(sygnatura, *argumenty):
+    return selektor(sygnatura) + "".join(slowo(a) for a in argumenty)
+
+
+# --- 1. KLIENT JSON-RPC (asyncio, keep-alive) ---
+class AsyncKlientRPC:
+    """Minimalny klient HTTP/1.1 na asyncio z pulą stałych połączeń (bez zależności zewnętrznych)."""
+
+    def __init__(self, url, polaczenia=32):
+        czesci = urlsplit(url)
+        self.host = czesci.hostname
+        self.port = czesci.port or 80
+        self.sciezka = czesci.path or "/"
+        self.liczba_polaczen = polaczenia
+        self.wolne = asyncio.Queue()
+        self.utworzone = 0
+        self.licznik_id = 0
+
+    async def _polaczenie(self):
+        if self.wolne.empty() and self.utworzone < self.liczba_polaczen:
+            self.utworzone += 1
+            try:
+                return await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                self.utworzone -= 1
+                raise
+        return await self.wolne.get()
+
+    async def _http(self, cialo):
+        czytnik, pisarz = await self._polaczenie()
+        try:
+            pisarz.write(
+                f"POST {self.sciezka} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(cialo)}\r\n"
+                f"Connection: keep-alive\r\n\r\n".encode() + cialo
+            )
+            await pisarz.drain()
+
+            status = await czytnik.readline()
+            naglowki = {}
+            while True:
+                linia = await czytnik.readline()
+                if linia in (b"\r\n", b""):
+                    break
+                klucz, _, wartosc = linia.decode('latin-1').partition(":")
+                naglowki[klucz.strip().lower()] = wartosc.strip()
+
+            if naglowki.get('transfer-encoding') == 'chunked':
+                dane = b""
+                while True:
+                    rozmiar = int((await czytnik.readline()).strip(), 16)
+                    if rozmiar == 0:
+                        await czytnik.readline()
+                        break
+                    dane += await czytnik.readexactly(rozmiar)
+                    await czytnik.readline()
+            else:
+                dane = await czytnik.readexactly(int(naglowki.get('content-length', 0)))
+        except BaseException:
+            pisarz.close()
+            self.utworzone -= 1
+            raise
+
+        if naglowki.get('connection', '').lower() == 'close':
+            pisarz.close()
+            self.utworzone -= 1
+        else:
+            self.wolne.put_nowait((czytnik, pisarz))
+        if not status.split(b" ")[1].startswith(b"2"):
+            raise BladRPC(f"HTTP {status.decode().strip()}")
+        return json.loads(dane)
+
+    async def wywolaj(self, metoda, *parametry):
+        self.licznik_id += 1
+        odpowiedz = await self._http(json.dumps(
+            {'jsonrpc': '2.0', 'id': self.licznik_id, 'method': metoda, 'params': list(parametry)}
+        ).encode())
+        if 'error' in odpowiedz:
+            raise BladRPC(odpowiedz['error'])
+        return odpowiedz['result']
+
+    async def zamknij(self):
+        while not self.wolne.empty():
+            _, pisarz = self.wolne.get_nowait()
+            pisarz.close()
+
+
+# --- 2. KONTA I NONCE ---
+class Konta:
+    """Deterministyczne adresy testowe, zasilane i podszywane przez metody dev węzła."""
+
+    def __init__(self, klient, liczba, ziarno=2024):
+        self.klient = klient
+        self.adresy = ["0x" + keccak256(f"konto-obciazenia-{ziarno}-{i}".encode())[12:].hex() for i in range(liczba)]
+        self.nonce = {}
+        self.blokady = {}
+        self.prefiks = 'hardhat_'
+
+    async def przygotuj(self, saldo_eth=1000, rownolegle=64):
+        wersja = await self.klient.wywolaj('web3_clientVersion')
+        self.prefiks = 'anvil_' if 'anvil' in wersja.lower() else 'hardhat_'
+        limit = asyncio.Semaphore(rownolegle)
+
+        async def przygotuj_konto(adres):
+            async with limit:
+                await self.klient.wywolaj(self.prefiks + 'setBalance', adres, hex(saldo_eth * ETH))
+                await self.klient.wywolaj(self.prefiks + 'impersonateAccount', adres)
+                self.nonce[adres] = int(await self.klient.wywolaj('eth_getTransactionCount', adres, 'pending'), 16)
+                self.blokady[adres] = asyncio.Lock()
+
+        await asyncio.gather(*(przygotuj_konto(a) for a in self.adresy))
+        return wersja
+
+    async def wyslij(self, adres, tx):
+        # Blokada per nadawca: nonce rośnie w tej samej kolejności, w jakiej węzeł dostaje transakcje
+        async with self.blokady[adres]:
+            tx = dict(tx, **{'from': adres, 'nonce': hex(self.nonce[adres])})
+            try:
+                tx_hash = await self.klient.wywolaj('eth_sendTransaction', tx)
+            except BladRPC:
+                # Odrzucona (np. revert przy estymacji) mogła zużyć nonce albo nie - ustala to węzeł
+                self.nonce[adres] = int(await self.klient.wywolaj('eth_getTransactionCount', adres, 'pending'), 16)
+                raise
+            self.nonce[adres] += 1
+            return tx_hash
+
+
+# --- 3. POMIAR ---
+class Pomiar:
+    """Śledzi nowe bloki: czas włączenia każdej transakcji, gaz i liczba transakcji na blok."""
+
+    def __init__(self, klient, interwal=0.02):
+        self.klient = klient
+        self.interwal = interwal
+        self.wyslane = {}      # hash -> czas wysłania
+        self.wlaczone = {}     # hash -> czas zobaczenia bloku
+        self.bloki = []        # (numer, czas, gasUsed, liczba_tx)
+        self.bledy = []
+        self._stop = False
+
+    async def sledz_bloki(self, od_bloku):
+        nastepny = od_bloku
+        while not self._stop:
+            najnowszy = int(await self.klient.wywolaj('eth_blockNumber'), 16)
+            while nastepny <= najnowszy:
+                blok = await self.klient.wywolaj('eth_getBlockByNumber', hex(nastepny), False)
+                teraz = time.perf_counter()
+                for h in blok['transactions']:
+                    self.wlaczone.setdefault(h, teraz)
+                self.bloki.append((nastepny, teraz, int(blok['gasUsed'], 16), len(blok['transactions'])))
+                nastepny += 1
+            await asyncio.sleep(self.interwal)
+
+    def oczekujace(self, hashe=None):
+        hashe = self.wyslane if hashe is None else hashe
+        return [h for h in hashe if h not in self.wlaczone]
+
+    async def czekaj_na_wlaczenie(self, hashe, timeout=300):
+        koniec = time.perf_counter() + timeout
+        while self.oczekujace(hashe) and time.perf_counter() < koniec:
+            await asyncio.sleep(self.interwal)
+        return not self.oczekujace(hashe)
+
+    def zatrzymaj(self):
+        self._stop = True
+
+
+async def faza(nazwa, konta, pomiar, transakcje, tps, gaz):
+    """Wysyła listę (adres, tx) w tempie tps i czeka na włączenie wszystkich do bloków."""
+    start = time.perf_counter()
+    hashe = []
+
+    async def wyslij(i, adres, tx):
+        # Stałe tempo: transakcja i wychodzi w chwili start + i/tps (niezależnie od odpowiedzi węzła)
+        opoznienie = start + i / tps - time.perf_counter()
+        if opoznienie > 0:
+            await asyncio.sleep(opoznienie)
+        wyslano = time.perf_counter()
+        try:
+            tx_hash = await konta.wyslij(adres, dict(tx, gas=hex(gaz)))
+        except BladRPC as e:
+            pomiar.bledy.append((nazwa, str(e)))
+            return
+        pomiar.wyslane[tx_hash] = wyslano
+        hashe.append(tx_hash)
+
+    await asyncio.gather(*(wyslij(i, adres, tx) for i, (adres, tx) in enumerate(transakcje)))
+    czas_wysylania = time.perf_counter() - start
+    kompletne = await pomiar.czekaj_na_wlaczenie(hashe)
+    return podsumuj_faze(nazwa, pomiar, hashe, start, czas_wysylania, kompletne)
+
+
+def podsumuj_faze(nazwa, pomiar, hashe, start, czas_wysylania, kompletne):
+    wlaczone = [h for h in hashe if h in pomiar.wlaczone]
+    opoznienia = np.array([pomiar.wlaczone[h] - pomiar.wyslane[h] for h in wlaczone]) * 1000
+    koniec = max((pomiar.wlaczone[h] for h in wlaczone), default=start)
+    bloki = [b for b in pomiar.bloki if start <= b[1] <= koniec and b[3] > 0]
+    gaz = np.array([b[2] for b in bloki], dtype=float)
+    return {
+        'faza': nazwa,
+        'wyslane': len(hashe),
+        'wlaczone': len(wlaczone),
+        'bledy': sum(1 for f, _ in pomiar.bledy if f == nazwa),
+        'kompletne': kompletne,
+        'tps_wysylania': len(hashe) / czas_wysylania if czas_wysylania > 0 else float('nan'),
+        'tps_osiagniete': len(wlaczone) / (koniec - start) if koniec > start else float('nan'),
+        'opoznienie_p50_ms': float(np.percentile(opoznienia, 50)) if len(opoznienia) else float('nan'),
+        'opoznienie_p90_ms': float(np.percentile(opoznienia, 90)) if len(opoznienia) else float('nan'),
+        'opoznienie_p99_ms': float(np.percentile(opoznienia, 99)) if len(opoznienia) else float('nan'),
+        'bloki': len(bloki),
+        'gaz_na_blok_sr': float(gaz.mean()) if len(gaz) else 0.0,
+        'gaz_na_blok_max': float(gaz.max()) if len(gaz) else 0.0,
+        'tx_na_blok_sr': float(np.mean([b[3] for b in bloki])) if bloki else 0.0,
+    }
+
+
+# --- 4. WDRAŻANIE ---
+def bajtkod(nazwa):
+    sciezka = os.path.join(KATALOG_ARTEFAKTOW, f"{nazwa}.sol", f"{nazwa}.json")
+    if not os.path.exists(sciezka):
+        # Mocki Chainlinka są kompilowane przez MockImports.sol
+        for katalog, _, pliki in os.walk(os.path.join(KATALOG, 'artifacts')):
+            if f"{nazwa}.json" in pliki:
+                sciezka = os.path.join(katalog, f"{nazwa}.json")
+                break
+        else:
+            raise FileNotFoundError(f"Brak artefaktu {nazwa} - uruchom `npx hardhat compile`")
+    with open(sciezka, encoding='utf-8') as f:
+        return json.load(f)['bytecode']
+
+
+async def transakcja(klient, od, tx):
+    """Pojedyncza transakcja administracyjna - czeka na receipt."""
+    tx_hash = await klient.wywolaj('eth_sendTransaction', dict(tx, **{'from': od}))
+    while True:
+        receipt = await klient.wywolaj('eth_getTransactionReceipt', tx_hash)
+        if receipt is not None:
+            if int(receipt.get('status', '0x1'), 16) != 1:
+                raise BladRPC(f"Transakcja {tx_hash} odrzucona")
+            return receipt
+        await asyncio.sleep(0.05)
+
+
+async def wdroz(klient, od, nazwa, *argumenty):
+    receipt = await transakcja(klient, od, {'data': bajtkod(nazwa) + "".join(slowo(a) for a in argumenty),
+                                            'gas': hex(10_000_000)})
+    return receipt['contractAddress']
+
+
+async def wdroz_vrf(klient, od):
+    """Mock koordynatora + subskrypcja + VRFGame jako konsument (jak w generate_stats.ts)."""
+    mock = await wdroz(klient, od, 'VRFCoordinatorV2Mock', ETH // 10, 10 ** 9)
+    await transakcja(klient, od, {'to': mock, 'data': wywolanie('createSubscription()')})
+    await transakcja(klient, od, {'to': mock, 'data': wywolanie('fundSubscription(uint64,uint96)', 1, 10 ** 6 * ETH)})
+    gra = await wdroz(klient, od, 'VRFGame', 1, mock, KEY_HASH)
+    await transakcja(klient, od, {'to': mock, 'data': wywolanie('addConsumer(uint64,address)', 1, gra)})
+    return gra
+
+
+# --- 5. SCENARIUSZE ---
+async def scenariusz_runda(args, klient, konta, pomiar, admin, nazwa_kontraktu):
+    """Runda commit -> (startRevealPhase) -> reveal dla wszystkich kont."""
+    kontrakt = args.kontrakt or await wdroz(klient, admin, nazwa_kontraktu, args.wpisowe)
+    wpisowe = int(await klient.wywolaj('eth_call', {'to': kontrakt, 'data': wywolanie('entryFee()')}, 'latest'), 16)
+    print(f"Kontrakt {nazwa_kontraktu}: {kontrakt} (wpisowe {wpisowe} wei)")
+
+    rng = np.random.default_rng(args.ziarno)
+    sekrety = rng.integers(0, 256, size=(len(konta.adresy), 32), dtype=np.uint8)
+    hashe = zobowiazania(sekrety)  # wsadowo, zamiast keccaka per transakcja
+
+    commity = [(a, {'to': kontrakt, 'value': hex(wpisowe), 'data': selektor('commit(bytes32)') + bytes(h).hex()})
+               for a, h in zip(konta.adresy, hashe)]
+    wyniki = [await faza('commit', konta, pomiar, commity, args.tps, args.gaz)]
+
+    if nazwa_kontraktu == 'Randao':
+        await transakcja(klient, admin, {'to': kontrakt, 'data': wywolanie('startRevealPhase()')})
+
+    reveale = [(a, {'to': kontrakt, 'data': selektor('reveal(uint256)') + bytes(s).hex()})
+               for a, s in zip(konta.adresy, sekrety)]
+    wyniki.append(await faza('reveal', konta, pomiar, reveale, args.tps, args.gaz))
+
+    if nazwa_kontraktu == 'Randao':
+        receipt = await transakcja(klient, admin, {'to': kontrakt, 'data': wywolanie('getFinalRandom()'),
+                                                   'gas': hex(29_000_000)})
+        print(f"getFinalRandom() dla {len(konta.adresy)} graczy: {int(receipt['gasUsed'], 16):,} gas")
+    return wyniki
+
+
+async def scenariusz_vrf(args, klient, konta, pomiar, admin):
+    kontrakt = args.kontrakt or await wdroz_vrf(klient, admin)
+    print(f"Kontrakt VRFGame: {kontrakt}")
+    liczba = args.transakcje or len(konta.adresy)
+    gry = [(konta.adresy[i % len(konta.adresy)], {'to': kontrakt, 'data': wywolanie('play()')}) for i in range(liczba)]
+    return [await faza('play', konta, pomiar, gry, args.tps, args.gaz)]
+
+
+async def main_async(args):
+    klient = AsyncKlientRPC(args.rpc, args.polaczenia)
+    try:
+        konta = Konta(klient, args.konta, args.ziarno)
+        start = time.perf_counter()
+        wersja = await konta.przygotuj()
+        print(f"Węzeł: {wersja}; zasilono {len(konta.adresy):,} kont w {time.perf_counter() - start:.1f}s")
+
+        admin = (await klient.wywolaj('eth_accounts'))[0]
+        if args.interwal_bloku:
+            # Bloki co N ms zamiast automine - bliżej realnej sieci, kilka transakcji na blok
+            await klient.wywolaj('evm_setAutomine', False)
+            await klient.wywolaj('evm_setIntervalMining', args.interwal_bloku)
+
+        pomiar = Pomiar(klient)
+        sledzenie = asyncio.ensure_future(
+            pomiar.sledz_bloki(int(await klient.wywolaj('eth_blockNumber'), 16) + 1))
+        try:
+            if args.scenariusz == 'vrf':
+                wyniki = await scenariusz_vrf(args, klient, konta, pomiar, admin)
+            else:
+                nazwa = 'Randao' if args.scenariusz == 'randao' else 'RandaoSlashing'
+                wyniki = await scenariusz_runda(args, klient, konta, pomiar, admin, nazwa)
+        finally:
+            pomiar.zatrzymaj()
+            await sledzenie
+            if args.interwal_bloku:
+                await klient.wywolaj('evm_setAutomine', True)
+    finally:
+        await klient.zamknij()
+
+    wypisz(wyniki, pomiar)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'fazy': wyniki, 'bloki': pomiar.bloki}, f, indent=2)
+        print(f"\nZapisano: {args.json}")
+    return 0 if all(w['kompletne'] and not w['bledy'] for w in wyniki) else 1
+
+
+def wypisz(wyniki, pomiar):
+    print(f"\n{'Faza':8} {'Wysłane':>8} {'W bloku':>8} {'Błędy':>6} {'TPS wys.':>9} {'TPS':>8} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'Bloki':>6} {'Gaz/blok':>12} {'Tx/blok':>8}")
+    for w in wyniki:
+        print(f"{w['faza']:8} {w['wyslane']:8,} {w['wlaczone']:8,} {w['bledy']:6} {w['tps_wysylania']:9.1f} "
+              f"{w['tps_osiagniete']:8.1f} {w['opoznienie_p50_ms']:8.1f} {w['opoznienie_p90_ms']:8.1f} "
+              f"{w['opoznienie_p99_ms']:8.1f} {w['bloki']:6} {w['gaz_na_blok_sr']:12,.0f} {w['tx_na_blok_sr']:8.1f}")
+    for faza_bledu, blad in pomiar.bledy[:5]:
+        print(f"  ⚠️  {faza_bledu}: {blad}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator obciążenia commit/reveal/play dla lokalnego węzła")
+    parser.add_argument("--rpc", default=os.environ.get("HARDHAT_WEZEL_URL", "http://127.0.0.1:8545"))
+    parser.add_argument("--scenariusz", choices=["randao", "slashing", "vrf"], default="randao")
+    parser.add_argument("--kontrakt", help="adres wdrożonego kontraktu (domyślnie wdrażamy z artifacts/)")
+    parser.add_argument("--konta", type=int, default=1000, help="liczba kont (graczy)")
+    parser.add_argument("--transakcje", type=int, help="liczba wywołań play() (scenariusz vrf)")
+    parser.add_argument("--tps", type=float, default=100, help="docelowe tempo wysyłania [tx/s]")
+    parser.add_argument("--gaz", type=int, default=300_000, help="limit gazu na transakcję")
+    parser.add_argument("--wpisowe", type=int, default=10 ** 15, help="entryFee przy wdrożeniu [wei]")
+    parser.add_argument("--interwal-bloku", type=int, help="bloki co N ms (evm_setIntervalMining) zamiast automine")
+    parser.add_argument("--polaczenia", type=int, default=32, help="połączenia HTTP keep-alive")
+    parser.add_argument("--ziarno", type=int, default=2024)
+    parser.add_argument("--json", help="zapis wyników (fazy + bloki) do pliku JSON")
+    args = parser.parse_args()
+
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    except (OSError, BladRPC, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
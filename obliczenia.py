@@ -0,0 +1,267 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import rownolegle
+from leniwe import leniwy_import
+from szkice import SzkicKLL
+
+# Obliczenia stojące za zakładkami dashboardu (app.py) i raportem wsadowym (raport.py).
+# Moduł nie importuje streamlit ani matplotlib - same liczby, bez rysowania.
+
+# scipy ładujemy dopiero przy pierwszym teście (import scipy.stats to ~1 s startu)
+special = leniwy_import("scipy.special")
+
+WEI_PER_GWEI = 1e9
+WEI_PER_ETH = 1e18
+GWEI_PER_ETH = WEI_PER_ETH / WEI_PER_GWEI
+
+# Przykładowy stały koszt VRF używany w analizie skalowalności
+VRF_KOSZT_STALY = 150000
+
+
+# --- 1. DANE ---
+def wczytaj_dane(filename):
+    """Wczytuje plik CSV z wynikami. Zwraca None, jeśli pliku nie ma."""
+    if os.path.exists(filename):
+        return pd.read_csv(filename)
+    return None
+
+
+def ma_kolumne(df, kolumna):
+    """Czy DataFrame istnieje i zawiera wymaganą kolumnę."""
+    return df is not None and kolumna in df.columns
+
+
+# --- 2. KOSZTY (zakładki 1 i 2) ---
+def statystyki_kosztow(df_costs):
+    """Średnie koszty gazu RANDAO i VRF (request + callback) oraz różnica między nimi."""
+    avg_randao = df_costs['randao_total_gas'].mean()
+    avg_vrf_req = df_costs['vrf_request_gas'].mean()
+    avg_vrf_cb = df_costs['vrf_callback_gas'].mean()
+    avg_vrf = avg_vrf_req + avg_vrf_cb
+
+    diff_gas = avg_vrf - avg_randao
+    diff_pct = (diff_gas / avg_randao) * 100
+
+    return {
+        'avg_randao': avg_randao,
+        'avg_vrf_req': avg_vrf_req,
+        'avg_vrf_cb': avg_vrf_cb,
+        'avg_vrf': avg_vrf,
+        'diff_gas': diff_gas,
+        'diff_pct': diff_pct,
+        'zwyciezca': "RANDAO" if avg_randao < avg_vrf else "VRF",
+    }
+
+
+def koszt_w_eth(gas, gas_price_gwei):
+    """Przeliczenie zużycia gazu na ETH przy danej cenie gazu."""
+    return (gas * gas_price_gwei * WEI_PER_GWEI) / WEI_PER_ETH
+
+
+def koszty_w_eth(koszty, gas_price_gwei):
+    """Koszt RANDAO i VRF w ETH oraz różnica bezwzględna."""
+    cost_randao_eth = koszt_w_eth(koszty['avg_randao'], gas_price_gwei)
+    cost_vrf_eth = koszt_w_eth(koszty['avg_vrf'], gas_price_gwei)
+    return {
+        'randao_eth': cost_randao_eth,
+        'vrf_eth': cost_vrf_eth,
+        'roznica_eth': abs(cost_vrf_eth - cost_randao_eth),
+    }
+
+
+# --- 3. TESTY STATYSTYCZNE (zakładka 3) ---
+def chi_kwadrat(values, bins=10):
+    """Test Chi-kwadrat dla rozkładu jednostajnego"""
+    observed, _ = np.histogram(values, bins=bins, range=(0, 100))
+    expected = len(values) / bins
+
+    chi2_stat = np.sum((observed - expected)**2 / expected)
+    p_value = special.chdtrc(bins - 1, chi2_stat)  # = 1 - chi2.cdf
+
+    return chi2_stat, p_value
+
+
+def entropia_shannona(values):
+    """Entropia Shannona"""
+    value_counts = pd.Series(values).value_counts()
+    probabilities = value_counts / len(values)
+    entropy = -np.sum(probabilities * np.log2(probabilities))
+    return entropy
+
+
+def qq_jednostajny(values, punkty=200):
+    """Punkty Q-Q względem U(0,1) i prosta dopasowania - to samo co stats.probplot(dist="uniform").
+
+    Dla szkicu kwantylowego (szkice.SzkicKLL) bez sortowania próby: `punkty` kwantyli ze szkicu.
+    """
+    if isinstance(values, SzkicKLL):
+        osm = (np.arange(1, punkty + 1) - 0.5) / punkty
+        osr = values.kwantyle(osm)
+        slope, intercept = np.polyfit(osm, osr, 1)
+        return osm, osr, slope, intercept
+    n = len(values)
+    # Mediany statystyk pozycyjnych rozkładu jednostajnego (Filliben)
+    osm = np.empty(n)
+    osm[-1] = 0.5 ** (1.0 / n)
+    osm[0] = 1 - osm[-1]
+    osm[1:-1] = (np.arange(2, n) - 0.3175) / (n + 0.365)
+    osr = np.sort(values)
+    slope, intercept = np.polyfit(osm, osr, 1)
+    return osm, osr, slope, intercept
+
+
+def statystyki_opisowe(values):
+    return {
+        'srednia': values.mean(),
+        'odchylenie': values.std(),
+        'min': values.min(),
+        'max': values.max(),
+    }
+
+
+def analiza_statystyczna(df_stats, alfa=0.05):
+    """Komplet testów losowości dla kolumn randao_val i vrf_val (wartości 0-99)."""
+    wynik = {'max_entropia': np.log2(100)}  # Dla 100 możliwych wartości
+
+    # Duże próby: statystyki z puli procesów na pamięci współdzielonej (rownolegle.py) - ten sam wynik
+    kolumny = {nazwa: df_stats[f'{nazwa}_val'].values for nazwa in ['randao', 'vrf']}
+    duza = len(df_stats) >= rownolegle.PROG_WIELOPROCESOWY
+    bateria = rownolegle.bateria_kolumn(kolumny, zakres=100, kosze=10) if duza else {}
+
+    for nazwa, values in kolumny.items():
+        if duza:
+            b = bateria[nazwa]
+            chi2_stat, p_value, entropia = b['chi2'], b['p'], b['entropia']
+            obecne = np.flatnonzero(b['liczniki'])
+            opis = {'srednia': b['srednia'], 'odchylenie': b['odchylenie'] * np.sqrt((b['n'] - 1) / b['n']),
+                    'min': int(obecne[0]), 'max': int(obecne[-1])}
+        else:
+            chi2_stat, p_value = chi_kwadrat(values)
+            entropia, opis = entropia_shannona(values), statystyki_opisowe(values)
+        wynik[nazwa] = {
+            'wartosci': values,
+            'opis': opis,
+            'chi2': chi2_stat,
+            'p': p_value,
+            'zaliczony': p_value > alfa,
+            'entropia': entropia,
+        }
+    return wynik
+
+
+# --- 4. BEZPIECZEŃSTWO (zakładka 4) ---
+# % podatności (100 = max podatność)
+KATEGORIE_RYZYKA = ['Manipulacja\nużytkownika', 'Przewidywalność\nwyniku', 'Odporność na\ncenzurę', 'Zależność od\n3rd party']
+RYZYKO_RANDAO = [100, 30, 100, 0]
+RYZYKO_VRF = [0, 0, 50, 100]
+
+
+def ekonomia_ataku(pool_size, entry_fee, penalty_pct):
+    """Bilans ataku last revealer przy karze wyrażonej w % puli."""
+    penalty_eth = pool_size * (penalty_pct / 100)
+    attack_cost = entry_fee + penalty_eth
+    attack_profit = pool_size - attack_cost
+    return {
+        'kara_eth': penalty_eth,
+        'koszt': attack_cost,
+        'zysk': pool_size,
+        'profit': attack_profit,
+        'oplacalny': attack_profit > 0,
+    }
+
+
+# --- 5. SKALOWALNOŚĆ (zakładka 5) ---
+def analiza_skalowalnosci(df_scalability, vrf_const=VRF_KOSZT_STALY):
+    """Regresja liniowa kosztu getFinalRandom() i punkt przełamania względem stałego kosztu VRF."""
+    players = df_scalability['players'].values
+    gas_total = df_scalability['gas_total'].astype(float).values
+
+    wynik = {
+        'players': players,
+        'gas_total': gas_total,
+        'vrf_const': vrf_const,
+        'trend': None,
+        'breakeven': None,
+    }
+
+    if len(players) > 1:
+        # RANDAO: y = ax + b, VRF: y = const
+        a, b = np.polyfit(players, gas_total, 1)
+        wynik['trend'] = (a, b)
+        wynik['breakeven'] = (vrf_const - b) / a if a > 0 else float('inf')
+
+    return wynik
+
+
+def breakeven_w_zakresie(breakeven, limit=1000):
+    return breakeven is not None and 0 < breakeven < limit
+
+
+# --- 6. WNIOSKI (zakładka 6) ---
+TABELA_POROWNAWCZA = {
+    "Kryterium": [
+        "Bezpieczeństwo - manipulacja",
+        "Bezpieczeństwo - decentralizacja",
+        "Koszty (małe aplikacje)",
+        "Koszty (duże aplikacje)",
+        "Skalowalność",
+        "Przewidywalność kosztów",
+        "Łatwość implementacji",
+        "Właściwości statystyczne"
+    ],
+    "RANDAO": [
+        "⚠️ Wymaga slashing",
+        "✅ Pełna",
+        "✅ Niższe",
+        "⚠️ Rosną O(n)",
+        "⚠️ O(n)",
+        "⚠️ Zależne od n",
+        "⚠️ Średnia",
+        "✅ Rozkład jednostajny"
+    ],
+    "VRF": [
+        "✅ Wysoka",
+        "⚠️ Oracle dependency",
+        "⚠️ Wyższe",
+        "✅ Stałe",
+        "✅ O(1)",
+        "✅ Stałe",
+        "✅ Prosta (Chainlink)",
+        "✅ Rozkład jednostajny"
+    ],
+    "Zwycięzca": [
+        "VRF",
+        "RANDAO",
+        "RANDAO",
+        "VRF",
+        "VRF",
+        "VRF",
+        "VRF",
+        "Remis"
+    ]
+}
+
+KOLORY_ZWYCIEZCY = {
+    'RANDAO': '#d6eaf8',
+    'VRF': '#d5f4e6',
+    'Remis': '#fef9e7',
+}
+
+
+def tabela_porownawcza():
+    return pd.DataFrame(TABELA_POROWNAWCZA)
+
+
+def wnioski_kosztowe(df_costs):
+    """Zaokrąglone średnie do sekcji 'Wyniki badań'."""
+    koszty = statystyki_kosztow(df_costs)
+    avg_randao = int(koszty['avg_randao'])
+    avg_vrf = int(koszty['avg_vrf'])
+    return {
+        'avg_randao': avg_randao,
+        'avg_vrf': avg_vrf,
+        'diff_pct': (avg_vrf - avg_randao) / avg_randao * 100,
+    }
@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+# Asynchroniczny odpowiednik run_all.sh.
+#
+# run_all.sh uruchamia 6 testów Hardhat i 4 skrypty po kolei (wyjście do /dev/null),
+# a potem sprawdza, czy powstały pliki CSV. Tutaj niezależne etapy idą równolegle jako
+# podprocesy - każdy etap Hardhat dostaje własny węzeł `npx hardhat node` na osobnym
+# porcie - a etapy Pythona startują, gdy tylko gotowe są ich pliki wejściowe.
+# Czas całości ≈ czas najdłuższego etapu (Fairness / generate_stats).
+#
+#   python orkiestracja.py                   # cały pipeline
+#   python orkiestracja.py --json            # zdarzenia jako JSON lines (do CI)
+#   python orkiestracja.py --bez-wezlow      # sieć Hardhat in-process (też izolowana per proces)
+
+KATALOG = os.path.dirname(os.path.abspath(__file__))
+KATALOG_LOGOW = os.path.join(KATALOG, 'logi')
+
+# "Postęp: 100/500...", "Symulacja 3/20...", "Test dla 15 graczy" itp.
+WZORZEC_POSTEPU = re.compile(r'(\d+)\s*/\s*(\d+)')
+
+
+class Etap:
+    """Jeden krok pipeline'u: polecenie, pliki, które czyta, i pliki, które produkuje."""
+
+    def __init__(self, nazwa, polecenie, wejscia=(), wyjscia=(), hardhat=False):
+        self.nazwa = nazwa
+        self.polecenie = list(polecenie)
+        self.wejscia = list(wejscia)
+        self.wyjscia = list(wyjscia)
+        self.hardhat = hardhat  # czy potrzebuje sieci (węzła) Hardhat
+
+
+def hardhat_test(plik):
+    return Etap(f"test:{os.path.basename(plik)}", ["npx", "hardhat", "test", plik], hardhat=True)
+
+
+def hardhat_run(skrypt, wyjscia=()):
+    return Etap(f"run:{os.path.basename(skrypt)}", ["npx", "hardhat", "run", skrypt], wyjscia=wyjscia, hardhat=True)
+
+
+def python_etap(skrypt, wejscia=(), wyjscia=()):
+    return Etap(f"py:{skrypt}", [sys.executable, skrypt], wejscia=wejscia, wyjscia=wyjscia)
+
+
+# Te same kroki co w run_all.sh (3/6 - 6/6) + skrypty Pythona czytające wygenerowane CSV
+ETAPY = [
+    hardhat_test("test/Randao.test.ts"),
+    hardhat_test("test/VRFGame.test.ts"),
+    hardhat_test("test/Slashing.test.ts"),
+    hardhat_test("test/Fairness.test.ts"),
+    hardhat_test("test/SecurityComparison.test.ts"),
+    hardhat_test("test/EconomicAnalysis.test.ts"),
+
+    hardhat_run("scripts/attack_simulation.ts"),
+    hardhat_run("scripts/simulation.ts", wyjscia=["wyniki_badan.csv"]),
+    hardhat_run("scripts/generate_stats.ts", wyjscia=["dane_statystyczne.csv", "analiza_statystyczna_podsumowanie.txt"]),
+    hardhat_run("scripts/check_scalability.ts", wyjscia=["wyniki_skalowalnosc.csv"]),
+
+    python_etap("analiza_statystyczna_pro.py"),
+    python_etap("generuj_koszty_ekonomiczne.py", wyjscia=["tabela_koszty_2026_fix.png", "tabela_koszty_2026_fix.svg"]),
+    python_etap("generuj_wykres_ataku.py", wyjscia=["wykres_progu_ataku.png"]),
+    python_etap("generuj_wykres_fairness.py", wyjscia=["wykres_fairness.png"]),
+    python_etap("generuj_tabele.py", wejscia=["wyniki_badan.csv"],
+                wyjscia=["tabela_koszty.png", "tabela_koszty.svg", "tabela_slashing.png", "tabela_slashing.svg"]),
+    python_etap("generuj_tabele_pro.py", wejscia=["wyniki_badan.csv"],
+                wyjscia=["tabela_statystyka_pro.png", "tabela_statystyka_pro.svg",
+                         "tabela_zalacznik.png", "tabela_zalacznik.svg"]),
+    python_etap("analiza.py", wejscia=["wyniki_badan.csv"], wyjscia=["wykres_sredni_koszt.png", "wykres_stabilnosc.png"]),
+    python_etap("analiza_rozkladu.py", wejscia=["dane_statystyczne.csv"], wyjscia=["wykres_rozklad_entropia.png"]),
+    python_etap("generuj_tablice_loteria.py", wejscia=["wynik_loterii.txt"],
+                wyjscia=["tabela_loteria_final.png", "tabela_loteria_final.svg"]),
+    python_etap("projekcja_loterii.py", wejscia=["wynik_loterii.txt", "wyniki_skalowalnosc.csv"],
+                wyjscia=["projekcja_loterii.csv", "tabela_projekcja_loterii.png", "tabela_projekcja_loterii.svg",
+                         "wykres_projekcja_loterii.png", "wykres_prog_loterii.png"]),
+    python_etap("raport.py", wejscia=["wyniki_badan.csv", "dane_statystyczne.csv", "wyniki_skalowalnosc.csv"],
+                wyjscia=["raport.html"]),
+]
+
+
+# --- 1. ZDARZENIA ---
+class Zdarzenia:
+    """Strumień ustrukturyzowanych zdarzeń postępu (konsola albo JSON lines)."""
+
+    def __init__(self, tryb_json=False, gadatliwy=False):
+        self.tryb_json = tryb_json
+        self.gadatliwy = gadatliwy
+        self.start = time.monotonic()
+
+    def emituj(self, rodzaj, etap, **dane):
+        zdarzenie = {'t': round(time.monotonic() - self.start, 2), 'rodzaj': rodzaj, 'etap': etap, **dane}
+        if self.tryb_json:
+            print(json.dumps(zdarzenie, ensure_ascii=False), flush=True)
+            return
+        if rodzaj == 'linia' and not self.gadatliwy:
+            return
+        opis = " ".join(f"{k}={v}" for k, v in dane.items())
+        print(f"[{zdarzenie['t']:7.1f}s] {rodzaj:10} {etap:40} {opis}", flush=True)
+
+
+# --- 2. WĘZŁY HARDHAT ---
+class Wezly:
+    """Przydziela kolejne porty i uruchamia `npx hardhat node` dla etapów."""
+
+    def __init__(self, port_startowy):
+        self.nastepny_port = port_startowy
+
+    def przydziel_port(self):
+        port = self.nastepny_port
+        self.nastepny_port += 1
+        return port
+
+    async def uruchom(self, port, timeout=120):
+        proc = await asyncio.create_subprocess_exec(
+            *polecenie_systemowe(["npx", "hardhat", "node", "--port", str(port)]),
+            cwd=KATALOG, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        try:
+            await asyncio.wait_for(self._czekaj_na_start(proc), timeout)
+        except (asyncio.TimeoutError, RuntimeError):
+            await zakoncz(proc)
+            raise RuntimeError(f"Węzeł Hardhat na porcie {port} nie wystartował")
+
+        # Dalsze logi węzła trzeba czytać, żeby nie zapchać bufora rury
+        asyncio.ensure_future(self._odrzucaj(proc.stdout))
+        return proc
+
+    @staticmethod
+    async def _odrzucaj(strumien):
+        while await strumien.read(65536):
+            pass
+
+    @staticmethod
+    async def _czekaj_na_start(proc):
+        while True:
+            linia = await proc.stdout.readline()
+            if not linia:
+                raise RuntimeError("węzeł zakończył działanie")
+            if b"JSON-RPC server" in linia:
+                return
+
+
+def polecenie_systemowe(polecenie):
+    # Na Windows npx to npx.cmd - szukamy pełnej ścieżki
+    pelna = shutil.which(polecenie[0])
+    return [pelna or polecenie[0]] + polecenie[1:]
+
+
+async def zakoncz(proc):
+    if proc.returncode is None:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), 10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+
+# --- 3. ORKIESTRATOR ---
+class Orkiestrator:
+    def __init__(self, etapy, zdarzenia, rownolegle=None, ponowienia=1, wezly=None):
+        self.etapy = etapy
+        self.zdarzenia = zdarzenia
+        # Domyślnie bez limitu - etapy Hardhat większość czasu czekają na RPC węzła
+        self.limit = asyncio.Semaphore(rownolegle or len(etapy) or 1)
+        self.ponowienia = ponowienia
+        self.wezly = wezly
+
+        # Plik jest "gotowy", gdy zakończył się etap, który go produkuje.
+        # Pliki bez producenta w tym planie muszą już leżeć na dysku.
+        self.gotowe = {}
+        for etap in etapy:
+            for plik in etap.wyjscia:
+                self.gotowe[plik] = asyncio.Event()
+        self.wyniki = {}
+
+    async def _czekaj_na_wejscia(self, etap):
+        for plik in etap.wejscia:
+            if plik in self.gotowe:
+                await self.gotowe[plik].wait()
+            # Także po czekaniu: producent mógł zakończyć się błędem albo zostać pominięty bez zapisu pliku
+            if not os.path.exists(os.path.join(KATALOG, plik)):
+                raise FileNotFoundError(plik)
+
+    async def _uruchom_raz(self, etap, log):
+        env = dict(os.environ, MPLBACKEND="Agg", PYTHONUNBUFFERED="1")
+        polecenie = polecenie_systemowe(etap.polecenie)
+        wezel = None
+
+        if etap.hardhat and self.wezly is not None:
+            port = self.wezly.przydziel_port()
+            wezel = await self.wezly.uruchom(port)
+            polecenie += ["--network", "wezel"]
+            env["HARDHAT_WEZEL_URL"] = f"http://127.0.0.1:{port}"
+            self.zdarzenia.emituj('wezel', etap.nazwa, port=port)
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *polecenie, cwd=KATALOG, env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+            async for surowa in proc.stdout:
+                linia = surowa.decode('utf-8', errors='replace').rstrip()
+                log.write(linia + "\n")
+                self.zdarzenia.emituj('linia', etap.nazwa, tekst=linia)
+                dopasowanie = WZORZEC_POSTEPU.search(linia)
+                if dopasowanie and int(dopasowanie.group(2)) > 0:
+                    wykonano, razem = int(dopasowanie.group(1)), int(dopasowanie.group(2))
+                    if wykonano <= razem:
+                        self.zdarzenia.emituj('postep', etap.nazwa, wykonano=wykonano, razem=razem)
+            return await proc.wait()
+        finally:
+            if wezel is not None:
+                await zakoncz(wezel)
+
+    async def _uruchom_etap(self, etap):
+        try:
+            await self._czekaj_na_wejscia(etap)
+        except FileNotFoundError as e:
+            self.zdarzenia.emituj('pominiety', etap.nazwa, brak=str(e))
+            self.wyniki[etap.nazwa] = 'pominiety'
+            self._oznacz_wyjscia(etap)
+            return
+
+        os.makedirs(KATALOG_LOGOW, exist_ok=True)
+        nazwa_logu = re.sub(r'[^\w.-]', '_', etap.nazwa) + ".log"
+        sciezka_logu = os.path.join(KATALOG_LOGOW, nazwa_logu)
+
+        async with self.limit:
+            # Log czyszczony raz na uruchomienie; kolejne próby dopisują się, żeby zachować wyjście nieudanych
+            open(sciezka_logu, 'w', encoding='utf-8').close()
+            for proba in range(1, self.ponowienia + 2):
+                start = time.monotonic()
+                self.zdarzenia.emituj('start', etap.nazwa, proba=proba)
+                with open(sciezka_logu, 'a', encoding='utf-8') as log:
+                    log.write(f"=== próba {proba} ===\n")
+                    try:
+                        kod = await self._uruchom_raz(etap, log)
+                    except RuntimeError as e:
+                        log.write(f"{e}\n")
+                        kod = -1
+                czas = round(time.monotonic() - start, 1)
+
+                if kod == 0:
+                    self.zdarzenia.emituj('koniec', etap.nazwa, status='ok', czas_s=czas)
+                    self.wyniki[etap.nazwa] = 'ok'
+                    break
+                if proba <= self.ponowienia:
+                    self.zdarzenia.emituj('ponowienie', etap.nazwa, kod=kod, czas_s=czas)
+                    await asyncio.sleep(2 ** proba)
+                else:
+                    self.zdarzenia.emituj('koniec', etap.nazwa, status='blad', kod=kod, czas_s=czas,
+                                          log=os.path.join('logi', nazwa_logu))
+                    self.wyniki[etap.nazwa] = 'blad'
+
+        self._oznacz_wyjscia(etap)
+
+    def _oznacz_wyjscia(self, etap):
+        # Po błędzie też zwalniamy czekających - _czekaj_na_wejscia sprawdza, czy plik powstał
+        for plik in etap.wyjscia:
+            self.gotowe[plik].set()
+
+    async def uruchom(self):
+        await asyncio.gather(*(self._uruchom_etap(etap) for etap in self.etapy))
+        return self.wyniki
+
+
+async def kompiluj(zdarzenia):
+    # Kompilacja raz, przed równoległymi etapami (wspólny katalog artifacts/)
+    zdarzenia.emituj('start', 'compile')
+    proc = await asyncio.create_subprocess_exec(
+        *polecenie_systemowe(["npx", "hardhat", "compile"]), cwd=KATALOG,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    wyjscie, _ = await proc.communicate()
+    if proc.returncode != 0:
+        zdarzenia.emituj('koniec', 'compile', status='blad', kod=proc.returncode)
+        print(wyjscie.decode('utf-8', errors='replace'), file=sys.stderr)
+        return False
+    zdarzenia.emituj('koniec', 'compile', status='ok')
+    return True
+
+
+async def main_async(args):
+    zdarzenia = Zdarzenia(tryb_json=args.json, gadatliwy=args.gadatliwy)
+
+    etapy = ETAPY
+    if args.etapy:
+        etapy = [e for e in ETAPY if any(wzor in e.nazwa for wzor in args.etapy)]
+
+    if not args.bez_kompilacji and any(e.hardhat for e in etapy):
+        if not await kompiluj(zdarzenia):
+            return 1
+
+    wezly = None if args.bez_wezlow else Wezly(args.port)
+    orkiestrator = Orkiestrator(etapy, zdarzenia, args.rownolegle, args.ponowienia, wezly)
+    wyniki = await orkiestrator.uruchom()
+
+    bledy = [n for n, s in wyniki.items() if s == 'blad']
+    zdarzenia.emituj('podsumowanie', 'pipeline', ok=sum(s == 'ok' for s in wyniki.values()),
+                     bledy=len(bledy), pominiete=sum(s == 'pominiety' for s in wyniki.values()))
+    return 1 if bledy else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Równoległy pipeline: Hardhat -> dane -> wykresy")
+    parser.add_argument("--etapy", nargs="*", help="uruchom tylko etapy zawierające podane fragmenty nazw")
+    parser.add_argument("--rownolegle", type=int, help="maks. liczba równoległych etapów (domyślnie wszystkie)")
+    parser.add_argument("--ponowienia", type=int, default=1, help="ile razy ponowić nieudany etap")
+    parser.add_argument("--port", type=int, default=8600, help="pierwszy port dla węzłów Hardhat")
+    parser.add_argument("--bez-wezlow", action="store_true", help="bez `hardhat node` - sieć in-process")
+    parser.add_argument("--bez-kompilacji", action="store_true")
+    parser.add_argument("--json", action="store_true", help="zdarzenia jako JSON lines")
+    parser.add_argument("--gadatliwy", action="store_true", help="pokazuj też wyjście etapów")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
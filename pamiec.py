@@ -0,0 +1,389 @@
+import argparse
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+
+# Dyskowa pamięć wyników wspólna dla procesów: sesji dashboardu, skryptów CLI i zadań nocnych.
+#
+# st.cache_data trzyma wyniki w pamięci jednego procesu Streamlit, a każdy skrypt liczy od
+# zera. Tutaj wynik funkcji trafia do katalogu .pamiec/ pod kluczem SHA-256 z: nazwy funkcji,
+# jej wersji (podbijanej przy zmianie algorytmu) i argumentów - tablice i DataFrame po treści,
+# np.memmap tylko do odczytu po ścieżce, rozmiarze i mtime pliku oraz położeniu wycinka,
+# pliki wskazane w `pliki` po treści pliku (katalog magazynu po manifeście i rozmiarach kolumn).
+# Zapis atomowy (plik tymczasowy + os.replace), odczyt odświeża mtime, a po przekroczeniu
+# limitu rozmiaru usuwane są najdawniej używane wpisy (LRU). Plik blokady na klucz sprawia,
+# że dwóch użytkowników prosi o ten sam wynik, a liczy go tylko jeden - drugi czeka na zapis.
+# Blokada zawiera token właściciela i jest odświeżana w tle, dopóki trwa obliczenie, więc
+# przejmowana jest tylko po przerwanym procesie, a zdejmuje ją wyłącznie jej właściciel.
+#
+# Wpisy to pickle, czyli kod do wykonania przy odczycie: katalog jest tworzony jako 0700,
+# pliki jako 0600, a katalog cudzy albo zapisywalny dla innych jest ignorowany (liczymy bez pamięci).
+#
+#   @pamiec.zapamietaj(wersja=1, pliki=('zrodlo',), pomin=('procesy',))
+#   def entropia_kolumny(zrodlo, kolumna, ...): ...
+#
+#   python pamiec.py                 # statystyki pamięci
+#   python pamiec.py --przytnij 200  # zmniejsz do 200 MB
+#   python pamiec.py --wyczysc
+#
+# Zmienne środowiskowe: PAMIEC_KATALOG, PAMIEC_LIMIT_MB (domyślnie 1024), PAMIEC_WYLACZ=1.
+
+KATALOG = os.environ.get('PAMIEC_KATALOG') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pamiec')
+LIMIT_MB = float(os.environ.get('PAMIEC_LIMIT_MB', 1024))
+WYLACZONA = os.environ.get('PAMIEC_WYLACZ') == '1'
+CZAS_BLOKADY = 60         # s - blokada nieodświeżana dłużej to pozostałość po przerwanym procesie
+ODSWIEZANIE_BLOKADY = 10  # s - co tyle właściciel odświeża mtime blokady
+OKRES_CZEKANIA = 0.1      # s - odpytywanie, czy inny proces już zapisał wynik
+ROZSZERZENIE = '.pkl'
+BLOK = 1 << 24
+
+
+# --- 1. SKRÓTY ARGUMENTÓW ---
+_skroty_plikow = {}  # ścieżka -> (rozmiar, mtime, skrót) - duże pliki liczone raz na wersję
+
+
+def _skrot_pliku(sciezka):
+    st = os.stat(sciezka)
+    znany = _skroty_plikow.get(sciezka)
+    if znany and znany[:2] == (st.st_size, st.st_mtime_ns):
+        return znany[2]
+    h = hashlib.sha256()
+    with open(sciezka, 'rb') as f:
+        while blok := f.read(BLOK):
+            h.update(blok)
+    _skroty_plikow[sciezka] = (st.st_size, st.st_mtime_ns, h.hexdigest())
+    return h.hexdigest()
+
+
+def skrot_zrodla(sciezka):
+    """Treść pliku; dla katalogu (np. magazynu wyników) manifest + rozmiar i mtime pozostałych plików."""
+    sciezka = os.path.abspath(sciezka)
+    if not os.path.isdir(sciezka):
+        return _skrot_pliku(sciezka)
+    h = hashlib.sha256()
+    for nazwa in sorted(os.listdir(sciezka)):
+        pelna = os.path.join(sciezka, nazwa)
+        if nazwa.endswith('.json'):
+            h.update(f"{nazwa}:{_skrot_pliku(pelna)}".encode())
+        elif os.path.isfile(pelna):
+            # Kolumny magazynu mają dziesiątki GB - wystarczy, że dopisanie zmienia rozmiar i mtime
+            st = os.stat(pelna)
+            h.update(f"{nazwa}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def _aktualizuj(h, wartosc):
+    """Dopisuje do skrótu treść wartości (deterministycznie między procesami)."""
+    modul = type(wartosc).__module__
+    if wartosc is None or isinstance(wartosc, (bool, int, float, str, bytes)):
+        h.update(f"{type(wartosc).__name__}:{wartosc!r};".encode())
+    elif isinstance(wartosc, (list, tuple)):
+        h.update(f"{type(wartosc).__name__}[{len(wartosc)}];".encode())
+        for element in wartosc:
+            _aktualizuj(h, element)
+    elif isinstance(wartosc, dict):
+        h.update(f"dict[{len(wartosc)}];".encode())
+        for klucz in sorted(wartosc, key=repr):
+            _aktualizuj(h, klucz)
+            _aktualizuj(h, wartosc[klucz])
+    elif modul.startswith('numpy') and hasattr(wartosc, 'dtype') and hasattr(wartosc, 'shape'):
+        import numpy as np
+        if isinstance(wartosc, np.memmap) and (opis := _opis_memmap(wartosc)):
+            h.update(opis.encode())
+            return
+        tablica = np.ascontiguousarray(wartosc)
+        h.update(f"ndarray:{tablica.dtype.str}:{tablica.shape};".encode())
+        if tablica.dtype.hasobject:
+            h.update(pickle.dumps(tablica.tolist(), protocol=4))
+        else:
+            h.update(tablica.reshape(-1).view(np.uint8))  # bez kopii - także dla np.memmap
+    elif modul.startswith('pandas'):
+        import pandas as pd
+        h.update(f"{type(wartosc).__name__}:{list(getattr(wartosc, 'columns', [wartosc.name]))!r};".encode())
+        _aktualizuj(h, pd.util.hash_pandas_object(wartosc, index=True).to_numpy())
+    else:
+        h.update(pickle.dumps(wartosc, protocol=4))
+
+
+def _opis_memmap(tablica):
+    """Klucz np.memmap otwartego tylko do odczytu bez czytania danych (None = haszować treść).
+
+    Wycinek dzieli mapowanie z oryginałem, więc położenie w pliku liczymy z adresu danych
+    względem początku mapowania (numpy mapuje od offsetu wyrównanego do ALLOCATIONGRANULARITY).
+    """
+    import mmap
+    import numpy as np
+    if tablica.mode != 'r' or tablica._mmap is None or not tablica.filename:
+        return None
+    try:
+        st = os.stat(tablica.filename)
+    except OSError:
+        return None
+    poczatek = tablica.offset - tablica.offset % mmap.ALLOCATIONGRANULARITY
+    adres = tablica.__array_interface__['data'][0] - np.frombuffer(tablica._mmap, dtype=np.uint8).ctypes.data
+    return (f"memmap:{os.path.abspath(tablica.filename)}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}:"
+            f"{poczatek + adres}:{tablica.dtype.str}:{tablica.shape}:{tablica.strides};")
+
+
+def klucz(funkcja, wersja, argumenty, pliki=(), pomin=()):
+    h = hashlib.sha256(f"{funkcja.__module__}.{funkcja.__qualname__}:v{wersja};".encode())
+    for nazwa, wartosc in argumenty.items():
+        if nazwa in pomin:
+            continue
+        h.update(f"{nazwa}=".encode())
+        if nazwa in pliki and isinstance(wartosc, str) and os.path.exists(wartosc):
+            h.update(f"plik:{skrot_zrodla(wartosc)};".encode())
+        else:
+            _aktualizuj(h, wartosc)
+    return h.hexdigest()
+
+
+# --- 2. MAGAZYN NA DYSKU ---
+class Pamiec:
+    """Katalog z wynikami <kk>/<klucz>.pkl, przycinany do limitu bajtów wg czasu ostatniego użycia."""
+
+    def __init__(self, katalog=KATALOG, limit_mb=LIMIT_MB):
+        self.katalog = katalog
+        self.limit = int(limit_mb * 1024 * 1024)
+        self.trafienia = 0
+        self.chybienia = 0
+        self._zaufanie = None
+
+    def zaufany(self):
+        """Czy katalog jest nasz i niezapisywalny dla innych (tylko wtedy wolno czytać z niego pickle)."""
+        if self._zaufanie is None:
+            os.makedirs(self.katalog, mode=0o700, exist_ok=True)
+            st = os.stat(self.katalog)
+            wlasny = not hasattr(os, 'getuid') or st.st_uid == os.getuid()
+            self._zaufanie = wlasny and not st.st_mode & 0o022
+            if not self._zaufanie:
+                print(f"⚠️ Pamięć wyłączona: {self.katalog} należy do innego użytkownika "
+                      f"albo jest zapisywalny dla innych (chmod 700)", file=sys.stderr)
+        return self._zaufanie
+
+    def _sciezka(self, klucz):
+        return os.path.join(self.katalog, klucz[:2], klucz + ROZSZERZENIE)
+
+    def pobierz(self, klucz):
+        """-> (True, wartość) albo (False, None)."""
+        sciezka = self._sciezka(klucz)
+        try:
+            with open(sciezka, 'rb') as f:
+                wartosc = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+            # Uszkodzony wpis albo wynik klasy, której już nie ma - liczymy od nowa
+            self._usun(sciezka)
+            return False, None
+        try:
+            os.utime(sciezka)  # LRU: mtime = ostatnie użycie
+        except OSError:
+            pass
+        return True, wartosc
+
+    def zapisz(self, klucz, wartosc):
+        """False, gdy wyniku nie da się zserializować (wtedy po prostu nie trafia do pamięci)."""
+        try:
+            dane = pickle.dumps(wartosc, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        sciezka = self._sciezka(klucz)
+        os.makedirs(os.path.dirname(sciezka), mode=0o700, exist_ok=True)
+        tymczasowy = f"{sciezka}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tymczasowy, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+            f.write(dane)
+        os.replace(tymczasowy, sciezka)
+        self.przytnij()
+        return True
+
+    def pobierz_lub_oblicz(self, klucz, oblicz):
+        if not self.zaufany():
+            self.chybienia += 1
+            return oblicz()
+        while True:
+            jest, wartosc = self.pobierz(klucz)
+            if jest:
+                self.trafienia += 1
+                return wartosc
+            blokada = self._sciezka(klucz) + '.blokada'
+            token = self._zablokuj(blokada)
+            if token:
+                break
+            time.sleep(OKRES_CZEKANIA)  # ktoś inny właśnie to liczy
+
+        koniec = threading.Event()
+        threading.Thread(target=self._odswiezaj, args=(blokada, token, koniec), daemon=True).start()
+        try:
+            # Wynik mógł pojawić się między odczytem a założeniem blokady
+            jest, wartosc = self.pobierz(klucz)
+            if jest:
+                self.trafienia += 1
+                return wartosc
+            self.chybienia += 1
+            wartosc = oblicz()
+            self.zapisz(klucz, wartosc)
+            return wartosc
+        finally:
+            koniec.set()
+            self._odblokuj(blokada, token)
+
+    def _zablokuj(self, blokada):
+        """Token nowej blokady albo None, gdy trzyma ją ktoś inny (przeterminowaną zdejmuje)."""
+        os.makedirs(os.path.dirname(blokada), mode=0o700, exist_ok=True)
+        token = f"{os.getpid()}:{os.urandom(8).hex()}"
+        try:
+            fd = os.open(blokada, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            cudzy = self._token(blokada)
+            try:
+                if cudzy and time.time() - os.stat(blokada).st_mtime > CZAS_BLOKADY:
+                    self._odblokuj(blokada, cudzy)
+            except FileNotFoundError:
+                pass
+            return None
+        with os.fdopen(fd, 'w') as f:
+            f.write(token)
+        return token
+
+    @staticmethod
+    def _token(blokada):
+        try:
+            with open(blokada) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _odswiezaj(self, blokada, token, koniec):
+        """Wątek w tle: mtime blokady świeży, dopóki trwa obliczenie i blokada jest nasza."""
+        while not koniec.wait(ODSWIEZANIE_BLOKADY):
+            if self._token(blokada) != token:
+                return
+            try:
+                os.utime(blokada)
+            except FileNotFoundError:
+                return
+
+    def _odblokuj(self, blokada, token):
+        """Usuwa blokadę tylko wtedy, gdy nadal ma podany token."""
+        if self._token(blokada) == token:
+            self._usun(blokada)
+
+    @staticmethod
+    def _usun(sciezka):
+        try:
+            os.remove(sciezka)
+        except FileNotFoundError:
+            pass
+
+    def wpisy(self):
+        """-> [(mtime, rozmiar, ścieżka)] od najdawniej używanego."""
+        wynik = []
+        if not os.path.isdir(self.katalog):
+            return wynik
+        for podkatalog in os.scandir(self.katalog):
+            if not podkatalog.is_dir():
+                continue
+            for wpis in os.scandir(podkatalog.path):
+                if wpis.name.endswith(ROZSZERZENIE):
+                    try:
+                        st = wpis.stat()
+                    except FileNotFoundError:
+                        continue  # usunięty równolegle przez inny proces
+                    wynik.append((st.st_mtime, st.st_size, wpis.path))
+        return sorted(wynik)
+
+    def przytnij(self, limit=None):
+        """Usuwa najdawniej używane wpisy, aż całość zmieści się w limicie. -> liczba usuniętych."""
+        limit = self.limit if limit is None else limit
+        wpisy = self.wpisy()
+        razem = sum(rozmiar for _, rozmiar, _ in wpisy)
+        usuniete = 0
+        for _, rozmiar, sciezka in wpisy:
+            if razem <= limit:
+                break
+            self._usun(sciezka)
+            razem -= rozmiar
+            usuniete += 1
+        return usuniete
+
+    def wyczysc(self):
+        return self.przytnij(0)
+
+    def statystyki(self):
+        wpisy = self.wpisy()
+        return {
+            'katalog': self.katalog,
+            'wpisy': len(wpisy),
+            'rozmiar_mb': sum(r for _, r, _ in wpisy) / 1024 / 1024,
+            'limit_mb': self.limit / 1024 / 1024,
+            'trafienia': self.trafienia,
+            'chybienia': self.chybienia,
+        }
+
+
+_domyslna = None
+
+
+def domyslna():
+    global _domyslna
+    if _domyslna is None:
+        _domyslna = Pamiec()
+    return _domyslna
+
+
+# --- 3. DEKORATOR ---
+def zapamietaj(wersja=1, pliki=(), pomin=()):
+    """Wynik funkcji w pamięci dyskowej.
+
+    wersja - podbić przy każdej zmianie wyniku funkcji (stare wpisy wygasną przez LRU);
+    pliki  - argumenty będące ścieżkami: do klucza trafia treść pliku/katalogu, nie nazwa;
+    pomin  - argumenty, które nie wpływają na wynik (np. liczba procesów).
+    Oryginalna funkcja bez pamięci: f.bez_pamieci.
+    """
+    def dekorator(funkcja):
+        sygnatura = inspect.signature(funkcja)
+
+        @functools.wraps(funkcja)
+        def opakowanie(*args, **kwargs):
+            if WYLACZONA:
+                return funkcja(*args, **kwargs)
+            wiazanie = sygnatura.bind(*args, **kwargs)
+            wiazanie.apply_defaults()
+            k = klucz(funkcja, wersja, wiazanie.arguments, pliki, pomin)
+            return domyslna().pobierz_lub_oblicz(k, lambda: funkcja(*args, **kwargs))
+
+        opakowanie.bez_pamieci = funkcja
+        return opakowanie
+    return dekorator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dyskowa pamięć wyników (wspólna dla dashboardu i skryptów)")
+    parser.add_argument("--katalog", default=KATALOG)
+    parser.add_argument("--przytnij", type=float, metavar="MB", help="zmniejsz pamięć do podanego rozmiaru")
+    parser.add_argument("--wyczysc", action="store_true", help="usuń wszystkie wpisy")
+    args = parser.parse_args()
+
+    pamiec = Pamiec(args.katalog)
+    try:
+        if args.wyczysc:
+            print(f"Usunięto wpisów: {pamiec.wyczysc()}")
+        elif args.przytnij is not None:
+            print(f"Usunięto wpisów: {pamiec.przytnij(int(args.przytnij * 1024 * 1024))}")
+    except OSError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    s = pamiec.statystyki()
+    print(f"Katalog: {s['katalog']}")
+    print(f"Wpisy: {s['wpisy']}, rozmiar {s['rozmiar_mb']:.1f} MB z limitu {s['limit_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+import argparse
+import ast
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+
+from orkiestracja import ETAPY, KATALOG, Orkiestrator, Zdarzenia
+
+# Przyrostowa przebudowa artefaktów (PNG, HTML, txt) ze skryptów Pythona + tryb obserwacji.
+#
+# run_all.sh / orkiestracja.py uruchamiają wszystko od zera. Tutaj etapy Pythona z ETAPY
+# (pliki wejściowe -> skrypt -> artefakty) tworzą graf, uzupełniony o zależności od kodu:
+# sam skrypt i lokalne moduły, które importuje (także pośrednio). Skróty SHA-256 wejść
+# i wyjść z ostatniego udanego uruchomienia trafiają do .potok_stan.json, więc zadanie
+# rusza tylko wtedy, gdy zmieniła się TREŚĆ któregoś wejścia (samo `touch` nic nie robi)
+# albo jego wyjście zniknęło lub zostało nadpisane. Niezależne gałęzie idą równolegle.
+#
+#   python potok.py                        # przebuduj tylko to, co nieaktualne
+#   python potok.py --plan                 # pokaż, co by się uruchomiło i dlaczego
+#   python potok.py --obserwuj             # czekaj na zmiany plików i przebudowuj na bieżąco
+#   python potok.py --wymus analiza.py     # uruchom pasujące zadania mimo aktualności
+#   python potok.py --zadania tabele       # tylko zadania zawierające podane fragmenty nazw
+
+PLIK_STANU = os.path.join(KATALOG, '.potok_stan.json')
+OKRES_OBSERWACJI = 0.2  # s - zmiana wykryta i przebudowa wystartowana w < 0.5 s
+BLOK = 1 << 20
+
+
+# --- 1. GRAF ZADAŃ ---
+class Zadanie:
+    """Etap z orkiestracja.py + pliki z kodem, od których zależy jego wynik."""
+
+    def __init__(self, etap, kod):
+        self.etap = etap
+        self.kod = kod
+
+    @property
+    def nazwa(self):
+        return self.etap.nazwa
+
+    @property
+    def zrodla(self):
+        return self.etap.wejscia + [p for p in self.kod if p not in self.etap.wejscia]
+
+
+def zaleznosci_kodu(skrypt):
+    """Skrypt i lokalne moduły (*.py z katalogu projektu), które importuje - także pośrednio."""
+    wynik, do_odwiedzenia = [], [skrypt]
+    while do_odwiedzenia:
+        plik = do_odwiedzenia.pop()
+        if plik in wynik:
+            continue
+        wynik.append(plik)
+        with open(os.path.join(KATALOG, plik), encoding='utf-8') as f:
+            drzewo = ast.parse(f.read(), plik)
+        # ast.walk obejmuje też importy wewnątrz funkcji (leniwe ładowanie modułów)
+        for wezel in ast.walk(drzewo):
+            if isinstance(wezel, ast.Import):
+                nazwy = [alias.name for alias in wezel.names]
+            elif isinstance(wezel, ast.ImportFrom) and wezel.module and not wezel.level:
+                nazwy = [wezel.module]
+            else:
+                continue
+            for nazwa in nazwy:
+                modul = nazwa.split('.')[0] + '.py'
+                if os.path.exists(os.path.join(KATALOG, modul)):
+                    do_odwiedzenia.append(modul)
+    return sorted(wynik)
+
+
+def zbuduj_graf(etapy):
+    """Zadania dla etapów Pythona; sprawdza, czy każdy artefakt ma jednego producenta i brak cykli."""
+    zadania = []
+    producenci = {}
+    for etap in etapy:
+        if etap.hardhat:
+            continue  # pliki CSV z Hardhat są dla potoku danymi wejściowymi
+        skrypt = etap.polecenie[1]
+        zadania.append(Zadanie(etap, zaleznosci_kodu(skrypt)))
+        for plik in etap.wyjscia:
+            if plik in producenci:
+                raise ValueError(f"{plik} produkują dwa zadania: {producenci[plik]} i {etap.nazwa}")
+            producenci[plik] = etap.nazwa
+
+    # Cykl zawiesiłby Orkiestrator (zadania czekałyby na siebie nawzajem)
+    po_nazwie = {z.nazwa: z for z in zadania}
+    stan_odwiedzin = {}
+
+    def odwiedz(nazwa, sciezka):
+        if stan_odwiedzin.get(nazwa) == 'gotowe':
+            return
+        if stan_odwiedzin.get(nazwa) == 'w_toku':
+            raise ValueError("Cykl w grafie zadań: " + " -> ".join(sciezka + [nazwa]))
+        stan_odwiedzin[nazwa] = 'w_toku'
+        for plik in po_nazwie[nazwa].etap.wejscia:
+            if plik in producenci:
+                odwiedz(producenci[plik], sciezka + [nazwa])
+        stan_odwiedzin[nazwa] = 'gotowe'
+
+    for zadanie in zadania:
+        odwiedz(zadanie.nazwa, [])
+    return zadania
+
+
+def pliki_grafu(zadania):
+    pliki = []
+    for zadanie in zadania:
+        for plik in zadanie.zrodla + zadanie.etap.wyjscia:
+            if plik not in pliki:
+                pliki.append(plik)
+    return pliki
+
+
+# --- 2. SKRÓTY I STAN ---
+class Skroty:
+    """SHA-256 plików z pamięcią podręczną wg (rozmiar, mtime) - duże CSV liczone raz na wersję."""
+
+    def __init__(self, pamiec=None):
+        self.pamiec = pamiec or {}
+
+    def skrot(self, plik):
+        try:
+            st = os.stat(os.path.join(KATALOG, plik))
+        except FileNotFoundError:
+            return None
+        znany = self.pamiec.get(plik)
+        if znany and znany[0] == st.st_size and znany[1] == st.st_mtime_ns:
+            return znany[2]
+
+        h = hashlib.sha256()
+        with open(os.path.join(KATALOG, plik), 'rb') as f:
+            while blok := f.read(BLOK):
+                h.update(blok)
+        skrot = h.hexdigest()
+        self.pamiec[plik] = [st.st_size, st.st_mtime_ns, skrot]
+        return skrot
+
+
+def wczytaj_stan(sciezka=PLIK_STANU):
+    try:
+        with open(sciezka, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'zadania': {}, 'skroty': {}}
+
+
+def zapisz_stan(stan, sciezka=PLIK_STANU):
+    tymczasowy = sciezka + '.tmp'
+    with open(tymczasowy, 'w', encoding='utf-8') as f:
+        json.dump(stan, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tymczasowy, sciezka)
+
+
+def powod_przebudowy(zadanie, zapis, skroty):
+    """None, gdy artefakty zadania są aktualne; inaczej krótki opis przyczyny."""
+    if zapis is None:
+        return "brak historii"
+    for plik in zadanie.zrodla:
+        if skroty.skrot(plik) != zapis['wejscia'].get(plik):
+            return f"zmiana: {plik}"
+    for plik in zadanie.etap.wyjscia:
+        skrot = skroty.skrot(plik)
+        if skrot is None:
+            return f"brak: {plik}"
+        if skrot != zapis['wyjscia'].get(plik):
+            return f"nadpisano: {plik}"
+    return None
+
+
+# --- 3. PRZEBUDOWA ---
+class Przebudowa(Orkiestrator):
+    """Orkiestrator, który pomija aktualne zadania i zapisuje skróty po udanych uruchomieniach.
+
+    Nieaktualność sprawdzana jest dopiero po zakończeniu producentów wejść - jeśli przebudowany
+    artefakt wyszedł bajt w bajt taki sam, zadania dalej w grafie nie ruszają.
+    """
+
+    def __init__(self, zadania, stan, zdarzenia, rownolegle=None, wymus=()):
+        super().__init__([z.etap for z in zadania], zdarzenia, rownolegle or os.cpu_count(), ponowienia=0)
+        self.zadania = {z.nazwa: z for z in zadania}
+        self.stan = stan
+        self.skroty = Skroty(stan['skroty'])
+        self.wymus = wymus
+
+    async def _uruchom_etap(self, etap):
+        zadanie = self.zadania[etap.nazwa]
+        for plik in etap.wejscia:
+            if plik in self.gotowe:
+                await self.gotowe[plik].wait()
+
+        brak = [p for p in etap.wejscia if self.skroty.skrot(p) is None]
+        if brak:
+            self.zdarzenia.emituj('pominiety', etap.nazwa, brak=",".join(brak))
+            self.wyniki[etap.nazwa] = 'pominiety'
+            self._oznacz_wyjscia(etap)
+            return
+
+        zapis = self.stan['zadania'].get(etap.nazwa)
+        powod = powod_przebudowy(zadanie, zapis, self.skroty)
+        if powod is None and any(wzor in etap.nazwa for wzor in self.wymus):
+            powod = "wymuszone"
+        if powod is None:
+            self.zdarzenia.emituj('aktualny', etap.nazwa)
+            self.wyniki[etap.nazwa] = 'aktualny'
+            self._oznacz_wyjscia(etap)
+            return
+
+        # Skróty wejść sprzed uruchomienia - zmiana w trakcie wymusi kolejną przebudowę
+        wejscia = {p: self.skroty.skrot(p) for p in zadanie.zrodla}
+        self.zdarzenia.emituj('nieaktualny', etap.nazwa, powod=powod)
+        self.stan['zadania'].pop(etap.nazwa, None)
+        await super()._uruchom_etap(etap)
+        if self.wyniki[etap.nazwa] != 'ok':
+            return
+
+        wyjscia = {p: self.skroty.skrot(p) for p in etap.wyjscia}
+        brak = [p for p, s in wyjscia.items() if s is None]
+        if brak:
+            # Skrypt skończył się kodem 0, ale artefaktu nie ma (np. "Brak pliku ..." + exit())
+            self.zdarzenia.emituj('ostrzezenie', etap.nazwa, brak_wyjscia=",".join(brak))
+            return
+        self.stan['zadania'][etap.nazwa] = {'wejscia': wejscia, 'wyjscia': wyjscia}
+
+
+def przebuduj(zadania, stan, zdarzenia, rownolegle=None, wymus=()):
+    przebudowa = Przebudowa(zadania, stan, zdarzenia, rownolegle, wymus)
+    try:
+        wyniki = asyncio.run(przebudowa.uruchom())
+    finally:
+        zapisz_stan(stan)
+
+    licznik = {s: sum(w == s for w in wyniki.values()) for s in ('ok', 'aktualny', 'pominiety', 'blad')}
+    zdarzenia.emituj('podsumowanie', 'potok', **licznik)
+    return wyniki
+
+
+def plan(zadania, stan):
+    skroty = Skroty(stan['skroty'])
+    print(f"{'Zadanie':40} {'Status':14} Powód")
+    for zadanie in zadania:
+        brak = [p for p in zadanie.etap.wejscia if skroty.skrot(p) is None]
+        if brak:
+            print(f"{zadanie.nazwa:40} {'pominięte':14} brak: {', '.join(brak)}")
+            continue
+        powod = powod_przebudowy(zadanie, stan['zadania'].get(zadanie.nazwa), skroty)
+        print(f"{zadanie.nazwa:40} {'aktualne' if powod is None else 'do przebudowy':14} {powod or ''}")
+
+
+# --- 4. TRYB OBSERWACJI ---
+def migawka(pliki):
+    wynik = {}
+    for plik in pliki:
+        try:
+            st = os.stat(os.path.join(KATALOG, plik))
+            wynik[plik] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            wynik[plik] = None
+    return wynik
+
+
+def migawka_po_przebudowie(zadania, przed):
+    """Punkt odniesienia dla kolejnych zmian: źródła z migawki sprzed przebudowy, artefakty - po niej.
+
+    Edycja źródła w trakcie przebudowy różni się wtedy od `przed` i wywoła kolejną przebudowę;
+    artefakty zapisane przez samą przebudowę nie.
+    """
+    wyjscia = {p for z in zadania for p in z.etap.wyjscia}
+    po = migawka(pliki_grafu(zadania))
+    return {p: po[p] if p in wyjscia or p not in przed else przed[p] for p in po}
+
+
+def obserwuj(wybierz_zadania, stan, zdarzenia, rownolegle=None, okres=OKRES_OBSERWACJI):
+    """Odpytuje stat() obserwowanych plików; po zmianie przebudowuje zależne artefakty.
+
+    Zapis trwający dłużej niż okres (np. CSV dopisywany przez skrypt Hardhat) przeczekujemy:
+    przebudowa rusza, gdy rozmiar i mtime nie zmieniły się między dwoma odczytami.
+    """
+    zadania = wybierz_zadania()
+    pliki = pliki_grafu(zadania)
+    przed = migawka(pliki)
+    przebuduj(zadania, stan, zdarzenia, rownolegle)
+    poprzednia = migawka_po_przebudowie(zadania, przed)
+    zdarzenia.emituj('obserwacja', 'potok', pliki=len(pliki), okres_s=okres)
+
+    while True:
+        time.sleep(okres)
+        biezaca = migawka(pliki)
+        zmienione = [p for p in pliki if biezaca[p] != poprzednia[p]]
+        if not zmienione:
+            continue
+        time.sleep(okres)
+        if migawka(pliki) != biezaca:
+            continue  # zapis wciąż trwa - sprawdzimy w następnym obiegu
+
+        zdarzenia.emituj('zmiana', 'potok', pliki=",".join(zmienione))
+        try:
+            # Zmiana kodu mogła dodać lub usunąć import - graf budujemy od nowa
+            zadania = wybierz_zadania()
+        except (SyntaxError, ValueError) as e:
+            zdarzenia.emituj('blad_grafu', 'potok', opis=str(e))
+        else:
+            pliki = pliki_grafu(zadania)
+            biezaca = migawka(pliki)
+            przebuduj(zadania, stan, zdarzenia, rownolegle)
+        poprzednia = migawka_po_przebudowie(zadania, biezaca)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Przyrostowa przebudowa wykresów i tabel (graf zależności)")
+    parser.add_argument("--zadania", nargs="*", help="tylko zadania zawierające podane fragmenty nazw")
+    parser.add_argument("--wymus", nargs="*", default=[], help="uruchom pasujące zadania mimo aktualności")
+    parser.add_argument("--plan", action="store_true", help="tylko wypisz, co jest nieaktualne")
+    parser.add_argument("--obserwuj", action="store_true", help="przebudowuj po każdej zmianie plików")
+    parser.add_argument("--okres", type=float, default=OKRES_OBSERWACJI, help="okres odpytywania plików (s)")
+    parser.add_argument("--rownolegle", type=int, help="maks. liczba równoległych zadań (domyślnie liczba CPU)")
+    parser.add_argument("--json", action="store_true", help="zdarzenia jako JSON lines")
+    parser.add_argument("--gadatliwy", action="store_true", help="pokazuj też wyjście skryptów")
+    args = parser.parse_args()
+
+    def wybierz_zadania():
+        zadania = zbuduj_graf(ETAPY)
+        if args.zadania:
+            zadania = [z for z in zadania if any(wzor in z.nazwa for wzor in args.zadania)]
+        return zadania
+
+    try:
+        zadania = wybierz_zadania()
+    except (SyntaxError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    stan = wczytaj_stan()
+    if args.plan:
+        plan(zadania, stan)
+        return
+
+    zdarzenia = Zdarzenia(tryb_json=args.json, gadatliwy=args.gadatliwy)
+    if args.obserwuj:
+        try:
+            obserwuj(wybierz_zadania, stan, zdarzenia, args.rownolegle, args.okres)
+        except KeyboardInterrupt:
+            print("\nKoniec obserwacji.")
+        return
+
+    wyniki = przebuduj(zadania, stan, zdarzenia, args.rownolegle, args.wymus)
+    sys.exit(1 if any(s == 'blad' for s in wyniki.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
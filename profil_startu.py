@@ -0,0 +1,144 @@
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Profil zimnego startu wszystkich punktów wejścia (skryptów Pythona i dashboardu).
+# Każdy skrypt uruchamiamy w osobnym procesie z `-X importtime`, w katalogu tymczasowym
+# z kopią plików wejściowych (żeby nie nadpisywać PNG w repozytorium).
+#
+#   python profil_startu.py                  # tabela w konsoli
+#   python profil_startu.py atak_sybil.py potok.py
+#   python profil_startu.py --budzet 3.0     # kod wyjścia 1, jeśli któryś skrypt jest wolniejszy
+#   python profil_startu.py --csv profil_startu.csv
+
+KATALOG = os.path.dirname(os.path.abspath(__file__))
+
+PUNKTY_WEJSCIA = [
+    'analiza.py',
+    'analiza_rozkladu.py',
+    'analiza_statystyczna_pro.py',
+    'generuj_koszty_ekonomiczne.py',
+    'generuj_tabele.py',
+    'generuj_tabele_pro.py',
+    'generuj_tablice_loteria.py',
+    'generuj_wykres_ataku.py',
+    'generuj_wykres_fairness.py',
+    'raport.py',
+    'app.py',  # Streamlit w trybie "bare" - wykonuje cały skrypt bez serwera
+]
+
+# Narzędzia z argparse uruchamiamy z --help: mierzy to importy i parser bez symulacji ani połączenia z węzłem
+PUNKTY_WEJSCIA_CLI = [
+    'atak_ostatniego.py',
+    'atak_sybil.py',
+    'autokorelacja.py',
+    'entropia.py',
+    'generuj_probki.py',
+    'historia_gazu.py',
+    'ingestia.py',
+    'kolejka_vrf.py',
+    'kolizje.py',
+    'obciazenie.py',
+    'orkiestracja.py',
+    'pamiec.py',
+    'potok.py',
+    'profiler_gazu.py',
+    'projekcja_loterii.py',
+    'rownolegle.py',
+    'sekwencyjne.py',
+    'symulacja_slashing.py',
+    'szkice.py',
+    'tabele.py',
+    'wrazliwosc.py',
+    'zobowiazania.py',
+]
+
+PLIKI_WEJSCIOWE = ['wyniki_badan.csv', 'dane_statystyczne.csv', 'wyniki_skalowalnosc.csv', 'wynik_loterii.txt']
+
+
+def parsuj_importtime(stderr):
+    """Zwraca (łączny czas importów [s], {pakiet najwyższego poziomu: czas [s]})."""
+    pakiety = {}
+    for linia in stderr.splitlines():
+        if not linia.startswith("import time:") or "cumulative" in linia:
+            continue
+        try:
+            _, cumulative, nazwa = linia[len("import time:"):].split("|")
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue
+        # Moduły zagnieżdżone mają wcięcie - liczymy tylko poziom najwyższy
+        if not nazwa.startswith("  "):
+            pakiety[nazwa.strip()] = pakiety.get(nazwa.strip(), 0) + cumulative_us / 1e6
+    return sum(pakiety.values()), pakiety
+
+
+def profiluj(skrypt, katalog_roboczy, powtorzenia=1):
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONDONTWRITEBYTECODE="1")
+    env["PYTHONPATH"] = KATALOG + os.pathsep + env.get("PYTHONPATH", "")
+
+    czasy = []
+    for _ in range(powtorzenia):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.join(KATALOG, skrypt)]
+            + (["--help"] if skrypt in PUNKTY_WEJSCIA_CLI else []),
+            cwd=katalog_roboczy, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL
+        )
+        czasy.append(time.perf_counter() - start)
+
+    import_s, pakiety = parsuj_importtime(proc.stderr)
+    najciezsze = sorted(pakiety.items(), key=lambda kv: -kv[1])[:3]
+    return {
+        'skrypt': skrypt,
+        'czas_s': min(czasy),
+        'importy_s': import_s,
+        'najciezsze': ", ".join(f"{n} {t:.2f}s" for n, t in najciezsze),
+        'kod': proc.returncode,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pomiar czasu zimnego startu skryptów")
+    parser.add_argument("skrypty", nargs="*", help="domyślnie wszystkie punkty wejścia")
+    parser.add_argument("--powtorzenia", type=int, default=1, help="bierzemy najlepszy z N pomiarów")
+    parser.add_argument("--budzet", type=float, help="maksymalny czas [s] na skrypt")
+    parser.add_argument("--csv", help="zapis wyników do pliku CSV")
+    args = parser.parse_args()
+
+    skrypty = args.skrypty or PUNKTY_WEJSCIA + PUNKTY_WEJSCIA_CLI
+    wyniki = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for plik in PLIKI_WEJSCIOWE + ['wykres_progu_ataku.png']:
+            if os.path.exists(os.path.join(KATALOG, plik)):
+                shutil.copy(os.path.join(KATALOG, plik), tmp)
+
+        print(f"{'Skrypt':32} {'Czas':>7} {'Importy':>8}  Najcięższe importy")
+        for skrypt in skrypty:
+            w = profiluj(skrypt, tmp, args.powtorzenia)
+            wyniki.append(w)
+            blad = "" if w['kod'] == 0 else f"  (kod wyjścia {w['kod']})"
+            print(f"{skrypt:32} {w['czas_s']:6.2f}s {w['importy_s']:7.2f}s  {w['najciezsze']}{blad}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(wyniki[0].keys()))
+            writer.writeheader()
+            writer.writerows(wyniki)
+        print(f"\nZapisano: {args.csv}")
+
+    if args.budzet is not None:
+        przekroczone = [w['skrypt'] for w in wyniki if w['czas_s'] > args.budzet]
+        if przekroczone:
+            print(f"\n❌ Przekroczony budżet {args.budzet:.2f}s: {', '.join(przekroczone)}")
+            sys.exit(1)
+        print(f"\n✅ Wszystkie skrypty w budżecie {args.budzet:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
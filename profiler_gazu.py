@@ -0,0 +1,379 @@
+import argparse
+import bisect
+import codecs
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+import pandas as pd
+
+from ingestia import BladRPC, KlientRPC
+
+# Profiler gazu na podstawie debug_traceTransaction z lokalnego węzła (Hardhat / anvil).
+#
+# Do tej pory mamy tylko gasUsed całej transakcji (wyniki_badan.csv, wyniki_skalowalnosc.csv)
+# i średnie z gas-reportera. Tu węzeł odtwarza transakcję krok po kroku, a profiler rozkłada gaz na:
+#   - opkody (SLOAD, SSTORE, XOR, KECCAK256...),
+#   - sloty storage - klucze mapowań (participants[gracz]) odtwarzane z argumentów KECCAK256 (--pamiec),
+#   - linie źródła .sol - przez sourceMap z artifacts/build-info (kod kontraktu dopasowany po eth_getCode).
+#
+# structLogs dla pętli po wszystkich graczach potrafią mieć setki MB, więc odpowiedź jest czytana
+# strumieniowo (requests stream=True) i parsowana krok po kroku - w pamięci jest tylko bieżący krok
+# i stos ramek wywołań. Gaz kroku = różnica `gas` względem następnego kroku na tej samej głębokości;
+# dla CALL/CREATE odejmujemy gaz zużyty w wywołanym kodzie, więc sumy się nie dublują.
+#
+#   python profiler_gazu.py --tx 0xabc...                          # http://127.0.0.1:8545
+#   python profiler_gazu.py --blok 12 --pamiec --top 20            # wszystkie transakcje bloku
+#   python profiler_gazu.py --tx 0xabc... --csv profil             # profil_opkody.csv, profil_sloty.csv, profil_linie.csv
+
+OPKODY_WYWOLAN = {'CALL', 'CALLCODE', 'DELEGATECALL', 'STATICCALL'}
+OPKODY_STORAGE = {'SLOAD', 'SSTORE'}
+ROZMIAR_PORCJI = 1 << 20
+MALE_SLOTY = 1 << 16  # sloty zmiennych stanu; większe to zwykle skróty keccak (mapowania, tablice)
+
+
+# --- 1. STRUMIENIOWY PARSER structLogs ---
+def kroki_strumieniowo(porcje):
+    """Kolejne obiekty z tablicy "structLogs" odpowiedzi JSON-RPC, bez wczytywania całości.
+
+    porcje - iterator bajtów (np. Response.iter_content). Błąd RPC zgłaszany jako BladRPC.
+    """
+    dekoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    bufor, poz, w_tablicy = "", 0, False
+    porcje = iter(porcje)
+    koniec_danych = False
+
+    def dociagnij():
+        nonlocal bufor, poz, koniec_danych
+        try:
+            bufor = bufor[poz:] + utf8.decode(next(porcje))
+            poz = 0
+        except StopIteration:
+            bufor = bufor[poz:] + utf8.decode(b"", final=True)
+            poz = 0
+            koniec_danych = True
+
+    while not w_tablicy:
+        i = bufor.find('"structLogs"')
+        if i >= 0:
+            j = bufor.find('[', i)
+            if j >= 0:
+                poz, w_tablicy = j + 1, True
+                break
+        if koniec_danych:
+            odpowiedz = json.loads(bufor) if bufor.strip() else {}
+            raise BladRPC(odpowiedz.get('error', 'brak structLogs w odpowiedzi'))
+        dociagnij()
+
+    while True:
+        while poz < len(bufor) and bufor[poz] in ' \t\r\n,':
+            poz += 1
+        if poz < len(bufor) and bufor[poz] == ']':
+            return
+        try:
+            krok, nowa_poz = dekoder.raw_decode(bufor, poz)
+        except json.JSONDecodeError:
+            if koniec_danych:
+                raise BladRPC("urwana odpowiedź debug_traceTransaction")
+            dociagnij()
+            continue
+        poz = nowa_poz
+        yield krok
+
+
+def sledz(klient, tx, pamiec=False):
+    """Strumień kroków debug_traceTransaction (stos zawsze, pamięć tylko z --pamiec, bez storage)."""
+    opcje = {'disableStorage': True, 'disableStack': False,
+             'disableMemory': not pamiec, 'enableMemory': pamiec}
+    cialo = {'jsonrpc': '2.0', 'id': 1, 'method': 'debug_traceTransaction', 'params': [tx, opcje]}
+    with klient.sesja.post(klient.url, json=cialo, timeout=klient.timeout, stream=True) as odpowiedz:
+        odpowiedz.raise_for_status()
+        yield from kroki_strumieniowo(odpowiedz.iter_content(ROZMIAR_PORCJI))
+
+
+# --- 2. MAPY ŹRÓDEŁ (artifacts/build-info) ---
+def _bez_metadanych(kod):
+    """Bajtkod bez końcowych metadanych CBOR (długość w ostatnich 2 bajtach)."""
+    if len(kod) < 2:
+        return kod
+    dlugosc = int.from_bytes(kod[-2:], 'big') + 2
+    return kod[:-dlugosc] if dlugosc <= len(kod) else kod
+
+
+def _indeksy_instrukcji(kod):
+    """pc -> numer instrukcji (PUSH1..PUSH32 mają dane inline)."""
+    indeksy, pc, n = {}, 0, 0
+    while pc < len(kod):
+        indeksy[pc] = n
+        op = kod[pc]
+        pc += 1 + (op - 0x5f if 0x60 <= op <= 0x7f else 0)
+        n += 1
+    return indeksy
+
+
+def _rozwin_mape(mapa):
+    """Skompresowany sourceMap solc (s:l:f:j;...) -> lista (start, dlugosc, plik)."""
+    wpisy, poprzedni = [], [-1, -1, -1]
+    for wpis in mapa.split(';'):
+        pola = wpis.split(':')
+        for k in range(3):
+            if k < len(pola) and pola[k] != '':
+                poprzedni[k] = int(pola[k])
+        wpisy.append(tuple(poprzedni))
+    return wpisy
+
+
+class MapyZrodel:
+    """Kontrakty z artifacts/build-info: dopasowanie bajtkodu i pc -> (plik, linia)."""
+
+    def __init__(self, katalog="artifacts/build-info"):
+        self.kontrakty = []  # (nazwa, kod bez metadanych, mapa, id->plik)
+        self.linie = {}      # plik -> (początki linii w bajtach, treść linii)
+        for sciezka in sorted(glob.glob(os.path.join(katalog, "*.json"))):
+            with open(sciezka) as f:
+                info = json.load(f)
+            pliki = {zrodlo['id']: plik for plik, zrodlo in info['output'].get('sources', {}).items()}
+            for plik, zrodlo in info['input']['sources'].items():
+                tresc = zrodlo.get('content', '').encode()
+                poczatki = [0] + [i + 1 for i, b in enumerate(tresc) if b == 0x0a]
+                self.linie[plik] = (poczatki, tresc.split(b'\n'))
+            for plik, kontrakty in info['output'].get('contracts', {}).items():
+                for nazwa, dane in kontrakty.items():
+                    wdrozony = dane.get('evm', {}).get('deployedBytecode', {})
+                    if wdrozony.get('object') and wdrozony.get('sourceMap'):
+                        kod = bytes.fromhex(wdrozony['object'])
+                        self.kontrakty.append((f"{plik}:{nazwa}", _bez_metadanych(kod), wdrozony['sourceMap'], pliki))
+        self._pamiec = {}
+
+    def dla_kodu(self, kod):
+        """Funkcja pc -> (plik, linia) albo None, jeśli kod nie pasuje do żadnego artefaktu."""
+        klucz = _bez_metadanych(kod)
+        if klucz in self._pamiec:
+            return self._pamiec[klucz]
+        wynik = None
+        for nazwa, wzor, mapa, pliki in self.kontrakty:
+            # immutables podmieniają fragmenty kodu - wystarcza zgodna długość i większość bajtów
+            if len(wzor) == len(klucz) and (wzor == klucz or sum(a == b for a, b in zip(wzor, klucz)) > 0.95 * len(wzor)):
+                wynik = self._odwzorowanie(nazwa, kod, mapa, pliki)
+                break
+        self._pamiec[klucz] = wynik
+        return wynik
+
+    def _odwzorowanie(self, nazwa, kod, mapa, pliki):
+        indeksy = _indeksy_instrukcji(kod)
+        wpisy = _rozwin_mape(mapa)
+        linie = self.linie
+
+        def linia(pc):
+            n = indeksy.get(pc)
+            if n is None or n >= len(wpisy):
+                return (nazwa, None, '')
+            start, _, plik_id = wpisy[n]
+            plik = pliki.get(plik_id)
+            if plik not in linie or start < 0:
+                return (nazwa, None, '(kod generowany przez kompilator)')
+            poczatki, tresc = linie[plik]
+            nr = bisect.bisect_right(poczatki, start)
+            return (plik, nr, tresc[nr - 1].decode(errors='replace').strip()[:80])
+        return linia
+
+
+# --- 3. AGREGACJA ---
+def _liczba(hex_str):
+    return int(hex_str, 16) if hex_str else 0
+
+
+class Profil:
+    """Sumy gazu po opkodach, slotach i liniach dla jednej lub wielu transakcji."""
+
+    def __init__(self, klient=None, mapy=None):
+        self.klient = klient
+        self.mapy = mapy
+        self.opkody = defaultdict(lambda: [0, 0])
+        self.sloty = defaultdict(lambda: [0, 0])
+        self.linie = defaultdict(lambda: [0, 0])
+        self.skroty = {}        # keccak -> opis (mapping / tablica)
+        self.kody = {}          # adres -> funkcja pc -> linia
+        self.gaz_evm = 0
+        self.gaz_transakcji = 0
+        self.kroki = 0
+
+    def _linia_dla(self, adres):
+        if self.mapy is None or adres is None:
+            return None
+        if adres not in self.kody:
+            kod = self.klient.wywolaj('eth_getCode', [adres, 'latest'])
+            self.kody[adres] = self.mapy.dla_kodu(bytes.fromhex(kod[2:])) if kod and kod != '0x' else None
+        return self.kody[adres]
+
+    def _opis_slotu(self, slot):
+        if slot < MALE_SLOTY:
+            return f"slot {slot}"
+        for przesuniecie in range(32):
+            baza = self.skroty.get(slot - przesuniecie)
+            if baza:
+                return baza if przesuniecie == 0 else f"{baza} +{przesuniecie}"
+        return f"0x{slot:064x}"[:18] + "…"
+
+    def _przypisz(self, krok, gaz, adres_kodu, adres_storage):
+        op = krok['op']
+        self.opkody[op][0] += 1
+        self.opkody[op][1] += gaz
+        if op in OPKODY_STORAGE and krok.get('stack'):
+            slot = _liczba(krok['stack'][-1])
+            wpis = self.sloty[(adres_storage, self._opis_slotu(slot), op)]
+            wpis[0] += 1
+            wpis[1] += gaz
+        linia = self._linia_dla(adres_kodu)
+        if linia:
+            wpis = self.linie[linia(krok['pc'])]
+            wpis[0] += 1
+            wpis[1] += gaz
+        self.gaz_evm += gaz
+
+    def dodaj_transakcje(self, kroki, adres, gaz_uzyty=0):
+        """kroki - strumień structLogs; adres - `to` transakcji (wywoływany kontrakt)."""
+        self.gaz_transakcji += gaz_uzyty
+        ramki = []                      # [krok wywołania, suma gazu w środku]
+        kod = {1: adres}
+        storage = {1: adres}
+        poprzedni = None
+        skrot_w_toku = None
+        for krok in kroki:
+            self.kroki += 1
+            if skrot_w_toku is not None and krok.get('stack'):
+                self.skroty[_liczba(krok['stack'][-1])] = skrot_w_toku
+                skrot_w_toku = None
+
+            if poprzedni is not None:
+                d, dp = krok['depth'], poprzedni['depth']
+                if d == dp:
+                    self._krok_na_glebokosci(poprzedni, poprzedni['gas'] - krok['gas'], kod, storage, ramki)
+                elif d > dp:
+                    # Wejście do wywołania: koszt CALL znany dopiero po powrocie
+                    stos = poprzedni.get('stack') or []
+                    if poprzedni['op'] in OPKODY_WYWOLAN and len(stos) >= 2:
+                        cel = "0x" + f"{_liczba(stos[-2]):040x}"[-40:]
+                        kod[d] = cel
+                        storage[d] = storage[dp] if poprzedni['op'] in ('DELEGATECALL', 'CALLCODE') else cel
+                    else:
+                        kod[d] = storage[d] = None  # CREATE - kod inicjalizujący bez mapy źródeł
+                    ramki.append([poprzedni, 0])
+                else:
+                    self._krok_na_glebokosci(poprzedni, poprzedni.get('gasCost', 0), kod, storage, ramki)
+                    wywolanie, w_srodku = ramki.pop()
+                    calosc = wywolanie['gas'] - krok['gas']
+                    if ramki:
+                        ramki[-1][1] += w_srodku
+                    self._krok_na_glebokosci(wywolanie, max(calosc - w_srodku, 0), kod, storage, ramki)
+
+            if krok['op'] in ('KECCAK256', 'SHA3'):
+                skrot_w_toku = self._preobraz(krok, storage.get(krok['depth']))
+            poprzedni = krok
+
+        if poprzedni is not None:
+            self._krok_na_glebokosci(poprzedni, poprzedni.get('gasCost', 0), kod, storage, ramki)
+
+    def _krok_na_glebokosci(self, krok, gaz, kod, storage, ramki):
+        d = krok['depth']
+        self._przypisz(krok, gaz, kod.get(d), storage.get(d))
+        if ramki:
+            ramki[-1][1] += gaz
+
+    def _preobraz(self, krok, adres):
+        """Opis slotu liczonego przez keccak(klucz . slot) (mapping) albo keccak(slot) (tablica)."""
+        pamiec, stos = krok.get('memory'), krok.get('stack') or []
+        if not pamiec or len(stos) < 2:
+            return None
+        przesuniecie, dlugosc = _liczba(stos[-1]), _liczba(stos[-2])
+        dane = bytes.fromhex(''.join(pamiec))[przesuniecie:przesuniecie + dlugosc]
+        if dlugosc == 64:
+            klucz, slot = dane[:32], int.from_bytes(dane[32:], 'big')
+            klucz_int = int.from_bytes(klucz, 'big')
+            opis = f"0x{klucz_int:040x}" if klucz_int < 1 << 160 else f"0x{klucz.hex()[:16]}…"
+            return f"mapping(slot {self._opis_slotu(slot).removeprefix('slot ')})[{opis}]"
+        if dlugosc == 32:
+            return f"tablica(slot {int.from_bytes(dane, 'big')})[0]"
+        return None
+
+    # --- 4. WYNIKI ---
+    def tabele(self):
+        def ramka(slownik, kolumny):
+            wiersze = [(*klucz, n, gaz) if isinstance(klucz, tuple) else (klucz, n, gaz)
+                       for klucz, (n, gaz) in slownik.items()]
+            df = pd.DataFrame(wiersze, columns=kolumny + ['wykonania', 'gaz'])
+            df['udzial_%'] = 100 * df['gaz'] / max(self.gaz_evm, 1)
+            return df.sort_values('gaz', ascending=False, ignore_index=True)
+
+        linie = ramka(self.linie, ['plik', 'linia', 'kod'])
+        linie['linia'] = linie['linia'].astype('Int64')
+        return {
+            'opkody': ramka(self.opkody, ['opkod']),
+            'sloty': ramka(self.sloty, ['adres', 'slot', 'opkod']),
+            'linie': linie,
+        }
+
+
+def transakcje_bloku(klient, blok):
+    dane = klient.wywolaj('eth_getBlockByNumber', [hex(blok), False])
+    if dane is None:
+        raise BladRPC(f"brak bloku {blok}")
+    return dane['transactions']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil gazu po opkodach, slotach i liniach (debug_traceTransaction)")
+    parser.add_argument("--rpc", default="http://127.0.0.1:8545")
+    parser.add_argument("--tx", nargs="*", default=[], help="hashe transakcji")
+    parser.add_argument("--blok", type=int, nargs="*", default=[], help="profiluj wszystkie transakcje bloków")
+    parser.add_argument("--artefakty", default="artifacts/build-info", help="katalog build-info Hardhat (mapy źródeł)")
+    parser.add_argument("--pamiec", action="store_true", help="śledź pamięć - nazwy slotów mapowań z KECCAK256 (wolniej)")
+    parser.add_argument("--top", type=int, default=15, help="liczba wierszy w tabelach")
+    parser.add_argument("--csv", help="prefiks plików CSV z pełnymi tabelami")
+    args = parser.parse_args()
+
+    klient = KlientRPC(args.rpc, polaczenia=2, timeout=600)
+    mapy = MapyZrodel(args.artefakty)
+    if not mapy.kontrakty:
+        print(f"⚠️ Brak artefaktów w {args.artefakty} - bez podziału na linie (uruchom npx hardhat compile)")
+        mapy = None
+
+    try:
+        hashe = list(args.tx)
+        for blok in args.blok:
+            hashe += transakcje_bloku(klient, blok)
+        if not hashe:
+            print("❌ Podaj --tx albo --blok")
+            sys.exit(1)
+
+        profil = Profil(klient, mapy)
+        for i, tx in enumerate(hashe, 1):
+            dane = klient.wywolaj('eth_getTransactionByHash', [tx])
+            receipt = klient.wywolaj('eth_getTransactionReceipt', [tx])
+            if dane is None or receipt is None:
+                raise BladRPC(f"nieznana transakcja {tx}")
+            profil.dodaj_transakcje(sledz(klient, tx, args.pamiec), dane.get('to'), _liczba(receipt['gasUsed']))
+            print(f"Postęp: {i}/{len(hashe)} transakcji ({profil.kroki:,} kroków)", flush=True)
+    except (BladRPC, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\ngasUsed: {profil.gaz_transakcji:,}, w EVM: {profil.gaz_evm:,}, "
+          f"poza EVM (21000 + calldata - zwroty): {profil.gaz_transakcji - profil.gaz_evm:,}")
+    tabele = profil.tabele()
+    for nazwa, df in tabele.items():
+        if df.empty:
+            continue
+        print(f"\n=== {nazwa.upper()} ===")
+        print(df.head(args.top).to_string(index=False, float_format=lambda x: f"{x:.1f}"))
+        if args.csv:
+            df.to_csv(f"{args.csv}_{nazwa}.csv", index=False)
+    if args.csv:
+        print(f"\nZapisano: {args.csv}_*.csv")
+
+
+if __name__ == "__main__":
+    main()
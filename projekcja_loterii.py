@@ -0,0 +1,252 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+
+import historia_gazu
+import tabele
+from kolejka_vrf import LIMIT_GAZU_BLOKU
+from leniwe import leniwy_import
+
+wykresy = leniwy_import("wykresy")  # matplotlib tylko przy zapisie wykresów
+
+# Projekcja kosztu rundy LotteryRandao vs LotteryVRF dla 10^1 - 10^6 graczy.
+#
+# generuj_tablice_loteria.py pokazuje średnie enter / reveal / pickWinner z przebiegu z 3 graczami.
+# Tu te same pomiary (gas-reporter -> historia gazu -> dane zapasowe) kalibrują model liniowy rundy:
+#   RANDAO: n * (enter + reveal) + pickWinner(n),  pickWinner(n) = b + a * n   (O(n), nachylenie
+#           z wyniki_skalowalnosc.csv - pętla po graczach jak w getFinalRandom())
+#   VRF:    n * enter + pickWinner + fulfillRandomWords + opłata Chainlink (LINK)
+# Różnicę kosztu liczymy jednym przebiegiem numpy na siatce gracze x cena gazu x kurs LINK,
+# a próg opłacalności n* (RANDAO tańszy dla n < n*) w postaci zamkniętej na siatce gaz x LINK.
+#
+#   python projekcja_loterii.py                          # tabela, CSV i wykresy dla rynku z 06.01.2026
+#   python projekcja_loterii.py --gaz 25 --link 20       # inny punkt rynku
+#   python projekcja_loterii.py --siatka 400             # gęstsza siatka gaz x LINK
+
+RAPORT = 'wynik_loterii.txt'
+SKALOWALNOSC = 'wyniki_skalowalnosc.csv'
+
+# Zrzut Hardhat z generuj_tablice_loteria.py (3 graczy) - gdy brak raportu i historii gazu
+GAZ_ZAPASOWY = {
+    ('LotteryRandao', 'enter'): 83872,
+    ('LotteryRandao', 'reveal'): 97911,
+    ('LotteryRandao', 'pickWinner'): 104952,
+    ('LotteryVRF', 'enter'): 56328,
+    ('LotteryVRF', 'pickWinner'): 81670,
+    ('VRFCoordinatorV2Mock', 'fulfillRandomWords'): 96976,
+}
+GRACZE_POMIARU = 3
+NACHYLENIE_ZAPASOWE = 10782.4   # gaz na gracza w getFinalRandom(), gdy brak pomiarów skalowalności
+
+# Rynek jak w generuj_koszty_ekonomiczne.py (06.01.2026)
+RYNEK = {'eth_usd': 3280.45, 'link_usd': 13.90, 'cena_gazu': 0.90, 'oplata_link': 0.25}
+
+GRACZE_TABELI = [10 ** k for k in range(1, 7)]
+GRACZE_PROJEKCJI = np.unique(np.round(np.logspace(1, 6, 121)))   # gęsta oś do CSV i wykresów
+CENY_GAZU = (0.1, 200.0)        # Gwei, skala log
+CENY_LINK = (2.0, 50.0)         # USD
+SIATKA = 200
+
+
+# --- 1. KALIBRACJA ---
+def pomiary_gazu(raport=RAPORT, baza=historia_gazu.BAZA):
+    """Średni gaz metod (kontrakt, metoda) i liczba graczy przebiegu; źródło jak w generuj_tablice_loteria.py."""
+    try:
+        wiersze = historia_gazu.wczytaj_raport(raport)
+        gaz = {(w['kontrakt'], w['metoda']): w['srednia'] for w in wiersze}
+        wywolania = {(w['kontrakt'], w['metoda']): w['wywolania'] for w in wiersze}
+        if ('LotteryRandao', 'enter') in gaz:
+            return gaz, wywolania.get(('LotteryRandao', 'enter')) or GRACZE_POMIARU, raport
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(baza):
+        with sqlite3.connect(baza) as polaczenie:
+            gaz = historia_gazu.ostatnie_srednie(polaczenie)
+        if ('LotteryRandao', 'enter') in gaz:
+            return gaz, GRACZE_POMIARU, baza
+    return dict(GAZ_ZAPASOWY), GRACZE_POMIARU, 'dane zapasowe'
+
+
+def nachylenie_petli(plik=SKALOWALNOSC):
+    """Gaz na gracza pętli O(n) - regresja tylko z wierszy zmierzonych (bez '(est.)')."""
+    if not os.path.exists(plik):
+        return NACHYLENIE_ZAPASOWE
+    df = pd.read_csv(plik)
+    if 'gas_per_player' in df.columns:
+        df = df[~df['gas_per_player'].astype(str).str.contains('est')]
+    if len(df) < 2:
+        return NACHYLENIE_ZAPASOWE
+    a, _ = np.polyfit(df['players'].astype(float), df['gas_total'].astype(float), 1)
+    return float(a)
+
+
+def kalibracja(raport=RAPORT, skalowalnosc=SKALOWALNOSC):
+    """Współczynniki modelu liniowego: gaz rundy = na_gracza * n + staly."""
+    gaz, n0, zrodlo = pomiary_gazu(raport)
+
+    def g(kontrakt, metoda):
+        return float(gaz.get((kontrakt, metoda), GAZ_ZAPASOWY[(kontrakt, metoda)]))
+
+    a = nachylenie_petli(skalowalnosc)
+    return {
+        'randao_gracz': g('LotteryRandao', 'enter') + g('LotteryRandao', 'reveal'),
+        'randao_petla': a,
+        # pickWinner zmierzony przy n0 graczach -> wyraz wolny prostej b + a * n
+        'randao_staly': g('LotteryRandao', 'pickWinner') - a * n0,
+        'vrf_gracz': g('LotteryVRF', 'enter'),
+        'vrf_staly': g('LotteryVRF', 'pickWinner') + g('VRFCoordinatorV2Mock', 'fulfillRandomWords'),
+        'gracze_pomiaru': n0,
+        'zrodlo': zrodlo,
+    }
+
+
+# --- 2. MODEL ---
+def gaz_rundy(kal, gracze):
+    """Gaz całej rundy (RANDAO, VRF) i samego pickWinner RANDAO dla tablicy liczby graczy."""
+    n = np.asarray(gracze, dtype=float)
+    pick = kal['randao_staly'] + kal['randao_petla'] * n
+    randao = kal['randao_gracz'] * n + pick
+    vrf = kal['vrf_gracz'] * n + kal['vrf_staly']
+    return randao, vrf, pick
+
+
+def limit_bloku(kal, limit=LIMIT_GAZU_BLOKU):
+    """Największa liczba graczy, dla której pickWinner RANDAO mieści się w jednym bloku."""
+    return int((limit - kal['randao_staly']) // kal['randao_petla'])
+
+
+def prog_oplacalnosci(kal, cena_gazu, link_usd, eth_usd=RYNEK['eth_usd'], oplata_link=RYNEK['oplata_link']):
+    """n*, poniżej którego runda RANDAO jest tańsza (broadcast po cenie gazu i kursie LINK).
+
+    Różnica VRF - RANDAO jest liniowa w n: (staly_V - staly_R) * c + opłata - (gracz_R - gracz_V) * c * n,
+    gdzie c = USD za jednostkę gazu, więc próg ma postać zamkniętą.
+    """
+    c = np.asarray(cena_gazu) * 1e-9 * eth_usd
+    na_gracza = (kal['randao_gracz'] + kal['randao_petla'] - kal['vrf_gracz']) * c
+    stale = (kal['vrf_staly'] - kal['randao_staly']) * c + oplata_link * np.asarray(link_usd)
+    return stale / na_gracza
+
+
+def osie_siatki(punkty=SIATKA):
+    """Osie siatki: ceny gazu (log) i kursy LINK (lin)."""
+    return np.geomspace(*CENY_GAZU, punkty), np.linspace(*CENY_LINK, punkty)
+
+
+def powierzchnie(kal, gracze, ceny_gazu, ceny_link, eth_usd=RYNEK['eth_usd'], oplata_link=RYNEK['oplata_link']):
+    """Różnica kosztu rundy VRF - RANDAO (USD) na siatce gracze x gaz x LINK i próg n* na siatce gaz x LINK."""
+    gracze, ceny_gazu, ceny_link = (np.asarray(x, dtype=float) for x in (gracze, ceny_gazu, ceny_link))
+    randao, vrf, pick = gaz_rundy(kal, gracze)
+    c = ceny_gazu * 1e-9 * eth_usd
+    roznica = (vrf - randao)[:, None, None] * c[None, :, None] + oplata_link * ceny_link[None, None, :]
+    return {
+        'gracze': gracze,
+        'ceny_gazu': ceny_gazu,
+        'ceny_link': ceny_link,
+        'roznica': roznica,
+        'randao_tansze': roznica > 0,
+        'miesci_sie': pick <= LIMIT_GAZU_BLOKU,
+        'prog': prog_oplacalnosci(kal, ceny_gazu[:, None], ceny_link[None, :], eth_usd, oplata_link),
+        'n_blok': limit_bloku(kal),
+    }
+
+
+def projekcja(kal, gracze, rynek=RYNEK):
+    """Koszt rundy i koszt na gracza (USD) obu loterii w jednym punkcie rynku."""
+    gracze = np.asarray(gracze, dtype=float)
+    randao, vrf, pick = gaz_rundy(kal, gracze)
+    c = rynek['cena_gazu'] * 1e-9 * rynek['eth_usd']
+    oplata = rynek['oplata_link'] * rynek['link_usd']
+    return {
+        'gracze': gracze,
+        'gaz_randao': randao,
+        'gaz_vrf': vrf,
+        'gaz_pick_randao': pick,
+        'usd_randao': randao * c,
+        'usd_vrf': vrf * c + oplata,
+        'prog': float(prog_oplacalnosci(kal, rynek['cena_gazu'], rynek['link_usd'], rynek['eth_usd'], rynek['oplata_link'])),
+        'n_blok': limit_bloku(kal),
+    }
+
+
+def tabela(proj):
+    """Wiersze projekcji do CSV."""
+    return pd.DataFrame({
+        'gracze': proj['gracze'].astype(np.int64),
+        'gaz_randao': proj['gaz_randao'].round().astype(np.int64),
+        'gaz_vrf': proj['gaz_vrf'].round().astype(np.int64),
+        'gaz_pick_randao': proj['gaz_pick_randao'].round().astype(np.int64),
+        'usd_randao': proj['usd_randao'],
+        'usd_vrf': proj['usd_vrf'],
+        'usd_gracz_randao': proj['usd_randao'] / proj['gracze'],
+        'usd_gracz_vrf': proj['usd_vrf'] / proj['gracze'],
+        'randao_tansze': proj['usd_randao'] < proj['usd_vrf'],
+        'pick_w_bloku': proj['gaz_pick_randao'] <= LIMIT_GAZU_BLOKU,
+    })
+
+
+def tabela_do_druku(df):
+    def fmt(n):
+        return f"{n:,}".replace(",", " ")
+
+    return pd.DataFrame({
+        'Gracze': [fmt(n) for n in df['gracze']],
+        'Gaz RANDAO (runda)': [fmt(n) for n in df['gaz_randao']],
+        'Gaz VRF (runda)': [fmt(n) for n in df['gaz_vrf']],
+        'RANDAO (USD/gracza)': [f"${x:.2f}" for x in df['usd_gracz_randao']],
+        'VRF (USD/gracza)': [f"${x:.2f}" for x in df['usd_gracz_vrf']],
+        'Tańszy': ['RANDAO' if t else 'VRF' for t in df['randao_tansze']],
+        'pickWinner w bloku': ['tak' if m else 'NIE' for m in df['pick_w_bloku']],
+    })
+
+
+# --- 3. ZAPIS ---
+def main():
+    parser = argparse.ArgumentParser(description="Projekcja kosztu rundy LotteryRandao vs LotteryVRF (10^1 - 10^6 graczy)")
+    parser.add_argument("--raport", default=RAPORT, help="raport gas-reportera z testu loterii")
+    parser.add_argument("--skalowalnosc", default=SKALOWALNOSC)
+    parser.add_argument("--eth", type=float, default=RYNEK['eth_usd'], help="kurs ETH (USD)")
+    parser.add_argument("--link", type=float, default=RYNEK['link_usd'], help="kurs LINK (USD)")
+    parser.add_argument("--gaz", type=float, default=RYNEK['cena_gazu'], help="cena gazu (Gwei)")
+    parser.add_argument("--oplata", type=float, default=RYNEK['oplata_link'], help="opłata Chainlink (LINK)")
+    parser.add_argument("--siatka", type=int, default=SIATKA, help="punktów na oś gaz / LINK")
+    parser.add_argument("--csv", default="projekcja_loterii.csv")
+    args = parser.parse_args()
+
+    if min(args.eth, args.link, args.gaz, args.siatka) <= 0 or args.oplata < 0:
+        print("❌ Kursy, cena gazu i siatka muszą być dodatnie")
+        sys.exit(1)
+
+    kal = kalibracja(args.raport, args.skalowalnosc)
+    rynek = {'eth_usd': args.eth, 'link_usd': args.link, 'cena_gazu': args.gaz, 'oplata_link': args.oplata}
+    print(f"Kalibracja ({kal['zrodlo']}, {kal['gracze_pomiaru']} graczy): "
+          f"RANDAO {kal['randao_gracz']:,.0f} gas/gracza + pickWinner {kal['randao_staly']:,.0f} + {kal['randao_petla']:,.0f}·n, "
+          f"VRF {kal['vrf_gracz']:,.0f} gas/gracza + {kal['vrf_staly']:,.0f}")
+
+    proj = projekcja(kal, GRACZE_PROJEKCJI, rynek)
+    tabela(proj).to_csv(args.csv, index=False)
+
+    powierzchnia = powierzchnie(kal, GRACZE_PROJEKCJI, *osie_siatki(args.siatka), args.eth, args.oplata)
+    print(f"Siatka {powierzchnia['roznica'].size:,} punktów: RANDAO tańszy w {powierzchnia['randao_tansze'].mean():.1%}, "
+          f"n* od {powierzchnia['prog'].min():.1f} do {powierzchnia['prog'].max():.1f} graczy")
+    print(f"Punkt przełamania przy bieżącym rynku: ~{proj['prog']:.1f} graczy; "
+          f"pickWinner RANDAO przekracza limit bloku od {proj['n_blok'] + 1:,} graczy")
+
+    druk = tabela_do_druku(tabela(projekcja(kal, GRACZE_TABELI, rynek)))
+    tytul = (f"Projekcja kosztu rundy loterii (n* ≈ {proj['prog']:.0f} graczy)\n"
+             f"ETH = {args.eth:,.0f} USD, LINK = {args.link} USD, Gas = {args.gaz} gwei, opłata {args.oplata} LINK")
+    tabele.zapisz(druk, ['tabela_projekcja_loterii.png', 'tabela_projekcja_loterii.svg'], tytul=tytul,
+                  wyroznienia={i: '#f8d7da' for i, m in enumerate(druk['pickWinner w bloku']) if m == 'NIE'})
+
+    fig = wykresy.wykres_projekcji_loterii(proj)
+    fig.savefig('wykres_projekcja_loterii.png', bbox_inches='tight', dpi=300)
+    fig = wykresy.wykres_progu_loterii(powierzchnia, rynek)
+    fig.savefig('wykres_prog_loterii.png', bbox_inches='tight', dpi=300)
+    print(f"Zapisano: {args.csv}, tabela_projekcja_loterii.png/.svg, wykres_projekcja_loterii.png, wykres_prog_loterii.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import argparse
+import base64
+import html
+import io
+import os
+
+import matplotlib
+matplotlib.use("Agg")  # Tryb wsadowy - bez okien i bez serwera Streamlit
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+import atak_ostatniego
+import atak_sybil
+import autokorelacja
+import entropia
+import obliczenia as obl
+import projekcja_loterii
+import tabele
+import wrazliwosc
+import wykresy
+
+# Raport wsadowy: ta sama treść co zakładki dashboardu (app.py), ale jako
+# statyczny HTML (wykresy osadzone jako base64) i/lub PDF - w jednym procesie.
+#
+#   python raport.py --html raport.html --pdf raport.pdf
+#   python raport.py --gracze 100 --adresy 10 --sobol 1048576
+
+
+def fig_do_base64(fig):
+    bufor = io.BytesIO()
+    fig.savefig(bufor, format='png', bbox_inches='tight', dpi=100)
+    return base64.b64encode(bufor.getvalue()).decode('ascii')
+
+
+class Raport:
+    """Zbiera sekcje raportu i zapisuje je jako HTML i/lub PDF."""
+
+    def __init__(self, tytul):
+        self.tytul = tytul
+        self.sekcje = []  # lista (naglowek, [elementy])
+
+    def sekcja(self, naglowek):
+        self.sekcje.append((naglowek, []))
+
+    def tekst(self, linie):
+        if isinstance(linie, str):
+            linie = [linie]
+        self.sekcje[-1][1].append(('tekst', list(linie)))
+
+    def tabela(self, df):
+        self.sekcje[-1][1].append(('tabela', df))
+
+    def wykres(self, fig):
+        self.sekcje[-1][1].append(('wykres', fig))
+
+    def zapisz_html(self, filename):
+        czesci = [
+            "<!DOCTYPE html><html lang='pl'><head><meta charset='utf-8'>",
+            f"<title>{html.escape(self.tytul)}</title>",
+            "<style>body{font-family:sans-serif;max-width:1100px;margin:auto;color:#2c3e50}"
+            "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px 8px}"
+            "th{background:#d9edf7}img{max-width:100%}</style></head><body>",
+            f"<h1>{html.escape(self.tytul)}</h1>",
+        ]
+        for naglowek, elementy in self.sekcje:
+            czesci.append(f"<h2>{html.escape(naglowek)}</h2>")
+            for rodzaj, tresc in elementy:
+                if rodzaj == 'tekst':
+                    czesci.extend(f"<p>{html.escape(linia)}</p>" for linia in tresc)
+                elif rodzaj == 'tabela':
+                    czesci.append(tabele.tabela_html(tresc))
+                else:
+                    czesci.append(f"<img src='data:image/png;base64,{fig_do_base64(tresc)}'>")
+        czesci.append("</body></html>")
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("\n".join(czesci))
+        print(f"Wygenerowano: {filename}")
+
+    def zapisz_pdf(self, filename):
+        with PdfPages(filename) as pdf:
+            for naglowek, elementy in self.sekcje:
+                # Strona tekstowa sekcji (tekst + tabele), potem po jednej stronie na wykres
+                linie = [naglowek, ""]
+                for rodzaj, tresc in elementy:
+                    if rodzaj == 'tekst':
+                        linie.extend(tresc)
+                    elif rodzaj == 'tabela':
+                        linie.extend(tresc.to_string(index=False).splitlines())
+                    linie.append("")
+
+                fig = plt.figure(figsize=(8.27, 11.69))  # A4
+                fig.text(0.05, 0.95, "\n".join(linie), va='top', family='monospace', fontsize=8)
+                pdf.savefig(fig)
+                plt.close(fig)
+
+                for rodzaj, tresc in elementy:
+                    if rodzaj == 'wykres':
+                        pdf.savefig(tresc, bbox_inches='tight')
+        print(f"Wygenerowano: {filename}")
+
+    def zamknij_wykresy(self):
+        for _, elementy in self.sekcje:
+            for rodzaj, tresc in elementy:
+                if rodzaj == 'wykres':
+                    plt.close(tresc)
+
+
+def zbuduj_raport(df_costs, df_stats, df_scalability, gas_price_gwei=50, pula=100, wpisowe=1.0, kara=100,
+                  gracze=10, adresy=8, n_sobol=wrazliwosc.N_DOMYSLNE):
+    """Odpowiednik zakładek dashboardu - te same obliczenia, bez st.* (suwaki w wartościach domyślnych)"""
+    r = Raport("Analiza i porównanie algorytmów generowania losowości: VRF vs RANDAO")
+
+    # --- 1. PODSUMOWANIE + 2. KOSZTY ---
+    r.sekcja("Podsumowanie i analiza kosztów")
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
+        koszty = obl.statystyki_kosztow(df_costs)
+        eth = obl.koszty_w_eth(koszty, gas_price_gwei)
+        r.tekst([
+            f"Średni koszt RANDAO (commit + reveal): {int(koszty['avg_randao']):,} gas",
+            f"Średni koszt VRF: {int(koszty['avg_vrf']):,} gas "
+            f"(request {int(koszty['avg_vrf_req']):,} + callback {int(koszty['avg_vrf_cb']):,})",
+            f"Różnica: {int(koszty['diff_gas']):,} gas ({koszty['diff_pct']:+.1f}%), tańszy: {koszty['zwyciezca']}",
+            f"Przy {gas_price_gwei} Gwei: RANDAO {eth['randao_eth']:.6f} ETH, VRF {eth['vrf_eth']:.6f} ETH, "
+            f"różnica {eth['roznica_eth']:.6f} ETH",
+        ])
+        r.wykres(wykresy.wykres_kosztow(df_costs, koszty))
+    else:
+        r.tekst("Brak danych kosztowych (wyniki_badan.csv).")
+
+    # --- 3. TESTY STATYSTYCZNE ---
+    r.sekcja("Testy statystyczne losowości")
+    if obl.ma_kolumne(df_stats, 'randao_val'):
+        analiza = obl.analiza_statystyczna(df_stats)
+        for nazwa, klucz in [("RANDAO", 'randao'), ("VRF", 'vrf')]:
+            a = analiza[klucz]
+            werdykt = "PASSED" if a['zaliczony'] else "FAILED"
+            r.tekst(
+                f"{nazwa}: średnia {a['opis']['srednia']:.2f}, odch. std {a['opis']['odchylenie']:.2f}, "
+                f"χ² = {a['chi2']:.3f}, p = {a['p']:.4f} ({werdykt}), "
+                f"entropia {a['entropia']:.2f} / {analiza['max_entropia']:.2f} bitów"
+            )
+        r.wykres(wykresy.wykres_histogramow(analiza['randao']['wartosci'], analiza['vrf']['wartosci']))
+        r.wykres(wykresy.wykres_qq(analiza['randao']['wartosci'], analiza['vrf']['wartosci']))
+
+        r.sekcja("Autokorelacja i widmo")
+        wartosci = {'RANDAO': analiza['randao']['wartosci'], 'VRF': analiza['vrf']['wartosci']}
+        maks_opoznienie = min(50, max(5, len(wartosci['RANDAO']) // 4))
+        wyniki_acf = {nazwa: autokorelacja.test(w, maks_opoznienie) for nazwa, w in wartosci.items()}
+        for nazwa, w in wyniki_acf.items():
+            werdykt = "PASSED" if w['zaliczony'] else "FAILED"
+            r.tekst(
+                f"{nazwa}: r1 = {w['r1']:+.4f} (p = {w['p_r1']:.4f}), Ljung-Box p = {w['p_ljung_box']:.4f}, "
+                f"pik widma przy okresie {w['okres']:.1f} rund (p = {w['p_widmo']:.4f}) - {werdykt}"
+            )
+        r.tekst(f"Opóźnienia 1..{maks_opoznienie}; werdykt ma łączne α = 0.01 "
+                f"({wyniki_acf['RANDAO']['alfa_testu']} na każdy z {autokorelacja.TESTY} testów).")
+        r.wykres(wykresy.wykres_autokorelacji(wyniki_acf))
+    else:
+        r.tekst("Brak danych statystycznych (dane_statystyczne.csv).")
+
+    r.sekcja("Min-entropia 256-bitowych wyników (SP 800-90B)")
+    if os.path.isdir("magazyn_probki"):
+        minima = {}
+        for nazwa, kolumna in [("RANDAO", "randao_slowo"), ("VRF", "vrf_slowo")]:
+            w = entropia.entropia_kolumny("magazyn_probki", kolumna, 1 << 14)
+            minima[nazwa] = [round(w[e], 4) for e in entropia.ESTYMATORY] + [round(w['min'], 4)]
+            r.tekst(f"{nazwa}: {w['min']:.4f} bit/bit ({w['min'] * 256:.1f} z 256 bitów)")
+        r.tabela(pd.DataFrame({'Estymator': entropia.ESTYMATORY + ['min'], **minima}))
+    else:
+        r.tekst("Brak magazynu słów 256-bit (python generuj_probki.py --probki 100000).")
+
+    # --- 4. BEZPIECZEŃSTWO ---
+    r.sekcja("Analiza bezpieczeństwa")
+    atak = obl.ekonomia_ataku(pula, wpisowe, kara)
+    r.tekst([
+        f"Atak last revealer: pula {pula:.2f} ETH, entry fee {wpisowe:.2f} ETH, kara {kara}% puli",
+        f"Koszt ataku: {atak['koszt']:.2f} ETH, profit netto: {atak['profit']:.2f} ETH - "
+        + ("atak OPŁACALNY" if atak['oplacalny'] else "atak NIEOPŁACALNY"),
+    ])
+    r.wykres(wykresy.wykres_ryzyka())
+
+    r.sekcja(f"Atak last revealer i Sybil ({gracze} graczy)")
+    krzywa = atak_ostatniego.krzywa_ataku(gracze, min(atak_ostatniego.MAKS_ATAKUJACYCH, gracze))
+    metoda = "dokładnie (WHT)" if krzywa[-1]['dokladny'] else "Monte Carlo na pełnych 256 bitach"
+    r.tekst(
+        f"P(sukces) koalicji 1..{len(krzywa)} atakujących ({metoda}): "
+        + ", ".join(f"k={p['atakujacy']}: {p['p_atak']:.1%}" for p in krzywa)
+    )
+    r.wykres(wykresy.wykres_ataku_ostatniego(krzywa))
+    sybil = atak_sybil.analiza(gracze, min(adresy, gracze), pula=float(pula), kaucja=float(wpisowe), kara=float(kara))
+    r.tekst(f"Atak Sybil: m = 1..{len(sybil)} adresów, kaucja {wpisowe:.2f} ETH + kara {kara}% puli za nieujawniony adres")
+    r.wykres(wykresy.wykres_sybil(sybil))
+    r.tabela(sybil.round(4).rename(columns={
+        'adresy': 'm',
+        'p_uczciwie': 'P uczciwie',
+        'p_wygrana': 'P wygrana',
+        'p_oplacalna': 'P opłacalna',
+        'sr_nieujawnione': 'Śr. nieujawnione',
+        'spalona_kaucja': 'Spalone ETH/runda',
+        'zysk_oczekiwany': 'Zysk vs uczciwa gra (ETH)',
+    }))
+
+    # --- 5. SKALOWALNOŚĆ ---
+    r.sekcja("Skalowalność")
+    if obl.ma_kolumne(df_scalability, 'players'):
+        skal = obl.analiza_skalowalnosci(df_scalability)
+        if skal['trend'] is not None:
+            a, b = skal['trend']
+            r.tekst(f"Trend RANDAO: y = {a:.0f}x + {b:.0f}")
+            if obl.breakeven_w_zakresie(skal['breakeven']):
+                r.tekst(f"Punkt przełamania: ~{int(skal['breakeven'])} graczy")
+            else:
+                r.tekst("W testowanym zakresie RANDAO pozostaje tańszy")
+        r.wykres(wykresy.wykres_skalowalnosci(skal))
+        r.tabela(df_scalability)
+    else:
+        r.tekst("Brak danych skalowalności (wyniki_skalowalnosc.csv).")
+
+    r.sekcja("Projekcja loterii: 10 - 1 000 000 graczy")
+    kal = projekcja_loterii.kalibracja()
+    rynek = projekcja_loterii.RYNEK
+    proj = projekcja_loterii.projekcja(kal, projekcja_loterii.GRACZE_PROJEKCJI, rynek)
+    r.tekst([
+        f"Rynek: gaz {rynek['cena_gazu']} Gwei, ETH {rynek['eth_usd']} USD, LINK {rynek['link_usd']} USD "
+        f"(kalibracja: {kal['zrodlo']})",
+        f"Przełamanie: ~{proj['prog']:.0f} graczy; pickWinner RANDAO przekracza limit gazu bloku "
+        f"od {proj['n_blok'] + 1:,} graczy",
+    ])
+    r.wykres(wykresy.wykres_projekcji_loterii(proj))
+    powierzchnia = projekcja_loterii.powierzchnie(
+        kal, proj['gracze'], *projekcja_loterii.osie_siatki(120), rynek['eth_usd'], rynek['oplata_link'])
+    r.wykres(wykresy.wykres_progu_loterii(powierzchnia, rynek))
+    r.tabela(projekcja_loterii.tabela_do_druku(projekcja_loterii.tabela(
+        projekcja_loterii.projekcja(kal, projekcja_loterii.GRACZE_TABELI, rynek))))
+
+    # --- 6. WNIOSKI ---
+    r.sekcja("Wnioski")
+    r.tabela(obl.tabela_porownawcza())
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
+        wnioski = obl.wnioski_kosztowe(df_costs)
+        r.tekst(
+            f"RANDAO: ~{wnioski['avg_randao']:,} gas, VRF: ~{wnioski['avg_vrf']:,} gas, "
+            f"różnica {wnioski['diff_pct']:+.1f}%"
+        )
+
+    r.sekcja("Wrażliwość wniosków (indeksy Sobola)")
+    wrazl = wrazliwosc.analiza(n_sobol, stale=wrazliwosc.stale_z_pomiarow(df_costs, df_scalability))
+    r.tekst(
+        f"{wrazl['ewaluacje']:,} ewaluacji modelu: RANDAO tańszy w {wrazl['udzial_randao_tansze']:.1%}, "
+        f"atak last revealer opłacalny w {wrazl['udzial_atak_oplacalny']:.1%} przestrzeni parametrów"
+    )
+    r.wykres(wykresy.wykres_wrazliwosci(wrazl['indeksy'], {
+        'roznica_kosztu': 'Różnica kosztu VRF - RANDAO',
+        'atak_oplacalny': 'Opłacalność ataku',
+    }))
+    for wyjscie, opis in wrazliwosc.WYJSCIA.items():
+        r.tekst(opis)
+        r.tabela(wrazliwosc.ranking(wrazl, wyjscie).round(3))
+
+    return r
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raport VRF vs RANDAO bez serwera Streamlit")
+    parser.add_argument("--html", help="ścieżka raportu HTML (domyślnie raport.html)")
+    parser.add_argument("--pdf", help="ścieżka raportu PDF")
+    parser.add_argument("--koszty", default="wyniki_badan.csv")
+    parser.add_argument("--statystyki", default="dane_statystyczne.csv")
+    parser.add_argument("--skalowalnosc", default="wyniki_skalowalnosc.csv")
+    parser.add_argument("--gas-price", type=float, default=50, help="cena gazu w Gwei")
+    parser.add_argument("--pula", type=float, default=100, help="pula nagród (ETH)")
+    parser.add_argument("--wpisowe", type=float, default=1.0, help="entry fee (ETH)")
+    parser.add_argument("--kara", type=float, default=100, help="kara za nieujawnienie (% puli)")
+    parser.add_argument("--gracze", type=int, default=10, help="liczba graczy w analizie ataków")
+    parser.add_argument("--adresy", type=int, default=8, help="maksymalna liczba adresów atakującego Sybil")
+    parser.add_argument("--sobol", type=int, default=wrazliwosc.N_DOMYSLNE, help="punkty bazowe N indeksów Sobola")
+    args = parser.parse_args()
+
+    if not args.html and not args.pdf:
+        args.html = "raport.html"
+
+    r = zbuduj_raport(
+        obl.wczytaj_dane(args.koszty),
+        obl.wczytaj_dane(args.statystyki),
+        obl.wczytaj_dane(args.skalowalnosc),
+        gas_price_gwei=args.gas_price,
+        pula=args.pula,
+        wpisowe=args.wpisowe,
+        kara=args.kara,
+        gracze=args.gracze,
+        adresy=args.adresy,
+        n_sobol=args.sobol,
+    )
+    if args.html:
+        r.zapisz_html(args.html)
+    if args.pdf:
+        r.zapisz_pdf(args.pdf)
+    r.zamknij_wykresy()
+
+
+if __name__ == "__main__":
+    main()
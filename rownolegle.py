@@ -0,0 +1,258 @@
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import pamiec
+from leniwe import leniwy_import
+
+# Bateria testów statystycznych na wielu rdzeniach - próbki w pamięci współdzielonej.
+#
+# Testy z zakładki 3 (chi-kwadrat, entropia), analiza_rozkladu.py i analiza_statystyczna_pro.py
+# liczą wszystko w jednym wątku. Tu próbki (wartości całkowite 0..zakres-1) kopiujemy raz do
+# multiprocessing.shared_memory, a procesy robocze podłączają je przy starcie - zadanie to tylko
+# (nazwa, start, stop), bez serializowania danych. Każdy fragment daje statystyki dostateczne:
+# liczniki wartości, sumę i sumę kwadratów, liczbę serii powyżej/poniżej środka zakresu (z bitem
+# pierwszym i ostatnim do sklejenia na granicy) oraz iloczyny x_t x_{t+k} dla k = 1..K (fragment
+# widzi całą tablicę, więc iloczyny przez granicę liczy sam). Wszystko to liczby całkowite, więc
+# redukcja w procesie głównym jest dokładna - wynik nie zależy od liczby procesów ani fragmentów.
+#
+#   python rownolegle.py                                              # dane_statystyczne.csv
+#   python rownolegle.py --zrodlo magazyn_probki --kolumny randao_val,vrf_val --procesy 64
+#   python rownolegle.py --zrodlo magazyn_probki --procesy 1          # ten sam wynik sekwencyjnie
+
+special = leniwy_import("scipy.special")
+
+FRAGMENT = 1 << 22                # wartości na zadanie
+PROG_WIELOPROCESOWY = 1 << 24     # poniżej tego liczymy w bieżącym procesie
+OPOZNIENIA = 5
+KOLUMNY = ['randao_val', 'vrf_val']
+
+# Tablice podłączone w procesie roboczym: nazwa -> (SharedMemory, ndarray)
+_TABLICE = {}
+
+
+# --- 1. STATYSTYKI DOSTATECZNE FRAGMENTU ---
+def statystyki_fragmentu(x, start, stop, zakres, opoznienia=OPOZNIENIA):
+    """Liczniki, sumy, serie i iloczyny opóźnione dla x[start:stop] (wszystko całkowite)."""
+    w = np.asarray(x[start:stop], dtype=np.int64)
+    znaki = 2 * w >= zakres   # powyżej środka zakresu (zakres - 1) / 2
+    iloczyny = []
+    for k in range(1, opoznienia + 1):
+        koniec = min(stop, len(x) - k)
+        iloczyny.append(int(np.dot(w[:max(koniec - start, 0)], np.asarray(x[start + k:koniec + k], dtype=np.int64)))
+                        if koniec > start else 0)
+    return {
+        'n': len(w),
+        'liczniki': np.bincount(w, minlength=zakres),
+        'suma': int(w.sum()),
+        'suma_kw': int(np.dot(w, w)),
+        'powyzej': int(znaki.sum()),
+        'serie': 1 + int(np.count_nonzero(znaki[1:] != znaki[:-1])),
+        'pierwszy': bool(znaki[0]),
+        'ostatni': bool(znaki[-1]),
+        'iloczyny': iloczyny,
+    }
+
+
+def scal(stany):
+    """Dokładna suma stanów kolejnych fragmentów (seria na granicy fragmentów liczona raz)."""
+    wynik = None
+    for s in stany:
+        if wynik is None:
+            wynik = dict(s, iloczyny=list(s['iloczyny']))
+            continue
+        for klucz in ('n', 'liczniki', 'suma', 'suma_kw', 'powyzej', 'serie'):
+            wynik[klucz] = wynik[klucz] + s[klucz]
+        wynik['serie'] -= wynik['ostatni'] == s['pierwszy']
+        wynik['iloczyny'] = [a + b for a, b in zip(wynik['iloczyny'], s['iloczyny'])]
+        wynik['ostatni'] = s['ostatni']
+    return wynik
+
+
+# --- 2. PAMIĘĆ WSPÓŁDZIELONA ---
+def _podlacz(opisy):
+    """Inicjalizator procesu roboczego: podłączenie segmentów utworzonych przez proces główny.
+
+    Procesy potomne dzielą resource_tracker z głównym, więc segment jest zarejestrowany raz
+    i usuwa go tylko WspolneProbki.zwolnij().
+    """
+    for nazwa, (segment, ksztalt, dtype) in opisy.items():
+        shm = shared_memory.SharedMemory(name=segment)
+        _TABLICE[nazwa] = (shm, np.ndarray(ksztalt, dtype=dtype, buffer=shm.buf))
+
+
+def _zadanie(argumenty):
+    nazwa, start, stop, zakres, opoznienia = argumenty
+    return nazwa, statystyki_fragmentu(_TABLICE[nazwa][1], start, stop, zakres, opoznienia)
+
+
+class WspolneProbki:
+    """Kopie próbek w multiprocessing.shared_memory; `with` zwalnia segmenty."""
+
+    def __init__(self, probki, fragment=FRAGMENT):
+        self.segmenty, self.opisy = [], {}
+        try:
+            for nazwa, x in probki.items():
+                dtype = np.asarray(x[:0]).dtype
+                shm = shared_memory.SharedMemory(create=True, size=max(1, len(x) * dtype.itemsize))
+                self.segmenty.append(shm)
+                cel = np.ndarray((len(x),), dtype=dtype, buffer=shm.buf)
+                for start in range(0, len(x), fragment):   # memmap kopiowany porcjami
+                    cel[start:start + fragment] = x[start:start + fragment]
+                self.opisy[nazwa] = (shm.name, (len(x),), dtype.str)
+        except BaseException:
+            self.zwolnij()
+            raise
+
+    def zwolnij(self):
+        for shm in self.segmenty:
+            shm.close()
+            shm.unlink()
+        self.segmenty = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *wyjatek):
+        self.zwolnij()
+
+
+def statystyki_kolumn(probki, zakres, opoznienia=OPOZNIENIA, procesy=None, fragment=FRAGMENT):
+    """{nazwa: scalone statystyki} - w puli procesów na pamięci współdzielonej albo w bieżącym procesie."""
+    zadania = [(nazwa, s, min(s + fragment, len(x)), zakres, opoznienia)
+               for nazwa, x in probki.items() for s in range(0, len(x), fragment)]
+    stany = {nazwa: [] for nazwa in probki}
+    if procesy == 1 or sum(len(x) for x in probki.values()) < PROG_WIELOPROCESOWY:
+        for nazwa, start, stop, _, _ in zadania:
+            stany[nazwa].append(statystyki_fragmentu(probki[nazwa], start, stop, zakres, opoznienia))
+    else:
+        with WspolneProbki(probki) as wspolne, \
+                ProcessPoolExecutor(max_workers=procesy, initializer=_podlacz, initargs=(wspolne.opisy,)) as pula:
+            for nazwa, stan in pula.map(_zadanie, zadania):   # map zachowuje kolejność fragmentów
+                stany[nazwa].append(stan)
+    wynik = {}
+    for nazwa, x in probki.items():
+        wynik[nazwa] = scal(stany[nazwa])
+        # Sumy z pominięciem k pierwszych / ostatnich wartości - do centrowania iloczynów
+        wynik[nazwa]['poczatek'] = np.cumsum(np.asarray(x[:opoznienia], dtype=np.int64)).tolist()
+        wynik[nazwa]['koniec'] = np.cumsum(np.asarray(x[::-1][:opoznienia], dtype=np.int64)).tolist()
+    return wynik
+
+
+# --- 3. TESTY ZE STATYSTYK ---
+def chi_kwadrat(liczniki, kosze=None):
+    """Chi-kwadrat zgodności z rozkładem jednostajnym; kosze - łączenie sąsiednich wartości."""
+    liczniki = np.asarray(liczniki)
+    if kosze and len(liczniki) % kosze == 0:
+        liczniki = liczniki.reshape(kosze, -1).sum(axis=1)
+    oczekiwane = liczniki.sum() / len(liczniki)
+    chi2 = float(((liczniki - oczekiwane) ** 2 / oczekiwane).sum())
+    return chi2, float(special.chdtrc(len(liczniki) - 1, chi2))
+
+
+def entropia(liczniki):
+    p = np.asarray(liczniki, dtype=np.float64)
+    p = p[p > 0] / p.sum()
+    return float(-(p * np.log2(p)).sum())
+
+
+def bateria(st, kosze=None):
+    """Wyniki testów z scalonych statystyk jednej kolumny."""
+    n, S, S2 = st['n'], st['suma'], st['suma_kw']
+    srednia = S / n
+    m2 = (n * S2 - S * S) / n          # suma kwadratów odchyleń, licznik całkowity
+    chi2, p = chi_kwadrat(st['liczniki'], kosze)
+
+    # Test serii Walda-Wolfowitza (powyżej / poniżej środka zakresu)
+    n1, n2 = st['powyzej'], n - st['powyzej']
+    if n1 and n2:
+        mu = 2 * n1 * n2 / n + 1
+        z_serii = (st['serie'] - mu) / math.sqrt((mu - 1) * (mu - 2) / (n - 1))
+    else:
+        z_serii = math.nan
+
+    # r_k = sum (x_t - m)(x_{t+k} - m) / sum (x_t - m)^2
+    autokorelacje = []
+    for k, iloczyn in enumerate(st['iloczyny'], start=1):
+        bez_konca = S - st['koniec'][k - 1]      # sum x_t, t < n - k
+        bez_poczatku = S - st['poczatek'][k - 1]  # sum x_t, t >= k
+        licznik = iloczyn - srednia * (bez_konca + bez_poczatku) + (n - k) * srednia ** 2
+        autokorelacje.append(licznik / m2 if m2 else math.nan)
+
+    return {
+        'n': n,
+        'srednia': srednia,
+        'odchylenie': math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+        'chi2': chi2,
+        'p': p,
+        'entropia': entropia(st['liczniki']),
+        'serie': st['serie'],
+        'z_serii': z_serii,
+        'p_serii': float(2 * special.ndtr(-abs(z_serii))) if not math.isnan(z_serii) else math.nan,
+        'autokorelacje': autokorelacje,
+        'liczniki': st['liczniki'],
+    }
+
+
+@pamiec.zapamietaj(wersja=1, pomin=('procesy',))
+def bateria_kolumn(probki, zakres, kosze=None, opoznienia=OPOZNIENIA, procesy=None, fragment=FRAGMENT):
+    """Komplet testów dla wielu kolumn naraz (jedna pula procesów na wszystkie).
+
+    Wspólne dla obliczenia.analiza_statystyczna (dashboard, raport), analiza_rozkladu.py
+    i analiza_statystyczna_pro.py - kolumny kluczowane po treści, więc ten sam plik danych
+    liczy się raz dla wszystkich.
+    """
+    statystyki = statystyki_kolumn(probki, zakres, opoznienia, procesy, fragment)
+    return {nazwa: bateria(st, kosze) for nazwa, st in statystyki.items()}
+
+
+def wczytaj_kolumny(zrodlo, kolumny):
+    """Kolumny z magazynu wyników (memmap) albo z CSV."""
+    from magazyn import PLIK_MANIFESTU, Magazyn
+    if os.path.isdir(zrodlo) and os.path.exists(os.path.join(zrodlo, PLIK_MANIFESTU)):
+        magazyn = Magazyn(zrodlo)
+        return {k: magazyn.kolumna(k) for k in kolumny}
+    import pandas as pd
+    df = pd.read_csv(zrodlo, usecols=kolumny)
+    return {k: df[k].to_numpy() for k in kolumny}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bateria testów losowości na wielu rdzeniach (pamięć współdzielona)")
+    parser.add_argument("--zrodlo", default="dane_statystyczne.csv", help="plik CSV albo katalog magazynu wyników")
+    parser.add_argument("--kolumny", default=",".join(KOLUMNY))
+    parser.add_argument("--zakres", type=int, default=100, help="wartości 0..zakres-1")
+    parser.add_argument("--kosze", type=int, default=10, help="liczba koszy testu chi-kwadrat")
+    parser.add_argument("--opoznienia", type=int, default=OPOZNIENIA)
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni, 1 = sekwencyjnie)")
+    parser.add_argument("--fragment", type=int, default=FRAGMENT)
+    args = parser.parse_args()
+
+    try:
+        probki = wczytaj_kolumny(args.zrodlo, [k for k in args.kolumny.split(',') if k])
+        for nazwa, x in probki.items():
+            if len(x) and (x.min() < 0 or x.max() >= args.zakres):
+                raise ValueError(f"Kolumna {nazwa} ma wartości spoza 0..{args.zakres - 1}")
+    except (OSError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    wyniki = bateria_kolumn(probki, args.zakres, args.kosze, args.opoznienia, args.procesy, args.fragment)
+    czas = time.perf_counter() - start
+    for nazwa, w in wyniki.items():
+        print(f"\n{nazwa}: n = {w['n']:,}, średnia {w['srednia']:.4f}, odchylenie {w['odchylenie']:.4f}")
+        print(f"  chi-kwadrat {w['chi2']:.3f} (p = {w['p']:.4f}), entropia {w['entropia']:.4f} bitów")
+        print(f"  serie {w['serie']:,} (z = {w['z_serii']:+.3f}, p = {w['p_serii']:.4f})")
+        print(f"  autokorelacje: {', '.join(f'{r:+.5f}' for r in w['autokorelacje'])}")
+    print(f"\nCzas: {czas:.2f}s, procesy: {args.procesy or os.cpu_count()}")
+
+
+if __name__ == "__main__":
+    main()
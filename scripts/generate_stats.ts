@@ -61,6 +61,20 @@ function shannonEntropy(values: number[]): number {
   return entropy;
 }
 
+// Tryb fragmentu (generuj_probki.py --silnik hardhat):
+//   PROBKI          - liczba iteracji (domyślnie 500)
+//   ZIARNO          - bytes32; sekrety RANDAO i słowa VRF wyliczane deterministycznie z ziarna
+//   PLIK_WYJSCIOWY  - CSV z dodatkowymi kolumnami randao_slowo,vrf_slowo (bez podsumowania)
+//   PLIK_STOP       - sygnał z testu sekwencyjnego (sekwencyjne.py): gdy plik istnieje, kończymy pętlę
+const ITERACJE = Number(process.env.PROBKI || 500);
+const ZIARNO = process.env.ZIARNO;
+const PLIK_WYJSCIOWY = process.env.PLIK_WYJSCIOWY;
+const PLIK_STOP = process.env.PLIK_STOP;
+
+function slowoZZiarna(seed: string, etykieta: string, i: number): bigint {
+  return BigInt(ethers.solidityPackedKeccak256(["bytes32", "string", "uint256"], [seed, etykieta, i]));
+}
+
 async function main() {
   console.log("=== ZAAWANSOWANE BADANIE STATYSTYCZNE ===\n");
   
@@ -87,28 +101,33 @@ async function main() {
   const randaoValues: number[] = [];
   const vrfValues: number[] = [];
   
-  const iterations = 500;
+  const iterations = ITERACJE;
   
   // CSV setup
-  const header = "iteracja,randao_val,vrf_val\n";
-  fs.writeFileSync("dane_statystyczne.csv", header);
+  const outFile = PLIK_WYJSCIOWY || "dane_statystyczne.csv";
+  const header = PLIK_WYJSCIOWY ? "iteracja,randao_val,vrf_val,randao_slowo,vrf_slowo\n" : "iteracja,randao_val,vrf_val\n";
+  fs.writeFileSync(outFile, header);
 
   // Pętla generująca
   for (let i = 1; i <= iterations; i++) {
     if (i % 100 === 0) console.log(`Postęp: ${i}/${iterations}...`);
+    if (PLIK_STOP && fs.existsSync(PLIK_STOP)) {
+      console.log(`Test sekwencyjny rozstrzygnięty - stop po ${i - 1} iteracjach`);
+      break;
+    }
 
     // --- RANDAO ---
     const Randao = await ethers.getContractFactory("Randao");
     const randao = await Randao.deploy(entryFee);
     
-    const secret = Math.floor(Math.random() * 1000000);
+    const secret = ZIARNO ? slowoZZiarna(ZIARNO, "randao", i) : BigInt(Math.floor(Math.random() * 1000000));
     const hash = ethers.solidityPackedKeccak256(["uint256"], [secret]);
     
     await randao.connect(alice).commit(hash, { value: entryFee });
     await randao.startRevealPhase();
     await randao.connect(alice).reveal(secret);
     
-    const randaoResult = secret % 100;
+    const randaoResult = Number(secret % 100n);
     randaoValues.push(randaoResult);
 
     // --- VRF ---
@@ -125,14 +144,20 @@ async function main() {
       const parsed = vrfGame.interface.parseLog(reqLog);
       const reqId = parsed!.args[0];
       
-      await vrfMock.fulfillRandomWords(reqId, await vrfGame.getAddress());
+      if (ZIARNO) {
+        const word = slowoZZiarna(ZIARNO, "vrf", i);
+        await vrfMock.fulfillRandomWordsWithOverride(reqId, await vrfGame.getAddress(), [word]);
+      } else {
+        await vrfMock.fulfillRandomWords(reqId, await vrfGame.getAddress());
+      }
       
       const vrfBigInt = await vrfGame.randomResult();
       const vrfResult = Number(vrfBigInt % 100n);
       vrfValues.push(vrfResult);
       
       // Zapis do CSV
-      fs.appendFileSync("dane_statystyczne.csv", `${i},${randaoResult},${vrfResult}\n`);
+      const slowa = PLIK_WYJSCIOWY ? `,${ethers.toBeHex(secret, 32)},${ethers.toBeHex(vrfBigInt, 32)}` : "";
+      fs.appendFileSync(outFile, `${i},${randaoResult},${vrfResult}${slowa}\n`);
     }
   }
 
@@ -178,7 +203,7 @@ async function main() {
 
   // Zapis podsumowania
   const summary = `
-PODSUMOWANIE ANALIZY STATYSTYCZNEJ (N=${iterations})
+PODSUMOWANIE ANALIZY STATYSTYCZNEJ (N=${randaoValues.length})
 
 RANDAO:
 - Średnia: ${mean(randaoValues).toFixed(2)}
@@ -197,11 +222,14 @@ Oba algorytmy wykazują zgodność z rozkładem jednostajnym.
 Nie ma statystycznie istotnej różnicy w jakości generowanych liczb losowych.
 `;
 
-  fs.writeFileSync("analiza_statystyczna_podsumowanie.txt", summary);
-  
   console.log("\n=== ZAKOŃCZONO ===");
-  console.log("Dane zapisane w: dane_statystyczne.csv");
-  console.log("Podsumowanie: analiza_statystyczna_podsumowanie.txt");
+  console.log(`Dane zapisane w: ${outFile}`);
+
+  // Fragmenty nie nadpisują podsumowania całego badania
+  if (!PLIK_WYJSCIOWY) {
+    fs.writeFileSync("analiza_statystyczna_podsumowanie.txt", summary);
+    console.log("Podsumowanie: analiza_statystyczna_podsumowanie.txt");
+  }
 }
 
 main().catch((error) => {
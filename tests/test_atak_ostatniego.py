@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import atak_ostatniego as ao
+
+PROBY = 40000
+
+
+def _dokladnie(modul, k, rodzaj, cel=0, ziarno=2024):
+    sekrety = ao.sekrety_losowe(k, ziarno)
+    bity, nieparzysty = ao.okno_dla(modul, rodzaj)
+    wagi = ao.wagi_okna(rodzaj, bity, modul, cel=cel, prog=k)
+    return sekrety, wagi, nieparzysty, bity
+
+
+# --- Transformata i przestrzenie GF(2) ---
+def test_wht_odwrotna_to_ta_sama_transformata():
+    a = np.random.default_rng(0).integers(-5, 5, 64)
+    np.testing.assert_array_equal(ao.wht(ao.wht(a.copy())), a * 64)
+    np.testing.assert_allclose(ao.wht(ao.wht(a.astype(float))), a * 64.0)
+
+
+def test_dopelnienie_ortogonalne():
+    wektory = ao.baza([0b1011, 0b0110, 0b1101], 4)
+    assert len(wektory) == 2  # trzeci sekret to XOR dwóch pierwszych
+    v, w = ao.rozpiecie(wektory), ao.rozpiecie(ao.dopelnienie(wektory, 4))
+    assert len(v) * len(w) == 16
+    assert all(bin(int(a) & int(b)).count('1') % 2 == 0 for a in v for b in w)
+
+
+@pytest.mark.parametrize('modul, oczekiwane', [(10, (1, 5)), (16, (4, 1)), (10 ** 6, (6, 15625)), (7, (0, 7))])
+def test_okno_dla(modul, oczekiwane):
+    assert ao.okno_dla(modul) == oczekiwane
+    assert ao.okno_dla(modul, 'parzystosc') == (1, 1)
+    assert ao.okno_dla(1 << (ao.MAKS_BITOW + 1)) is None
+
+
+def test_wagi_sumuja_sie_do_wygrywajacych():
+    for modul, prog in [(10, 3), (12, 5), (16, 4)]:
+        bity, nieparzysty = ao.okno_dla(modul)
+        wagi = ao.wagi_okna('prog', bity, modul, prog=prog)
+        assert wagi.sum() == ao.wygrywajace_reszty('prog', modul, prog=prog).sum()
+        assert wagi.max() <= nieparzysty
+
+
+# --- Zgodność ścieżki dokładnej z Monte Carlo na 256 bitach ---
+@pytest.mark.parametrize('modul, k, rodzaj, cel', [
+    (10, 1, 'prog', 0),
+    (10, 3, 'prog', 0),
+    (12, 2, 'prog', 0),
+    (16, 4, 'modulo', 3),
+    (1000, 5, 'prog', 0),
+    (2, 1, 'parzystosc', 1),
+])
+def test_dokladnie_zgodne_z_monte_carlo(modul, k, rodzaj, cel):
+    sekrety, wagi, nieparzysty, bity = _dokladnie(modul, k, rodzaj, cel)
+    p = ao.sukces_ataku(wagi, nieparzysty, sekrety, bity)
+    p_mc, blad = ao.sukces_ataku_mc(sekrety, modul, rodzaj, cel, prog=k, proby=PROBY)
+    assert abs(p - p_mc) <= 4 * blad
+    assert p >= ao.p_uczciwie(rodzaj, modul, cel, prog=k)
+
+
+def test_rozklad_zgodny_z_monte_carlo():
+    modul, k = 10, 2
+    sekrety, wagi, nieparzysty, bity = _dokladnie(modul, k, 'prog')
+    wygrywajace = ao.wygrywajace_reszty('prog', modul, prog=k)
+    rozklad = ao.rozklad_wyniku(wagi, nieparzysty, sekrety, bity, wygrywajace)
+    assert rozklad.sum() == pytest.approx(1.0)
+    assert rozklad[wygrywajace].sum() == pytest.approx(ao.sukces_ataku(wagi, nieparzysty, sekrety, bity))
+    rozklad_mc = ao.rozklad_wyniku_mc(sekrety, modul, 'prog', prog=k, proby=PROBY)
+    np.testing.assert_allclose(rozklad, rozklad_mc, atol=4 * np.sqrt(0.25 / PROBY))
+
+
+def test_bez_uczciwych():
+    sekrety = ao.sekrety_losowe(3)
+    # Każda reszta wygrywa - wynik pewny bez przeglądu
+    assert ao.bez_uczciwych(ao.sekrety_losowe(ao.MAKS_PRZEGLADU + 5), 3, prog=3) == 1.0
+    assert ao.bez_uczciwych(sekrety, 10, prog=3) in (0.0, 1.0)
+    with pytest.raises(ValueError):
+        ao.bez_uczciwych(ao.sekrety_losowe(ao.MAKS_PRZEGLADU + 1), 10, prog=3)
+
+
+def test_krzywa_dokladna_dla_duzego_n():
+    krzywa = ao.krzywa_ataku(10 ** 6, 8)
+    assert all(punkt['dokladny'] for punkt in krzywa)
+    p = [punkt['p_atak'] for punkt in krzywa]
+    assert all(a <= b for a, b in zip(p, p[1:]))
@@ -0,0 +1,95 @@
+import numpy as np
+
+import kolizje
+from magazyn import Magazyn, slowa_z_int
+
+
+def _skroty(n, ziarno):
+    rng = np.random.default_rng(ziarno)
+    return kolizje.skroty(rng.integers(0, 256, (n, 32), dtype=np.uint8))
+
+
+# --- Filtr Blooma ---
+def test_filtr_bez_falszywych_negatywow():
+    h1, h2, _ = _skroty(5000, 0)
+    filtr = kolizje.FiltrBlooma.dla(5000, fp=1e-3)
+    assert not filtr.sprawdz_i_dodaj(h1, h2).any()
+    assert filtr.sprawdz_i_dodaj(h1, h2).all()
+
+
+def test_filtr_czestosc_falszywych_trafien():
+    n = 20000
+    h1, h2, _ = _skroty(n, 1)
+    filtr = kolizje.FiltrBlooma.dla(n, fp=0.01)
+    filtr.sprawdz_i_dodaj(h1, h2)
+    nowe1, nowe2, _ = _skroty(n, 2)
+    zmierzone = filtr.sprawdz_i_dodaj(nowe1, nowe2).mean()
+    assert abs(filtr.fp(n) - 0.01) < 0.002
+    assert zmierzone < 2 * filtr.fp(n)
+
+
+def test_filtr_ograniczony_budzetem_pamieci():
+    filtr = kolizje.FiltrBlooma.dla(10 ** 9, fp=1e-4, pamiec_mb=1)
+    assert int(filtr.bity) == 8 * 2 ** 20
+    assert filtr.fp(10 ** 9) > kolizje.FP_OSTRZEZENIE
+
+
+def test_skroty_rozrozniaja_slowa_z_zerami():
+    # Słowa różniące się tylko najmłodszym bitem nie mogą dawać tych samych odcisków
+    odciski = kolizje.skroty(slowa_z_int(range(1000)))[2]
+    assert len(np.unique(odciski)) == 1000
+
+
+# --- Indeks na dysku ---
+def test_liczba_czesci_potega_dwojki():
+    assert kolizje.liczba_czesci(10) == kolizje.CZESCI
+    for n in (10 ** 8, 3 * 10 ** 8, 10 ** 10):
+        c = kolizje.liczba_czesci(n, pamiec_mb=64)
+        assert c >= kolizje.CZESCI and c & (c - 1) == 0
+        assert n / c * kolizje.BAJTY_SORTOWANIA <= 64 * 2 ** 20
+
+
+def test_indeks_grupuje_rowne_odciski(tmp_path):
+    indeks = kolizje.IndeksDyskowy(str(tmp_path / 'indeks'), czesci=4)
+    odciski = np.array([5, 2 ** 63 + 7, 5, 9, 2 ** 63 + 7, 5], dtype=np.uint64)
+    indeks.dopisz(odciski[:3], np.arange(3))
+    indeks.dopisz(odciski[3:], np.arange(3, 6))
+    indeks.zamknij()
+    grupy = [g.tolist() for c in range(4) for g in indeks.grupy(c)]
+    assert sorted(grupy) == [[0, 2, 5], [1, 4]]
+
+
+# --- Pełny przebieg ---
+def test_powtorzenia_zgodne_z_przegladem(tmp_path):
+    rng = np.random.default_rng(4)
+    n = 5000
+    slowa = rng.integers(0, 256, (n, 32), dtype=np.uint8)
+    # Powtórzenia w obrębie fragmentu, między fragmentami, potrójne i słowa zerowe
+    for zrodlo, cele in [(10, [11]), (20, [1500, 4000]), (3000, [4999])]:
+        slowa[cele] = slowa[zrodlo]
+    slowa[[100, 2600]] = 0
+
+    katalog = str(tmp_path / 'magazyn')
+    m = Magazyn.utworz(katalog, {'slowo': ('u1', (32,)), 'blok': ('<i8', ())})
+    m.dopisz({'slowo': slowa, 'blok': np.arange(n) * 10})
+
+    wynik, statystyki = kolizje.znajdz_powtorzenia(katalog, 'slowo', kolumny_id=['blok'], fragment=1000,
+                                                    katalog_roboczy=str(tmp_path / 'roboczy'), postep=False)
+
+    _, odwrotne, liczby = np.unique(slowa, axis=0, return_inverse=True, return_counts=True)
+    odwrotne = odwrotne.ravel()
+    oczekiwane = sorted(np.flatnonzero(odwrotne == g).tolist() for g in np.flatnonzero(liczby > 1))
+    assert sorted(wynik['wiersze']) == oczekiwane == [[10, 11], [20, 1500, 4000], [100, 2600], [3000, 4999]]
+    assert wynik['wystapienia'].tolist() == [3, 2, 2, 2]
+    zerowe = wynik[wynik['zerowe']]
+    assert zerowe['wiersze'].tolist() == [[100, 2600]] and zerowe['blok'].tolist() == [[1000, 26000]]
+    assert statystyki['kandydaci'] >= 5
+    assert statystyki['sortowane_czesci'] <= statystyki['czesci']
+
+
+def test_csv_jako_zrodlo(tmp_path):
+    sciezka = tmp_path / 'slowa.csv'
+    sciezka.write_text('iteracja,slowo\n1,0x01\n2,0x02\n3,0x01\n')
+    wynik, _ = kolizje.znajdz_powtorzenia(str(sciezka), 'slowo', postep=False)
+    assert wynik['wiersze'].tolist() == [[0, 2]]
+    assert wynik['iteracja'].tolist() == [['1', '3']]
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+
+from magazyn import Magazyn, slowa_modulo, slowa_na_hex, slowa_na_int, slowa_z_hex, slowa_z_int
+
+KOLUMNY = {'val': ('u1', ()), 'slowo': ('u1', (32,))}
+
+
+def _porcja(rng, n):
+    return {'val': rng.integers(0, 100, n, dtype=np.uint8),
+            'slowo': rng.integers(0, 256, (n, 32), dtype=np.uint8)}
+
+
+def test_dopisywanie_porcji(tmp_path):
+    rng = np.random.default_rng(0)
+    m = Magazyn.utworz(str(tmp_path / 'm'), KOLUMNY, metadane={'zrodlo': 'test'})
+    a, b = _porcja(rng, 5), _porcja(rng, 7)
+    m.dopisz(a)
+    m.dopisz(b, metadane={'porcje': 2})
+
+    # Odczyt nowym obiektem - stan tylko z manifestu i plików
+    m = Magazyn(str(tmp_path / 'm'))
+    assert m.wiersze == 12
+    assert m.metadane == {'zrodlo': 'test', 'porcje': 2}
+    np.testing.assert_array_equal(m.kolumna('val'), np.concatenate([a['val'], b['val']]))
+    np.testing.assert_array_equal(m.kolumna('slowo', 3, 9), np.concatenate([a['slowo'], b['slowo']])[3:9])
+    assert [len(f) for f in m.fragmenty('val', 5)] == [5, 5, 2]
+
+
+def test_smieci_po_przerwanym_zapisie_ignorowane(tmp_path):
+    rng = np.random.default_rng(1)
+    m = Magazyn.utworz(str(tmp_path / 'm'), KOLUMNY)
+    a = _porcja(rng, 4)
+    m.dopisz(a)
+    # Przerwany zapis: dane dopisane, manifest nie
+    with open(os.path.join(m.katalog, 'val.bin'), 'ab') as f:
+        f.write(b'\xff' * 3)
+    assert len(Magazyn(m.katalog).kolumna('val')) == 4
+
+    b = _porcja(rng, 2)
+    m.dopisz(b)
+    np.testing.assert_array_equal(Magazyn(m.katalog).kolumna('val'), np.concatenate([a['val'], b['val']]))
+
+
+def test_otworz_lub_utworz_nie_czysci_istniejacego(tmp_path):
+    m = Magazyn.otworz_lub_utworz(str(tmp_path / 'm'), KOLUMNY)
+    m.dopisz(_porcja(np.random.default_rng(2), 3))
+    ponownie = Magazyn.otworz_lub_utworz(str(tmp_path / 'm'), KOLUMNY)
+    assert ponownie.wiersze == 3 and ponownie.id == m.id
+
+
+def test_bledne_kolumny_odrzucone(tmp_path):
+    m = Magazyn.utworz(str(tmp_path / 'm'), KOLUMNY)
+    with pytest.raises(ValueError):
+        m.dopisz({'val': np.zeros(2)})
+    with pytest.raises(ValueError):
+        m.dopisz({'val': np.zeros(2), 'slowo': np.zeros((2, 31))})
+    with pytest.raises(ValueError):
+        m.dopisz({'val': np.zeros(2), 'slowo': np.zeros((3, 32))})
+    assert Magazyn(m.katalog).wiersze == 0
+
+
+def test_brak_manifestu(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Magazyn(str(tmp_path))
+
+
+# --- Słowa 256-bitowe ---
+def test_slowa_int_i_hex_w_obie_strony():
+    liczby = [0, 1, 2 ** 255 + 12345, 2 ** 256 - 1]
+    slowa = slowa_z_int(liczby)
+    assert slowa_na_int(slowa) == liczby
+    napisy = slowa_na_hex(slowa)
+    assert napisy[1] == '0x' + '0' * 63 + '1'
+    np.testing.assert_array_equal(slowa_z_hex(napisy), slowa)
+    # Bez prefiksu, wielkie litery i krótsze napisy (ścieżka ogólna)
+    np.testing.assert_array_equal(slowa_z_hex([s[2:].upper() for s in napisy]), slowa)
+    np.testing.assert_array_equal(slowa_z_hex(['0x1', 'ff']), slowa_z_int([1, 255]))
+
+
+def test_niepoprawny_hex_to_blad():
+    with pytest.raises(ValueError):
+        slowa_z_hex(['0x' + 'g' * 64])
+
+
+def test_slowa_modulo():
+    rng = np.random.default_rng(3)
+    liczby = [int.from_bytes(rng.bytes(32), 'big') for _ in range(50)]
+    for modul in (2, 10, 1_000_003):
+        assert slowa_modulo(slowa_z_int(liczby), modul).tolist() == [x % modul for x in liczby]
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import pamiec
+
+
+@pytest.fixture
+def magazyn_pamieci(tmp_path, monkeypatch):
+    """Pamięć w katalogu tymczasowym jako domyślna - także dla dekoratora."""
+    p = pamiec.Pamiec(katalog=str(tmp_path / 'pamiec'), limit_mb=1)
+    monkeypatch.setattr(pamiec, '_domyslna', p)
+    monkeypatch.setattr(pamiec, 'WYLACZONA', False)
+    return p
+
+
+# --- Obliczenie i odczyt ---
+def test_drugie_wywolanie_czyta_z_pamieci(magazyn_pamieci):
+    wywolania = []
+
+    @pamiec.zapamietaj(wersja=1)
+    def kwadrat(x):
+        wywolania.append(x)
+        return x * x
+
+    assert kwadrat(7) == 49
+    assert kwadrat(7) == 49
+    assert kwadrat(8) == 64
+    assert wywolania == [7, 8]
+    assert magazyn_pamieci.trafienia == 1
+
+
+def test_pomin_nie_wplywa_na_klucz(magazyn_pamieci):
+    wywolania = []
+
+    @pamiec.zapamietaj(wersja=1, pomin=('procesy',))
+    def suma(x, procesy=1):
+        wywolania.append(procesy)
+        return x + 1
+
+    suma(1, procesy=1)
+    suma(1, procesy=8)
+    assert wywolania == [1]
+
+
+def test_uszkodzony_wpis_liczony_od_nowa(magazyn_pamieci):
+    k = 'ab' * 32
+    magazyn_pamieci.zapisz(k, 1)
+    with open(magazyn_pamieci._sciezka(k), 'wb') as f:
+        f.write(b'\x80nie pickle')
+    assert magazyn_pamieci.pobierz_lub_oblicz(k, lambda: 2) == 2
+    assert magazyn_pamieci.pobierz(k) == (True, 2)
+
+
+# --- Unieważnianie ---
+def test_zmiana_pliku_uniewaznia_wynik(magazyn_pamieci, tmp_path):
+    sciezka = tmp_path / 'dane.csv'
+    sciezka.write_text('a\n1\n')
+
+    @pamiec.zapamietaj(wersja=1, pliki=('zrodlo',))
+    def wiersze(zrodlo):
+        with open(zrodlo) as f:
+            return len(f.readlines())
+
+    assert wiersze(str(sciezka)) == 2
+    sciezka.write_text('a\n1\n2\n')
+    assert wiersze(str(sciezka)) == 3
+
+
+def test_wersja_zmienia_klucz():
+    def f(x):
+        return x
+    assert pamiec.klucz(f, 1, {'x': 1}) != pamiec.klucz(f, 2, {'x': 1})
+    assert pamiec.klucz(f, 1, {'x': 1}) == pamiec.klucz(f, 1, {'x': 1})
+
+
+def test_tablice_kluczowane_po_tresci():
+    def f(x):
+        return x
+    a = np.arange(10)
+    b = a.copy()
+    b[3] = -1
+    assert pamiec.klucz(f, 1, {'x': a}) == pamiec.klucz(f, 1, {'x': a.copy()})
+    assert pamiec.klucz(f, 1, {'x': a}) != pamiec.klucz(f, 1, {'x': b})
+
+
+def test_memmap_kluczowany_po_pliku_i_wycinku(tmp_path):
+    def f(x):
+        return x
+    sciezka = str(tmp_path / 'kolumna.bin')
+    np.arange(1000, dtype=np.int64).tofile(sciezka)
+    mm = np.memmap(sciezka, dtype=np.int64, mode='r')
+    k_calosc = pamiec.klucz(f, 1, {'x': mm})
+    assert k_calosc != pamiec.klucz(f, 1, {'x': mm[10:20]})
+    assert pamiec.klucz(f, 1, {'x': mm[10:20]}) != pamiec.klucz(f, 1, {'x': mm[20:30]})
+    del mm
+
+    # Nadpisanie pliku (nowy mtime) unieważnia klucz, choć ścieżka i rozmiar są te same
+    time.sleep(0.01)
+    (np.arange(1000, dtype=np.int64) + 1).tofile(sciezka)
+    mm = np.memmap(sciezka, dtype=np.int64, mode='r')
+    assert pamiec.klucz(f, 1, {'x': mm}) != k_calosc
+
+
+# --- Blokady ---
+def test_blokada_wylaczna_i_zdejmowana_przez_wlasciciela(magazyn_pamieci):
+    blokada = magazyn_pamieci._sciezka('cd' * 32) + '.blokada'
+    token = magazyn_pamieci._zablokuj(blokada)
+    assert token
+    assert magazyn_pamieci._zablokuj(blokada) is None
+
+    # Cudzy token nie zdejmuje blokady
+    magazyn_pamieci._odblokuj(blokada, 'inny:token')
+    assert os.path.exists(blokada)
+    magazyn_pamieci._odblokuj(blokada, token)
+    assert not os.path.exists(blokada)
+
+
+def test_przeterminowana_blokada_przejmowana(magazyn_pamieci):
+    blokada = magazyn_pamieci._sciezka('ef' * 32) + '.blokada'
+    stary = magazyn_pamieci._zablokuj(blokada)
+    dawno = time.time() - pamiec.CZAS_BLOKADY - 1
+    os.utime(blokada, (dawno, dawno))
+
+    # Pierwsza próba zdejmuje pozostałość, kolejna zakłada nową blokadę
+    assert magazyn_pamieci._zablokuj(blokada) is None
+    nowy = magazyn_pamieci._zablokuj(blokada)
+    assert nowy and nowy != stary
+
+    # Spóźniony poprzedni właściciel nie zdejmuje cudzej blokady
+    magazyn_pamieci._odblokuj(blokada, stary)
+    assert magazyn_pamieci._token(blokada) == nowy
+
+
+def test_blokada_odswiezana_w_trakcie_obliczenia(magazyn_pamieci, monkeypatch):
+    monkeypatch.setattr(pamiec, 'ODSWIEZANIE_BLOKADY', 0.02)
+    k = '12' * 32
+    blokada = magazyn_pamieci._sciezka(k) + '.blokada'
+    czasy = []
+
+    def oblicz():
+        for _ in range(2):
+            czasy.append(os.stat(blokada).st_mtime_ns)
+            time.sleep(0.1)
+        return 1
+
+    assert magazyn_pamieci.pobierz_lub_oblicz(k, oblicz) == 1
+    assert czasy[1] > czasy[0]
+    assert not os.path.exists(blokada)
+
+
+def test_rownolegle_zadanie_liczone_raz(magazyn_pamieci):
+    k = '34' * 32
+    wywolania = []
+    wyniki = []
+
+    def oblicz():
+        wywolania.append(1)
+        time.sleep(0.3)
+        return 42
+
+    watki = [threading.Thread(target=lambda: wyniki.append(magazyn_pamieci.pobierz_lub_oblicz(k, oblicz)))
+             for _ in range(3)]
+    for w in watki:
+        w.start()
+    for w in watki:
+        w.join()
+    assert wyniki == [42, 42, 42]
+    assert len(wywolania) == 1
+
+
+# --- Uprawnienia i limit ---
+def test_katalog_zapisywalny_dla_innych_pomijany(tmp_path, capsys):
+    katalog = tmp_path / 'otwarty'
+    katalog.mkdir()
+    os.chmod(katalog, 0o777)
+    p = pamiec.Pamiec(katalog=str(katalog))
+    wywolania = []
+    for _ in range(2):
+        p.pobierz_lub_oblicz('56' * 32, lambda: wywolania.append(1))
+    assert len(wywolania) == 2
+    assert p.wpisy() == []
+    assert 'Pamięć wyłączona' in capsys.readouterr().err
+
+
+def test_pliki_tylko_dla_wlasciciela(magazyn_pamieci):
+    magazyn_pamieci.pobierz_lub_oblicz('78' * 32, lambda: 1)
+    assert os.stat(magazyn_pamieci.katalog).st_mode & 0o777 == 0o700
+    assert os.stat(magazyn_pamieci._sciezka('78' * 32)).st_mode & 0o777 == 0o600
+
+
+def test_przycinanie_usuwa_najdawniej_uzywane(magazyn_pamieci):
+    klucze = [f"{i:02x}" * 32 for i in range(3)]
+    for i, k in enumerate(klucze):
+        magazyn_pamieci.zapisz(k, bytes(1000))
+        os.utime(magazyn_pamieci._sciezka(k), (1000 + i, 1000 + i))
+    magazyn_pamieci.pobierz(klucze[0])  # odczyt odświeża mtime
+
+    rozmiar = magazyn_pamieci.wpisy()[0][1]
+    assert magazyn_pamieci.przytnij(2 * rozmiar) == 1
+    assert magazyn_pamieci.pobierz(klucze[1]) == (False, None)
+    assert magazyn_pamieci.pobierz(klucze[0])[0] and magazyn_pamieci.pobierz(klucze[2])[0]
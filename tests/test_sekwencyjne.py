@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from sekwencyjne import TestSekwencyjny as Sekwencyjny
+
+PRZEBIEGI = 200
+PORCJA = 10
+
+
+def _decyzje(p, ziarno):
+    """Decyzje testu (alfa = 0.05, beta = 0.2, e = 0.06) dla PRZEBIEGI strumieni z rozkładu binów p."""
+    rng = np.random.default_rng(ziarno)
+    decyzje, dlugosci = [], []
+    for _ in range(PRZEBIEGI):
+        test = Sekwencyjny(maks_probek=5000)
+        while test.decyzja is None:
+            biny = rng.choice(10, PORCJA, p=p)
+            test.aktualizuj(biny * 10 + rng.uniform(0, 10, PORCJA))
+        decyzje.append(test.decyzja)
+        dlugosci.append(test.n)
+    return np.array(decyzje), np.array(dlugosci)
+
+
+def test_bledy_pierwszego_rodzaju_ponizej_alfa():
+    decyzje, dlugosci = _decyzje(np.full(10, 0.1), ziarno=1)
+    assert not (decyzje == 'limit').any()
+    assert (decyzje == 'obciazony').mean() <= 0.05
+    assert dlugosci.mean() < 500  # krócej niż stałe N z generate_stats.ts
+
+
+def test_bledy_drugiego_rodzaju_ponizej_beta():
+    p = np.full(10, (1 - 0.16) / 9)
+    p[0] = 0.16
+    decyzje, dlugosci = _decyzje(p, ziarno=2)
+    assert (decyzje == 'jednostajny').mean() <= 0.2
+    assert dlugosci.mean() < 500
+
+
+def test_silne_obciazenie_odrzucane_szybko():
+    test = Sekwencyjny()
+    assert test.aktualizuj(np.full(200, 5.0)) == 'obciazony'
+    assert test.p_wartosc() <= test.alfa
+
+
+def test_decyzja_ostateczna():
+    test = Sekwencyjny()
+    test.aktualizuj(np.full(200, 5.0))
+    # Kolejne porcje nie zmieniają decyzji ani liczności
+    assert test.aktualizuj(np.arange(0, 100, 0.01)) == 'obciazony'
+    assert test.n == 200
+
+
+def test_limit_probek():
+    test = Sekwencyjny(maks_probek=20)
+    assert test.aktualizuj(np.arange(5, 100, 10)) is None
+    assert test.aktualizuj(np.arange(5, 100, 10)) == 'limit'
+
+
+@pytest.mark.parametrize('tolerancja', [0, 0.1, 0.5, -0.01])
+def test_tolerancja_poza_zakresem(tolerancja):
+    with pytest.raises(ValueError):
+        Sekwencyjny(biny=10, tolerancja=tolerancja)
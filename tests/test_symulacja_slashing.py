@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import symulacja_slashing as ss
+
+MALA = {'uczestnicy': 200, 'rundy': 5, 'odstep_rund': 600.0, 'offline': 0.05, 'ziarno': 7}
+
+
+@pytest.fixture(scope='module')
+def symulacja():
+    return ss.Symulacja(MALA).uruchom()
+
+
+# --- Kolejki ---
+def test_paczka_wydaje_transakcje_w_kolejnosci_czasu():
+    czas = np.array([5.0, 1.0, 3.0, 9.0])
+    paczka = ss.Paczka(czas, np.zeros(4, np.int8), np.arange(4), np.full(4, -1))
+    assert paczka.nastepny == 1.0
+    assert paczka.pobierz_do(4.0)[1].tolist() == [1, 2]
+    assert paczka.nastepny == 5.0
+    assert paczka.pobierz_do(100.0)[1].tolist() == [0, 3]
+    assert paczka.nastepny is None
+
+
+def test_mempool_bierze_najwyzszy_priorytet_do_limitu_gazu():
+    rng = np.random.default_rng(0)
+    mempool = ss.Mempool(np.random.default_rng(1), 3_000_000)
+    for blok in range(100):
+        k = int(rng.integers(0, 120))
+        mempool.dodaj(rng.integers(0, 3, k).astype(np.int8), np.arange(k) + 1000 * blok, np.full(k, -1))
+        # Przegląd: wszystkie oczekujące po priorytecie malejąco, prefiks mieszczący się w limicie
+        priorytet, typ, ucz, _ = (np.concatenate(kolumna) for kolumna in zip(*mempool.serie))
+        kolejnosc = np.argsort(-priorytet, kind='stable')
+        miesci = int(np.searchsorted(np.cumsum(ss.GAZ_TYPU[typ[kolejnosc]]), 3_000_000, side='right'))
+        oczekujace = len(priorytet)
+
+        typ_bloku, ucz_bloku, _ = mempool.zdejmij()
+        assert ucz_bloku.tolist() == ucz[kolejnosc[:miesci]].tolist()
+        assert ss.GAZ_TYPU[typ_bloku].sum() <= 3_000_000
+        assert len(mempool) == oczekujace - miesci
+        assert len(mempool.serie) <= ss.MAKS_SERII
+
+
+# --- Kolejność zdarzeń w symulacji ---
+def test_wszyscy_rozstrzygnieci(symulacja):
+    u, s = symulacja.u, symulacja.statystyki
+    assert u.rozstrzygniety.all()
+    assert s['reveal'] + s['slash'] == len(u.commit)
+    assert symulacja.slashe.sum() == s['slash']
+
+
+def test_commit_przed_rozstrzygnieciem(symulacja):
+    u = symulacja.u
+    # Commit rundy r najwcześniej w jej oknie; reveal/slash w bloku po commicie
+    assert (u.commit >= u.runda * MALA['odstep_rund']).all()
+    assert (u.termin == u.commit + ss.DOMYSLNE['czas_reveal']).all()
+    assert (u.koniec > u.commit).all()
+
+
+def test_slash_dopiero_po_terminie(symulacja):
+    u = symulacja.u
+    # Kontrakt: slash tylko gdy block.timestamp > revealDeadline
+    assert (u.koniec[u.ukarany] > u.termin[u.ukarany]).all()
+
+
+def test_gracze_offline_ukarani(symulacja):
+    u = symulacja.u
+    assert u.ukarany[np.isinf(u.opoznienie)].all()
+    # Kto zdążył przed terminem, nie mógł zostać ukarany
+    assert not u.ukarany[u.commit + u.opoznienie < u.termin - ss.DOMYSLNE['czas_bloku']].any()
+
+
+def test_deterministyczna_dla_ziarna(symulacja):
+    assert ss.Symulacja(MALA).uruchom().podsumowanie() == symulacja.podsumowanie()
+
+
+def test_bez_slasherow_spoznione_reveal_przechodza():
+    sym = ss.Symulacja(dict(MALA, slasherzy=0, offline=0.0, mediana_reveal=600.0)).uruchom()
+    s = sym.statystyki
+    assert s['slash'] == 0 and s['reveal'] == len(sym.u.commit)
+    assert s['reveal_po_terminie'] > 0
+
+
+def test_rozlozone_rundy_bez_zatoru(symulacja):
+    wynik = symulacja.podsumowanie()
+    assert wynik['pelne_bloki'] == 0
+    assert wynik['rundy_niezamkniete'] == 0
+    # Czas otwarcia od startu rundy: okno commit + revealDuration + kilka bloków
+    assert wynik['czas_otwarcia_max_s'] < ss.DOMYSLNE['okno_commit'] + ss.DOMYSLNE['czas_reveal'] + 200
+
+
+def test_limit_gazu_przestrzegany():
+    # Jedna runda, blok mieści ~10 commitów - mempool czeka przez wiele bloków
+    sym = ss.Symulacja({'uczestnicy': 300, 'rundy': 1, 'limit_gazu_bloku': 1_500_000, 'ziarno': 3}).uruchom()
+    wynik = sym.podsumowanie()
+    assert wynik['pelne_bloki'] > 0
+    commity_w_bloku = np.unique(sym.u.commit[np.isfinite(sym.u.commit)], return_counts=True)[1]
+    assert commity_w_bloku.max() <= 1_500_000 // ss.GAZ_COMMIT
@@ -0,0 +1,247 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import obliczenia as obl
+import pamiec
+from leniwe import leniwy_import
+
+# Globalna analiza wrażliwości (indeksy Sobola) wniosków z zakładki 6.
+#
+# "RANDAO tańszy poniżej ~N graczy" i "slashing czyni atak nieopłacalnym" zależą naraz od ceny
+# gazu, kursów ETH/LINK, opłaty Chainlink, wpisowego, kary, puli i liczby graczy - suwaki
+# w dashboardzie zmieniają je pojedynczo. Tutaj wszystkie parametry losujemy razem z
+# zaszumionego (scrambled) ciągu Sobola w schemacie Saltellego: macierze A i B (N x d) oraz
+# d macierzy AB_i (A z kolumną i z B) - razem N(d+2) ewaluacji modelu, liczonego wektorowo.
+# Estymatory Jansena:
+#   S_i  = 1 - E[(f(B) - f(AB_i))^2] / 2V     (efekt samego parametru i)
+#   ST_i =     E[(f(A) - f(AB_i))^2] / 2V     (efekt łączny, z interakcjami)
+# Sumy potrzebne estymatorom są addytywne, więc bloki ciągu (fast_forward) liczą procesy
+# niezależnie, a wyniki scalamy - jak w rownolegle.py.
+#
+#   python wrazliwosc.py                       # N = 2^17 -> ~1.3 mln ewaluacji
+#   python wrazliwosc.py --n 1048576 --procesy 8 --csv wrazliwosc.csv
+
+qmc = leniwy_import("scipy.stats.qmc")
+
+# (nazwa, minimum, maksimum, skala, opis) - skala 'log' dla parametrów rozpiętych na rzędy wielkości
+PARAMETRY = [
+    ('cena_gazu', 0.5, 100.0, 'log', 'Cena gazu (Gwei)'),
+    ('eth_usd', 1500.0, 6000.0, 'lin', 'Kurs ETH (USD)'),
+    ('link_usd', 5.0, 40.0, 'lin', 'Kurs LINK (USD)'),
+    ('oplata_link', 0.1, 2.0, 'lin', 'Opłata Chainlink (LINK)'),
+    ('wpisowe', 0.01, 10.0, 'log', 'Wpisowe / kaucja (ETH)'),
+    ('kara_pct', 0.0, 200.0, 'lin', 'Kara za nieujawnienie (% puli)'),
+    ('pula', 1.0, 1000.0, 'log', 'Pula nagród (ETH)'),
+    ('gracze', 2.0, 1000.0, 'log', 'Liczba graczy'),
+]
+
+# Zużycie gazu z pomiarów (dashboard podstawia wartości z wczytanych CSV)
+STALE = {
+    'gaz_randao_gracz': 175157,     # commit + reveal jednego gracza (wyniki_badan.csv)
+    'gaz_final_a': 10782.4,         # getFinalRandom(): a * n + b (wyniki_skalowalnosc.csv)
+    'gaz_final_b': 13625.0,
+    'gaz_vrf_gracz': 56328,         # enter() w loterii VRF (tabela_loteria_final)
+    'gaz_vrf_losowanie': 176285,    # request + callback (generuj_koszty_ekonomiczne.py)
+}
+
+WYJSCIA = {
+    'roznica_kosztu': 'Koszt rundy VRF - RANDAO (USD)',
+    'randao_tansze': 'RANDAO tańszy (0/1)',
+    'zysk_ataku': 'Oczekiwany zysk ataku last revealer (ETH/rundę)',
+    'atak_oplacalny': 'Atak opłacalny (0/1)',
+}
+
+N_DOMYSLNE = 1 << 17
+FRAGMENT = 1 << 14                 # wierszy macierzy A/B na zadanie (potęga 2 - zachowuje równomierność)
+PROG_WIELOPROCESOWY = 1 << 16      # poniżej tylu wierszy liczymy w bieżącym procesie
+ZIARNO = 2024
+
+
+# --- 1. MODEL ---
+def przeskaluj(u, parametry=PARAMETRY):
+    """Punkty z [0,1)^d -> {nazwa: wartości} wg zakresów i skal parametrów."""
+    wynik = {}
+    for j, (nazwa, lo, hi, skala, _) in enumerate(parametry):
+        if skala == 'log':
+            wynik[nazwa] = lo * (hi / lo) ** u[:, j]
+        else:
+            wynik[nazwa] = lo + (hi - lo) * u[:, j]
+    return wynik
+
+
+def model(p, stale=STALE):
+    """Wektorowo: koszt rundy obu schematów (USD) i bilans ataku last revealer (ETH).
+
+    RANDAO: n graczy robi commit + reveal, a getFinalRandom() kosztuje a*n + b.
+    VRF: n wejść + jedno losowanie (request + callback) + opłata Chainlink w LINK.
+    Atak: pojedynczy ostatni ujawniający wstrzymuje sekret, gdy wynik uczciwy go nie wybiera,
+    a wynik bez jego sekretu tak - P = (1 - 1/n) / n; wtedy zgarnia pulę, ale traci kaucję
+    i karę (% puli), jak w obliczenia.ekonomia_ataku.
+    """
+    n = p['gracze']
+    usd_za_gaz = p['cena_gazu'] * 1e-9 * p['eth_usd']
+    randao = (n * stale['gaz_randao_gracz'] + stale['gaz_final_a'] * n + stale['gaz_final_b']) * usd_za_gaz
+    vrf = (n * stale['gaz_vrf_gracz'] + stale['gaz_vrf_losowanie']) * usd_za_gaz + p['oplata_link'] * p['link_usd']
+    roznica = vrf - randao
+
+    bilans = p['pula'] - p['wpisowe'] - p['pula'] * p['kara_pct'] / 100
+    zysk = (1 - 1 / n) / n * bilans
+    return {
+        'roznica_kosztu': roznica,
+        'randao_tansze': (roznica > 0).astype(float),
+        'zysk_ataku': zysk,
+        'atak_oplacalny': (bilans > 0).astype(float),
+    }
+
+
+# --- 2. SUMY SALTELLEGO DLA BLOKU ---
+def statystyki_bloku(zadanie):
+    """Sumy estymatorów Jansena dla wierszy [start, start + n) ciągu Sobola."""
+    start, n, ziarno, parametry, stale = zadanie
+    d = len(parametry)
+    sobol = qmc.Sobol(d=2 * d, scramble=True, seed=ziarno)
+    if start:
+        sobol.fast_forward(start)
+    u = sobol.random(n)
+    a, b = u[:, :d], u[:, d:]
+
+    f_a = model(przeskaluj(a, parametry), stale)
+    f_b = model(przeskaluj(b, parametry), stale)
+    wynik = {w: {'n': n, 'suma_a': 0.0, 'suma_t': np.zeros(d), 'suma_s': np.zeros(d)} for w in f_a}
+    for w in f_a:
+        # Wariancja z A i B razem (2n wartości) - momenty do scalenia metodą Chana
+        f = np.concatenate([f_a[w], f_b[w]])
+        wynik[w]['m'] = 2 * n
+        wynik[w]['srednia'] = f.mean()
+        wynik[w]['m2'] = ((f - f.mean()) ** 2).sum()
+
+    for i in range(d):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        f_ab = model(przeskaluj(ab, parametry), stale)
+        for w in f_a:
+            wynik[w]['suma_t'][i] = ((f_a[w] - f_ab[w]) ** 2).sum()
+            wynik[w]['suma_s'][i] = ((f_b[w] - f_ab[w]) ** 2).sum()
+    return wynik
+
+
+def scal(stany):
+    wynik = {}
+    for stan in stany:
+        for w, s in stan.items():
+            if w not in wynik:
+                wynik[w] = {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in s.items()}
+                continue
+            r = wynik[w]
+            delta = s['srednia'] - r['srednia']
+            m = r['m'] + s['m']
+            r['m2'] += s['m2'] + delta ** 2 * r['m'] * s['m'] / m
+            r['srednia'] += delta * s['m'] / m
+            r['m'] = m
+            r['n'] += s['n']
+            r['suma_t'] += s['suma_t']
+            r['suma_s'] += s['suma_s']
+    return wynik
+
+
+def indeksy(stan, parametry=PARAMETRY):
+    """Tabela S1/ST dla każdego wyjścia, posortowana wg ST malejąco."""
+    wiersze = []
+    for w, s in stan.items():
+        wariancja = s['m2'] / s['m']
+        for i, (nazwa, *_, opis) in enumerate(parametry):
+            if wariancja > 0:
+                s1 = 1 - s['suma_s'][i] / (2 * s['n'] * wariancja)
+                st = s['suma_t'][i] / (2 * s['n'] * wariancja)
+            else:
+                s1 = st = 0.0  # wyjście stałe w całej przestrzeni - nic go nie zmienia
+            wiersze.append({'wyjscie': w, 'parametr': nazwa, 'opis': opis, 'S1': s1, 'ST': st,
+                            'srednia': s['srednia'], 'odchylenie': np.sqrt(wariancja)})
+    df = pd.DataFrame(wiersze)
+    return df.sort_values(['wyjscie', 'ST'], ascending=[True, False], ignore_index=True)
+
+
+# --- 3. ANALIZA ---
+@pamiec.zapamietaj(wersja=1, pomin=('procesy',))
+def analiza(n=N_DOMYSLNE, ziarno=ZIARNO, procesy=None, fragment=FRAGMENT, parametry=PARAMETRY, stale=STALE):
+    """Indeksy Sobola dla N wierszy (N zaokrąglone w górę do potęgi 2) -> słownik z tabelą i liczbą ewaluacji."""
+    n = 1 << max(int(n) - 1, 1).bit_length()
+    fragment = min(1 << max(int(fragment) - 1, 1).bit_length(), n)
+    parametry = [tuple(p) for p in parametry]
+    zadania = [(s, fragment, ziarno, parametry, stale) for s in range(0, n, fragment)]
+
+    start = time.perf_counter()
+    if procesy == 1 or n < PROG_WIELOPROCESOWY or len(zadania) == 1:
+        stany = list(map(statystyki_bloku, zadania))
+    else:
+        with ProcessPoolExecutor(max_workers=procesy) as pula:
+            stany = list(pula.map(statystyki_bloku, zadania))
+    stan = scal(stany)
+
+    return {
+        'indeksy': indeksy(stan, parametry),
+        'n': n,
+        'ewaluacje': n * (len(parametry) + 2),
+        'czas': time.perf_counter() - start,
+        # Udział przestrzeni parametrów, w którym wniosek zachodzi (średnia wskaźnika 0/1)
+        'udzial_randao_tansze': stan['randao_tansze']['srednia'],
+        'udzial_atak_oplacalny': stan['atak_oplacalny']['srednia'],
+    }
+
+
+def ranking(wynik, wyjscie):
+    """Parametry jednego wyjścia od najważniejszego (ST), z udziałem interakcji ST - S1."""
+    df = wynik['indeksy']
+    df = df[df['wyjscie'] == wyjscie].copy()
+    df['interakcje'] = (df['ST'] - df['S1']).clip(lower=0)
+    return df[['parametr', 'opis', 'S1', 'ST', 'interakcje']].reset_index(drop=True)
+
+
+def stale_z_pomiarow(df_costs, df_scalability, stale=STALE):
+    """STALE z gazem podmienionym na wartości z wczytanych CSV (dashboard i raport), gdy są dostępne."""
+    stale = dict(stale)
+    if obl.ma_kolumne(df_scalability, 'players'):
+        trend = obl.analiza_skalowalnosci(df_scalability)['trend']
+        if trend is not None:
+            stale['gaz_final_a'], stale['gaz_final_b'] = float(trend[0]), float(trend[1])
+    if obl.ma_kolumne(df_costs, 'randao_total_gas'):
+        stale['gaz_randao_gracz'] = float(df_costs['randao_total_gas'].mean())
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indeksy Sobola (Saltelli + Jansen) dla kosztów i opłacalności ataku")
+    parser.add_argument("--n", type=int, default=N_DOMYSLNE, help="wiersze macierzy A/B (potęga 2)")
+    parser.add_argument("--ziarno", type=int, default=ZIARNO)
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--fragment", type=int, default=FRAGMENT, help="wierszy na zadanie")
+    parser.add_argument("--csv", help="zapis tabeli indeksów")
+    args = parser.parse_args()
+
+    try:
+        wynik = analiza(args.n, args.ziarno, args.procesy, args.fragment)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"N = {wynik['n']:,}, {wynik['ewaluacje']:,} ewaluacji modelu, czas {wynik['czas']:.2f}s")
+    print(f"RANDAO tańszy w {wynik['udzial_randao_tansze']:.1%} przestrzeni parametrów, "
+          f"atak opłacalny w {wynik['udzial_atak_oplacalny']:.1%}")
+    for wyjscie, opis in WYJSCIA.items():
+        print(f"\n{opis}:")
+        print(f"  {'parametr':<14} {'S1':>7} {'ST':>7}")
+        for _, r in ranking(wynik, wyjscie).iterrows():
+            print(f"  {r['parametr']:<14} {r['S1']:7.3f} {r['ST']:7.3f}")
+
+    if args.csv:
+        wynik['indeksy'].to_csv(args.csv, index=False)
+        print(f"\nZapisano: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
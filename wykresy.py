@@ -0,0 +1,271 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from obliczenia import KATEGORIE_RYZYKA, RYZYKO_RANDAO, RYZYKO_VRF, qq_jednostajny
+
+# Wykresy wspólne dla dashboardu (st.pyplot) i raportu wsadowego (raport.py).
+# Każda funkcja zwraca gotową figurę matplotlib - wyświetlenie/zapis robi wywołujący.
+
+
+def wykres_kosztow(df_costs, koszty):
+    """Przebieg kosztów RANDAO i VRF w kolejnych iteracjach wraz ze średnimi."""
+    fig, ax = plt.subplots(figsize=(12, 5))
+
+    ax.plot(
+        df_costs['iteracja'],
+        df_costs['randao_total_gas'],
+        label='RANDAO (Total)',
+        marker='o',
+        linewidth=2,
+        color='#3498db'
+    )
+    ax.plot(
+        df_costs['iteracja'],
+        df_costs['vrf_request_gas'] + df_costs['vrf_callback_gas'],
+        label='VRF (Total)',
+        marker='s',
+        linewidth=2,
+        color='#2ecc71'
+    )
+
+    # Średnie linie
+    ax.axhline(
+        y=koszty['avg_randao'],
+        color='#3498db',
+        linestyle='--',
+        alpha=0.5,
+        label=f"RANDAO avg: {int(koszty['avg_randao']):,}"
+    )
+    ax.axhline(
+        y=koszty['avg_vrf'],
+        color='#2ecc71',
+        linestyle='--',
+        alpha=0.5,
+        label=f"VRF avg: {int(koszty['avg_vrf']):,}"
+    )
+
+    ax.set_xlabel("Numer próby", fontsize=12)
+    ax.set_ylabel("Zużycie gazu (gas)", fontsize=12)
+    ax.set_title("Porównanie kosztów Gas w kolejnych iteracjach", fontsize=14, fontweight='bold')
+    ax.legend(loc='best')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def wykres_histogramow(randao_vals, vrf_vals):
+    """Histogramy wartości 0-99 z linią rozkładu jednostajnego."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+
+    for ax, vals, nazwa, kolor in [
+        (ax1, randao_vals, "RANDAO", '#3498db'),
+        (ax2, vrf_vals, "VRF", '#2ecc71'),
+    ]:
+        ax.hist(vals, bins=20, color=kolor, alpha=0.7, edgecolor='black')
+        ax.set_title(f"{nazwa} - Rozkład wartości", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Wartość (0-99)")
+        ax.set_ylabel("Częstość")
+        ax.axhline(y=len(vals)/20, color='red', linestyle='--', label='Oczekiwane (jednostajny)')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def wykres_qq(randao_vals, vrf_vals):
+    """Q-Q plot względem rozkładu jednostajnego."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+
+    for ax, vals, nazwa in [(ax1, randao_vals, "RANDAO"), (ax2, vrf_vals, "VRF")]:
+        osm, osr, slope, intercept = qq_jednostajny(vals)
+        ax.plot(osm, osr, 'bo')
+        ax.plot(osm, slope * osm + intercept, 'r-')
+        ax.set_xlabel("Theoretical quantiles")
+        ax.set_ylabel("Ordered Values")
+        ax.set_title(f"{nazwa} - Q-Q Plot", fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def wykres_ryzyka():
+    """Porównanie poziomu ryzyka w czterech kategoriach bezpieczeństwa."""
+    x = np.arange(len(KATEGORIE_RYZYKA))
+    width = 0.35
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+
+    ax.bar(x - width/2, RYZYKO_RANDAO, width, label='RANDAO', color='#3498db', alpha=0.8)
+    ax.bar(x + width/2, RYZYKO_VRF, width, label='VRF', color='#2ecc71', alpha=0.8)
+
+    ax.set_ylabel('Poziom ryzyka (%)', fontsize=12)
+    ax.set_title('Porównanie ryzyka bezpieczeństwa', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(KATEGORIE_RYZYKA)
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
+    return fig
+
+
+def wykres_skalowalnosci(skal):
+    """Zmierzony koszt RANDAO, linia trendu i stały koszt VRF."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    players = skal['players']
+    ax.plot(players, skal['gas_total'], marker='o', linewidth=2, markersize=8, color='#3498db', label='RANDAO (measured)')
+
+    # Linia trendu (regresja liniowa)
+    if skal['trend'] is not None:
+        a, b = skal['trend']
+        ax.plot(players, a * players + b, "--", color='red', alpha=0.7, label=f'Trend: y = {a:.0f}x + {b:.0f}')
+
+    # Teoretyczny VRF (stała linia)
+    ax.axhline(y=skal['vrf_const'], color='#2ecc71', linestyle='--', linewidth=2, label='VRF (constant O(1))')
+
+    ax.set_xlabel("Liczba graczy", fontsize=12)
+    ax.set_ylabel("Zużycie gazu (gas)", fontsize=12)
+    ax.set_title("Skalowalność: RANDAO O(n) vs VRF O(1)", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def wykres_ataku_ostatniego(krzywa):
+    """P(wygrana) koalicji last revealer vs gra uczciwa (atak_ostatniego.krzywa_ataku); punkty Monte Carlo z ±2 SE."""
+    fig, ax = plt.subplots(figsize=(10, 5))
+
+    k = [w['atakujacy'] for w in krzywa]
+    ax.errorbar(k, [100 * w['p_atak'] for w in krzywa], yerr=[200 * w.get('blad', 0) for w in krzywa], marker='o',
+                linewidth=2, capsize=3, color='#e74c3c', label='RANDAO z wstrzymaniem reveal')
+    ax.plot(k, [100 * w['p_uczciwie'] for w in krzywa], marker='s', linewidth=2, color='#3498db', linestyle='--', label='Gra uczciwa (k/n)')
+
+    ax.set_xlabel('Liczba atakujących ujawniających na końcu (k)', fontsize=12)
+    ax.set_ylabel('P(zwycięzca w koalicji) (%)', fontsize=12)
+    metoda = 'dokładnie (WHT)' if all(w.get('dokladny', True) for w in krzywa) else 'Monte Carlo, 256 bitów'
+    ax.set_title(f'Atak last revealer - prawdopodobieństwo ({metoda})', fontsize=14, fontweight='bold')
+    ax.set_ylim(0, 105)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def wykres_sybil(wyniki):
+    """Atak Sybil: P(wygrana) i spalona kaucja w funkcji liczby kontrolowanych adresów."""
+    fig, ax = plt.subplots(figsize=(10, 5))
+
+    m = wyniki['adresy']
+    ax.plot(m, 100 * wyniki['p_wygrana'], marker='o', linewidth=2, color='#e74c3c', label='P(wygrana) - najlepszy podzbiór')
+    ax.plot(m, 100 * wyniki['p_oplacalna'], marker='^', linewidth=2, color='#e67e22', label='P(opłacalna wygrana)')
+    ax.plot(m, 100 * wyniki['p_uczciwie'], marker='s', linewidth=2, color='#3498db', linestyle='--', label='Gra uczciwa (m/n)')
+    ax.set_xlabel('Liczba adresów atakującego (m)', fontsize=12)
+    ax.set_ylabel('Prawdopodobieństwo (%)', fontsize=12)
+    ax.set_ylim(0, 105)
+    ax.grid(True, alpha=0.3)
+
+    ax2 = ax.twinx()
+    ax2.bar(m, wyniki['spalona_kaucja'], alpha=0.25, color='#7f8c8d', label='Spalona kaucja (ETH/runda)')
+    ax2.set_ylabel('Spalona kaucja (ETH)', fontsize=12)
+
+    linie, etykiety = ax.get_legend_handles_labels()
+    linie2, etykiety2 = ax2.get_legend_handles_labels()
+    ax.legend(linie + linie2, etykiety + etykiety2, loc='center right')
+    ax.set_title('Atak Sybil na RANDAO (2^m podzbiorów)', fontsize=14, fontweight='bold')
+    return fig
+
+
+def wykres_autokorelacji(wyniki):
+    """ACF z pasmami istotności i periodogram z progiem łącznym (autokorelacja.test) dla każdego strumienia."""
+    fig, osie = plt.subplots(2, len(wyniki), figsize=(7 * len(wyniki), 8), squeeze=False)
+
+    for (ax1, ax2), (nazwa, w) in zip(osie.T, wyniki.items()):
+        ax1.vlines(w['opoznienia'], 0, w['acf'], color='#3498db')
+        ax1.plot(w['opoznienia'], w['acf'], 'o', color='#3498db', markersize=3)
+        ax1.axhspan(-w['pasmo'], w['pasmo'], color='#95a5a6', alpha=0.2, label='Pasmo pojedyncze')
+        for znak in (-1, 1):
+            ax1.axhline(znak * w['pasmo_laczne'], color='#e74c3c', linestyle='--',
+                        label='Pasmo łączne (wszystkie opóźnienia)' if znak > 0 else None)
+        ax1.axhline(0, color='black', linewidth=0.8)
+        ax1.set_xlabel('Opóźnienie (rundy)')
+        ax1.set_ylabel('Autokorelacja r_k')
+        ax1.set_title(f"{nazwa} - ACF (n = {w['n']:,})", fontsize=14, fontweight='bold')
+        ax1.legend(fontsize=9)
+        ax1.grid(True, alpha=0.3)
+
+        ax2.plot(w['czestotliwosci'], w['moc'], color='#2ecc71', linewidth=1)
+        ax2.axhline(1, color='black', linewidth=0.8)
+        ax2.axhline(w['prog_mocy'], color='#e74c3c', linestyle='--', label='Próg okresowości')
+        ax2.set_xlabel('Częstotliwość (cykle na rundę)')
+        ax2.set_ylabel('Moc znormalizowana')
+        ax2.set_title(f"{nazwa} - periodogram ({w['okna']} okien)", fontsize=14, fontweight='bold')
+        ax2.legend(fontsize=9)
+        ax2.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def wykres_wrazliwosci(indeksy, opisy):
+    """Indeksy Sobola S1 i ST parametrów dla każdego wyjścia modelu (wrazliwosc.analiza)."""
+    fig, osie = plt.subplots(1, len(opisy), figsize=(6 * len(opisy), 4.5), squeeze=False, sharex=True)
+
+    for ax, (wyjscie, opis) in zip(osie[0], opisy.items()):
+        df = indeksy[indeksy['wyjscie'] == wyjscie].sort_values('ST')
+        y = np.arange(len(df))
+        ax.barh(y + 0.2, df['ST'].clip(lower=0), height=0.4, color='#e74c3c', label='ST (łączny)')
+        ax.barh(y - 0.2, df['S1'].clip(lower=0), height=0.4, color='#3498db', label='S1 (pierwszego rzędu)')
+        ax.set_yticks(y)
+        ax.set_yticklabels(df['parametr'])
+        ax.set_xlim(0, 1.05)
+        ax.set_xlabel('Udział wariancji')
+        ax.set_title(opis, fontsize=12, fontweight='bold')
+        ax.grid(True, axis='x', alpha=0.3)
+    osie[0][0].legend(loc='lower right', fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+
+def wykres_projekcji_loterii(proj):
+    """Koszt rundy i koszt na gracza obu loterii w funkcji liczby graczy (projekcja_loterii.projekcja)."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    n = proj['gracze']
+
+    for ax, dzielnik, tytul in [(ax1, 1, 'Koszt całej rundy'), (ax2, n, 'Koszt na gracza')]:
+        ax.plot(n, proj['usd_randao'] / dzielnik, linewidth=2, color='#3498db', label='LotteryRandao')
+        ax.plot(n, proj['usd_vrf'] / dzielnik, linewidth=2, color='#2ecc71', label='LotteryVRF (+ opłata LINK)')
+        ax.axvline(proj['prog'], color='#34495e', linestyle='--', label=f"Przełamanie: ~{proj['prog']:.0f} graczy")
+        ax.axvspan(proj['n_blok'], n[-1], color='#e74c3c', alpha=0.12,
+                   label=f"pickWinner RANDAO > limit bloku (n > {proj['n_blok']:,})")
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Liczba graczy', fontsize=12)
+        ax.set_ylabel('USD', fontsize=12)
+        ax.set_title(tytul, fontsize=14, fontweight='bold')
+        ax.grid(True, which='both', alpha=0.3)
+    ax1.legend(fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+
+def wykres_progu_loterii(powierzchnia, rynek):
+    """Próg opłacalności n* (RANDAO tańszy poniżej) na siatce cena gazu x kurs LINK."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    g, link = powierzchnia['ceny_gazu'], powierzchnia['ceny_link']
+    log_prog = np.log10(np.clip(powierzchnia['prog'].T, 1, None))
+    mapa = ax.contourf(g, link, log_prog, levels=30, cmap='viridis')
+    linie = ax.contour(g, link, log_prog, levels=np.log10([3, 10, 30, 100, 300, 1000]), colors='white', linewidths=1)
+    ax.clabel(linie, fmt=lambda v: f"{10 ** v:.0f}", fontsize=9)
+    pasek = fig.colorbar(mapa, ax=ax)
+    pasek.set_label('log10(n*) - liczba graczy')
+
+    ax.scatter([rynek['cena_gazu']], [rynek['link_usd']], color='#e74c3c', s=80, zorder=5, edgecolors='white',
+               label='Rynek bieżący')
+    ax.set_xscale('log')
+    ax.set_xlabel('Cena gazu (Gwei)', fontsize=12)
+    ax.set_ylabel('Kurs LINK (USD)', fontsize=12)
+    ax.set_title('Punkt przełamania RANDAO vs VRF (loteria)', fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right')
+    return fig
@@ -0,0 +1,136 @@
+import numpy as np
+
+from leniwe import leniwy_import
+from obliczenia import qq_jednostajny
+
+# Odpowiedniki wykresów z wykresy.py renderowane w przeglądarce (plotly + WebGL).
+#
+# st.pyplot rysuje figurę matplotlib na serwerze i wysyła PNG przy każdym rerunie - przy
+# długich seriach gazu i dużych próbach to sekundy CPU i setki KB na odświeżenie. Tutaj do
+# przeglądarki trafiają tylko dane już zmniejszone: serie przerzedzone metodą min-max (piki
+# zostają widoczne), histogramy jako gotowe liczności koszy, Q-Q jako wybrane statystyki
+# pozycyjne. Ślady Scattergl rysuje WebGL, a powiększanie i przesuwanie dzieje się po stronie
+# klienta, bez reruna Streamlit. Eksport (raport.py, PNG) zostaje przy wykresy.py.
+
+go = leniwy_import("plotly.graph_objects")
+podwykresy = leniwy_import("plotly.subplots")
+
+PUNKTY = 4000        # maks. punktów na ślad po przerzedzeniu
+PROG_WEBGL = 5000    # od tylu punktów dashboard domyślnie wybiera ten backend
+KONFIGURACJA = {'scrollZoom': True, 'displaylogo': False}
+
+NIEBIESKI = '#3498db'
+ZIELONY = '#2ecc71'
+CZERWONY = '#e74c3c'
+
+
+def zmniejsz(x, y, punkty=PUNKTY):
+    """Przerzedzenie min-max: z każdego z punkty/2 kubełków minimum i maksimum w kolejności x.
+
+    W przeciwieństwie do brania co k-tego punktu nie gubi pojedynczych skoków kosztu.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= punkty:
+        return x, y
+
+    kubelki = punkty // 2
+    granice = np.linspace(0, n, kubelki + 1).astype(np.int64)
+    indeksy = np.empty(2 * kubelki, dtype=np.int64)
+    for k, (a, b) in enumerate(zip(granice[:-1], granice[1:])):
+        fragment = y[a:b]
+        i_min, i_max = a + int(np.argmin(fragment)), a + int(np.argmax(fragment))
+        indeksy[2 * k], indeksy[2 * k + 1] = min(i_min, i_max), max(i_min, i_max)
+    return x[indeksy], y[indeksy]
+
+
+def _uklad(fig, tytul=None, x=None, y=None, wysokosc=450):
+    fig.update_layout(title=dict(text=f"<b>{tytul}</b>") if tytul else None, height=wysokosc,
+                      template='plotly_white', margin=dict(l=60, r=20, t=60, b=50),
+                      legend=dict(orientation='h', yanchor='bottom', y=1.02, x=0))
+    if x:
+        fig.update_xaxes(title_text=x)
+    if y:
+        fig.update_yaxes(title_text=y)
+    return fig
+
+
+def wykres_kosztow(df_costs, koszty, punkty=PUNKTY):
+    """Przebieg kosztów RANDAO i VRF (wykresy.wykres_kosztow) - serie przerzedzone, WebGL."""
+    fig = go.Figure()
+    iteracje = df_costs['iteracja'].to_numpy()
+    serie = [
+        ('RANDAO (Total)', df_costs['randao_total_gas'].to_numpy(), koszty['avg_randao'], NIEBIESKI),
+        ('VRF (Total)', (df_costs['vrf_request_gas'] + df_costs['vrf_callback_gas']).to_numpy(), koszty['avg_vrf'], ZIELONY),
+    ]
+    for nazwa, wartosci, srednia, kolor in serie:
+        x, y = zmniejsz(iteracje, wartosci, punkty)
+        # Znaczniki tylko przy krótkich seriach - przy tysiącach punktów zasłaniają przebieg
+        tryb = 'lines+markers' if len(x) <= 200 else 'lines'
+        fig.add_trace(go.Scattergl(x=x, y=y, mode=tryb, name=nazwa, line=dict(color=kolor, width=2)))
+        fig.add_hline(y=srednia, line=dict(color=kolor, dash='dash'), opacity=0.5,
+                      annotation_text=f"{nazwa.split()[0]} avg: {int(srednia):,}", annotation_position='top left')
+    return _uklad(fig, "Porównanie kosztów Gas w kolejnych iteracjach", "Numer próby", "Zużycie gazu (gas)")
+
+
+def wykres_histogramow(randao_vals, vrf_vals, kosze=20):
+    """Histogramy (wykresy.wykres_histogramow) - liczności liczone na serwerze, do przeglądarki idzie `kosze` słupków."""
+    fig = podwykresy.make_subplots(rows=1, cols=2, subplot_titles=("RANDAO - Rozkład wartości", "VRF - Rozkład wartości"))
+    for kolumna, (vals, nazwa, kolor) in enumerate([(randao_vals, "RANDAO", NIEBIESKI), (vrf_vals, "VRF", ZIELONY)], 1):
+        vals = np.asarray(vals)
+        liczniki, krawedzie = np.histogram(vals, bins=kosze)
+        fig.add_trace(go.Bar(x=(krawedzie[:-1] + krawedzie[1:]) / 2, y=liczniki, width=np.diff(krawedzie),
+                             name=nazwa, marker=dict(color=kolor, line=dict(color='black', width=1)), opacity=0.7),
+                      row=1, col=kolumna)
+        fig.add_hline(y=len(vals) / kosze, line=dict(color='red', dash='dash'), row=1, col=kolumna,
+                      annotation_text='Oczekiwane (jednostajny)')
+        fig.update_xaxes(title_text="Wartość (0-99)", row=1, col=kolumna)
+        fig.update_yaxes(title_text="Częstość", row=1, col=kolumna)
+    return _uklad(fig, wysokosc=420)
+
+
+def wykres_qq(randao_vals, vrf_vals, punkty=PUNKTY):
+    """Q-Q względem U(0,1) (wykresy.wykres_qq); z dużej próby tylko `punkty` równo rozłożonych statystyk pozycyjnych."""
+    fig = podwykresy.make_subplots(rows=1, cols=2, subplot_titles=("RANDAO - Q-Q Plot", "VRF - Q-Q Plot"))
+    for kolumna, vals in enumerate([randao_vals, vrf_vals], 1):
+        osm, osr, slope, intercept = qq_jednostajny(vals)
+        if len(osm) > punkty:
+            wybrane = np.linspace(0, len(osm) - 1, punkty).astype(np.int64)
+            osm, osr = osm[wybrane], osr[wybrane]
+        fig.add_trace(go.Scattergl(x=osm, y=osr, mode='markers', marker=dict(color='blue', size=5),
+                                   showlegend=False), row=1, col=kolumna)
+        fig.add_trace(go.Scattergl(x=osm[[0, -1]], y=slope * osm[[0, -1]] + intercept, mode='lines',
+                                   line=dict(color='red'), showlegend=False), row=1, col=kolumna)
+        fig.update_xaxes(title_text="Theoretical quantiles", row=1, col=kolumna)
+        fig.update_yaxes(title_text="Ordered Values", row=1, col=kolumna)
+    return _uklad(fig, wysokosc=420)
+
+
+def wykres_autokorelacji(wyniki, punkty=PUNKTY):
+    """ACF z pasmami i periodogram (wykresy.wykres_autokorelacji); periodogram przerzedzony."""
+    nazwy = list(wyniki)
+    tytuly = [f"{n} - ACF (n = {wyniki[n]['n']:,})" for n in nazwy] + \
+             [f"{n} - periodogram ({wyniki[n]['okna']} okien)" for n in nazwy]
+    fig = podwykresy.make_subplots(rows=2, cols=len(nazwy), subplot_titles=tytuly, vertical_spacing=0.15)
+
+    for kolumna, nazwa in enumerate(nazwy, 1):
+        w = wyniki[nazwa]
+        fig.add_trace(go.Bar(x=w['opoznienia'], y=w['acf'], marker_color=NIEBIESKI, width=0.3,
+                             name='r_k', showlegend=False), row=1, col=kolumna)
+        fig.add_hrect(y0=-w['pasmo'], y1=w['pasmo'], fillcolor='#95a5a6', opacity=0.2, line_width=0,
+                      row=1, col=kolumna)
+        for znak in (-1, 1):
+            fig.add_hline(y=znak * w['pasmo_laczne'], line=dict(color=CZERWONY, dash='dash'), row=1, col=kolumna)
+
+        x, y = zmniejsz(w['czestotliwosci'], w['moc'], punkty)
+        fig.add_trace(go.Scattergl(x=x, y=y, mode='lines', line=dict(color=ZIELONY, width=1),
+                                   name='moc', showlegend=False), row=2, col=kolumna)
+        fig.add_hline(y=1, line=dict(color='black', width=0.8), row=2, col=kolumna)
+        fig.add_hline(y=w['prog_mocy'], line=dict(color=CZERWONY, dash='dash'), row=2, col=kolumna)
+
+        fig.update_xaxes(title_text='Opóźnienie (rundy)', row=1, col=kolumna)
+        fig.update_yaxes(title_text='Autokorelacja r_k', row=1, col=kolumna)
+        fig.update_xaxes(title_text='Częstotliwość (cykle na rundę)', row=2, col=kolumna)
+        fig.update_yaxes(title_text='Moc znormalizowana', row=2, col=kolumna)
+    return _uklad(fig, wysokosc=750)
@@ -0,0 +1,265 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from magazyn import ROZMIAR_SLOWA, Magazyn, slowa_na_hex, slowa_z_hex
+
+# Wsadowy keccak256 dla zobowiązań RANDAO.
+#
+# Kontrakt liczy keccak256(abi.encodePacked(_secret)), a skrypty - ethers.solidityPackedKeccak256(["uint256"], [secret]);
+# w obu przypadkach to keccak256 z 32 bajtów big-endian sekretu. Tutaj permutacja keccak-f[1600]
+# jest liczona w numpy naraz dla całej tablicy wiadomości (stan 25 x n słów uint64), więc
+# milion zobowiązań to kilka sekund zamiast miliona wywołań. Sekrety w formacie magazynu
+# ((n, 32) uint8, big-endian) są widokiem na bufor - pakowanie do bloków keccaka nie kopiuje danych.
+#
+#   python zobowiazania.py --generuj 1000000 --magazyn magazyn_zobowiazan   # dane do testów obciążeniowych
+#   python zobowiazania.py --audyt reveal.csv commit.csv                    # weryfikacja par (sekret, zobowiązanie)
+
+RATE = 136  # bajty bloku keccak256 (1600 - 2*256 bitów)
+LANE_W_BLOKU = RATE // 8
+
+# Stałe rund (iota)
+RC = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)
+
+# Przesunięcia rho dla lane (x, y), indeks x + 5*y
+ROTACJE = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+]
+
+# pi: lane (x, y) trafia na pozycję (y, 2x + 3y)
+PI = [0] * 25
+for _x in range(5):
+    for _y in range(5):
+        PI[_y + 5 * ((2 * _x + 3 * _y) % 5)] = _x + 5 * _y
+
+# Procesy opłacają się dopiero przy dużych wsadach (koszt startu i przesłania danych)
+PROG_WIELOPROCESOWY = 500_000
+
+
+# Stan dzielimy na porcje, żeby tablice pośrednie mieściły się w cache procesora
+PORCJA = 8192
+
+_PRZESUNIECIA = [(np.uint64(r), np.uint64(64 - r)) for r in range(64)]
+
+
+# --- 1. KECCAK-F[1600] ---
+def keccak_f(stan):
+    """Permutacja keccak-f[1600] na stanie (25, n) uint64 - n stanów naraz, w miejscu.
+
+    Wszystkie operacje idą przez out=, bez alokacji w pętli rund.
+    """
+    n = stan.shape[1]
+    c = np.empty((5, n), dtype=np.uint64)
+    d = np.empty((5, n), dtype=np.uint64)
+    b = np.empty((25, n), dtype=np.uint64)
+    tmp = np.empty(n, dtype=np.uint64)
+    a5, b5 = stan.reshape(5, 5, n), b.reshape(5, 5, n)  # [y, x]
+    jeden, szescdziesiat_trzy = _PRZESUNIECIA[1]
+
+    for rc in RC:
+        # theta
+        np.bitwise_xor(stan[0:5], stan[5:10], out=c)
+        c ^= stan[10:15]
+        c ^= stan[15:20]
+        c ^= stan[20:25]
+        for x in range(5):
+            np.left_shift(c[(x + 1) % 5], jeden, out=d[x])
+            np.right_shift(c[(x + 1) % 5], szescdziesiat_trzy, out=tmp)
+            d[x] |= tmp
+            d[x] ^= c[(x - 1) % 5]
+        a5 ^= d[None]
+        # rho + pi
+        for i in range(25):
+            zrodlo = PI[i]
+            r = ROTACJE[zrodlo]
+            if r == 0:
+                b[i] = stan[zrodlo]
+            else:
+                w_lewo, w_prawo = _PRZESUNIECIA[r]
+                np.left_shift(stan[zrodlo], w_lewo, out=b[i])
+                np.right_shift(stan[zrodlo], w_prawo, out=tmp)
+                b[i] |= tmp
+        # chi
+        for x in range(5):
+            np.invert(b5[:, (x + 1) % 5], out=a5[:, x])
+            a5[:, x] &= b5[:, (x + 2) % 5]
+            a5[:, x] ^= b5[:, x]
+        # iota
+        stan[0] ^= rc
+    return stan
+
+
+def keccak256_wsadowo(wiadomosci):
+    """keccak256 dla tablicy (n, L) uint8 wiadomości o równej długości L -> (n, 32) uint8."""
+    wiadomosci = np.ascontiguousarray(wiadomosci, dtype=np.uint8)
+    n, dlugosc = wiadomosci.shape
+    if dlugosc == ROZMIAR_SLOWA:
+        return zobowiazania(wiadomosci)
+
+    # Padding keccak (0x01 ... 0x80) - inaczej niż w SHA3 (0x06)
+    bloki = dlugosc // RATE + 1
+    bufor = np.zeros((n, bloki * RATE), dtype=np.uint8)
+    bufor[:, :dlugosc] = wiadomosci
+    bufor[:, dlugosc] ^= 0x01
+    bufor[:, -1] ^= 0x80
+    lanes = bufor.view('<u8')  # (n, bloki * 17)
+
+    stan = np.zeros((25, n), dtype=np.uint64)
+    for blok in range(bloki):
+        stan[:LANE_W_BLOKU] ^= lanes[:, blok * LANE_W_BLOKU:(blok + 1) * LANE_W_BLOKU].T
+        keccak_f(stan)
+    return _skrot(stan)
+
+
+def _skrot(stan):
+    # Pierwsze 4 lane (little-endian) to 32 bajty wyniku
+    return np.ascontiguousarray(stan[:4].T).astype('<u8', copy=False).view(np.uint8)
+
+
+# --- 2. ZOBOWIĄZANIA ---
+def zobowiazania(sekrety):
+    """keccak256(abi.encodePacked(uint256)) dla tablicy sekretów (n, 32) uint8 big-endian.
+
+    32 bajty mieszczą się w jednym bloku, więc 4 pierwsze lane stanu to po prostu
+    widok '<u8' na bufor sekretów; padding to stałe w lane 4 i 16.
+    """
+    sekrety = np.ascontiguousarray(sekrety, dtype=np.uint8)
+    lanes = sekrety.view('<u8')  # (n, 4) - widok na ten sam bufor
+    wynik = np.empty((len(sekrety), ROZMIAR_SLOWA), dtype=np.uint8)
+    for start in range(0, len(sekrety), PORCJA):
+        czesc = lanes[start:start + PORCJA]
+        stan = np.zeros((25, len(czesc)), dtype=np.uint64)
+        stan[:4] = czesc.T
+        stan[4] = 0x01
+        stan[LANE_W_BLOKU - 1] = 0x80 << 56
+        keccak_f(stan)
+        wynik[start:start + PORCJA] = _skrot(stan)
+    return wynik
+
+
+def keccak256(dane):
+    """keccak256 pojedynczego ciągu bajtów (np. sygnatury eventu)."""
+    return bytes(keccak256_wsadowo(np.frombuffer(dane, dtype=np.uint8).reshape(1, -1))[0])
+
+
+def zobowiazania_rownolegle(sekrety, procesy=None):
+    """Jak zobowiazania(), ale duże wsady dzielone między procesy."""
+    procesy = procesy or os.cpu_count() or 1
+    if procesy == 1 or len(sekrety) < PROG_WIELOPROCESOWY:
+        return zobowiazania(sekrety)
+    czesci = np.array_split(np.asarray(sekrety), procesy * 4)
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        return np.concatenate(list(pula.map(zobowiazania, czesci)))
+
+
+def weryfikuj(sekrety, oczekiwane, procesy=None):
+    """Odpowiednik require(keccak256(abi.encodePacked(secret)) == commitment) dla całej tablicy par."""
+    return np.all(zobowiazania_rownolegle(sekrety, procesy) == np.asarray(oczekiwane, dtype=np.uint8), axis=1)
+
+
+# --- 3. CLI ---
+def generuj(katalog, liczba, ziarno, procesy=None, porcja=1_000_000):
+    """Losowe sekrety + zobowiązania do magazynu (wejście dla testów obciążeniowych)."""
+    magazyn = Magazyn.otworz_lub_utworz(
+        katalog, {'sekret': ('u1', (ROZMIAR_SLOWA,)), 'zobowiazanie': ('u1', (ROZMIAR_SLOWA,))}, {'ziarno': ziarno}
+    )
+    while magazyn.wiersze < liczba:
+        # Ziarno z bezwzględnego numeru porcji: wznowione generowanie daje te same sekrety co nieprzerwane
+        nr, przesuniecie = divmod(magazyn.wiersze, porcja)
+        rng = np.random.default_rng(np.random.SeedSequence(ziarno, spawn_key=(nr,)))
+        sekrety = rng.integers(0, 256, size=(porcja, ROZMIAR_SLOWA), dtype=np.uint8)
+        sekrety = sekrety[przesuniecie:min(porcja, liczba - nr * porcja)]
+        magazyn.dopisz({'sekret': sekrety, 'zobowiazanie': zobowiazania_rownolegle(sekrety, procesy)})
+        print(f"Postęp: {magazyn.wiersze}/{liczba}", flush=True)
+    return magazyn
+
+
+def _ponumeruj(df, klucz):
+    """Numer kolejnego wpisu pod tym samym kluczem (0, 1, ...) w kolumnie `_kolejnosc`."""
+    for k in klucz:
+        df[k] = df[k].str.lower()
+    if 'blok' in df.columns:
+        df = df.sort_values('blok', key=lambda b: b.astype('int64'), kind='stable')
+    return df.assign(_kolejnosc=df.groupby(klucz, sort=False).cumcount())
+
+
+def audytuj(plik_reveal, plik_commit, procesy=None):
+    """Łączy ujawnienia (LogReveal: gracz, sekret) z zobowiązaniami z commit() i weryfikuje pary.
+
+    LogCommit nie zawiera hasha - kolumnę `zobowiazanie` trzeba wyciągnąć z calldata commit(bytes32)
+    albo z gettera participants(gracz). Klucz złączenia: wspólne kolumny spośród (kontrakt, runda, gracz).
+    Gracz z kilkoma wpisami pod tym samym kluczem (kolejne rundy bez kolumny `runda`) jest parowany
+    po kolejności - k-te ujawnienie z k-tym zobowiązaniem, wg kolumny `blok`, jeśli jest - zamiast
+    iloczynu kartezjańskiego wszystkich jego wpisów.
+    """
+    import pandas as pd
+    reveal = pd.read_csv(plik_reveal, dtype=str)
+    commit = pd.read_csv(plik_commit, dtype=str)
+    klucz = [k for k in ('kontrakt', 'runda', 'gracz') if k in reveal.columns and k in commit.columns]
+    if 'gracz' not in klucz:
+        raise ValueError("Pliki muszą mieć wspólną kolumnę 'gracz' (i opcjonalnie 'kontrakt', 'runda')")
+    reveal, commit = _ponumeruj(reveal, klucz), _ponumeruj(commit, klucz)
+
+    pary = reveal.merge(commit, on=klucz + ['_kolejnosc'], how='inner').drop(columns='_kolejnosc')
+    bez_pary = len(reveal) - len(pary)
+    zgodne = weryfikuj(slowa_z_hex(pary['sekret']), slowa_z_hex(pary['zobowiazanie']), procesy)
+    return pary.assign(zgodne=zgodne), bez_pary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wsadowe zobowiązania keccak256 dla RANDAO")
+    tryb = parser.add_mutually_exclusive_group(required=True)
+    tryb.add_argument("--generuj", type=int, metavar="N", help="wygeneruj N par (sekret, zobowiązanie)")
+    tryb.add_argument("--audyt", nargs=2, metavar=("REVEAL_CSV", "COMMIT_CSV"), help="zweryfikuj zapisane rundy")
+    parser.add_argument("--magazyn", default="magazyn_zobowiazan", help="katalog magazynu (--generuj)")
+    parser.add_argument("--csv", help="eksport par do CSV (sekret,zobowiazanie w hex)")
+    parser.add_argument("--ziarno", type=int, default=2024)
+    parser.add_argument("--procesy", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--niezgodne", help="zapisz niezgodne pary do CSV (--audyt)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.generuj:
+        magazyn = generuj(args.magazyn, args.generuj, args.ziarno, args.procesy)
+        czas = time.perf_counter() - start
+        print(f"Magazyn {args.magazyn}: {magazyn.wiersze:,} par ({czas:.1f}s)")
+        if args.csv:
+            with open(args.csv, 'w') as f:
+                f.write("sekret,zobowiazanie\n")
+                for s, z in zip(magazyn.fragmenty('sekret'), magazyn.fragmenty('zobowiazanie')):
+                    f.writelines(f"{a},{b}\n" for a, b in zip(slowa_na_hex(s), slowa_na_hex(z)))
+            print(f"Zapisano: {args.csv}")
+        return
+
+    try:
+        pary, bez_pary = audytuj(*args.audyt, procesy=args.procesy)
+    except (ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    czas = time.perf_counter() - start
+    niezgodne = pary[~pary['zgodne']]
+    print(f"Zweryfikowano {len(pary):,} par w {czas:.1f}s: zgodne {int(pary['zgodne'].sum()):,}, "
+          f"niezgodne {len(niezgodne):,}, ujawnienia bez zobowiązania {bez_pary:,}")
+    if args.niezgodne and len(niezgodne):
+        niezgodne.to_csv(args.niezgodne, index=False)
+        print(f"Zapisano: {args.niezgodne}")
+    sys.exit(1 if len(niezgodne) else 0)
+
+
+if __name__ == "__main__":
+    main()